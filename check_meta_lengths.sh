@@ -1,10 +1,5 @@
 #!/bin/bash
-find EVENT-MANAGEMENT MARKETING TECHNOLOGY -name "index.html" -type f | while read file; do
-    desc=$(grep -oP 'name="description" content="\K[^"]+' "$file" 2>/dev/null)
-    if [ -n "$desc" ]; then
-        len=${#desc}
-        if [ $len -lt 150 ] || [ $len -gt 160 ]; then
-            echo "[$len] $file"
-        fi
-    fi
-done
+# Category pages whose meta description is outside 150-160 characters:
+# the meta-description rule of the site lint (see scripts/site_lint.py)
+cd "$(dirname "$0")" || exit 1
+python3 scripts/lint-site.py --rule meta-description --fail-on never EVENT-MANAGEMENT MARKETING TECHNOLOGY "$@"
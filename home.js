@@ -108,320 +108,280 @@ document.addEventListener('DOMContentLoaded', () => {
     // Handle hash navigation when hash changes (browser back/forward)
     window.addEventListener('hashchange', handleHashNavigation);
 
-    // Search database with all available topics
-    const searchDatabase = [
-        // Event Management
-        {
-            title: "Digital Ticketing Systems",
-            description: "Complete guide to digital ticketing platforms, QR codes, NFC, and modern event ticketing solutions",
-            category: "Event Management",
-            url: "EVENT-MANAGEMENT/ticketing-platform/index.html",
-            keywords: ["ticketing", "digital tickets", "qr code", "nfc", "event management", "tickets", "ticket platform", "digital ticketing", "event tickets"]
-        },
-        {
-            title: "Volunteer Management Systems",
-            description: "Comprehensive guide to streamlining team coordination and volunteer management",
-            category: "Event Management", 
-            url: "EVENT-MANAGEMENT/volunteer-systems/index.html",
-            keywords: ["volunteer", "volunteers", "team coordination", "volunteer management", "vms", "volunteer systems", "event volunteers", "volunteering"]
-        },
-        {
-            title: "Event Budgeting",
-            description: "Financial planning and budget management for successful events",
-            category: "Event Management",
-            url: "EVENT-MANAGEMENT/Event-budgeting/index.html",
-            keywords: ["budget", "budgeting", "finance", "financial planning", "event budget", "cost management", "expenses", "event finance"]
-        },
-        {
-            title: "Logistic Planning",
-            description: "Comprehensive logistics and operational planning for events",
-            category: "Event Management",
-            url: "EVENT-MANAGEMENT/Logistic-Planning/index.html",
-            keywords: ["logistics", "planning", "operations", "event logistics", "operational planning", "supply chain", "event operations"]
-        },
-        {
-            title: "Event Management",
-            description: "Overview of event management tools and strategies",
-            category: "Event Management",
-            url: "#event-management",
-            keywords: ["event management", "events", "event planning", "event coordination", "event organization"]
-        },
-        
-        // Technology
-        {
-            title: "5G Technology",
-            description: "Fifth-generation cellular network technology and its applications",
-            category: "Technology",
-            url: "TECHNOLOGY/5G-Technology/index.html",
-            keywords: ["5g", "5g technology", "network", "cellular", "wireless", "connectivity", "mobile network", "telecommunications"]
-        },
-        {
-            title: "Agentic AI",
-            description: "Autonomous AI agents and intelligent automation systems",
-            category: "Technology",
-            url: "TECHNOLOGY/Agentic-AI/index.html",
-            keywords: ["agentic ai", "ai agents", "autonomous ai", "intelligent agents", "artificial intelligence", "automation", "ai systems"]
-        },
-        {
-            title: "APIs",
-            description: "Application Programming Interfaces and integration solutions",
-            category: "Technology",
-            url: "TECHNOLOGY/APIs/index.html",
-            keywords: ["api", "apis", "rest api", "integration", "web services", "application programming interface", "endpoints", "web api"]
-        },
-        {
-            title: "Biotech & Engineered Living Therapeutics",
-            description: "Biotechnology and advanced living therapeutic solutions",
-            category: "Technology",
-            url: "TECHNOLOGY/Biotech-&-Engineered-Living-Therapeutics/index.html",
-            keywords: ["biotech", "biotechnology", "therapeutics", "living therapeutics", "engineered biology", "bioscience", "medical tech"]
-        },
-        {
-            title: "Collaborative Sensing & Autonomous Biochemical Sensors",
-            description: "Advanced sensor networks and autonomous biochemical detection systems",
-            category: "Technology",
-            url: "TECHNOLOGY/Collaborative-Sensing-&-Autonomous-Biochemical-Sensors/index.html",
-            keywords: ["sensors", "sensing", "biochemical", "autonomous sensors", "sensor networks", "detection systems", "iot sensors"]
-        },
-        {
-            title: "Database Management",
-            description: "Database systems, design, and management best practices",
-            category: "Technology",
-            url: "TECHNOLOGY/Database-Management/index.html",
-            keywords: ["database", "db", "sql", "nosql", "database management", "data storage", "dbms", "data management"]
-        },
-        {
-            title: "DevOps",
-            description: "Development and operations practices for software delivery",
-            category: "Technology",
-            url: "TECHNOLOGY/Devops/index.html",
-            keywords: ["devops", "ci cd", "continuous integration", "deployment", "automation", "infrastructure", "dev ops"]
-        },
-        {
-            title: "Edge Computing",
-            description: "Distributed computing paradigm bringing computation closer to data sources",
-            category: "Technology",
-            url: "TECHNOLOGY/Edge-Computing/index.html",
-            keywords: ["edge computing", "edge", "distributed computing", "fog computing", "iot", "cloud edge"]
-        },
-        {
-            title: "Generative AI",
-            description: "AI systems that generate new content, text, images, and more",
-            category: "Technology",
-            url: "TECHNOLOGY/Generative-AI/index.html",
-            keywords: ["generative ai", "genai", "chatgpt", "ai generation", "llm", "large language models", "image generation", "ai content"]
-        },
-        {
-            title: "Green Nitrogen Fixation & Advanced Clean Energy",
-            description: "Sustainable nitrogen fixation and clean energy technologies",
-            category: "Technology",
-            url: "TECHNOLOGY/Green-Nitrogen-Fixation-&-Advanced-Clean-Energy/index.html",
-            keywords: ["green energy", "nitrogen fixation", "clean energy", "renewable energy", "sustainable energy", "green tech"]
-        },
-        {
-            title: "NFC Technology",
-            description: "Near Field Communication technology guide for events and ticketing",
-            category: "Technology",
-            url: "TECHNOLOGY/NFC/index.html",
-            keywords: ["nfc", "near field communication", "contactless", "technology", "smart cards", "tap", "rfid"]
-        },
-        {
-            title: "Quantum Computing",
-            description: "Quantum computing principles, applications, and future potential",
-            category: "Technology",
-            url: "TECHNOLOGY/Quantun-Computing/index.html",
-            keywords: ["quantum", "quantum computing", "qubits", "quantum mechanics", "quantum algorithms", "quantum tech"]
-        },
-        {
-            title: "Synthetic Media & Generative Watermarking",
-            description: "AI-generated media and digital watermarking technologies",
-            category: "Technology",
-            url: "TECHNOLOGY/Synthetic-Media-&-Generative-Watermarking/index.html",
-            keywords: ["synthetic media", "deepfake", "watermarking", "digital watermark", "ai media", "generated media"]
-        },
-        {
-            title: "VR Virtual Reality",
-            description: "Virtual reality technology, applications, and immersive experiences",
-            category: "Technology",
-            url: "TECHNOLOGY/VR-Virtual-Reality/index.html",
-            keywords: ["vr", "virtual reality", "immersive", "headset", "metaverse", "3d", "virtual world"]
-        },
-        {
-            title: "Web Development",
-            description: "Modern web development technologies, frameworks, and best practices",
-            category: "Technology",
-            url: "TECHNOLOGY/Web-Development/index.html",
-            keywords: ["web development", "web dev", "frontend", "backend", "html", "css", "javascript", "web design", "programming"]
-        },
-        {
-            title: "Technology Solutions",
-            description: "Web development, APIs, databases, and technical solutions",
-            category: "Technology",
-            url: "#technology", 
-            keywords: ["technology", "tech", "technical", "software", "it solutions"]
-        },
-        
-        // Marketing - Core
-        {
-            title: "Social Media Strategy",
-            description: "Complete guide to social media marketing, influencer campaigns, and digital event promotion",
-            category: "Marketing",
-            url: "MARKETING/social-media-strategy/index.html",
-            keywords: ["social media", "marketing", "social media strategy", "influencer", "facebook", "instagram", "linkedin", "tiktok", "social campaigns", "digital marketing", "social"]
-        },
-        {
-            title: "Content Marketing",
-            description: "Complete expert guide to content marketing strategy, creation, distribution, analytics, and future trends",
-            category: "Marketing",
-            url: "MARKETING/content-marketing/index.html",
-            keywords: ["content marketing", "content strategy", "inbound marketing", "brand publishing", "thought leadership", "seo", "digital marketing", "content creation", "marketing content", "content"]
-        },
-        {
-            title: "Analytics & Insights",
-            description: "Data-driven marketing analytics, metrics tracking, and actionable insights for campaigns",
-            category: "Marketing",
-            url: "MARKETING/analytics-&-insigths/index.html",
-            keywords: ["analytics", "insights", "data", "metrics", "tracking", "kpi", "roi", "measurement", "analysis", "marketing analytics"]
-        },
-        {
-            title: "Email Campaigns",
-            description: "Email marketing strategies, automation, and campaign optimization",
-            category: "Marketing",
-            url: "MARKETING/email-campaigns/index.html",
-            keywords: ["email", "email marketing", "campaigns", "newsletter", "email automation", "email strategy", "drip campaigns", "mailing"]
-        },
-        
-        // Marketing - Advanced Content
-        {
-            title: "Short Form Video Content",
-            description: "Creating engaging short-form videos for TikTok, Reels, and Shorts",
-            category: "Marketing",
-            url: "MARKETING/short-form-video-content/index.html",
-            keywords: ["short form", "video", "tiktok", "reels", "shorts", "video content", "short video", "vertical video", "video marketing"]
-        },
-        {
-            title: "Personalization & Data-Driven Content",
-            description: "Leveraging data and AI to personalize content and improve engagement",
-            category: "Marketing",
-            url: "MARKETING/Personalization-&-Data-Driven-Content/index.html",
-            keywords: ["personalization", "data driven", "ai", "targeting", "customization", "personalized content", "data", "audience segmentation"]
-        },
-        {
-            title: "Compliance & Ethical Content Marketing",
-            description: "Legal compliance, ethical practices, and responsible content marketing",
-            category: "Marketing",
-            url: "MARKETING/compliance-&-ethical-content-marketing/index.html",
-            keywords: ["compliance", "ethics", "legal", "gdpr", "privacy", "ethical marketing", "responsible marketing", "regulations"]
-        },
-        {
-            title: "AI-Powered Content Creation",
-            description: "Using artificial intelligence for content creation and marketing automation",
-            category: "Marketing",
-            url: "MARKETING/AI-Powered-Content-Creation-&-Exhaustive-Marketing/index.html",
-            keywords: ["ai", "artificial intelligence", "automation", "ai content", "machine learning", "chatgpt", "ai marketing", "content automation"]
-        },
-        {
-            title: "Humanizing Content & Authentic Storytelling",
-            description: "Creating authentic, human-centered content that resonates with audiences",
-            category: "Marketing",
-            url: "MARKETING/Humanizing-content-&-authentic-storytelling/index.html",
-            keywords: ["storytelling", "authentic", "human", "brand story", "narrative", "humanizing", "authenticity", "emotional content"]
-        },
-        {
-            title: "User Generated Content (UGC)",
-            description: "Leveraging user-generated content for authentic marketing and engagement",
-            category: "Marketing",
-            url: "MARKETING/UGC/index.html",
-            keywords: ["ugc", "user generated", "user content", "reviews", "testimonials", "community content", "social proof", "customer content"]
-        },
-        {
-            title: "Content Format Innovations",
-            description: "Exploring new content formats including interactive media and emerging technologies",
-            category: "Marketing",
-            url: "MARKETING/content-format-innovations/index.html",
-            keywords: ["innovation", "content formats", "interactive", "new media", "emerging tech", "content innovation", "formats"]
+    // Site search: the index is built by scripts/build-search-index.py and
+    // fetched lazily - index.json on first use, then only the term shards of
+    // the words typed and the document chunks of the hits.
+    const SEARCH_INDEX_URL = '/search/';
+    const SEARCH_INDEX_VERSION = 3;
+    const SEARCH_RESULT_LIMIT = 8;
+    // 'TXS1': first bytes of a binary term shard
+    const SEARCH_SHARD_MAGIC = 0x54585331;
+
+    const searchIndex = {
+        meta: null,
+        files: new Map(),
+
+        fetchFile(name, read) {
+            if (!this.files.has(name)) {
+                const request = fetch(SEARCH_INDEX_URL + name)
+                    .then(response => {
+                        if (!response.ok) throw new Error(`Search index: ${name} (${response.status})`);
+                        return read(response);
+                    })
+                    .catch(error => {
+                        // Let a later query try again
+                        this.files.delete(name);
+                        throw error;
+                    });
+                this.files.set(name, request);
+            }
+            return this.files.get(name);
         },
-        {
-            title: "Augmented Reality & Virtual Reality Marketing",
-            description: "Immersive AR/VR experiences for innovative content marketing",
-            category: "Marketing",
-            url: "MARKETING/augmented-reality-&-virtual-reality-for-content-marketing/index.html",
-            keywords: ["ar", "vr", "augmented reality", "virtual reality", "immersive", "metaverse", "3d", "xr", "mixed reality"]
+
+        fetchJson(name) {
+            return this.fetchFile(name, response => response.json());
         },
-        {
-            title: "Co-Marketing & Brand Partnership",
-            description: "Strategic partnerships and collaborative marketing initiatives",
-            category: "Marketing",
-            url: "MARKETING/Co-Marketing-&-brand-partnership/index.html",
-            keywords: ["partnership", "co-marketing", "collaboration", "brand partnership", "joint venture", "alliance", "strategic partnership"]
+
+        fetchShard(name) {
+            if (name.endsWith('.bin')) {
+                return this.fetchFile(name, async response => new BinaryShard(await response.arrayBuffer()));
+            }
+            return this.fetchFile(name, async response => new JsonShard(await response.json(), this.meta.prefix));
         },
-        {
-            title: "Newsletter & Community-Driven Growth",
-            description: "Building engaged communities and growing through newsletter marketing",
-            category: "Marketing",
-            url: "MARKETING/newsletter-&-community-driven-growth/index.html",
-            keywords: ["newsletter", "community", "growth", "community building", "engagement", "subscriber", "community driven", "audience building"]
+
+        async load() {
+            if (!this.meta) {
+                const meta = await this.fetchJson('index.json');
+                if (meta.version !== SEARCH_INDEX_VERSION) {
+                    throw new Error(`Search index version ${meta.version}, expected ${SEARCH_INDEX_VERSION}`);
+                }
+                // Word pattern, folds and Hinglish spelling rules of the indexer (scripts/site_text.py)
+                meta.stopwords = new Set(meta.stopwords);
+                meta.wordPattern = new RegExp(meta.pattern, 'gu');
+                meta.foldPattern = new RegExp(`[${Object.keys(meta.fold).join('')}]`, 'gu');
+                meta.variantRules = meta.variants.map(([pattern, replacement]) => [new RegExp(pattern, 'g'), replacement]);
+                this.meta = meta;
+            }
+            return this.meta;
         },
-        {
-            title: "Content Marketing Measurement & ROI Analytics",
-            description: "Measuring content performance and calculating marketing ROI",
-            category: "Marketing",
-            url: "MARKETING/content-marketing-measurement-&-ROI-analytics/index.html",
-            keywords: ["roi", "measurement", "analytics", "performance", "metrics", "content roi", "marketing measurement", "attribution"]
+
+        tokenize(query) {
+            const folded = query.normalize('NFC').toLowerCase().replace(this.meta.foldPattern, char => this.meta.fold[char]);
+            const words = folded.match(this.meta.wordPattern) || [];
+            // The last word may be half typed: a stopword is only dropped once it is complete
+            return words.filter((word, index) =>
+                word.length > 1 && (!this.meta.stopwords.has(word) || index === words.length - 1)
+            );
         },
-        
-        // Bhakti
-        {
-            title: "Hanuman Chalisa",
-            description: "Complete Hanuman Chalisa with meaning and significance",
-            category: "Bhakti",
-            url: "bhakti/hanuman-chalisa.html",
-            keywords: ["hanuman", "chalisa", "hanuman chalisa", "bhakti", "devotional", "prayer", "hindu", "lord hanuman"]
+
+        // Hinglish spelling key of a Latin word ("mahaveer" -> "mahavir")
+        variant(token) {
+            if (!/^[a-z]/.test(token)) return token;
+            return this.meta.variantRules.reduce((key, [pattern, replacement]) => key.replace(pattern, replacement), token);
         },
-        {
-            title: "Bhakti",
-            description: "Devotional content and spiritual resources",
-            category: "Bhakti",
-            url: "#bhakti",
-            keywords: ["bhakti", "devotion", "spiritual", "devotional", "religious", "prayer"]
+
+        shardFor(token) {
+            // Last shard of the word's first character that starts at or before it
+            let name = null;
+            for (const [start, fileName] of this.meta.shards[token[0]] || []) {
+                if (start <= token.slice(0, 2)) name = fileName;
+            }
+            return name ? this.fetchShard(name) : Promise.resolve(null);
         },
-        
-        // Jain Docs
-        {
-            title: "Jain Docs",
-            description: "Comprehensive Jain religious texts, prayers, and spiritual documentation",
-            category: "Jain Docs",
-            url: "Jain Docs/index.html",
-            keywords: ["jain", "jainism", "jain docs", "tirthankar", "mahavir", "jain prayers", "jain mantras", "jain bhajan", "jain puja", "jain stuti", "navkar mantra", "bhaktamar stotra", "jain religion", "jain dharma"]
+
+        async termScores(token, prefix) {
+            const shard = await this.shardFor(token);
+            const scores = new Map();
+            if (!shard) return scores;
+
+            const terms = shard.terms;
+            let matches = [];
+            if (prefix) {
+                const [start, end] = shard.bounds(token);
+                let position = lowerBound(terms, token, start, end);
+                while (position < end && terms[position].startsWith(token)) {
+                    matches.push(position++);
+                }
+                // Most frequent completions first
+                matches.sort((a, b) => shard.count(b) - shard.count(a));
+                matches = matches.slice(0, this.meta.expansions);
+            } else {
+                const position = lowerBound(terms, token, 0, terms.length);
+                if (terms[position] === token) matches.push(position);
+            }
+
+            matches.forEach(match => {
+                const factor = terms[match] === token ? 1 : this.meta.prefixFactor;
+                const flat = shard.postings(match);
+                for (let i = 0; i < flat.length; i += 2) {
+                    const score = flat[i + 1] * factor;
+                    if (score > (scores.get(flat[i]) || 0)) scores.set(flat[i], score);
+                }
+            });
+            return scores;
         },
-        
-        // Main Categories
-        {
-            title: "Marketing Strategies",
-            description: "Social media, content marketing, and analytics insights",
-            category: "Marketing",
-            url: "#marketing",
-            keywords: ["marketing", "strategy", "campaigns", "digital marketing", "marketing strategies"]
+
+        async document(doc) {
+            const chunk = await this.fetchJson(this.meta.docs[Math.floor(doc / this.meta.chunk)]);
+            const [url, title, category, description] = chunk[doc % this.meta.chunk];
+            return { url, title, category, description };
         },
-        {
-            title: "Tools",
-            description: "Useful online tools and utilities",
-            category: "Tools",
-            url: "tools.html",
-            keywords: ["tools", "utilities", "calculator", "converter", "generator", "online tools", "web tools"]
+
+        // Documents containing every word of the query (the last one as a prefix), best first
+        async search(query, limit = SEARCH_RESULT_LIMIT) {
+            await this.load();
+            const tokens = this.tokenize(query);
+            if (tokens.length === 0) return [];
+
+            const scores = await Promise.all(tokens.map(async (token, index) => {
+                const prefix = index === tokens.length - 1;
+                const scores = await this.termScores(token, prefix);
+                const key = this.variant(token);
+                if (key !== token) {
+                    (await this.termScores(key, prefix)).forEach((score, doc) => {
+                        if (score > (scores.get(doc) || 0)) scores.set(doc, score);
+                    });
+                }
+                return scores;
+            }));
+            let totals = scores[0];
+            for (const next of scores.slice(1)) {
+                const combined = new Map();
+                totals.forEach((total, doc) => {
+                    if (next.has(doc)) combined.set(doc, total + next.get(doc));
+                });
+                totals = combined;
+            }
+
+            const ranked = [...totals.entries()]
+                .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+                .slice(0, limit);
+            return Promise.all(ranked.map(([doc]) => this.document(doc)));
+        }
+    };
+
+    // Term shard as JSON: terms, flat [doc, score, ...] postings and a prefix table
+    class JsonShard {
+        constructor(data, prefixLength) {
+            this.terms = data.terms;
+            this.flatPostings = data.postings;
+            this.prefixes = data.prefixes;
+            this.prefixLength = prefixLength;
+        }
+
+        bounds(token) {
+            return this.prefixes[token.slice(0, this.prefixLength)] || [0, 0];
+        }
+
+        count(position) {
+            return this.flatPostings[position].length / 2;
+        }
+
+        postings(position) {
+            return this.flatPostings[position];
+        }
+    }
+
+    // Binary term shard (see scripts/site_search.py): a front-coded term
+    // dictionary, decoded on load, and varint delta postings, decoded per term
+    class BinaryShard {
+        constructor(buffer) {
+            this.view = new DataView(buffer);
+            if (this.view.getUint32(0) !== SEARCH_SHARD_MAGIC) throw new Error('Not a binary search shard');
+            this.offset = 4;
+
+            const bytes = new Uint8Array(buffer);
+            const decoder = new TextDecoder();
+            const count = this.varint();
+            this.terms = new Array(count);
+            this.counts = new Array(count);
+            this.offsets = new Array(count);
+            const sizes = new Array(count);
+            let previous = new Uint8Array(0);
+            for (let i = 0; i < count; i++) {
+                const shared = this.varint();
+                const length = this.varint();
+                const term = new Uint8Array(shared + length);
+                term.set(previous.subarray(0, shared));
+                term.set(bytes.subarray(this.offset, this.offset + length), shared);
+                this.offset += length;
+                this.terms[i] = decoder.decode(term);
+                previous = term;
+                this.counts[i] = this.varint();
+                sizes[i] = this.varint();
+            }
+            for (let i = 0; i < count; i++) {
+                this.offsets[i] = this.offset;
+                this.offset += sizes[i];
+            }
         }
-    ];
+
+        varint() {
+            let value = 0;
+            let scale = 1;
+            let byte;
+            do {
+                byte = this.view.getUint8(this.offset++);
+                value += (byte & 0x7f) * scale;
+                scale *= 128;
+            } while (byte & 0x80);
+            return value;
+        }
+
+        bounds() {
+            return [0, this.terms.length];
+        }
+
+        count(position) {
+            return this.counts[position];
+        }
+
+        postings(position) {
+            const flat = new Array(this.counts[position] * 2);
+            this.offset = this.offsets[position];
+            let doc = 0;
+            for (let i = 0; i < flat.length; i += 2) {
+                doc += this.varint();
+                flat[i] = doc;
+                flat[i + 1] = this.varint();
+            }
+            return flat;
+        }
+    }
+
+    function lowerBound(terms, token, start, end) {
+        while (start < end) {
+            const middle = (start + end) >> 1;
+            if (terms[middle] < token) start = middle + 1;
+            else end = middle;
+        }
+        return start;
+    }
+
+    function escapeHtml(text) {
+        return text.replace(/[&<>"']/g, char => ({
+            '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+        })[char]);
+    }
 
     // Search form functionality with autocomplete
     const searchForm = document.querySelector('.search-form');
     const searchInput = document.getElementById('search-input');
     const searchSuggestions = document.getElementById('search-suggestions');
     let currentHighlight = -1;
+    // Only the latest query's results are shown (lookups may finish out of order)
+    let searchSequence = 0;
 
     if (searchForm && searchInput && searchSuggestions) {
+        // Start loading the index as soon as the user heads for the search box
+        searchInput.addEventListener('focus', () => {
+            searchIndex.load().catch(() => {});
+        }, { once: true });
+
         // Handle input events for real-time search
-        searchInput.addEventListener('input', (e) => {
+        searchInput.addEventListener('input', async (e) => {
             const query = e.target.value.trim().toLowerCase();
+            const sequence = ++searchSequence;
             currentHighlight = -1;
             
             if (query.length < 2) {
@@ -429,13 +389,16 @@ document.addEventListener('DOMContentLoaded', () => {
                 return;
             }
             
-            const results = searchDatabase.filter(item => 
-                item.keywords.some(keyword => keyword.toLowerCase().includes(query)) ||
-                item.title.toLowerCase().includes(query) ||
-                item.description.toLowerCase().includes(query)
-            );
-            
-            showSuggestions(results, query);
+            let results;
+            try {
+                results = await searchIndex.search(query);
+            } catch (error) {
+                console.error(error);
+                results = [];
+            }
+            if (sequence === searchSequence) {
+                showSuggestions(results, query);
+            }
         });
 
         // Handle keyboard navigation
@@ -487,15 +450,15 @@ document.addEventListener('DOMContentLoaded', () => {
             searchSuggestions.innerHTML = '<div class="search-no-results">No results found</div>';
         } else {
             searchSuggestions.innerHTML = results.map((result, index) => `
-                <div class="search-suggestion" data-url="${result.url}" data-index="${index}">
+                <div class="search-suggestion" data-url="${escapeHtml(result.url)}" data-index="${index}">
                     <svg class="search-suggestion-icon" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
                         <circle cx="11" cy="11" r="8"></circle>
                         <line x1="21" y1="21" x2="16.65" y2="16.65"></line>
                     </svg>
                     <div class="search-suggestion-content">
-                        <div class="search-suggestion-category">${result.category}</div>
-                        <div class="search-suggestion-title">${highlightMatch(result.title, query)}</div>
-                        <div class="search-suggestion-description">${highlightMatch(result.description, query)}</div>
+                        <div class="search-suggestion-category">${escapeHtml(result.category)}</div>
+                        <div class="search-suggestion-title">${highlightMatch(escapeHtml(result.title), query)}</div>
+                        <div class="search-suggestion-description">${highlightMatch(escapeHtml(result.description), query)}</div>
                     </div>
                 </div>
             `).join('');
@@ -574,28 +537,19 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    function handleSearch(query) {
-        // Find the best match based on query
-        const normalizedQuery = query.toLowerCase();
-        const exactMatch = searchDatabase.find(item => 
-            item.keywords.some(keyword => keyword.toLowerCase() === normalizedQuery) ||
-            item.title.toLowerCase() === normalizedQuery
-        );
+    async function handleSearch(query) {
+        // Go to the best match of the query
+        let results = [];
+        try {
+            results = await searchIndex.search(query, 1);
+        } catch (error) {
+            console.error(error);
+        }
         
-        if (exactMatch) {
-            navigateToResult(exactMatch.url);
+        if (results.length > 0) {
+            navigateToResult(results[0].url);
         } else {
-            // Find partial matches
-            const partialMatch = searchDatabase.find(item => 
-                item.keywords.some(keyword => keyword.toLowerCase().includes(normalizedQuery)) ||
-                item.title.toLowerCase().includes(normalizedQuery)
-            );
-            
-            if (partialMatch) {
-                navigateToResult(partialMatch.url);
-            } else {
-                alert('No results found for: "' + query + '". Try searching for topics like "ticketing", "volunteer systems", or "event management".');
-            }
+            alert('No results found for: "' + query + '". Try searching for topics like "ticketing", "volunteer systems", or "event management".');
         }
         
         hideSuggestions();
@@ -4,9 +4,13 @@ Script to add AdSense ad containers to Jain Docs and Tools pages
 Carefully places ads without disrupting content
 """
 
-import os
 import re
-from pathlib import Path
+
+from site_corpus import BASE_DIR, load_corpus
+from site_manifest import manifest_from_argv
+from site_parallel import DEFAULT_JOBS, jobs_from_argv, map_pages
+from site_pipeline import register_transform
+from site_profile import profile_from_argv
 
 # Define the AdSense ad block for Jain Docs
 JAIN_DOCS_AD_BLOCK = '''
@@ -31,15 +35,14 @@ def has_existing_ad(content):
     """Check if the page already has the specific ad slot"""
     return 'data-ad-slot="6328898375"' in content
 
-def add_ad_to_jain_docs_page(file_path):
+def add_ad_to_jain_docs_page(page):
     """Add AdSense ad to a Jain Docs HTML file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = page.content
         
         # Check if ad already exists
         if has_existing_ad(content):
-            print(f"⏭️  Ad already exists in: {file_path.name}")
+            print(f"⏭️  Ad already exists in: {page.name}")
             return False
         
         # Strategy 1: Add before </article> tag (most common in Jain Docs pages)
@@ -50,9 +53,8 @@ def add_ad_to_jain_docs_page(file_path):
             new_content = re.sub(pattern, replacement, content, count=1)
             
             if new_content != content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
-                print(f"✅ Added ad to: {file_path.name}")
+                page.write(new_content)
+                print(f"✅ Added ad to: {page.name}")
                 return True
         
         # Strategy 2: Add before </main> tag
@@ -62,9 +64,8 @@ def add_ad_to_jain_docs_page(file_path):
             new_content = re.sub(pattern, replacement, content, count=1)
             
             if new_content != content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
-                print(f"✅ Added ad to: {file_path.name}")
+                page.write(new_content)
+                print(f"✅ Added ad to: {page.name}")
                 return True
         
         # Strategy 3: Add before footer
@@ -74,27 +75,25 @@ def add_ad_to_jain_docs_page(file_path):
             new_content = re.sub(pattern, replacement, content, count=1)
             
             if new_content != content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
-                print(f"✅ Added ad to: {file_path.name}")
+                page.write(new_content)
+                print(f"✅ Added ad to: {page.name}")
                 return True
         
-        print(f"⚠️  Could not find suitable location in: {file_path.name}")
+        print(f"⚠️  Could not find suitable location in: {page.name}")
         return False
         
     except Exception as e:
-        print(f"❌ Error processing {file_path}: {e}")
+        print(f"❌ Error processing {page.rel_path}: {e}")
         return False
 
-def add_ad_to_tools_page(file_path):
+def add_ad_to_tools_page(page):
     """Add AdSense ad to a Tools HTML file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = page.content
         
         # Check if ad already exists
         if has_existing_ad(content):
-            print(f"⏭️  Ad already exists in: {file_path.name}")
+            print(f"⏭️  Ad already exists in: {page.name}")
             return False
         
         # For tools pages, add before </article> or </main>
@@ -105,9 +104,8 @@ def add_ad_to_tools_page(file_path):
             new_content = re.sub(pattern, replacement, content, count=1)
             
             if new_content != content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
-                print(f"✅ Added ad to: {file_path.name}")
+                page.write(new_content)
+                print(f"✅ Added ad to: {page.name}")
                 return True
         
         # Strategy 2: Add before </main> tag
@@ -117,9 +115,8 @@ def add_ad_to_tools_page(file_path):
             new_content = re.sub(pattern, replacement, content, count=1)
             
             if new_content != content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
-                print(f"✅ Added ad to: {file_path.name}")
+                page.write(new_content)
+                print(f"✅ Added ad to: {page.name}")
                 return True
         
         # Strategy 3: Add before footer placeholder
@@ -129,40 +126,48 @@ def add_ad_to_tools_page(file_path):
             new_content = re.sub(pattern, replacement, content, count=1)
             
             if new_content != content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
-                print(f"✅ Added ad to: {file_path.name}")
+                page.write(new_content)
+                print(f"✅ Added ad to: {page.name}")
                 return True
         
-        print(f"⚠️  Could not find suitable location in: {file_path.name}")
+        print(f"⚠️  Could not find suitable location in: {page.name}")
         return False
         
     except Exception as e:
-        print(f"❌ Error processing {file_path}: {e}")
+        print(f"❌ Error processing {page.rel_path}: {e}")
         return False
 
-def process_jain_docs():
+@register_transform('jain-docs-ads', lambda page: page.rel_path.startswith('Jain Docs/Pages/'))
+def jain_docs_ad_transform(page):
+    """Pipeline stage: add the bottom ad to a Jain Docs page"""
+    return add_ad_to_jain_docs_page(page)
+
+@register_transform('tools-ads', lambda page: page.section == 'TOOLS' and page.subfolder)
+def tools_ad_transform(page):
+    """Pipeline stage: add the bottom ad to a tool page"""
+    return add_ad_to_tools_page(page)
+
+def process_jain_docs(jobs=DEFAULT_JOBS, manifest=None):
     """Process all Jain Docs HTML files"""
     print("\n" + "="*60)
     print("PROCESSING JAIN DOCS PAGES")
     print("="*60)
     
-    base_dir = Path(r'c:\Users\MOINAK\OneDrive\PROJECTS\WIKI TAPNEX\Jain Docs')
-    pages_dir = base_dir / 'Pages'
+    pages_dir = BASE_DIR / 'Jain Docs' / 'Pages'
     
     if not pages_dir.exists():
         print(f"❌ Directory not found: {pages_dir}")
         return 0, 0, 0
     
-    html_files = list(pages_dir.glob('*.html'))
+    html_files = load_corpus(BASE_DIR).jain_docs_pages()
     print(f"Found {len(html_files)} HTML files in Jain Docs/Pages\n")
     
     success_count = 0
     skipped_count = 0
     failed_count = 0
     
-    for html_file in html_files:
-        result = add_ad_to_jain_docs_page(html_file)
+    for page_result in map_pages(add_ad_to_jain_docs_page, html_files, jobs, manifest=manifest):
+        result = page_result['value']
         if result:
             success_count += 1
         elif result is False and 'Ad already exists' in str(result):
@@ -172,25 +177,20 @@ def process_jain_docs():
     
     return success_count, skipped_count, failed_count
 
-def process_tools():
+def process_tools(jobs=DEFAULT_JOBS, manifest=None):
     """Process all Tools HTML files"""
     print("\n" + "="*60)
     print("PROCESSING TOOLS PAGES")
     print("="*60)
     
-    base_dir = Path(r'c:\Users\MOINAK\OneDrive\PROJECTS\WIKI TAPNEX\TOOLS')
+    base_dir = BASE_DIR / 'TOOLS'
     
     if not base_dir.exists():
         print(f"❌ Directory not found: {base_dir}")
         return 0, 0, 0
     
-    # Find all index.html files in subdirectories (each tool has its own folder)
-    html_files = []
-    for tool_dir in base_dir.iterdir():
-        if tool_dir.is_dir() and tool_dir.name != 'shared':
-            index_file = tool_dir / 'index.html'
-            if index_file.exists():
-                html_files.append(index_file)
+    # Every tool's index.html (each tool has its own folder)
+    html_files = load_corpus(BASE_DIR).subfolder_pages('TOOLS')
     
     print(f"Found {len(html_files)} HTML files in TOOLS\n")
     
@@ -198,8 +198,8 @@ def process_tools():
     skipped_count = 0
     failed_count = 0
     
-    for html_file in html_files:
-        result = add_ad_to_tools_page(html_file)
+    for page_result in map_pages(add_ad_to_tools_page, html_files, jobs, manifest=manifest):
+        result = page_result['value']
         if result:
             success_count += 1
         elif result is False and 'Ad already exists' in str(result):
@@ -210,15 +210,22 @@ def process_tools():
     return success_count, skipped_count, failed_count
 
 def main():
+    profile_from_argv(__file__)
     print("\n" + "🚀 " + "="*58)
     print("    ADDING ADSENSE ADS TO JAIN DOCS AND TOOLS PAGES")
     print("="*60)
     
+    jobs = jobs_from_argv()
+    manifest = manifest_from_argv(__file__)
+    
     # Process Jain Docs
-    jd_success, jd_skipped, jd_failed = process_jain_docs()
+    jd_success, jd_skipped, jd_failed = process_jain_docs(jobs, manifest)
     
     # Process Tools
-    t_success, t_skipped, t_failed = process_tools()
+    t_success, t_skipped, t_failed = process_tools(jobs, manifest)
+    
+    if manifest:
+        manifest.save()
     
     # Print summary
     print("\n" + "="*60)
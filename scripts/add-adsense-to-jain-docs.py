@@ -4,9 +4,12 @@ Script to add AdSense script to all Jain Docs HTML files
 Adds the ad before the closing </article> tag or before the footer
 """
 
-import os
 import re
-from pathlib import Path
+
+from site_corpus import BASE_DIR, load_corpus
+from site_manifest import manifest_from_argv
+from site_parallel import jobs_from_argv, map_pages
+from site_profile import profile_from_argv
 
 # Define the new AdSense ad block
 NEW_AD_BLOCK = '''
@@ -25,15 +28,14 @@ NEW_AD_BLOCK = '''
                     </div>
 '''
 
-def add_adsense_to_file(file_path):
+def add_adsense_to_file(page):
     """Add AdSense ad to a single HTML file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = page.content
         
         # Check if this specific ad slot is already present
         if 'data-ad-slot="1056713798"' in content:
-            print(f"⏭️  Ad already exists in: {file_path.name}")
+            print(f"⏭️  Ad already exists in: {page.name}")
             return False
         
         # Strategy 1: Try to add before </article> tag
@@ -44,8 +46,7 @@ def add_adsense_to_file(file_path):
             new_content = re.sub(pattern, replacement, content, count=1)
             
             if new_content != content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+                page.write(new_content)
                 return True
         
         # Strategy 2: Try to add before </main> tag
@@ -55,8 +56,7 @@ def add_adsense_to_file(file_path):
             new_content = re.sub(pattern, replacement, content, count=1)
             
             if new_content != content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+                page.write(new_content)
                 return True
         
         # Strategy 3: Try to add before footer
@@ -66,29 +66,27 @@ def add_adsense_to_file(file_path):
             new_content = re.sub(pattern, replacement, content, count=1)
             
             if new_content != content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+                page.write(new_content)
                 return True
         
-        print(f"⚠️  Could not find suitable location in: {file_path.name}")
+        print(f"⚠️  Could not find suitable location in: {page.name}")
         return False
         
     except Exception as e:
-        print(f"❌ Error processing {file_path}: {e}")
+        print(f"❌ Error processing {page.rel_path}: {e}")
         return False
 
 def main():
-    # Base directory
-    base_dir = Path(r'c:\Users\MOINAK\OneDrive\PROJECTS\WIKI TAPNEX\Jain Docs')
+    profile_from_argv(__file__)
+    corpus = load_corpus(BASE_DIR)
     
     # Find all HTML files in Pages directory
-    pages_dir = base_dir / 'Pages'
-    html_files = list(pages_dir.glob('*.html'))
+    html_files = corpus.jain_docs_pages()
     
     # Also check index.html in main Jain Docs directory
-    index_file = base_dir / 'index.html'
-    if index_file.exists():
-        html_files.append(index_file)
+    index_page = corpus.section_index('Jain Docs')
+    if index_page:
+        html_files.append(index_page)
     
     print(f"Found {len(html_files)} HTML files in Jain Docs")
     print("=" * 60)
@@ -97,16 +95,20 @@ def main():
     skipped_count = 0
     failed_count = 0
     
-    for html_file in html_files:
-        result = add_adsense_to_file(html_file)
+    manifest = manifest_from_argv(__file__)
+    for page_result in map_pages(add_adsense_to_file, html_files, jobs_from_argv(), manifest=manifest):
+        result = page_result['value']
         if result is True:
-            print(f"✅ Added ad to: {html_file.relative_to(base_dir.parent)}")
+            print(f"✅ Added ad to: {page_result['path']}")
             success_count += 1
         elif result is False and 'already exists' in str(result):
             skipped_count += 1
         else:
             failed_count += 1
     
+    if manifest:
+        manifest.save()
+    
     print("=" * 60)
     print(f"\n📊 Summary:")
     print(f"   ✅ Successfully added ads: {success_count} files")
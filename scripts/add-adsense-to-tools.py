@@ -4,9 +4,12 @@ Script to add new AdSense script to all TOOLS HTML files
 Adds the ad with slot 1056713798 before closing </body> tag
 """
 
-import os
 import re
-from pathlib import Path
+
+from site_corpus import BASE_DIR, load_corpus
+from site_manifest import manifest_from_argv
+from site_parallel import jobs_from_argv, map_pages
+from site_profile import profile_from_argv
 
 # Define the new AdSense ad block
 NEW_AD_BLOCK = '''
@@ -25,20 +28,19 @@ NEW_AD_BLOCK = '''
     </div>
 '''
 
-def add_adsense_to_file(file_path):
+def add_adsense_to_file(page):
     """Add AdSense ad to a single HTML file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = page.content
         
         # Check if this specific ad slot is already present
         if 'data-ad-slot="1056713798"' in content:
-            print(f"⏭️  Ad already exists in: {file_path.name}")
+            print(f"⏭️  Ad already exists in: {page.name}")
             return False
         
         # Check if this is a valid HTML file with body tag
         if '</body>' not in content:
-            print(f"⚠️  No </body> tag found in: {file_path.name}")
+            print(f"⚠️  No </body> tag found in: {page.name}")
             return False
         
         # Add the ad just before </body>
@@ -47,26 +49,20 @@ def add_adsense_to_file(file_path):
         new_content = re.sub(pattern, replacement, content, count=1)
         
         if new_content != content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            page.write(new_content)
             return True
         
-        print(f"⚠️  Could not add ad to: {file_path.name}")
+        print(f"⚠️  Could not add ad to: {page.name}")
         return False
         
     except Exception as e:
-        print(f"❌ Error processing {file_path}: {e}")
+        print(f"❌ Error processing {page.rel_path}: {e}")
         return False
 
 def main():
-    # Base directory
-    base_dir = Path(r'c:\Users\MOINAK\OneDrive\PROJECTS\WIKI TAPNEX\TOOLS')
-    
-    # Find all HTML files in TOOLS directory
-    html_files = list(base_dir.rglob('*.html'))
-    
-    # Filter out the shared footer file
-    html_files = [f for f in html_files if 'shared' not in str(f)]
+    profile_from_argv(__file__)
+    # Find all HTML files in TOOLS directory (the shared footer fragment is not a page)
+    html_files = load_corpus(BASE_DIR).pages('TOOLS')
     
     print(f"Found {len(html_files)} HTML files in TOOLS")
     print("=" * 60)
@@ -75,16 +71,20 @@ def main():
     skipped_count = 0
     failed_count = 0
     
-    for html_file in html_files:
-        result = add_adsense_to_file(html_file)
+    manifest = manifest_from_argv(__file__)
+    for page_result in map_pages(add_adsense_to_file, html_files, jobs_from_argv(), manifest=manifest):
+        result = page_result['value']
         if result is True:
-            print(f"✅ Added ad to: {html_file.relative_to(base_dir.parent)}")
+            print(f"✅ Added ad to: {page_result['path']}")
             success_count += 1
         elif result is False and 'already exists' in str(result):
             skipped_count += 1
         else:
             failed_count += 1
     
+    if manifest:
+        manifest.save()
+    
     print("=" * 60)
     print(f"\n📊 Summary:")
     print(f"   ✅ Successfully added ads: {success_count} files")
@@ -3,15 +3,19 @@
 Script to add Article schema to all article pages in EVENT-MANAGEMENT, MARKETING, and TECHNOLOGY folders
 """
 
-import os
 import re
 import json
-from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Tuple, Optional
+
+from site_corpus import BASE_DIR, Corpus, Page, load_corpus
+from site_dates import git_dates
+from site_manifest import Manifest, manifest_from_argv
+from site_parallel import DEFAULT_JOBS, jobs_from_argv, map_pages
+from site_pipeline import register_transform
+from site_profile import profile_from_argv
+from site_schema import with_schema_dates
 
-# Define the base directory
-BASE_DIR = Path(__file__).parent.parent
 FOLDERS_TO_PROCESS = ['EVENT-MANAGEMENT', 'MARKETING', 'TECHNOLOGY']
 
 # Article type mapping based on category
@@ -39,54 +43,10 @@ AUTHOR_INFO = {
     "name": "TapNex"
 }
 
-def extract_h1_title(html_content: str) -> Optional[str]:
-    """Extract the H1 title from the HTML content"""
-    h1_match = re.search(r'<h1[^>]*>(.*?)</h1>', html_content, re.IGNORECASE | re.DOTALL)
-    if h1_match:
-        # Remove any HTML tags from the h1 content
-        title = h1_match.group(1)
-        title = re.sub(r'<[^>]+>', '', title)
-        return title.strip()
-    return None
-
-def extract_meta_description(html_content: str) -> Optional[str]:
-    """Extract the meta description from the HTML"""
-    desc_match = re.search(
-        r'<meta\s+name=["\']description["\']\s+content=["\'](.*?)["\']',
-        html_content,
-        re.IGNORECASE
-    )
-    if desc_match:
-        return desc_match.group(1).strip()
-    return None
-
-def extract_canonical_url(html_content: str) -> Optional[str]:
-    """Extract the canonical URL from the HTML"""
-    canonical_match = re.search(
-        r'<link\s+rel=["\']canonical["\']\s+href=["\'](.*?)["\']',
-        html_content,
-        re.IGNORECASE
-    )
-    if canonical_match:
-        return canonical_match.group(1).strip()
-    return None
-
-def extract_og_image(html_content: str) -> Optional[str]:
-    """Extract the Open Graph image URL from the HTML"""
-    og_image_match = re.search(
-        r'<meta\s+property=["\']og:image["\']\s+content=["\'](.*?)["\']',
-        html_content,
-        re.IGNORECASE
-    )
-    if og_image_match:
-        return og_image_match.group(1).strip()
-    return None
-
-def extract_page_title(html_content: str) -> str:
-    """Extract the main title from the HTML page title tag"""
-    title_match = re.search(r'<title>(.*?)</title>', html_content, re.IGNORECASE | re.DOTALL)
-    if title_match:
-        full_title = title_match.group(1).strip()
+def clean_page_title(title: Optional[str]) -> str:
+    """Strip the site suffix from a <title> value"""
+    if title:
+        full_title = title
         # Remove common suffixes
         for separator in [' | TapNex', ' - TapNex', ' | TapNex Wiki', ' - TapNex Wiki']:
             if separator in full_title:
@@ -94,29 +54,24 @@ def extract_page_title(html_content: str) -> str:
         return full_title
     return "Article"
 
-def get_file_dates(file_path: Path) -> Tuple[str, str]:
+def get_file_dates(page: Page) -> Tuple[Optional[str], Optional[str]]:
     """
-    Get the creation and modification dates of the file.
-    For now, we'll use the current date as default since we don't have git history.
-    In production, you'd want to extract this from git or file metadata.
+    Get the publication and modification dates of the page from git history:
+    the dates of the first and of the last commit that touched the file.
+    Either is None when the import of the site is all the history there is
+    (see site_dates.py); files git does not track yet fall back to today's date.
     """
-    # Get file modification time
-    try:
-        mod_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-        date_modified = mod_time.strftime('%Y-%m-%d')
-    except:
-        date_modified = "2025-10-31"
-    
-    # For publication date, we'll use a reasonable default
-    # In a real scenario, you'd want to track this in git or metadata
-    date_published = "2025-01-01"  # Default to start of year
+    dates = git_dates(page.base_dir).dates(page.rel_path)
+    if dates is None:
+        today = datetime.now().strftime('%Y-%m-%d')
+        return today, today
     
-    return date_published, date_modified
+    return dates
 
-def has_article_schema(html_content: str) -> bool:
+def has_article_schema(page: Page) -> bool:
     """Check if the page already has Article schema"""
     # Check for both Article and TechArticle types
-    return bool(re.search(r'"@type":\s*"(Tech)?Article"', html_content))
+    return any(re.search(r'"@type":\s*"(Tech)?Article"', block) for block in page.ld_json)
 
 def generate_article_schema(
     category: str,
@@ -124,10 +79,10 @@ def generate_article_schema(
     description: str,
     image_url: str,
     canonical_url: str,
-    date_published: str,
-    date_modified: str
+    date_published: Optional[str],
+    date_modified: Optional[str]
 ) -> str:
-    """Generate Article or TechArticle schema for a page"""
+    """Generate Article or TechArticle schema for a page (without the dates that are None)"""
     
     # Determine article type based on category
     article_type = ARTICLE_TYPE_MAP.get(category, 'Article')
@@ -148,6 +103,7 @@ def generate_article_schema(
             "@id": canonical_url
         }
     }
+    schema = {key: value for key, value in schema.items() if value is not None}
     
     # Format as pretty JSON
     json_str = json.dumps(schema, indent=4, ensure_ascii=False)
@@ -161,40 +117,44 @@ def generate_article_schema(
     
     return article_script
 
-def add_article_schema_to_file(file_path: Path, category: str, subfolder: str) -> bool:
-    """Add article schema to a single HTML file"""
+def add_article_schema_to_file(page: Page, category: str, subfolder: str) -> bool:
+    """Add article schema to a single HTML page"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = page.content
         
-        # Check if article schema already exists
-        if has_article_schema(content):
-            print(f"  ⏭️  Skipping (already has Article schema): {file_path.name}")
-            return False
+        # Check if article schema already exists: then only its dates may need updating
+        if has_article_schema(page):
+            new_content = with_schema_dates(content, ('Article', 'TechArticle'), *get_file_dates(page))
+            if new_content == content:
+                print(f"  ⏭️  Skipping (already has Article schema): {page.name}")
+                return False
+            page.write(new_content)
+            print(f"  🔄 Updated the Article schema dates of: {page.name}")
+            return True
         
         # Extract necessary information
-        h1_title = extract_h1_title(content)
+        h1_title = page.h1s[0] if page.h1s else None
         if not h1_title:
             # Fall back to page title if no H1 found
-            h1_title = extract_page_title(content)
+            h1_title = clean_page_title(page.title)
         
-        meta_description = extract_meta_description(content)
+        meta_description = page.description
         if not meta_description:
-            print(f"  ⚠️  Warning: No meta description found in {file_path.name}")
+            print(f"  ⚠️  Warning: No meta description found in {page.name}")
             meta_description = h1_title  # Fallback to headline
         
-        canonical_url = extract_canonical_url(content)
+        canonical_url = page.canonical
         if not canonical_url:
-            print(f"  ⚠️  Warning: No canonical URL found in {file_path.name}")
+            print(f"  ⚠️  Warning: No canonical URL found in {page.name}")
             canonical_url = f"https://wiki.tapnex.tech/{category}/{subfolder}/"
         
-        image_url = extract_og_image(content)
+        image_url = page.og_image
         if not image_url:
             # Default to logo if no specific image
             image_url = "https://wiki.tapnex.tech/images/TAPNEX_LOGO.png"
         
         # Get dates
-        date_published, date_modified = get_file_dates(file_path)
+        date_published, date_modified = get_file_dates(page)
         
         # Generate article schema
         article_schema = generate_article_schema(
@@ -212,28 +172,32 @@ def add_article_schema_to_file(file_path: Path, category: str, subfolder: str) -
         head_match = re.search(head_close_pattern, content, re.IGNORECASE)
         
         if not head_match:
-            print(f"  ❌ Could not find </head> tag in: {file_path.name}")
+            print(f"  ❌ Could not find </head> tag in: {page.name}")
             return False
         
         # Insert the article schema before </head>
         new_content = content[:head_match.start()] + article_schema + '\n' + content[head_match.start():]
         
         # Write back to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        page.write(new_content)
         
         article_type = ARTICLE_TYPE_MAP.get(category, 'Article')
-        print(f"  ✅ Added {article_type} schema to: {file_path.name}")
+        print(f"  ✅ Added {article_type} schema to: {page.name}")
         print(f"     Headline: {h1_title[:60]}...")
         return True
         
     except Exception as e:
-        print(f"  ❌ Error processing {file_path.name}: {str(e)}")
+        print(f"  ❌ Error processing {page.name}: {str(e)}")
         return False
 
-def process_folder(base_path: Path, category: str) -> Tuple[int, int]:
+@register_transform('article-schema', lambda page: page.section in FOLDERS_TO_PROCESS and page.subfolder)
+def article_schema_transform(page: Page) -> bool:
+    """Pipeline stage: add Article/TechArticle schema to a category article"""
+    return add_article_schema_to_file(page, page.section, page.subfolder)
+
+def process_folder(corpus: Corpus, category: str, jobs: int = DEFAULT_JOBS, manifest: Optional[Manifest] = None) -> Tuple[int, int]:
     """Process all HTML files in a category folder"""
-    category_path = base_path / category
+    category_path = corpus.base_dir / category
     
     if not category_path.exists():
         print(f"❌ Category folder not found: {category}")
@@ -246,21 +210,18 @@ def process_folder(base_path: Path, category: str) -> Tuple[int, int]:
     total_files = 0
     updated_files = 0
     
-    # Find all index.html files in subfolders
-    for subfolder in sorted(category_path.iterdir()):
-        if subfolder.is_dir():
-            index_file = subfolder / 'index.html'
-            if index_file.exists():
-                total_files += 1
-                subfolder_name = subfolder.name
-                if add_article_schema_to_file(index_file, category, subfolder_name):
-                    updated_files += 1
+    # Every <category>/<subfolder>/index.html page
+    for result in map_pages(article_schema_transform, corpus.subfolder_pages(category), jobs, manifest=manifest):
+        total_files += 1
+        if result['value']:
+            updated_files += 1
     
     print(f"   📊 Updated {updated_files}/{total_files} files")
     return total_files, updated_files
 
 def main():
     """Main function to process all folders"""
+    profile_from_argv(__file__)
     print("=" * 70)
     print("📰 Article Schema Implementation Tool")
     print("=" * 70)
@@ -273,11 +234,17 @@ def main():
     total_all = 0
     updated_all = 0
     
+    corpus = load_corpus(BASE_DIR)
+    jobs = jobs_from_argv()
+    manifest = manifest_from_argv(__file__)
     for category in FOLDERS_TO_PROCESS:
-        total, updated = process_folder(BASE_DIR, category)
+        total, updated = process_folder(corpus, category, jobs, manifest)
         total_all += total
         updated_all += updated
     
+    if manifest:
+        manifest.save()
+    
     print("\n" + "=" * 70)
     print(f"✨ Summary: Updated {updated_all}/{total_all} files across all categories")
     print("=" * 70)
@@ -3,13 +3,15 @@
 Script to add BreadcrumbList schema to all article pages in EVENT-MANAGEMENT, MARKETING, and TECHNOLOGY folders
 """
 
-import os
 import re
-from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Optional, Tuple
+
+from site_corpus import BASE_DIR, Corpus, Page, load_corpus
+from site_manifest import Manifest, manifest_from_argv
+from site_parallel import DEFAULT_JOBS, jobs_from_argv, map_pages
+from site_pipeline import register_transform
+from site_profile import profile_from_argv
 
-# Define the base directory
-BASE_DIR = Path(__file__).parent.parent
 FOLDERS_TO_PROCESS = ['EVENT-MANAGEMENT', 'MARKETING', 'TECHNOLOGY']
 
 # Category display names
@@ -19,12 +21,11 @@ CATEGORY_NAMES = {
     'TECHNOLOGY': 'Technology Guides'
 }
 
-def extract_page_title(html_content: str) -> str:
+def clean_page_title(title: Optional[str]) -> str:
     """Extract the main title from the HTML page title tag"""
-    title_match = re.search(r'<title>(.*?)</title>', html_content, re.IGNORECASE | re.DOTALL)
-    if title_match:
+    if title:
         # Extract just the main part before the first | or - separator
-        full_title = title_match.group(1).strip()
+        full_title = title
         # Remove common suffixes
         for separator in [' | TapNex', ' - TapNex', ' | TapNex Wiki', ' - TapNex Wiki']:
             if separator in full_title:
@@ -91,31 +92,23 @@ def generate_breadcrumb_schema(category: str, subfolder: str, page_title: str, c
     
     return breadcrumb_script
 
-def extract_canonical_url(html_content: str) -> str:
-    """Extract the canonical URL from the HTML"""
-    canonical_match = re.search(r'<link\s+rel=["\']canonical["\']\s+href=["\'](.*?)["\']', html_content, re.IGNORECASE)
-    if canonical_match:
-        return canonical_match.group(1).strip()
-    return ""
-
-def has_breadcrumb_schema(html_content: str) -> bool:
+def has_breadcrumb_schema(page: Page) -> bool:
     """Check if the page already has breadcrumb schema"""
-    return 'BreadcrumbList' in html_content or 'Breadcrumb Schema' in html_content
+    return any('BreadcrumbList' in block for block in page.ld_json) or 'Breadcrumb Schema' in page.head
 
-def add_breadcrumb_to_file(file_path: Path, category: str, subfolder: str) -> bool:
-    """Add breadcrumb schema to a single HTML file"""
+def add_breadcrumb_to_file(page: Page, category: str, subfolder: str) -> bool:
+    """Add breadcrumb schema to a single HTML page"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = page.content
         
         # Check if breadcrumb already exists
-        if has_breadcrumb_schema(content):
-            print(f"  ⏭️  Skipping (already has breadcrumb): {file_path.name}")
+        if has_breadcrumb_schema(page):
+            print(f"  ⏭️  Skipping (already has breadcrumb): {page.name}")
             return False
         
         # Extract page title and canonical URL
-        page_title = extract_page_title(content)
-        canonical_url = extract_canonical_url(content)
+        page_title = clean_page_title(page.title)
+        canonical_url = page.canonical or ""
         
         # Generate breadcrumb schema
         breadcrumb_schema = generate_breadcrumb_schema(category, subfolder, page_title, canonical_url)
@@ -125,26 +118,30 @@ def add_breadcrumb_to_file(file_path: Path, category: str, subfolder: str) -> bo
         head_match = re.search(head_close_pattern, content, re.IGNORECASE)
         
         if not head_match:
-            print(f"  ❌ Could not find </head> tag in: {file_path.name}")
+            print(f"  ❌ Could not find </head> tag in: {page.name}")
             return False
         
         # Insert the breadcrumb schema before </head>
         new_content = content[:head_match.start()] + breadcrumb_schema + '\n' + content[head_match.start():]
         
         # Write back to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        page.write(new_content)
         
-        print(f"  ✅ Added breadcrumb to: {file_path.name}")
+        print(f"  ✅ Added breadcrumb to: {page.name}")
         return True
         
     except Exception as e:
-        print(f"  ❌ Error processing {file_path.name}: {str(e)}")
+        print(f"  ❌ Error processing {page.name}: {str(e)}")
         return False
 
-def process_folder(base_path: Path, category: str) -> Tuple[int, int]:
+@register_transform('breadcrumb-schema', lambda page: page.section in FOLDERS_TO_PROCESS and page.subfolder)
+def breadcrumb_schema_transform(page: Page) -> bool:
+    """Pipeline stage: add BreadcrumbList schema to a category article"""
+    return add_breadcrumb_to_file(page, page.section, page.subfolder)
+
+def process_folder(corpus: Corpus, category: str, jobs: int = DEFAULT_JOBS, manifest: Optional[Manifest] = None) -> Tuple[int, int]:
     """Process all HTML files in a category folder"""
-    category_path = base_path / category
+    category_path = corpus.base_dir / category
     
     if not category_path.exists():
         print(f"❌ Category folder not found: {category}")
@@ -156,21 +153,18 @@ def process_folder(base_path: Path, category: str) -> Tuple[int, int]:
     total_files = 0
     updated_files = 0
     
-    # Find all index.html files in subfolders
-    for subfolder in category_path.iterdir():
-        if subfolder.is_dir():
-            index_file = subfolder / 'index.html'
-            if index_file.exists():
-                total_files += 1
-                subfolder_name = subfolder.name
-                if add_breadcrumb_to_file(index_file, category, subfolder_name):
-                    updated_files += 1
+    # Every <category>/<subfolder>/index.html page
+    for result in map_pages(breadcrumb_schema_transform, corpus.subfolder_pages(category), jobs, manifest=manifest):
+        total_files += 1
+        if result['value']:
+            updated_files += 1
     
     print(f"   📊 Updated {updated_files}/{total_files} files")
     return total_files, updated_files
 
 def main():
     """Main function to process all folders"""
+    profile_from_argv(__file__)
     print("=" * 70)
     print("🔧 Breadcrumb Schema Implementation Tool")
     print("=" * 70)
@@ -179,11 +173,17 @@ def main():
     total_all = 0
     updated_all = 0
     
+    corpus = load_corpus(BASE_DIR)
+    jobs = jobs_from_argv()
+    manifest = manifest_from_argv(__file__)
     for category in FOLDERS_TO_PROCESS:
-        total, updated = process_folder(BASE_DIR, category)
+        total, updated = process_folder(corpus, category, jobs, manifest)
         total_all += total
         updated_all += updated
     
+    if manifest:
+        manifest.save()
+    
     print("\n" + "=" * 70)
     print(f"✨ Summary: Updated {updated_all}/{total_all} files across all categories")
     print("=" * 70)
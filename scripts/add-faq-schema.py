@@ -4,13 +4,16 @@ Script to add FAQPage schema to high-priority article pages
 Targets pages that naturally answer user questions and have high traffic potential
 """
 
-import os
 import re
 import json
-from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
-BASE_DIR = Path(__file__).parent.parent
+from site_corpus import BASE_DIR, Corpus, Page, load_corpus
+from site_manifest import Manifest, manifest_from_argv
+from site_parallel import DEFAULT_JOBS, jobs_from_argv, map_pages
+from site_pipeline import register_transform
+from site_profile import profile_from_argv
+
 FOLDERS_TO_PROCESS = ['EVENT-MANAGEMENT', 'MARKETING', 'TECHNOLOGY']
 
 # Strategic selection of 10 pages for FAQ schema expansion
@@ -250,9 +253,9 @@ TARGET_PAGES = {
     }
 }
 
-def has_faq_schema(html_content: str) -> bool:
+def has_faq_schema(page: Page) -> bool:
     """Check if the page already has FAQ schema"""
-    return 'FAQPage' in html_content
+    return any('FAQPage' in block for block in page.ld_json)
 
 def generate_faq_schema(questions: List[Dict[str, str]]) -> str:
     """Generate FAQPage schema from questions and answers"""
@@ -286,8 +289,8 @@ def generate_faq_schema(questions: List[Dict[str, str]]) -> str:
     
     return faq_script
 
-def add_faq_schema_to_file(file_path: Path, category: str, subfolder: str) -> bool:
-    """Add FAQ schema to a single HTML file"""
+def add_faq_schema_to_file(page: Page, category: str, subfolder: str) -> bool:
+    """Add FAQ schema to a single HTML page"""
     try:
         # Check if this page is in our target list
         if category not in TARGET_PAGES:
@@ -296,11 +299,10 @@ def add_faq_schema_to_file(file_path: Path, category: str, subfolder: str) -> bo
         if subfolder not in TARGET_PAGES[category]:
             return False
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = page.content
         
         # Check if FAQ schema already exists
-        if has_faq_schema(content):
+        if has_faq_schema(page):
             print(f"  ⏭️  Skipping (already has FAQ schema): {subfolder}")
             return False
         
@@ -315,27 +317,31 @@ def add_faq_schema_to_file(file_path: Path, category: str, subfolder: str) -> bo
         head_match = re.search(head_close_pattern, content, re.IGNORECASE)
         
         if not head_match:
-            print(f"  ❌ Could not find </head> tag in: {file_path.name}")
+            print(f"  ❌ Could not find </head> tag in: {page.name}")
             return False
         
         # Insert the FAQ schema before </head>
         new_content = content[:head_match.start()] + faq_schema + '\n' + content[head_match.start():]
         
         # Write back to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        page.write(new_content)
         
         print(f"  ✅ Added FAQ schema to: {subfolder}")
         print(f"     Questions: {len(questions)}")
         return True
         
     except Exception as e:
-        print(f"  ❌ Error processing {file_path.name}: {str(e)}")
+        print(f"  ❌ Error processing {page.name}: {str(e)}")
         return False
 
-def process_folder(base_path: Path, category: str) -> Tuple[int, int]:
+@register_transform('faq-schema', lambda page: page.subfolder in TARGET_PAGES.get(page.section, {}))
+def faq_schema_transform(page: Page) -> bool:
+    """Pipeline stage: add FAQPage schema to one of the target pages"""
+    return add_faq_schema_to_file(page, page.section, page.subfolder)
+
+def process_folder(corpus: Corpus, category: str, jobs: int = DEFAULT_JOBS, manifest: Optional[Manifest] = None) -> Tuple[int, int]:
     """Process HTML files in a category folder"""
-    category_path = base_path / category
+    category_path = corpus.base_dir / category
     
     if not category_path.exists():
         print(f"❌ Category folder not found: {category}")
@@ -353,20 +359,18 @@ def process_folder(base_path: Path, category: str) -> Tuple[int, int]:
     updated_files = 0
     
     # Process only target pages
-    for subfolder_name in TARGET_PAGES[category].keys():
-        subfolder = category_path / subfolder_name
-        if subfolder.is_dir():
-            index_file = subfolder / 'index.html'
-            if index_file.exists():
-                total_files += 1
-                if add_faq_schema_to_file(index_file, category, subfolder_name):
-                    updated_files += 1
+    pages = [corpus.get(f"{category}/{subfolder_name}/index.html") for subfolder_name in TARGET_PAGES[category]]
+    for result in map_pages(faq_schema_transform, [page for page in pages if page], jobs, manifest=manifest):
+        total_files += 1
+        if result['value']:
+            updated_files += 1
     
     print(f"   📊 Updated {updated_files}/{total_files} files")
     return total_files, updated_files
 
 def main():
     """Main function to process selected folders"""
+    profile_from_argv(__file__)
     print("=" * 70)
     print("❓ FAQ Schema Expansion Tool - Task 6")
     print("=" * 70)
@@ -377,11 +381,17 @@ def main():
     total_all = 0
     updated_all = 0
     
+    corpus = load_corpus(BASE_DIR)
+    jobs = jobs_from_argv()
+    manifest = manifest_from_argv(__file__)
     for category in FOLDERS_TO_PROCESS:
-        total, updated = process_folder(BASE_DIR, category)
+        total, updated = process_folder(corpus, category, jobs, manifest)
         total_all += total
         updated_all += updated
     
+    if manifest:
+        manifest.save()
+    
     print("\n" + "=" * 70)
     print(f"✨ Summary: Updated {updated_all}/{total_all} target pages with FAQ schema")
     print("=" * 70)
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Add internal links to article text from a keyword -> URL table.
+
+Every keyword of the table is matched against a page's <article> text in one
+Aho-Corasick pass (see site_keywords.py), so the table can grow to thousands
+of entries without slowing the run down. The first whole-word occurrence of
+a keyword is wrapped in a link to its page, except:
+
+    - text inside <a>, headings, <nav>, <button>, <code>, <pre>, <script>,
+      <style> and the like is never linked;
+    - a page is not linked to itself, nor to a page its article text
+      already links to (so running the script again changes nothing);
+    - a page gets at most --max-links added links (default 3), counting the
+      ones earlier runs added (marked with a data-auto-link attribute).
+
+Keywords whose URL no file of the tree serves are reported and skipped. The
+table below replaces the per-page sed lines of add-internal-links.sh; --table
+adds (or overrides) entries from a JSON object {"keyword": "/url", ...}.
+
+Usage:
+    python3 scripts/add-internal-links.py --dry-run
+    python3 scripts/add-internal-links.py --max-links 5 --jobs 0
+    python3 scripts/add-internal-links.py --table more-keywords.json --section article
+"""
+
+import argparse
+import json
+import re
+from html import escape, unescape
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from site_corpus import ANCHOR_HREF_PATTERN, BASE_DIR, CATEGORY_SECTIONS, Page, load_corpus
+from site_keywords import KeywordMatcher
+from site_links import normalize_href
+from site_manifest import Manifest, add_incremental_argument, source_version
+from site_parallel import add_jobs_argument, map_pages
+from site_pipeline import register_transform
+from site_profile import add_profile_arguments, profile_from_args
+from site_urls import SitePaths, url_path
+
+MAX_LINKS_PER_PAGE = 3
+
+# Sections whose pages get links: the category articles and the blog articles
+LINKED_SECTIONS = CATEGORY_SECTIONS + ['article', 'hindi_article']
+
+# Keyword -> page URL (clean URL, as vercel.json serves it)
+KEYWORD_LINKS = {
+    # Technology
+    'NFC': '/TECHNOLOGY/NFC',
+    'Near Field Communication': '/TECHNOLOGY/NFC',
+    '5G': '/TECHNOLOGY/5G-Technology',
+    '5G technology': '/TECHNOLOGY/5G-Technology',
+    'edge computing': '/TECHNOLOGY/Edge-Computing',
+    'generative AI': '/TECHNOLOGY/Generative-AI',
+    'agentic AI': '/TECHNOLOGY/Agentic-AI',
+    'AI agents': '/TECHNOLOGY/Agentic-AI',
+    'web development': '/TECHNOLOGY/Web-Development',
+    'database management': '/TECHNOLOGY/Database-Management',
+    'DevOps': '/TECHNOLOGY/Devops',
+    'API integration': '/TECHNOLOGY/APIs',
+    'APIs': '/TECHNOLOGY/APIs',
+    'virtual reality': '/TECHNOLOGY/VR-Virtual-Reality',
+    'quantum computing': '/TECHNOLOGY/Quantun-Computing',
+    'synthetic media': '/TECHNOLOGY/Synthetic-Media-&-Generative-Watermarking',
+    # Marketing
+    'AI-powered content': '/MARKETING/AI-Powered-Content-Creation-&-Exhaustive-Marketing',
+    'AI content creation': '/MARKETING/AI-Powered-Content-Creation-&-Exhaustive-Marketing',
+    'AR/VR marketing': '/MARKETING/augmented-reality-&-virtual-reality-for-content-marketing',
+    'content marketing': '/MARKETING/content-marketing',
+    'short-form video': '/MARKETING/short-form-video-content',
+    'social media strategy': '/MARKETING/social-media-strategy',
+    'marketing analytics': '/MARKETING/analytics-&-insigths',
+    'content ROI': '/MARKETING/content-marketing-measurement-&-ROI-analytics',
+    'ROI measurement': '/MARKETING/content-marketing-measurement-&-ROI-analytics',
+    'data-driven personalization': '/MARKETING/Personalization-&-Data-Driven-Content',
+    'personalization': '/MARKETING/Personalization-&-Data-Driven-Content',
+    'newsletter': '/MARKETING/newsletter-&-community-driven-growth',
+    'community-driven growth': '/MARKETING/newsletter-&-community-driven-growth',
+    'user-generated content': '/MARKETING/UGC',
+    'content format innovations': '/MARKETING/content-format-innovations',
+    'email marketing': '/MARKETING/email-campaigns',
+    'email campaigns': '/MARKETING/email-campaigns',
+    'co-marketing': '/MARKETING/Co-Marketing-&-brand-partnership',
+    'brand partnerships': '/MARKETING/Co-Marketing-&-brand-partnership',
+    'authentic storytelling': '/MARKETING/Humanizing-content-&-authentic-storytelling',
+    'ethical content marketing': '/MARKETING/compliance-&-ethical-content-marketing',
+    # Event management
+    'digital ticketing': '/EVENT-MANAGEMENT/ticketing-platform',
+    'ticketing platform': '/EVENT-MANAGEMENT/ticketing-platform',
+    'event budgeting': '/EVENT-MANAGEMENT/Event-budgeting',
+    'event budget': '/EVENT-MANAGEMENT/Event-budgeting',
+    'logistics planning': '/EVENT-MANAGEMENT/Logistic-Planning',
+    'event logistics': '/EVENT-MANAGEMENT/Logistic-Planning',
+    'volunteer management': '/EVENT-MANAGEMENT/volunteer-systems',
+}
+
+# Elements whose text is never turned into a link
+SKIPPED_ELEMENTS = {
+    'a', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'nav', 'button', 'label', 'select', 'option',
+    'textarea', 'code', 'pre', 'kbd', 'samp', 'script', 'style', 'svg', 'title', 'summary',
+}
+
+# Marks the links this script added, so they count towards the cap on later runs
+AUTO_LINK_ATTRIBUTE = 'data-auto-link'
+
+# Comments and start/end tags of the article markup
+MARKUP_PATTERN = re.compile(r'<!--.*?-->|<(/?)([a-zA-Z][\w-]*)\b[^>]*>', re.DOTALL)
+
+
+def load_keyword_table(path: Optional[Path] = None) -> Dict[str, str]:
+    """The built-in table, with the entries of a JSON file on top"""
+    table = dict(KEYWORD_LINKS)
+    if path is not None:
+        with open(path, 'r', encoding='utf-8') as f:
+            table.update(json.load(f))
+    return table
+
+
+def is_linked_page(page: Page) -> bool:
+    return page.section in LINKED_SECTIONS and page.rel_path != f"{page.section}/index.html"
+
+
+class InternalLinker:
+    """The keyword automaton and the tree's files, built once per process"""
+
+    def __init__(self, table: Dict[str, str], max_links: int = MAX_LINKS_PER_PAGE, base_dir: Path = BASE_DIR):
+        self.paths = SitePaths(base_dir)
+        self.max_links = max_links
+        self.urls: Dict[str, str] = {}
+        # Keyword -> file its URL serves
+        self.targets: Dict[str, str] = {}
+        self.missing: List[Tuple[str, str]] = []
+        for keyword, url in table.items():
+            resolved = self.paths.resolve(url)
+            if resolved is None:
+                self.missing.append((keyword, url))
+                continue
+            self.urls[keyword] = url
+            self.targets[keyword] = resolved[0]
+        self.matcher = KeywordMatcher(self.urls)
+
+    def linked_files(self, page: Page) -> set:
+        """Files the article text already links to (navigation aside), the page itself included"""
+        page_path = url_path(page.rel_path, self.paths.rules)
+        linked = {page.rel_path}
+        for match in ANCHOR_HREF_PATTERN.finditer(page.article_body):
+            kind, target = normalize_href(unescape(match.group(2)), page_path)
+            if kind == 'internal':
+                resolved = self.paths.resolve(target)
+                if resolved is not None:
+                    linked.add(resolved[0])
+        return linked
+
+    def link(self, page: Page) -> Tuple[str, List[Tuple[str, str]]]:
+        """Page source with the links added, and the (text, url) of every added link"""
+        content = page.content
+        lower = content.lower()
+        start = lower.find('<article')
+        end = lower.rfind('</article>')
+        if start == -1 or end < start:
+            return content, []
+        budget = self.max_links - content.count(AUTO_LINK_ATTRIBUTE, start, end)
+        if budget <= 0:
+            return content, []
+
+        linked = self.linked_files(page)
+        added: List[Tuple[str, str]] = []
+        pieces = [content[:start]]
+        skipped: Dict[str, int] = {}
+        position = start
+        for markup in MARKUP_PATTERN.finditer(content, start, end):
+            if markup.start() > position:
+                text = content[position:markup.start()]
+                if not any(skipped.values()) and len(added) < budget:
+                    text = self._link_text(text, linked, added, budget)
+                pieces.append(text)
+            pieces.append(markup.group(0))
+            position = markup.end()
+
+            closing, tag = markup.group(1), (markup.group(2) or '').lower()
+            if tag in SKIPPED_ELEMENTS and not markup.group(0).endswith('/>'):
+                skipped[tag] = max(0, skipped.get(tag, 0) + (-1 if closing else 1))
+        pieces.append(content[position:])
+        return ''.join(pieces), added
+
+    def _link_text(self, text: str, linked: set, added: List[Tuple[str, str]], budget: int) -> str:
+        """Wrap the first occurrence of each keyword whose page is not linked yet"""
+        pieces = []
+        position = 0
+        for start, end, keyword in self.matcher.find(text):
+            target = self.targets[keyword]
+            if target in linked:
+                continue
+            url = self.urls[keyword]
+            pieces.append(text[position:start])
+            pieces.append(f'<a href="{escape(url)}" {AUTO_LINK_ATTRIBUTE}>{text[start:end]}</a>')
+            position = end
+            linked.add(target)
+            added.append((text[start:end], url))
+            if len(added) >= budget:
+                break
+        pieces.append(text[position:])
+        return ''.join(pieces)
+
+
+# One linker per process and settings (map_pages workers build their own)
+_LINKERS: Dict[Tuple[Optional[str], int], InternalLinker] = {}
+
+
+def get_linker(table_path: Optional[str] = None, max_links: int = MAX_LINKS_PER_PAGE) -> InternalLinker:
+    key = (table_path, max_links)
+    if key not in _LINKERS:
+        table = load_keyword_table(Path(table_path) if table_path else None)
+        _LINKERS[key] = InternalLinker(table, max_links)
+    return _LINKERS[key]
+
+
+def add_links_to_page(page: Page, table_path: Optional[str] = None, max_links: int = MAX_LINKS_PER_PAGE,
+                      dry_run: bool = False) -> List[Tuple[str, str]]:
+    """Link one page; returns the (text, url) of the links added"""
+    new_content, added = get_linker(table_path, max_links).link(page)
+    if added and not dry_run:
+        page.write(new_content)
+    return added
+
+
+@register_transform('internal-links', is_linked_page)
+def internal_links_transform(page):
+    """Pipeline stage: link keywords of the article text to their pages"""
+    return bool(add_links_to_page(page))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add internal links to article text from a keyword table")
+    parser.add_argument('--table', type=Path, help="JSON file of extra {\"keyword\": \"/url\"} entries")
+    parser.add_argument('--max-links', type=int, default=MAX_LINKS_PER_PAGE,
+                        help=f"links to add per page at most (default: {MAX_LINKS_PER_PAGE})")
+    parser.add_argument('--section', action='append', default=[],
+                        help=f"only link pages of this section (repeatable; default: {', '.join(LINKED_SECTIONS)})")
+    parser.add_argument('--dry-run', action='store_true', help="report the links without writing")
+    add_jobs_argument(parser)
+    add_incremental_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    table_path = str(args.table.resolve()) if args.table else None
+    linker = get_linker(table_path, args.max_links)
+
+    print("🔗 Adding Internal Links for SEO...")
+    print("=" * 70)
+    print(f"Keywords: {len(linker.urls)}   max links per page: {args.max_links}")
+    if args.dry_run:
+        print("Mode: dry run (no files are written)")
+    for keyword, url in linker.missing:
+        print(f"⚠️  Skipped \"{keyword}\": nothing is served at {url}")
+
+    sections = args.section or LINKED_SECTIONS
+    corpus = load_corpus(BASE_DIR)
+    pages = [page for page in corpus if page.section in sections and is_linked_page(page)]
+
+    manifest = None
+    if args.incremental and not args.dry_run:
+        table_text = args.table.read_text(encoding='utf-8') if args.table else ''
+        manifest = Manifest('add-internal-links', source_version([Path(__file__).resolve()],
+                                                                 f"{args.max_links}{table_text}"))
+
+    linked_pages = 0
+    total_links = 0
+    for page, result in zip(pages, map_pages(add_links_to_page, pages, args.jobs,
+                                             args=(table_path, args.max_links, args.dry_run),
+                                             on_error=lambda message: message, echo=False,
+                                             manifest=manifest)):
+        added = result['value']
+        if isinstance(added, str):
+            print(f"✗ ERROR: {page.rel_path} - {added}")
+            continue
+        if not added:
+            continue
+        linked_pages += 1
+        total_links += len(added)
+        print(f"  ✓ {page.rel_path}")
+        for text, url in added:
+            print(f"      \"{text}\" -> {url}")
+
+    if manifest:
+        manifest.save()
+
+    print("\n" + "=" * 70)
+    verb = "Would add" if args.dry_run else "Added"
+    print(f"✅ {verb} {total_links} links on {linked_pages} of {len(pages)} pages")
+
+
+if __name__ == '__main__':
+    main()
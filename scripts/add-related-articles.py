@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Add a "Related articles" block to the article pages, chosen by TF-IDF.
+
+The article/ and hindi_article/ pages and the EVENT-MANAGEMENT, MARKETING and
+TECHNOLOGY articles are vectorised together and each page links to its k
+most similar pages by cosine similarity (see site_related.py). Term counts
+are cached, so only pages changed since the last run are tokenised again;
+the similarities of all pages come from one sparse matrix product.
+
+The block is inserted at the end of the <article>, between
+<!-- related-articles:start --> and <!-- related-articles:end --> markers,
+and replaced in place on later runs; pages whose block is already current
+are not written.
+
+Usage:
+    python3 scripts/add-related-articles.py --dry-run
+    python3 scripts/add-related-articles.py --top 5 --min-score 0.05
+    python3 scripts/add-related-articles.py --json related.json
+"""
+
+import argparse
+import json
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from site_corpus import BASE_DIR, CATEGORY_SECTIONS, Page, load_corpus
+from site_profile import add_profile_arguments, profile_from_args, stage
+from site_related import RELATED_BLOCK_PATTERN, RELATED_END, RELATED_START, TermCache, related_pages
+from site_urls import encode_path, load_url_rules, url_path
+
+DEFAULT_TOP = 5
+
+# Neighbours less similar than this are left out
+DEFAULT_MIN_SCORE = 0.05
+
+ARTICLE_SECTIONS = ['article', 'hindi_article']
+
+# Block heading per page language
+HEADINGS = {
+    'hi': 'संबंधित लेख',
+}
+DEFAULT_HEADING = 'Related Articles'
+
+
+def is_related_page(page: Page) -> bool:
+    """Pages that get (and are candidates for) related links"""
+    if page.section in ARTICLE_SECTIONS:
+        return page.rel_path != f"{page.section}/index.html"
+    return page.section in CATEGORY_SECTIONS and page.subfolder is not None
+
+
+def related_block(neighbours: List[Tuple[str, float]], entries: Dict[str, Dict[str, object]],
+                  lang: str, rules, newline: str) -> str:
+    """Markup of the block linking to the neighbours"""
+    lines = [
+        RELATED_START,
+        '<section class="related-articles">',
+        f"<h2>{HEADINGS.get((lang or '').split('-')[0], DEFAULT_HEADING)}</h2>",
+        '<ul>',
+    ]
+    for rel_path, _score in neighbours:
+        href = encode_path(url_path(rel_path, rules))
+        lines.append(f'<li><a href="{escape(href)}">{escape(entries[rel_path]["heading"])}</a></li>')
+    lines.extend(['</ul>', '</section>', RELATED_END])
+    return newline.join(lines) + newline
+
+
+def with_related_block(content: str, block: str) -> str:
+    """Content with the block replacing the old one, or inserted before the last </article>"""
+    if RELATED_BLOCK_PATTERN.search(content):
+        return RELATED_BLOCK_PATTERN.sub(lambda _match: block, content, count=1)
+    end = content.lower().rfind('</article>')
+    if end == -1:
+        return content
+    # Keep the indentation of </article> on its own line
+    line_start = content.rfind('\n', 0, end) + 1
+    if not content[line_start:end].strip():
+        end = line_start
+    return content[:end] + block + content[end:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add TF-IDF related-article links to the article pages")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help=f"links per page (default: {DEFAULT_TOP})")
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE,
+                        help=f"lowest cosine similarity to link (default: {DEFAULT_MIN_SCORE})")
+    parser.add_argument('--dry-run', action='store_true', help="report the related pages without writing")
+    parser.add_argument('--json', type=Path, help="write the related pages and scores as JSON to this file")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    print("=" * 70)
+    print("📚 Related Articles (TF-IDF)")
+    print("=" * 70)
+
+    corpus = load_corpus(BASE_DIR)
+    pages = [page for page in corpus if is_related_page(page)]
+    cache = TermCache()
+    related = related_pages(pages, args.top, cache)
+    print(f"Pages: {len(pages)}   tokenised this run: {cache.extracted}")
+
+    rules = load_url_rules(BASE_DIR)
+    written = 0
+    with stage('inject blocks'):
+        for page in pages:
+            neighbours = [(rel_path, score) for rel_path, score in related[page.rel_path] if score >= args.min_score]
+            if not neighbours:
+                print(f"⚠️  No related pages: {page.rel_path}")
+                continue
+            content = page.content
+            newline = '\r\n' if '\r\n' in content else '\n'
+            block = related_block(neighbours, cache.pages, page.lang, rules, newline)
+            new_content = with_related_block(content, block)
+            if new_content == content:
+                continue
+            written += 1
+            if args.dry_run:
+                print(f"📝 Would update: {page.rel_path}")
+                for rel_path, score in neighbours:
+                    print(f"      {score:.3f}  {rel_path}")
+                continue
+            page.write(new_content)
+            cache.refresh(page)
+            print(f"✅ Updated: {page.rel_path}")
+
+    if not args.dry_run:
+        cache.save(page.rel_path for page in pages)
+
+    if args.json:
+        args.json.write_text(json.dumps(related, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"📄 Related pages: {args.json}")
+
+    print("\n" + "=" * 70)
+    verb = "would be updated" if args.dry_run else "updated"
+    print(f"📊 {written} of {len(pages)} pages {verb}")
+
+
+if __name__ == '__main__':
+    main()
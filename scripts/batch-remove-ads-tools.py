@@ -3,37 +3,32 @@
 Batch remove AdSense ads from all HTML files in TOOLS folder
 """
 
-import os
-import re
-import glob
 import sys
 import io
 
+from site_ads import find_ad_blocks, remove_ad_blocks
+from site_corpus import BASE_DIR, load_corpus
+from site_manifest import manifest_from_argv
+from site_parallel import jobs_from_argv, map_pages
+from site_profile import profile_from_argv
+
 # Fix Windows console encoding
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 
-# Regex pattern to match complete ad blocks
-AD_BLOCK_PATTERN = re.compile(
-    r'<!-- AdSense.*?-->\s*'
-    r'<div class="ad-container[^>]*>.*?</div>',
-    re.DOTALL | re.MULTILINE
-)
-
-def remove_ads_from_file(file_path):
+def remove_ads_from_file(page):
     """Remove all ad blocks from a file. Returns (success, ad_count, message)"""
     try:
         # Read file
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            original_content = f.read()
+        original_content = page.content
         
         # Check if file has ads
-        ads_found = AD_BLOCK_PATTERN.findall(original_content)
+        ads_found = find_ad_blocks(original_content, require_comment=True)
         if not ads_found:
             return True, 0, "SKIP - No ads found"
         
         # Remove ads
-        new_content = AD_BLOCK_PATTERN.sub('', original_content)
+        new_content = remove_ad_blocks(original_content, ads_found)
         
         # Basic integrity check - ensure body tag still exists
         if '<body' in original_content and '<body' not in new_content:
@@ -41,14 +36,8 @@ def remove_ads_from_file(file_path):
         if '</body>' in original_content and '</body>' not in new_content:
             return False, 0, "ERROR: Closing body tag removed"
         
-        # Create backup
-        backup_path = file_path + '.backup'
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            f.write(original_content)
-        
-        # Write cleaned content
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        # Write cleaned content (the original is kept in the rollback journal)
+        page.write(new_content)
         
         ad_count = len(ads_found)
         bytes_saved = len(original_content) - len(new_content)
@@ -59,12 +48,9 @@ def remove_ads_from_file(file_path):
         return False, 0, f"ERROR: {str(e)}"
 
 def main():
+    profile_from_argv(__file__)
     # Get all HTML files recursively in TOOLS folder
-    html_files = []
-    for root, dirs, files in os.walk("TOOLS"):
-        for file in files:
-            if file.endswith('.html'):
-                html_files.append(os.path.join(root, file))
+    html_files = load_corpus(BASE_DIR).pages('TOOLS')
     
     total_files = len(html_files)
     print(f"Processing {total_files} files...")
@@ -75,13 +61,17 @@ def main():
     fail_count = 0
     total_ads_removed = 0
     
-    for i, file_path in enumerate(html_files, 1):
+    manifest = manifest_from_argv(__file__)
+    results = map_pages(remove_ads_from_file, html_files, jobs_from_argv(),
+                        on_error=lambda message: (False, 0, f"ERROR: {message}"),
+                        manifest=manifest)
+    for i, (page, result) in enumerate(zip(html_files, results), 1):
         # Get short filename for display (max 40 chars)
-        display_name = os.path.basename(file_path)
+        display_name = page.name
         if len(display_name) > 40:
             display_name = display_name[:37] + "..."
         
-        success, ad_count, message = remove_ads_from_file(file_path)
+        success, ad_count, message = result['value']
         
         if success and ad_count > 0:
             success_count += 1
@@ -98,6 +88,9 @@ def main():
         if i % 10 == 0:
             print(f"\nProgress: {i}/{total_files} files processed\n")
     
+    if manifest:
+        manifest.save()
+    
     # Print summary
     print("\n" + "=" * 60)
     print("SUMMARY")
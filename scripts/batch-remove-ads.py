@@ -4,43 +4,35 @@ Robust Ad Removal Script - Batch Processing
 Handles encoding issues and processes files safely
 """
 
-import re
-import os
 import sys
 
+from site_ads import find_ad_blocks, remove_ad_blocks
+from site_corpus import BASE_DIR, load_corpus
+from site_manifest import manifest_from_argv
+from site_parallel import DEFAULT_JOBS, jobs_from_argv, map_pages
+from site_profile import profile_from_argv
+
 # Force UTF-8 encoding for console output
 if sys.platform == 'win32':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-# Pattern to match ad blocks
-AD_BLOCK_PATTERN = re.compile(
-    r'<!-- AdSense.*?-->\s*'
-    r'<div class="ad-container[^>]*>.*?'
-    r'<script async src="https://pagead2\.googlesyndication\.com.*?</script>\s*'
-    r'<ins class="adsbygoogle".*?</ins>\s*'
-    r'<script>.*?\(adsbygoogle = window\.adsbygoogle.*?</script>\s*'
-    r'</div>',
-    re.DOTALL | re.MULTILINE
-)
 
-def remove_ads_from_file(file_path):
+def remove_ads_from_file(page):
     """Remove ad blocks from a single file"""
     try:
-        # Read with UTF-8 encoding
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            original_content = f.read()
+        original_content = page.content
         
-        # Count ad blocks
-        ad_matches = list(AD_BLOCK_PATTERN.finditer(original_content))
-        ad_count = len(ad_matches)
+        # Count ad blocks (AdSense comment + container with the full ad code)
+        ad_blocks = find_ad_blocks(original_content, require_comment=True, require_complete=True)
+        ad_count = len(ad_blocks)
         
         if ad_count == 0:
             return True, 0, "No ads"
         
         # Remove ad blocks
-        new_content = AD_BLOCK_PATTERN.sub('', original_content)
+        new_content = remove_ad_blocks(original_content, ad_blocks)
         
         # Verify important content markers still exist
         if '<body' in original_content and '<body' not in new_content:
@@ -50,19 +42,16 @@ def remove_ads_from_file(file_path):
             return False, 0, "ERROR: Closing body tag removed"
         
         # Write cleaned content
-        with open(file_path, 'w', encoding='utf-8', errors='ignore') as f:
-            f.write(new_content)
+        page.write(new_content)
         
         return True, ad_count, "OK"
         
     except Exception as e:
         return False, 0, f"Error: {str(e)[:50]}"
 
-def process_jain_docs():
+def process_jain_docs(jobs=DEFAULT_JOBS, manifest=None):
     """Process all Jain Docs files"""
-    import glob
-    
-    files = glob.glob("Jain Docs/Pages/*.html")
+    files = load_corpus(BASE_DIR).jain_docs_pages()
     total = len(files)
     processed = 0
     success = 0
@@ -73,12 +62,15 @@ def process_jain_docs():
     print(f"Processing {total} files...")
     print("="*60)
     
-    for i, file_path in enumerate(files, 1):
-        filename = os.path.basename(file_path)
+    results = map_pages(remove_ads_from_file, files, jobs,
+                        on_error=lambda message: (False, 0, f"Error: {message[:50]}"),
+                        manifest=manifest)
+    for i, (page, result) in enumerate(zip(files, results), 1):
+        filename = page.name
         # Truncate long filenames for display
         display_name = filename[:40] + "..." if len(filename) > 40 else filename
         
-        status, ad_count, message = remove_ads_from_file(file_path)
+        status, ad_count, message = result['value']
         processed += 1
         
         if status:
@@ -97,6 +89,9 @@ def process_jain_docs():
         if i % 25 == 0:
             print(f"\nProgress: {i}/{total} files processed\n")
     
+    if manifest:
+        manifest.save()
+    
     print("\n" + "="*60)
     print("SUMMARY")
     print("="*60)
@@ -108,8 +103,9 @@ def process_jain_docs():
     print("="*60)
 
 if __name__ == "__main__":
+    profile_from_argv(__file__)
     try:
-        process_jain_docs()
+        process_jain_docs(jobs_from_argv(), manifest_from_argv(__file__))
     except KeyboardInterrupt:
         print("\n\nStopped by user")
     except Exception as e:
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Benchmark the maintenance scripts on synthetic sites of growing size.
+
+For every size a synthetic site is generated (see generate-synthetic-site.py)
+and each stage of a maintenance run is timed separately:
+
+    discovery   walk the tree and list the pages
+    read        load every page source
+    parse       index title, description, canonical, h1s, JSON-LD and ad blocks
+    transform   run the registered page transforms in memory
+    write       write every page back (originals are restored afterwards)
+    verify      run the article, breadcrumb and Jain Docs SEO checks
+
+Pages are streamed through read..write one at a time, so memory stays flat
+at 100k pages; each of those stages' time is the sum over all pages. The
+verify stage then runs the way the verify scripts do: the article and
+breadcrumb checks from a fresh page index of the site, the Jain Docs checks
+through the SEO lint, without a manifest so every page is linted. Results are saved
+as JSON in .site-cache/bench/ and compared with the previous run.
+
+Usage:
+    python3 scripts/benchmark-scripts.py                       # 425, 1000 and 5000 pages
+    python3 scripts/benchmark-scripts.py --sizes 425,10000,100000
+    python3 scripts/benchmark-scripts.py --compare .site-cache/bench/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from site_ads import find_ad_blocks
+from site_corpus import BASE_DIR, CACHE_DIR, Corpus, Page, write_text
+from site_index import open_index
+from site_lint import ERROR, lint_pages
+from site_pipeline import load_script, load_transforms, run_page
+from site_profile import add_profile_arguments, profile_from_args
+
+BENCH_DIR = CACHE_DIR / 'bench'
+LATEST_FILE = BENCH_DIR / 'latest.json'
+
+STAGES = ['discovery', 'read', 'parse', 'transform', 'write', 'verify']
+
+DEFAULT_SIZES = '425,1000,5000'
+
+# A stage this much slower than in the compared run is reported as a regression
+DEFAULT_THRESHOLD = 1.10
+
+
+def parse_page(page: Page) -> None:
+    """Everything the scripts read from the page index"""
+    page.title, page.description, page.canonical, page.h1s, page.schema_types
+    find_ad_blocks(page.content)
+
+
+class Verifiers:
+    """The verify scripts' own checks of a whole site"""
+
+    def __init__(self):
+        self.article = load_script('verify-article-schema.py')
+        self.breadcrumb = load_script('verify-breadcrumb-schema.py')
+        self.jain_docs = load_script('verify-jain-docs-seo.py')
+
+    def verify(self, site_dir: Path) -> Set[str]:
+        """Paths of the pages that failed a check"""
+        failed = set()
+        index = open_index(site_dir, jobs=1)
+        for category in self.article.FOLDERS_TO_PROCESS:
+            failed.update(f['path'] for f in self.article.verify_folder(index, category)['files'] if not f['valid'])
+        for category in self.breadcrumb.FOLDERS_TO_PROCESS:
+            failed.update(f['path'] for f in self.breadcrumb.verify_folder(index, category)['files'] if not f['valid'])
+        index.close()
+
+        pages = [page for page in Corpus(site_dir) if self.jain_docs.is_jain_docs_page(page)]
+        for result in lint_pages(pages, 1, self.jain_docs.LINT_RULES):
+            if any(finding['level'] == ERROR for finding in result['findings']):
+                failed.add(result['path'])
+        return failed
+
+
+def benchmark_site(site_dir: Path) -> Dict[str, object]:
+    """Time every stage over one synthetic site"""
+    transforms = load_transforms()
+    verifiers = Verifiers()
+    stages = dict.fromkeys(STAGES, 0.0)
+    counts = {'pages': 0, 'bytes': 0, 'changed': 0, 'verify_failed': 0, 'errors': 0}
+
+    start = time.perf_counter()
+    pages = list(Corpus(site_dir))
+    stages['discovery'] = time.perf_counter() - start
+
+    for page in pages:
+        t0 = time.perf_counter()
+        original = page.content
+        t1 = time.perf_counter()
+        parse_page(page)
+        t2 = time.perf_counter()
+        result = run_page(page, transforms, dry_run=True)
+        t3 = time.perf_counter()
+        write_text(page.path, page.content)
+        t4 = time.perf_counter()
+
+        stages['read'] += t1 - t0
+        stages['parse'] += t2 - t1
+        stages['transform'] += t3 - t2
+        stages['write'] += t4 - t3
+
+        counts['pages'] += 1
+        counts['bytes'] += len(original.encode('utf-8'))
+        counts['changed'] += result['status'] == 'changed'
+        counts['errors'] += result['status'] == 'error'
+        # Keep the synthetic site as generated for the next run
+        if page.content != original:
+            write_text(page.path, original)
+
+    start = time.perf_counter()
+    counts['verify_failed'] = len(verifiers.verify(site_dir))
+    stages['verify'] = time.perf_counter() - start
+
+    total = sum(stages.values())
+    return {
+        **counts,
+        'seconds': round(total, 4),
+        'stages': {
+            stage: {
+                'seconds': round(seconds, 4),
+                'pages_per_second': round(counts['pages'] / seconds, 1) if seconds else None,
+            }
+            for stage, seconds in stages.items()
+        },
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_runs(current: Dict, previous: Dict, threshold: float) -> List[str]:
+    """Stages that got slower than threshold times the previous run"""
+    previous_runs = {run['size']: run for run in previous.get('runs', [])}
+    regressions = []
+    for run in current['runs']:
+        before = previous_runs.get(run['size'])
+        if before is None:
+            continue
+        for stage in STAGES:
+            old = before['stages'].get(stage, {}).get('seconds')
+            new = run['stages'][stage]['seconds']
+            # Sub-millisecond stages are noise
+            if old and new > 0.001 and new > old * threshold:
+                regressions.append(f"{run['size']} pages, {stage}: {old:.3f}s -> {new:.3f}s (x{new / old:.2f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the maintenance scripts on synthetic sites")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f"comma-separated page counts (default: {DEFAULT_SIZES})")
+    parser.add_argument('--output', type=Path, help="results file (default: .site-cache/bench/bench-<time>.json)")
+    parser.add_argument('--compare', type=Path, help="results file to compare with (default: the previous run)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"slowdown factor reported as a regression (default: {DEFAULT_THRESHOLD})")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    except ValueError:
+        print(f"❌ --sizes expects comma-separated numbers, got {args.sizes!r}")
+        sys.exit(2)
+
+    generator = load_script('generate-synthetic-site.py')
+
+    print("=" * 70)
+    print("⏱️  Maintenance Script Benchmark")
+    print("=" * 70)
+
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'runs': [],
+    }
+
+    for size in sizes:
+        start = time.perf_counter()
+        site_dir = generator.generate_site(size)
+        generate_seconds = time.perf_counter() - start
+
+        run = {'size': size, 'site': str(site_dir), 'generate_seconds': round(generate_seconds, 2)}
+        run.update(benchmark_site(site_dir))
+        results['runs'].append(run)
+
+        print(f"\n📁 {size} pages ({run['bytes'] / 1_000_000:.1f} MB, generated in {generate_seconds:.1f}s)")
+        for stage in STAGES:
+            timing = run['stages'][stage]
+            rate = f"{timing['pages_per_second']:>10.0f} pages/s" if timing['pages_per_second'] else ''
+            print(f"   {stage:<10} {timing['seconds']:>9.3f}s {rate}")
+        print(f"   {'total':<10} {run['seconds']:>9.3f}s")
+        if run['errors'] or run['verify_failed']:
+            print(f"   ⚠️  {run['errors']} transform errors, {run['verify_failed']} pages failed verification")
+
+    compare_path = args.compare or (LATEST_FILE if LATEST_FILE.exists() else None)
+    previous = json.loads(compare_path.read_text(encoding='utf-8')) if compare_path else None
+
+    output = args.output or BENCH_DIR / f"bench-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    LATEST_FILE.write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+    print("\n" + "=" * 70)
+    print(f"📄 Results: {output}")
+    if previous:
+        regressions = compare_runs(results, previous, args.threshold)
+        print(f"🔍 Compared with {compare_path} ({previous.get('commit') or 'unknown commit'})")
+        for regression in regressions:
+            print(f"   ⚠️  {regression}")
+        if not regressions:
+            print("   ✅ No stage regressed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Compare the binary and JSON formats of the search index: size and lookup time.
+
+Both formats are built from the same documents (see site_search.py) into
+temporary folders. For each format it reports:
+
+    size        term shards in total, gzip-compressed (as served), and the
+                largest shard
+    decode      time to load and parse every shard once
+    queries     per query: bytes of the shards the browser fetches for it,
+                cold time (index opened, shards loaded) and warm time
+                (shards cached), as the median of --repeat runs
+
+The queries default to a mix of English, Hinglish and Hindi ones, including
+words of the long Jain texts (the 262 KB Tattvartha Sutra page).
+
+Usage:
+    python3 scripts/benchmark-search-index.py
+    python3 scripts/benchmark-search-index.py --query "tattvarth" --repeat 200
+    python3 scripts/benchmark-search-index.py --json .site-cache/bench/search-index.json
+"""
+
+import argparse
+import gzip
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from site_corpus import BASE_DIR, load_corpus
+from site_parallel import add_jobs_argument
+from site_profile import add_profile_arguments, profile_from_args
+from site_search import FORMATS, SearchIndex, build_files, collect_documents
+from site_text import variant, words
+from site_urls import load_url_rules
+
+DEFAULT_QUERIES = [
+    'ticketing', 'blockchain', 'jain pu', 'mahaveer', 'navkar mantra',
+    'तत्त्वार्थ सूत्र', 'सम्यग्दर्शन', 'भक्तामर', 'calc',
+]
+
+
+def timed(func, repeat: int) -> float:
+    """Median time of func() in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def query_shards(index: SearchIndex, query: str) -> List[str]:
+    """Shard files a query reads (its words and their spelling variants)"""
+    names = {index.shard_name(token) for word in words(query) if len(word) > 1 for token in (word, variant(word))}
+    return sorted(name for name in names if name)
+
+
+def benchmark_format(directory: Path, files: Dict[str, bytes], queries: List[str], repeat: int) -> Dict[str, object]:
+    shards = {name: data for name, data in files.items() if name.startswith('terms-')}
+    result = {
+        'shards': len(shards),
+        'bytes': sum(len(data) for data in shards.values()),
+        'gzip_bytes': sum(len(gzip.compress(data, 9)) for data in shards.values()),
+        'largest': max(len(data) for data in shards.values()),
+    }
+
+    def decode_all():
+        index = SearchIndex(directory)
+        for name in shards:
+            index.load_shard(name)
+    result['decode_ms'] = timed(decode_all, max(1, repeat // 10))
+
+    result['queries'] = {}
+    for query in queries:
+        index = SearchIndex(directory)
+        names = query_shards(index, query)
+        warm_index = SearchIndex(directory)
+        warm_index.search(query)
+        result['queries'][query] = {
+            'results': len(warm_index.search(query)),
+            'fetched_bytes': sum(len(files[name]) for name in names),
+            'cold_ms': timed(lambda: SearchIndex(directory).search(query), repeat),
+            'warm_ms': timed(lambda: warm_index.search(query), repeat),
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the binary and JSON search index formats")
+    parser.add_argument('--query', action='append', default=[], help="query to time (repeatable)")
+    parser.add_argument('--repeat', type=int, default=50, help="runs per measurement (default: 50)")
+    parser.add_argument('--json', type=Path, help="write the results as JSON to this file")
+    add_jobs_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    print("=" * 70)
+    print("⏱️  Search Index Benchmark: binary vs JSON")
+    print("=" * 70)
+
+    documents, _read = collect_documents(load_corpus(BASE_DIR), args.jobs)
+    rules = load_url_rules(BASE_DIR)
+    queries = args.query or DEFAULT_QUERIES
+    print(f"Documents: {len(documents)}   queries: {len(queries)}   repeat: {args.repeat}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for shard_format in FORMATS:
+            start = time.perf_counter()
+            files = build_files(documents, rules, shard_format)
+            build_ms = (time.perf_counter() - start) * 1000
+            directory = Path(temp_dir) / shard_format
+            directory.mkdir()
+            for name, data in files.items():
+                (directory / name).write_bytes(data)
+            results[shard_format] = {'build_ms': build_ms,
+                                     **benchmark_format(directory, files, queries, args.repeat)}
+
+    binary, text = results['binary'], results['json']
+    print(f"\n📦 SIZE{'':<24}{'binary':>12}{'json':>12}{'ratio':>9}")
+    for key, label in (('bytes', 'term shards'), ('gzip_bytes', 'term shards, gzip'), ('largest', 'largest shard')):
+        print(f"   {label:<27}{binary[key]:>12,}{text[key]:>12,}{binary[key] / text[key]:>9.2f}")
+    print(f"   {'shard files':<27}{binary['shards']:>12}{text['shards']:>12}")
+    print(f"\n⏱️  TIME (ms){'':<19}{'binary':>12}{'json':>12}")
+    print(f"   {'build':<27}{binary['build_ms']:>12.1f}{text['build_ms']:>12.1f}")
+    print(f"   {'decode every shard':<27}{binary['decode_ms']:>12.2f}{text['decode_ms']:>12.2f}")
+
+    print(f"\n🔎 QUERIES{'':<21}{'fetched KB':>12}{'cold ms':>16}{'warm ms':>16}")
+    print(f"   {'':<27}{'bin / json':>12}{'bin / json':>16}{'bin / json':>16}")
+    for query in queries:
+        b, j = binary['queries'][query], text['queries'][query]
+        if b['results'] != j['results']:
+            print(f"   ⚠️  {query!r}: {b['results']} binary vs {j['results']} JSON results")
+        print(f"   {query[:27]:<27}{b['fetched_bytes'] / 1024:>5.1f} /{j['fetched_bytes'] / 1024:>5.1f}"
+              f"{b['cold_ms']:>8.2f} /{j['cold_ms']:>6.2f}{b['warm_ms']:>8.3f} /{j['warm_ms']:>6.3f}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"\n📄 Results: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Build dist/, the minified copy of the site that gets deployed.
+
+The pages are kept readable in the repository - indented markup, comments
+saying what each block is, JSON-LD written with indent=4 - and the largest
+Jain Docs pages run past 250 KB. This stage copies every file the site
+serves (the files git tracks with a SERVED_SUFFIXES suffix, but for the
+work records in UNSERVED_FILES) to the same path under dist/, with the HTML
+files run through
+site_minify.minify_html(): whitespace between tags collapsed, comments
+dropped except the AdSense markers, JSON-LD compacted, <pre>, <textarea>
+and inline scripts left byte for byte. Before minifying, each page gets the
+CSS of its first screen inlined and its stylesheets loaded late
+(inline-critical-css.py), and links the copies of the site-wide stylesheets
+pruned for its template, which are written under dist/ only
+(prune-unused-css.py). The pages in the repository keep their plain links to
+the source stylesheets.
+
+Only files whose bytes changed are written, so a re-run after editing a few
+pages is quick. The files a build writes are listed in dist/.dist-files.json
+and the next build removes only those of them that are gone from the tree;
+an output directory that holds the site, or that has files but no such list,
+is refused rather than cleaned. run-pipeline.py --dist runs this stage after the page transforms.
+To deploy the minified copy, serve dist/ (Vercel: outputDirectory "dist"
+with this script as the build command); the sources are never written.
+
+Usage:
+    python3 scripts/build-dist.py --jobs 0
+    python3 scripts/build-dist.py --dry-run
+    python3 scripts/build-dist.py --output /tmp/site
+"""
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from site_corpus import BASE_DIR, DIST_DIR, Corpus, Page, load_corpus, read_text, write_text
+from site_journal import record_write
+from site_minify import minify_html
+from site_parallel import add_jobs_argument, map_pages
+from site_pipeline import load_script
+from site_profile import add_profile_arguments, profile_from_args, stage
+
+# What the site serves: pages, styles and scripts, the search index, sitemaps, images and fonts
+SERVED_SUFFIXES = {
+    '.html', '.css', '.js', '.json', '.bin', '.xml', '.txt', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp',
+    '.avif', '.ico', '.woff', '.woff2', '.ttf', '.pdf', '.webmanifest',
+}
+# Tracked files with a served suffix that are not part of the site: hosting config and work records
+UNSERVED_FILES = {'vercel.json', 'enhancement_progress.txt', 'sitemap_backup_old.xml',
+                  'sitemap_verification_report.json'}
+
+# The files the last build wrote, relative to the output directory (not itself a site file)
+DIST_MANIFEST = '.dist-files.json'
+
+
+def served(rel_path: str) -> bool:
+    """Whether the site serves a file of the tree (dot files and folders never)"""
+    parts = rel_path.split('/')
+    return (Path(rel_path).suffix.lower() in SERVED_SUFFIXES and rel_path not in UNSERVED_FILES
+            and not any(part.startswith('.') for part in parts))
+
+
+def tracked_files(base_dir: Path) -> Optional[List[str]]:
+    """Files git tracks under base_dir, relative to it; None outside a repository"""
+    try:
+        output = subprocess.run(['git', '-C', str(base_dir), 'ls-files', '-z'], capture_output=True,
+                                check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return [name.decode('utf-8') for name in output.split(b'\0') if name]
+
+
+def site_files(base_dir: Path, output_dir: Path) -> List[str]:
+    """Files the site serves, relative to its root (every served file of the tree outside a repository)"""
+    files = tracked_files(base_dir)
+    if files is None:
+        files = [(Path(root) / name).relative_to(base_dir).as_posix()
+                 for root, _dirs, names in os.walk(base_dir) for name in names]
+    try:
+        output_prefix = output_dir.relative_to(base_dir).as_posix() + '/'
+    except ValueError:
+        output_prefix = None
+    return sorted(rel_path for rel_path in files
+                  if served(rel_path) and not (output_prefix and rel_path.startswith(output_prefix)))
+
+
+def check_output_dir(base_dir: Path, output_dir: Path) -> None:
+    """Refuse an output directory a build would overwrite or clean that it does not own"""
+    if output_dir == base_dir or output_dir in base_dir.parents:
+        raise SystemExit(f"❌ {output_dir} holds the site tree; build into a directory of its own (default: dist/)")
+    if output_dir.is_dir() and any(output_dir.iterdir()) and not (output_dir / DIST_MANIFEST).is_file():
+        raise SystemExit(f"❌ {output_dir} has files this script did not write (no {DIST_MANIFEST}); "
+                         f"remove it or choose another --output")
+
+
+def previous_files(output_dir: Path) -> List[str]:
+    """The files the last build into output_dir wrote"""
+    try:
+        return json.loads(read_text(output_dir / DIST_MANIFEST))['files']
+    except FileNotFoundError:
+        return []
+
+
+def write_if_changed(path: Path, content: str, dry_run: bool) -> bool:
+    try:
+        if read_text(path) == content:
+            return False
+    except FileNotFoundError:
+        pass
+    if not dry_run:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_text(path, content)
+    return True
+
+
+def gzip_size(text: str) -> int:
+    return len(gzip.compress(text.encode('utf-8'), 6))
+
+
+def build_page(page: Page, output_dir: str, dry_run: bool, targets: Dict[Tuple[str, str], str]) -> Dict[str, object]:
+    """
+    Inline the critical CSS of one page, link the pruned stylesheets (targets
+    of prune_site()) and minify it into the output directory; runs in
+    map_pages workers
+    """
+    content, critical = load_script('inline-critical-css.py').inline_critical_css(page)
+    content = load_script('prune-unused-css.py').with_pruned_sheets(page, content, targets)
+    minified = minify_html(content)
+    return {
+        'before': len(content.encode('utf-8')), 'after': len(minified.encode('utf-8')),
+        'gzip_before': gzip_size(content), 'gzip_after': gzip_size(minified), 'critical': critical,
+        'written': write_if_changed(Path(output_dir) / page.rel_path, minified, dry_run),
+    }
+
+
+def copy_if_changed(source: Path, target: Path, dry_run: bool) -> bool:
+    """Copy a file unless the target already has its size and modification time"""
+    try:
+        source_stat, target_stat = source.stat(), target.stat()
+        if source_stat.st_size == target_stat.st_size and source_stat.st_mtime_ns == target_stat.st_mtime_ns:
+            return False
+    except FileNotFoundError:
+        pass
+    if not dry_run:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
+    return True
+
+
+def build_dist(corpus: Corpus, output_dir: Path = DIST_DIR, jobs: int = 1,
+               dry_run: bool = False) -> Dict[str, object]:
+    """Bring output_dir up to date with the site tree; returns the numbers for report()"""
+    base_dir = corpus.base_dir.resolve()
+    output_dir = output_dir.resolve()
+    check_output_dir(base_dir, output_dir)
+    summary: Dict[str, object] = {'output': output_dir, 'pages': 0, 'written': [], 'stylesheets': [],
+                                  'partials': [], 'copied': [],
+                                  'removed': [], 'before': 0, 'after': 0, 'gzip_before': 0, 'gzip_after': 0,
+                                  'critical_pages': 0, 'critical': 0, 'errors': [], 'largest': None}
+    files = site_files(base_dir, output_dir)
+
+    with stage('prune stylesheets'):
+        pruning = load_script('prune-unused-css.py').prune_site(corpus, jobs)
+        summary['errors'].extend(pruning['errors'])
+        for rel_path, content in pruning['files'].items():
+            if write_if_changed(output_dir / rel_path, content, dry_run):
+                summary['stylesheets'].append(rel_path)
+
+    with stage('minify pages'):
+        for result in map_pages(build_page, corpus.pages(), jobs, args=(str(output_dir), dry_run, pruning['targets']),
+                                echo=False):
+            if result['status'] == 'error':
+                summary['errors'].append(f"{result['path']}: {result['message']}")
+                continue
+            value = result['value']
+            summary['pages'] += 1
+            for key in ('before', 'after', 'gzip_before', 'gzip_after', 'critical'):
+                summary[key] += value[key]
+            summary['critical_pages'] += bool(value['critical'])
+            if summary['largest'] is None or value['before'] > summary['largest'][1]:
+                summary['largest'] = (result['path'], value['before'], value['after'])
+            if value['written']:
+                summary['written'].append(result['path'])
+
+    with stage('copy files'):
+        pages = {page.rel_path for page in corpus.pages()}
+        for rel_path in files:
+            if rel_path in pages:
+                continue
+            source, target = base_dir / rel_path, output_dir / rel_path
+            if rel_path.endswith('.html'):
+                # Fragments other pages include (TOOLS/shared/footer.html)
+                if write_if_changed(target, minify_html(read_text(source)), dry_run):
+                    summary['partials'].append(rel_path)
+            elif copy_if_changed(source, target, dry_run):
+                summary['copied'].append(rel_path)
+
+    wanted = set(files) | set(pruning['files']) | {page.rel_path for page in corpus.pages()}
+    for rel_path in previous_files(output_dir):
+        path = output_dir / rel_path
+        if rel_path in wanted or not path.is_file():
+            continue
+        summary['removed'].append(rel_path)
+        if not dry_run:
+            record_write(path, None)
+            path.unlink()
+            # Folders the removal emptied go too
+            parent = path.parent
+            while parent != output_dir and not any(parent.iterdir()):
+                parent.rmdir()
+                parent = parent.parent
+    if not dry_run:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        write_text(output_dir / DIST_MANIFEST, json.dumps({'files': sorted(wanted)}, indent=1) + '\n')
+    return summary
+
+
+def report(summary: Dict[str, object], dry_run: bool, verbose: bool = False) -> None:
+    before, after = summary['before'], summary['after']
+    gzip_before, gzip_after = summary['gzip_before'], summary['gzip_after']
+    print(f"\n📦 {summary['output']}")
+    # Sizes after the critical CSS is inlined, so they show what minifying saves
+    print(f"   Pages: {summary['pages']}, HTML {before / 1024:,.0f} KB -> {after / 1024:,.0f} KB "
+          f"({1 - after / max(before, 1):.0%} smaller; gzipped {gzip_before / 1024:,.0f} KB -> "
+          f"{gzip_after / 1024:,.0f} KB, {1 - gzip_after / max(gzip_before, 1):.0%})")
+    if summary['largest']:
+        path, largest_before, largest_after = summary['largest']
+        print(f"   Largest page: {path} {largest_before / 1024:,.0f} KB -> {largest_after / 1024:,.0f} KB")
+    if summary['critical_pages']:
+        print(f"   Critical CSS: inlined in {summary['critical_pages']} pages, "
+              f"{summary['critical'] / summary['critical_pages'] / 1024:,.1f} KB per page")
+    suffix = " (dry run)" if dry_run else ""
+    for icon, label, key in (("✅", "Pages written", 'written'), ("✅", "Pruned stylesheets written", 'stylesheets'),
+                             ("✅", "Partials written", 'partials'),
+                             ("✅", "Files copied", 'copied'), ("🗑️ ", "Files removed", 'removed')):
+        print(f"   {icon} {label}{suffix}: {len(summary[key])}")
+        if verbose:
+            for path in summary[key]:
+                print(f"      {path}")
+    for message in summary['errors']:
+        print(f"   ❌ {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the minified deploy copy of the site")
+    parser.add_argument('--output', type=Path, default=DIST_DIR, help="output directory (default: dist/)")
+    parser.add_argument('--dry-run', action='store_true', help="report what would be written without writing")
+    parser.add_argument('--verbose', action='store_true', help="list every file written, copied or removed")
+    add_jobs_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    print("=" * 70)
+    print("🗜️  Deploy Build (minified HTML)")
+    print("=" * 70)
+
+    summary = build_dist(load_corpus(BASE_DIR), args.output.resolve(), args.jobs, args.dry_run)
+    report(summary, args.dry_run, args.verbose)
+    if summary['errors']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Build the site search index that home.js queries (see site_search.py).
+
+Every page of the tree except noindex pages - categories, article/,
+hindi_article/, Jain Docs, TOOLS, bhakti, ... - is indexed. Extracted
+documents are cached per page in .site-cache/manifests/build-search-index.json,
+so a rebuild only re-reads pages changed since the last run. Files are only
+written when their content changed, and shard or chunk files the new index
+no longer lists are removed.
+
+Term shards are written in the compact binary format by default (front-coded
+terms, varint delta postings); --format json writes the JSON shards instead.
+home.js reads either. See benchmark-search-index.py for how they compare.
+
+After building, the given queries (or a default set) are run against the
+written index the way the browser runs them, with timings.
+
+Usage:
+    python3 scripts/build-search-index.py
+    python3 scripts/build-search-index.py --dry-run
+    python3 scripts/build-search-index.py --format json
+    python3 scripts/build-search-index.py --query "blockchain" --query "jain pu"
+    python3 scripts/build-search-index.py --output dist/search
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from site_corpus import BASE_DIR, load_corpus, write_bytes
+from site_journal import record_write
+from site_parallel import add_jobs_argument
+from site_profile import add_profile_arguments, profile_from_args, stage
+from site_search import FORMATS, SEARCH_DIR, SearchIndex, build_files, collect_documents
+from site_urls import load_url_rules
+
+# Queries timed after a build when none are given
+SAMPLE_QUERIES = ['ticketing', 'volunteer management', 'blockchain', 'seo', 'jain pu', 'navkar', 'calc']
+
+# Files the builder owns in the output folder
+INDEX_FILE_PATTERNS = ('index.json', 'terms-*.json', 'terms-*.bin', 'docs-*.json')
+
+
+def write_file(path: Path, data: bytes, dry_run: bool) -> bool:
+    """Write data unless the file already holds it; returns True when it changed"""
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    if not dry_run:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_bytes(path, data)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the sharded search index used by the homepage search")
+    parser.add_argument('--output', type=Path, default=SEARCH_DIR,
+                        help=f"folder to write the index to (default: {SEARCH_DIR.relative_to(BASE_DIR)})")
+    parser.add_argument('--format', choices=FORMATS, default=FORMATS[0], help="term shard format (default: binary)")
+    parser.add_argument('--query', action='append', default=[], help="query to run against the built index (repeatable)")
+    parser.add_argument('--dry-run', action='store_true', help="report what would change without writing")
+    add_jobs_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    print("=" * 70)
+    print("🔎 Search Index Builder")
+    print("=" * 70)
+
+    corpus = load_corpus(BASE_DIR)
+    with stage('extract documents'):
+        documents, read = collect_documents(corpus, args.jobs)
+    print(f"Pages: {len(documents)} indexed, {len(corpus) - len(documents)} left out (noindex), "
+          f"{read} read this run")
+
+    with stage('build index'):
+        files = build_files(documents, load_url_rules(BASE_DIR), args.format)
+
+    written = []
+    with stage('write index'):
+        for name, data in files.items():
+            if write_file(args.output / name, data, args.dry_run):
+                written.append(name)
+        stale = sorted(path for pattern in INDEX_FILE_PATTERNS for path in args.output.glob(pattern)
+                       if path.name not in files)
+        for path in stale:
+            if not args.dry_run:
+                record_write(path, None)
+                path.unlink()
+
+    shards = [name for name in files if name.startswith('terms-')]
+    print(f"\n   📦 index.json: {len(files['index.json']):,} bytes")
+    print(f"   📦 {len(shards)} {args.format} term shards: {sum(len(files[name]) for name in shards):,} bytes, "
+          f"largest {max((len(files[name]) for name in shards), default=0):,}")
+    chunks = [name for name in files if name.startswith('docs-')]
+    print(f"   📦 {len(chunks)} document chunks: {sum(len(files[name]) for name in chunks):,} bytes")
+
+    verb = "Would write" if args.dry_run else "Wrote"
+    for name in written:
+        print(f"   ✅ {verb}: {name}")
+    for path in stale:
+        print(f"   🗑️  {'Would remove' if args.dry_run else 'Removed'}: {path.name}")
+    if not written and not stale:
+        print("   ✅ Search index is up to date")
+
+    if args.dry_run:
+        return
+
+    print("\n🔎 QUERIES (cold: shards and chunks loaded; warm: cached)")
+    index = SearchIndex(args.output)
+    for query in args.query or SAMPLE_QUERIES:
+        start = time.perf_counter()
+        results = index.search(query)
+        cold = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        index.search(query)
+        warm = (time.perf_counter() - start) * 1000
+        print(f"   {query!r}: {len(results)} result(s), cold {cold:.2f} ms, warm {warm:.3f} ms")
+        for document, score in results[:3]:
+            print(f"      {score:7.1f}  {document['url']}  {document['title']}")
+
+
+if __name__ == '__main__':
+    main()
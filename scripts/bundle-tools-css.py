@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Move the CSS the TOOLS pages have in common into shared, long-cacheable bundles.
+
+Every TOOLS/<tool>/ ships its own styles.css, and most of each one is the
+same resets, variables, header, sidebar and footer rules. This stage parses
+all of them (see site_css.py), matches rules that are identical up to
+comments and whitespace and moves those used by several tools into
+shared bundles, TOOLS/shared/tools.<hash>.css. What is left of a
+tool's stylesheet stays in its styles.css as the per-tool delta, and the
+page links its bundles right before it:
+
+    <link rel="stylesheet" href="/TOOLS/shared/tools.3f2a9c01d4.css">
+    <link rel="stylesheet" href="/TOOLS/Age-Calculator/styles.css">
+
+A tool may link a bundle holding rules it does not have when those rules
+match nothing on its page: every selector's subject needs a class the page
+and its scripts never use, so tools whose stylesheets differ a little can
+share one bundle. Bundles are picked greedily by the bytes they save a
+visitor who opens every tool, at most MAX_BUNDLES_PER_TOOL per tool, each
+worth MIN_BUNDLE_BYTES.
+
+Bundles load before the delta, so a shared rule can move ahead of rules it
+used to follow. Each move is checked with site_css.can_reorder(); a rule
+whose move could change the cascade (same property, same specificity,
+possibly the same element) stays in the delta of every tool. So each page
+resolves every property exactly as it did with its single stylesheet.
+
+Which classes can meet on one element, and which a page uses at all, is
+read from the markup (class_evidence()): the class attributes of the tool
+pages and the class strings of their scripts (scripts.js,
+TOOLS/shared/footer.js, home.js) give the sets of classes that appear
+together, and a class the scripts add at runtime (see
+site_styles.runtime_classes()) is taken to meet every other.
+
+The bundle names carry their content hash because vercel.json serves CSS
+as immutable for a year. A run starts from what the pages link now (bundles
+plus delta), so editing a bundle or a tool's styles.css and running the
+stage again re-balances the split, renames changed bundles and removes the
+ones no page links any more.
+
+Usage:
+    python3 scripts/bundle-tools-css.py
+    python3 scripts/bundle-tools-css.py --dry-run
+    python3 scripts/bundle-tools-css.py --check            # exit 1 if a run would change anything
+"""
+
+import argparse
+import gzip
+import hashlib
+import re
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+from site_corpus import BASE_DIR, Corpus, Page, load_corpus, read_text, write_bytes
+from site_css import (ClassCheck, Statement, can_reorder, cached_effects, parse_stylesheet, property_roots,
+                     subject_traits)
+from site_journal import record_write
+from site_profile import add_profile_arguments, profile_from_args, stage
+from site_styles import class_sets, runtime_classes
+
+TOOLS_DIR = BASE_DIR / 'TOOLS'
+SHARED_DIR = TOOLS_DIR / 'shared'
+
+# A rule is bundled when this many of the tools linking the bundle use it...
+MIN_TOOLS = 3
+# ...and at least this share of them (the others load it for nothing)
+MIN_SHARE = 0.5
+# A bundle is at least this large
+MIN_BUNDLE_BYTES = 2048
+# Stylesheet requests a tool page makes at most, besides its own styles.css
+MAX_BUNDLES_PER_TOOL = 3
+
+BUNDLE_GLOB = 'tools.*.css'
+BUNDLE_LINK_PATTERN = re.compile(
+    r'[ \t]*<link rel="stylesheet" href="/TOOLS/shared/(tools\.[0-9a-f]{10}\.css)">[ \t]*\r?\n?'
+)
+
+BUNDLE_HEADER = ("/* Generated by scripts/bundle-tools-css.py: rules shared by several TOOLS pages.\n"
+                 "   Edit them here or in a tool's styles.css, then run the bundler again. */\n")
+
+SHARED_SCRIPTS = [SHARED_DIR / 'footer.js', SHARED_DIR / 'footer.html', BASE_DIR / 'home.js']
+
+EMPTY_DELTA = "/* Every rule of this tool is in its shared bundles (TOOLS/shared/tools.*.css) */\n"
+
+
+class Tool:
+    """A tool page, the classes it uses and its stylesheet as it applies today (bundles + delta)"""
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.name = page.path.parent.name
+        self.delta_path = page.path.parent / 'styles.css'
+        self.bundles = BUNDLE_LINK_PATTERN.findall(page.content)
+
+        self.class_sets = class_sets(page.content)
+        self.runtime_classes: Set[str] = set()
+        for path in SHARED_SCRIPTS + [page.path.parent / 'scripts.js']:
+            if path.exists():
+                source = read_text(path)
+                self.class_sets.update(class_sets(source))
+                if path.suffix == '.js':
+                    self.runtime_classes.update(runtime_classes(source))
+        self.classes = self.runtime_classes.union(*self.class_sets)
+
+        # Bundled rules that match nothing here were never this tool's: leave them out
+        statements = [statement for bundle in self.bundles
+                      for statement in parse_stylesheet(strip_header(read_text(SHARED_DIR / bundle))).statements
+                      if not self.matches_nothing(statement)]
+        self.delta_source = read_text(self.delta_path)
+        sheet = parse_stylesheet('' if self.delta_source == EMPTY_DELTA else self.delta_source)
+        self.statements: List[Statement] = statements + sheet.statements
+        self.trailing = sheet.trailing
+        self.position = {statement.key: index for index, statement in enumerate(self.statements)}
+
+    def __repr__(self) -> str:
+        return f"Tool({self.name!r})"
+
+    @property
+    def link(self) -> str:
+        return f'<link rel="stylesheet" href="/TOOLS/{self.name}/styles.css">'
+
+    @property
+    def size(self) -> int:
+        """Bytes of CSS the page loads today"""
+        return sum(len(read_text(SHARED_DIR / bundle).encode('utf-8')) for bundle in self.bundles) \
+            + len(self.delta_source.encode('utf-8'))
+
+    def matches_nothing(self, statement: Statement) -> bool:
+        """Whether every selector of a rule (or @media block) needs a class this page never uses"""
+        found = cached_effects(statement)
+        return bool(found) and all(effect[0] == 'rule' and subject_traits(effect[1])[3] - self.classes
+                                   for effect in found)
+
+
+def strip_header(css: str) -> str:
+    return css[len(BUNDLE_HEADER):] if css.startswith(BUNDLE_HEADER) else css
+
+
+def find_tools(corpus: Corpus) -> List[Tool]:
+    """Tool pages that link their own TOOLS/<tool>/styles.css"""
+    tools = []
+    for page in corpus.pages('TOOLS'):
+        if page.path.name != 'index.html' or page.path.parent.parent != TOOLS_DIR:
+            continue
+        if (page.path.parent / 'styles.css').exists() and f'href="/TOOLS/{page.path.parent.name}/styles.css"' in page.content:
+            tools.append(Tool(page))
+    return tools
+
+
+def class_evidence(tools: List[Tool]) -> ClassCheck:
+    """Whether some element of the TOOLS pages may carry all of the given classes (see above)"""
+    static_sets = set().union(*(tool.class_sets for tool in tools))
+    dynamic = set().union(*(tool.runtime_classes for tool in tools))
+
+    def classes_may_meet(classes: FrozenSet[str]) -> bool:
+        static = classes - dynamic
+        return not static or any(static <= words for words in static_sets)
+
+    return classes_may_meet
+
+
+def statement_text(statement: Statement) -> str:
+    """A statement with its comment, whitespace in front of it normalised"""
+    comment = statement.leading.strip()
+    return (comment + '\n' if comment else '') + statement.source
+
+
+class Bundle:
+    """Rules shared by a set of tools, in the order they are written"""
+
+    def __init__(self, tools: List[Tool], keys: List[str]):
+        self.tools = tools
+        self.keys = keys
+
+    def __repr__(self) -> str:
+        return f"Bundle({len(self.tools)} tools, {len(self.keys)} rules)"
+
+
+def plan_bundles(tools: List[Tool]) -> List[Bundle]:
+    """
+    The bundles, in link order. Each is the set of tools, and the rules they
+    can all link, that saves the most bytes; then bundles are shrunk until
+    no moved rule could change the cascade of a tool that links them.
+    """
+    statements: Dict[str, Statement] = {}
+    users: Dict[str, int] = defaultdict(int)
+    repeated = set()
+    for bit, tool in enumerate(tools):
+        counts = Counter(statement.key for statement in tool.statements)
+        repeated.update(key for key, count in counts.items() if count > 1)
+        for statement in tool.statements:
+            statements.setdefault(statement.key, statement)
+            if not tool.matches_nothing(statement):
+                users[statement.key] |= 1 << bit
+    # Tools as bit masks: users of a rule, and tools that can link it (users, or nothing to match)
+    candidates = [key for key, mask in users.items() if bin(mask).count('1') >= MIN_TOOLS and key not in repeated]
+    linkable = {key: users[key] | sum(1 << bit for bit, tool in enumerate(tools)
+                                      if tool.matches_nothing(statements[key]))
+                for key in candidates}
+    sizes = {key: len(key) for key in candidates}
+    bundled: Dict[str, int] = defaultdict(int)
+    slots = [MAX_BUNDLES_PER_TOOL] * len(tools)
+
+    def contents(mask: int) -> List[str]:
+        return [key for key in candidates if not mask & ~linkable[key] and not mask & bundled[key]
+                and bin(users[key] & mask).count('1') >= max(MIN_TOOLS, MIN_SHARE * bin(mask).count('1'))]
+
+    def saved(mask: int) -> int:
+        return sum(sizes[key] * (bin(users[key] & mask).count('1') - 1) for key in contents(mask))
+
+    bundles: List[Tuple[int, List[str]]] = []
+    while True:
+        # Start from the best of the tool sets sharing some rule, then drop tools while that pays
+        open_tools = sum(1 << bit for bit in range(len(tools)) if slots[bit])
+        seeds = {mask & open_tools for key in candidates for mask in (users[key], linkable[key])}
+        best, mask = max(((saved(seed), seed) for seed in seeds), default=(0, 0))
+        while mask:
+            trials = [(saved(mask & ~(1 << bit)), -bit) for bit in range(len(tools)) if mask >> bit & 1]
+            if max(trials)[0] <= best:
+                break
+            best, bit = max(trials)
+            mask &= ~(1 << -bit)
+        keys = contents(mask)
+        if not keys or sum(sizes[key] for key in keys) < MIN_BUNDLE_BYTES:
+            break
+        bundles.append((mask, keys))
+        for key in keys:
+            bundled[key] |= mask
+        for bit in range(len(tools)):
+            if mask >> bit & 1:
+                slots[bit] -= 1
+
+    classes_may_meet = class_evidence(tools)
+    while True:
+        bundles = [(mask, rule_order(keys, [tool for bit, tool in enumerate(tools) if mask >> bit & 1],
+                                     classes_may_meet))
+                   for mask, keys in bundles
+                   if sum(sizes[key] for key in keys) >= MIN_BUNDLE_BYTES]
+        moved = set()
+        for bit, tool in enumerate(tools):
+            used = [[key for key in keys if users[key] >> bit & 1] for mask, keys in bundles if mask >> bit & 1]
+            moved.update(cascade_changes(tool, used, classes_may_meet))
+        if not moved:
+            return [Bundle([tool for bit, tool in enumerate(tools) if mask >> bit & 1], keys)
+                    for mask, keys in bundles]
+        bundles = [(mask, [key for key in keys if key not in moved]) for mask, keys in bundles]
+
+
+def rule_order(keys: List[str], members: List[Tool], classes_may_meet: ClassCheck) -> List[str]:
+    """
+    The rules of a bundle in an order that keeps every pair a member tool
+    has in a cascade-relevant order; otherwise by key, so that the order
+    does not depend on where the rules stood before (a second run must
+    write the same bundle).
+    """
+    after: Dict[str, Set[str]] = {key: set() for key in keys}
+    for tool in members:
+        statements = {statement.key: statement for statement in tool.statements}
+        used = sorted((key for key in keys if key in statements), key=tool.position.get)
+        for index, key in enumerate(used):
+            for later in used[index + 1:]:
+                if property_roots(statements[key]) & property_roots(statements[later]) \
+                        and not can_reorder(statements[key], statements[later], classes_may_meet):
+                    after[key].add(later)
+    before = Counter(later for key in keys for later in after[key])
+    result = []
+    remaining = set(keys)
+    while remaining:
+        # A cycle (tools disagreeing) is broken at its smallest key; cascade_changes() drops the loser
+        key = min(remaining, key=lambda key: (before[key], key))
+        remaining.discard(key)
+        result.append(key)
+        for later in after[key]:
+            before[later] -= 1
+    return result
+
+
+def cascade_changes(tool: Tool, bundle_keys: List[List[str]], classes_may_meet: ClassCheck) -> set:
+    """Keys of bundled rules that would now come before a rule they may not pass"""
+    bundled = [key for keys in bundle_keys for key in keys]
+    in_bundle = set(bundled)
+    statements = {statement.key: statement for statement in tool.statements}
+    order = bundled + [statement.key for statement in tool.statements if statement.key not in in_bundle]
+    roots = {key: property_roots(statements[key]) for key in order}
+    position = tool.position
+    moved = set()
+    for index, key in enumerate(order):
+        if key not in in_bundle:
+            continue
+        for later in order[index + 1:]:
+            if position[later] < position[key] and roots[key] & roots[later] \
+                    and not can_reorder(statements[later], statements[key], classes_may_meet):
+                moved.add(key)
+                break
+    return moved
+
+
+def bundle_file(bundle: Bundle) -> Tuple[str, str]:
+    """(file name, content) of a bundle, each rule's text taken from the first tool that has it"""
+    statements = {}
+    for tool in bundle.tools:
+        for statement in tool.statements:
+            statements.setdefault(statement.key, statement)
+    content = BUNDLE_HEADER + '\n' + '\n\n'.join(statement_text(statements[key]) for key in bundle.keys) + '\n'
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]
+    return f"tools.{digest}.css", content
+
+
+def delta_file(tool: Tool, bundled: set) -> str:
+    if not bundled and not tool.bundles:
+        return tool.delta_source
+    remaining = [statement_text(statement) for statement in tool.statements if statement.key not in bundled]
+    trailing = tool.trailing.strip()
+    if trailing:
+        remaining.append(trailing)
+    return '\n\n'.join(remaining) + '\n' if remaining else EMPTY_DELTA
+
+
+def with_bundle_links(content: str, tool: Tool, bundles: List[str]) -> str:
+    """Page source linking the given bundles right before the tool's own stylesheet"""
+    content = BUNDLE_LINK_PATTERN.sub('', content)
+    newline = '\r\n' if '\r\n' in content else '\n'
+    match = re.search(r'(?m)^([ \t]*)' + re.escape(tool.link), content)
+    indent = match.group(1)
+    links = ''.join(f'<link rel="stylesheet" href="/TOOLS/shared/{name}">{newline}{indent}' for name in bundles)
+    return content[:match.end(1)] + links + content[match.end(1):]
+
+
+def write_file(path: Path, content: str, dry_run: bool) -> bool:
+    data = content.encode('utf-8')
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    if not dry_run:
+        write_bytes(path, data)
+    return True
+
+
+def gzip_size(text: str) -> int:
+    return len(gzip.compress(text.encode('utf-8'), 9))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bundle the CSS the TOOLS pages share")
+    parser.add_argument('--dry-run', action='store_true', help="report the split without writing")
+    parser.add_argument('--check', action='store_true', help="exit 1 if the bundles are not up to date")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+    dry_run = args.dry_run or args.check
+
+    print("=" * 70)
+    print("🎨 TOOLS CSS Bundler")
+    print("=" * 70)
+
+    with stage('parse stylesheets'):
+        tools = find_tools(load_corpus(BASE_DIR))
+    print(f"Tools: {len(tools)}, {sum(len(tool.statements) for tool in tools)} statements")
+    before = {tool.name: tool.size for tool in tools}
+
+    with stage('plan bundles'):
+        plan = plan_bundles(tools)
+
+    files: Dict[str, str] = {}
+    links: Dict[str, List[str]] = defaultdict(list)
+    with stage('write'):
+        for bundle in plan:
+            name, content = bundle_file(bundle)
+            files[name] = content
+            for tool in bundle.tools:
+                links[tool.name].append(name)
+            print(f"   📦 {name}: {len(bundle.keys)} rules, {len(content.encode('utf-8')):,} bytes, "
+                  f"{len(bundle.tools)} tools")
+
+        changed = [name for name, content in files.items() if write_file(SHARED_DIR / name, content, dry_run)]
+        deltas = {}
+        for tool in tools:
+            bundled = {key for bundle in plan if tool in bundle.tools for key in bundle.keys}
+            deltas[tool.name] = delta_file(tool, bundled)
+            if write_file(tool.delta_path, deltas[tool.name], dry_run):
+                changed.append(str(tool.delta_path.relative_to(BASE_DIR)))
+            new_content = with_bundle_links(tool.page.content, tool, links[tool.name])
+            if new_content != tool.page.content:
+                changed.append(tool.page.rel_path)
+                if not dry_run:
+                    tool.page.write(new_content)
+
+        stale = sorted(path for path in SHARED_DIR.glob(BUNDLE_GLOB) if path.name not in files)
+        for path in stale:
+            if not dry_run:
+                record_write(path, None)
+                path.unlink()
+
+    after = {tool.name: sum(len(files[name].encode('utf-8')) for name in links[tool.name])
+             + len(deltas[tool.name].encode('utf-8')) for tool in tools}
+    all_before = sum(before.values())
+    all_after = sum(len(content.encode('utf-8')) for content in files.values()) \
+        + sum(len(delta.encode('utf-8')) for delta in deltas.values())
+    gzip_before = sum(gzip_size(tool.delta_source) for tool in tools if not tool.bundles)
+    print(f"\n📊 One tool page: {sum(after.values()) / len(tools) / 1024:.1f} KB of CSS on average "
+          f"(was {sum(before.values()) / len(tools) / 1024:.1f} KB)")
+    print(f"   Every tool page in turn: {all_after / 1024:.1f} KB downloaded (was {all_before / 1024:.1f} KB, "
+          f"-{(1 - all_after / all_before):.0%})")
+    if gzip_before:
+        gzip_after = sum(gzip_size(content) for content in files.values()) + sum(gzip_size(d) for d in deltas.values())
+        print(f"   gzip: {gzip_after / 1024:.1f} KB (was {gzip_before / 1024:.1f} KB)")
+    largest = sorted(tools, key=lambda tool: -len(deltas[tool.name]))[:3]
+    print(f"   Largest deltas: " + ', '.join(f"{tool.name} {len(deltas[tool.name].encode('utf-8')):,} B"
+                                              for tool in largest))
+
+    verb = "Would update" if dry_run else "Updated"
+    for path in changed:
+        print(f"   ✅ {verb}: {path}")
+    for path in stale:
+        print(f"   🗑️  {'Would remove' if dry_run else 'Removed'}: {path.relative_to(BASE_DIR)}")
+    if not changed and not stale:
+        print("   ✅ TOOLS bundles are up to date")
+    elif args.check:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
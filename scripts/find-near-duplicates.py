@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Find pages whose main content is a near-duplicate of another page's.
+
+Jain Docs and TOOLS pages share a lot of boilerplate, and the content
+expansions (see enhancement_progress.txt) can repeat whole sections from one
+page on another. Every indexable page is compared through MinHash signatures
+of its word shingles and LSH banding (see site_duplicates.py), so the run is
+linear in the number of pages rather than one comparison per pair.
+Signatures are cached by content hash: a re-run only reads changed pages.
+
+The report lists clusters of similar pages, each pair with its estimated
+Jaccard similarity and overlap (the share of the smaller page's content also
+found in the other one).
+
+Usage:
+    python3 scripts/find-near-duplicates.py
+    python3 scripts/find-near-duplicates.py --threshold 0.8
+    python3 scripts/find-near-duplicates.py --section TOOLS --section "Jain Docs"
+    python3 scripts/find-near-duplicates.py --json .site-cache/reports/near-duplicates.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from site_corpus import BASE_DIR, load_corpus
+from site_duplicates import DEFAULT_THRESHOLD, find_duplicates
+from site_index import open_index
+from site_parallel import add_jobs_argument
+from site_profile import add_profile_arguments, profile_from_args, stage
+from site_search import is_noindex
+
+# Pages with fewer distinct shingles than this (redirect stubs, empty shells)
+# match each other trivially and are left out by default
+MIN_SHINGLES = 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report clusters of near-duplicate pages")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"minimum Jaccard similarity of a reported pair (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--section', action='append', default=[],
+                        help="only compare pages of this section (repeatable)")
+    parser.add_argument('--min-shingles', type=int, default=MIN_SHINGLES,
+                        help=f"skip pages with less content than this many shingles (default: {MIN_SHINGLES})")
+    parser.add_argument('--json', type=Path, help="write the report as JSON to this file")
+    add_jobs_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+    if not 0 < args.threshold <= 1:
+        parser.error("--threshold must be in (0, 1]")
+
+    print("=" * 70)
+    print("🧬 Near-Duplicate Content Detector (MinHash + LSH)")
+    print("=" * 70)
+
+    with stage('page index'):
+        index = open_index(BASE_DIR, args.jobs)
+        records = [record for record in index.records(sections=args.section) if not is_noindex(record.robots)]
+
+    with stage('find duplicates'):
+        report = find_duplicates(records, load_corpus(BASE_DIR), args.threshold, args.jobs,
+                                 min_shingles=args.min_shingles)
+
+    print(f"Pages compared: {report['pages']} ({report['computed']} signature(s) computed this run)")
+    print(f"LSH: {report['bands']} bands x {report['rows']} rows, {report['candidates']} candidate pair(s), "
+          f"{report['pairs']} at or above {args.threshold:.0%}")
+    for error in report['errors']:
+        print(f"❌ {error}")
+
+    clusters = report['clusters']
+    if not clusters:
+        print("\n✅ No near-duplicate pages")
+    for number, cluster in enumerate(clusters, 1):
+        print(f"\n🔁 Cluster {number}: {len(cluster['pages'])} pages, up to {cluster['max_jaccard']:.0%} similar, "
+              f"{cluster['max_overlap']:.0%} overlap")
+        for pair in cluster['pairs']:
+            print(f"   {pair['jaccard']:>5.0%} similar  {pair['overlap']:>5.0%} overlap  {pair['a']}")
+            print(f"   {'':<26}{pair['b']}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"\n📄 Report: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
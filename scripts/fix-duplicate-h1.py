@@ -4,15 +4,16 @@ Fix duplicate H1 tags in article pages.
 Replaces <h1>Wiki</h1> in sidebar with <span class="sidebar-logo-text">Wiki</span>
 """
 
-import os
-import re
-from pathlib import Path
+from site_corpus import BASE_DIR, CATEGORY_SECTIONS, load_corpus
+from site_manifest import manifest_from_argv
+from site_parallel import jobs_from_argv, map_pages
+from site_pipeline import register_transform
+from site_profile import profile_from_argv
 
-def fix_h1_in_file(file_path):
+def fix_h1_in_file(page):
     """Fix duplicate H1 tag in a single HTML file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = page.content
         
         # Check if file has the problematic H1 in sidebar
         # Pattern: <h1>Wiki</h1> within the sidebar logo section
@@ -25,8 +26,7 @@ def fix_h1_in_file(file_path):
             
             if fixed_content != original_content:
                 # Write fixed content
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(fixed_content)
+                page.write(fixed_content)
                 
                 return True, "Fixed H1"
             else:
@@ -37,28 +37,23 @@ def fix_h1_in_file(file_path):
     except Exception as e:
         return False, f"Error: {str(e)}"
 
-def process_directory(base_dir):
-    """Process all HTML files in a directory recursively."""
-    html_files = []
-    
-    # Find all index.html files recursively
-    for root, dirs, files in os.walk(base_dir):
-        for file in files:
-            if file.endswith('.html'):
-                html_files.append(os.path.join(root, file))
-    
-    return html_files
+@register_transform('h1-fix', lambda page: page.section in CATEGORY_SECTIONS)
+def h1_fix_transform(page):
+    """Pipeline stage: demote the sidebar <h1>Wiki</h1>"""
+    success, message = fix_h1_in_file(page)
+    if "Error" in message:
+        print(f"✗ ERROR: {page.rel_path} - {message}")
+    return success
 
 def main():
     """Main function to fix H1 tags in all article pages."""
-    base_path = Path(r"c:\Users\MOINAK\OneDrive\PROJECTS\WIKI TAPNEX")
+    profile_from_argv(__file__)
+    corpus = load_corpus(BASE_DIR)
+    jobs = jobs_from_argv()
+    manifest = manifest_from_argv(__file__)
     
     # Directories to process
-    directories = [
-        base_path / "EVENT-MANAGEMENT",
-        base_path / "MARKETING",
-        base_path / "TECHNOLOGY"
-    ]
+    directories = [BASE_DIR / section for section in CATEGORY_SECTIONS]
     
     total_files = 0
     fixed_count = 0
@@ -75,26 +70,29 @@ def main():
         print(f"\nProcessing: {directory.name}/")
         print("-" * 70)
         
-        html_files = process_directory(directory)
+        html_files = corpus.pages(directory.name)
         dir_fixed = 0
         
-        for file_path in html_files:
+        results = map_pages(fix_h1_in_file, html_files, jobs,
+                            on_error=lambda message: (False, f"Error: {message}"),
+                            manifest=manifest)
+        for page, result in zip(html_files, results):
             total_files += 1
-            success, message = fix_h1_in_file(file_path)
+            success, message = result['value']
             
             if success:
                 fixed_count += 1
                 dir_fixed += 1
-                # Get relative path for display
-                rel_path = Path(file_path).relative_to(base_path)
-                print(f"✓ FIXED: {rel_path}")
+                print(f"✓ FIXED: {page.rel_path}")
             elif "Error" in message:
                 error_count += 1
-                rel_path = Path(file_path).relative_to(base_path)
-                print(f"✗ ERROR: {rel_path} - {message}")
+                print(f"✗ ERROR: {page.rel_path} - {message}")
         
         print(f"  → Fixed {dir_fixed} files in {directory.name}/")
     
+    if manifest:
+        manifest.save()
+    
     print("\n" + "=" * 70)
     print(f"\nSummary:")
     print(f"  Total HTML files scanned: {total_files}")
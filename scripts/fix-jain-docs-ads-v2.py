@@ -4,9 +4,13 @@ Fix AdSense ad placement in Jain Docs pages - Version 2.
 This script properly places all ads within the article entry-content div.
 """
 
-import os
 import re
-from pathlib import Path
+
+from site_ads import find_ad_blocks, remove_ad_blocks
+from site_corpus import BASE_DIR, load_corpus
+from site_manifest import manifest_from_argv
+from site_parallel import jobs_from_argv, map_pages
+from site_profile import profile_from_argv
 
 def fix_html_structure_v2(content):
     """
@@ -14,11 +18,11 @@ def fix_html_structure_v2(content):
     """
     
     # Find all ad blocks in the content
-    ad_pattern = r'<!-- AdSense.*?</script>\s*</div>'
-    ads = re.findall(ad_pattern, content, re.DOTALL)
+    ad_blocks = find_ad_blocks(content, require_comment=True)
+    ads = [block.text(content) for block in ad_blocks]
     
     # Remove all ad blocks from the content temporarily
-    content_without_ads = re.sub(ad_pattern, '', content, flags=re.DOTALL)
+    content_without_ads = remove_ad_blocks(content, ad_blocks)
     
     # Find the closing tag of entry-content div that comes before </article>
     # We need to place ads just before these closing tags
@@ -44,11 +48,10 @@ def fix_html_structure_v2(content):
     
     return content
 
-def process_file_v2(file_path):
+def process_file_v2(page):
     """Process a single HTML file - version 2."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = page.content
         
         # Check if file has ads and article structure
         if 'AdSense' in content and '<article>' in content:
@@ -56,9 +59,8 @@ def process_file_v2(file_path):
             fixed_content = fix_html_structure_v2(content)
             
             if fixed_content != original_content:
-                # Write fixed content (backup already exists from v1)
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(fixed_content)
+                # Write fixed content (the original is kept in the rollback journal)
+                page.write(fixed_content)
                 
                 return True, "Fixed v2"
             else:
@@ -71,13 +73,14 @@ def process_file_v2(file_path):
 
 def main():
     """Main function to process all Jain Docs pages."""
-    base_dir = Path(r"c:\Users\MOINAK\OneDrive\PROJECTS\WIKI TAPNEX\Jain Docs\Pages")
+    profile_from_argv(__file__)
+    base_dir = BASE_DIR / "Jain Docs" / "Pages"
     
     if not base_dir.exists():
         print(f"Directory not found: {base_dir}")
         return
     
-    html_files = list(base_dir.glob("*.html"))
+    html_files = load_corpus(BASE_DIR).jain_docs_pages()
     total_files = len(html_files)
     fixed_count = 0
     error_count = 0
@@ -85,18 +88,25 @@ def main():
     print(f"Version 2: Processing {total_files} HTML files...")
     print("-" * 60)
     
-    for i, file_path in enumerate(html_files, 1):
-        success, message = process_file_v2(file_path)
+    manifest = manifest_from_argv(__file__)
+    results = map_pages(process_file_v2, html_files, jobs_from_argv(),
+                        on_error=lambda message: (False, f"Error v2: {message}"),
+                        manifest=manifest)
+    for i, (page, result) in enumerate(zip(html_files, results), 1):
+        success, message = result['value']
         
         if success:
             fixed_count += 1
             status = "✓ FIXED V2"
             if i % 10 == 0 or success:
-                print(f"[{i}/{total_files}] {status}: {file_path.name}")
+                print(f"[{i}/{total_files}] {status}: {page.name}")
         elif "Error" in message:
             error_count += 1
             status = "✗ ERROR V2"
-            print(f"[{i}/{total_files}] {status}: {file_path.name}")
+            print(f"[{i}/{total_files}] {status}: {page.name}")
+    
+    if manifest:
+        manifest.save()
     
     print("-" * 60)
     print(f"\nVersion 2 Summary:")
@@ -4,77 +4,165 @@ Fix AdSense ad placement in Jain Docs pages.
 This script restructures the HTML to properly place ads within the article content area.
 """
 
-import os
-import re
-from pathlib import Path
+from site_ads import find_ad_blocks
+from site_corpus import BASE_DIR, load_corpus
+from site_manifest import manifest_from_argv
+from site_parallel import jobs_from_argv, map_pages
+from site_profile import profile_from_argv
 
-def fix_html_structure(content):
+# Malformed article opening with all divs on one line
+ARTICLE_OPENING = ('<article><div class="ast-post-format- single-layout-1"><header class="entry-header">'
+                   '<h1 class="entry-title" itemprop="headline">')
+ENTRY_CONTENT_OPENING = '</header><div class="entry-content clear"'
+ENTRY_CONTENT_ATTR = 'itemprop="text"'
+MALFORMED_CLOSE = '</div></div></div>'
+IN_CONTENT_AD_COMMENT = '<!-- AdSense - In-Content Ad -->'
+
+def skip_whitespace(content, pos):
+    """First index at or after pos that is not whitespace"""
+    while pos < len(content) and content[pos].isspace():
+        pos += 1
+    return pos
+
+def reformat_article_openings(content):
     """
-    Fix the HTML structure to properly place ads within the article content.
+    Rewrite every malformed one-line article opening (up to the first
+    </div></div></div>) with proper formatting, keeping the content div open.
     """
-    
-    # Pattern to match the malformed article opening with all divs on one line
-    # This captures the article opening tag through the entry-content div
-    article_pattern = r'<article><div class="ast-post-format- single-layout-1"><header class="entry-header"><h1 class="entry-title" itemprop="headline">(.*?)</h1>\s*</header><div class="entry-content clear"([^>]*)itemprop="text">(.*?)</div></div></div>'
-    
-    def replace_article(match):
-        h1_content = match.group(1)
-        entry_attrs = match.group(2)
-        content_start = match.group(3)
+    parts = []
+    position = 0
+    search_from = 0
+    while True:
+        start = content.find(ARTICLE_OPENING, search_from)
+        if start == -1:
+            break
+        search_from = start + 1
+        
+        h1_start = start + len(ARTICLE_OPENING)
+        h1_end = content.find('</h1>', h1_start)
+        if h1_end == -1:
+            break
+        entry_start = skip_whitespace(content, h1_end + len('</h1>'))
+        if not content.startswith(ENTRY_CONTENT_OPENING, entry_start):
+            continue
+        attrs_start = entry_start + len(ENTRY_CONTENT_OPENING)
+        tag_end = content.find('>', attrs_start)
+        if tag_end == -1 or not content.endswith(ENTRY_CONTENT_ATTR, attrs_start, tag_end):
+            continue
+        body_end = content.find(MALFORMED_CLOSE, tag_end + 1)
+        if body_end == -1:
+            break
+        
+        h1_content = content[h1_start:h1_end]
+        entry_attrs = content[attrs_start:tag_end - len(ENTRY_CONTENT_ATTR)]
+        content_start = content[tag_end + 1:body_end]
         
         # Reconstruct with proper formatting and keep the content div open
-        new_structure = f'''<article>
+        parts.append(content[position:start])
+        parts.append(f'''<article>
     <div class="ast-post-format- single-layout-1">
         <header class="entry-header">
             <h1 class="entry-title" itemprop="headline">{h1_content}</h1>
         </header>
         <div class="entry-content clear"{entry_attrs}itemprop="text">
-{content_start}'''
-        
-        return new_structure
-    
-    # Apply the fix
-    fixed_content = re.sub(article_pattern, replace_article, content, flags=re.DOTALL)
-    
-    # Now we need to find where the ads are placed and move the first ad inside the content
-    # Find the position of the first AdSense ad block that's outside the article
-    
-    # Pattern to find ads that appear right after the malformed closing tags
-    ad_outside_pattern = r'(</div>)\s*\n\s*\n\s*(<!-- AdSense - In-Content Ad -->.*?</script>\s*</div>)'
-    
-    def move_ad_inside(match):
-        # Keep one closing div, move ad inside, then close remaining divs
-        ad_block = match.group(2)
-        return f'\n\n            {ad_block}\n        </div>\n    </div>\n</div>'
+{content_start}''')
+        position = search_from = body_end + len(MALFORMED_CLOSE)
     
-    fixed_content = re.sub(ad_outside_pattern, move_ad_inside, fixed_content, count=1, flags=re.DOTALL)
-    
-    # Now handle the remaining ads that are outside the article tag
-    # These should be moved inside the article, before the closing article tag
+    parts.append(content[position:])
+    return ''.join(parts)
+
+def move_first_in_content_ad(content):
+    """
+    Move the first In-Content ad that sits after a closing </div> and a blank
+    line back inside the content: keep one closing div, then the ad, then
+    close the remaining divs.
+    """
+    for block in find_ad_blocks(content, require_comment=True):
+        if block.comment(content) != IN_CONTENT_AD_COMMENT:
+            continue
+        gap_start = block.start
+        while gap_start > 0 and content[gap_start - 1].isspace():
+            gap_start -= 1
+        if content[gap_start:block.start].count('\n') < 2 or not content.endswith('</div>', 0, gap_start):
+            continue
+        ad_block = block.text(content)
+        return (content[:gap_start - len('</div>')]
+                + f'\n\n            {ad_block}\n        </div>\n    </div>\n</div>'
+                + content[block.end:])
+    return content
+
+def move_ads_after_article(content):
+    """Move AdSense blocks that directly follow </article> to before it"""
+    blocks_by_start = {block.start: block for block in find_ad_blocks(content, require_comment=True)}
+    
+    # Every </article> followed only by whitespace and ad blocks
+    spans = []
+    article_end = content.find('</article>')
+    while article_end != -1:
+        ads_start = skip_whitespace(content, article_end + len('</article>'))
+        ads_end = ads_start
+        while ads_end in blocks_by_start:
+            ads_end = skip_whitespace(content, blocks_by_start[ads_end].end)
+        if ads_end != ads_start:
+            spans.append((article_end, ads_start, ads_end))
+        article_end = content.find('</article>', max(ads_end, article_end + 1))
+    
+    if not spans:
+        return content
+    ads_blocks = content[spans[0][1]:spans[0][2]]
+    
+    # Remove ads from after article
+    parts = []
+    position = 0
+    for article_end, _, ads_end in spans:
+        parts.append(content[position:article_end])
+        parts.append('</article>')
+        position = ads_end
+    parts.append(content[position:])
+    content = ''.join(parts)
+    
+    # Add ads before the first </div> </div> </article> sequence
+    article_end = content.find('</article>')
+    while article_end != -1:
+        position = article_end
+        for _ in range(2):
+            while position > 0 and content[position - 1].isspace():
+                position -= 1
+            if not content.endswith('</div>', 0, position):
+                break
+            position -= len('</div>')
+        else:
+            while position > 0 and content[position - 1].isspace():
+                position -= 1
+            return (content[:position]
+                    + f'\n\n{ads_blocks}\n        </div>\n    </div>\n</article>'
+                    + content[article_end + len('</article>'):])
+        article_end = content.find('</article>', article_end + 1)
+    return content
+
+def fix_html_structure(content):
+    """
+    Fix the HTML structure to properly place ads within the article content.
+    Every step is a forward scan for fixed markers, so large pages with
+    malformed markup cannot make it backtrack.
+    """
     
-    # Find where </article> is and move ads before it
-    article_end_pattern = r'\s*</article>'
+    # Reformat the malformed article opening
+    fixed_content = reformat_article_openings(content)
     
-    # Find all ad blocks that come after </article>
-    ads_after_article_pattern = r'</article>\s*((?:<!-- AdSense.*?</div>\s*)+)'
+    # Move the first In-Content ad that ended up outside the content div
+    fixed_content = move_first_in_content_ad(fixed_content)
     
-    match = re.search(ads_after_article_pattern, fixed_content, re.DOTALL)
-    if match:
-        ads_blocks = match.group(1)
-        # Remove ads from after article
-        fixed_content = re.sub(ads_after_article_pattern, '</article>', fixed_content, flags=re.DOTALL)
-        # Add ads before </article>
-        fixed_content = re.sub(r'(\s*</div>\s*</div>\s*</article>)', 
-                               f'\n\n{ads_blocks}\n        </div>\n    </div>\n</article>', 
-                               fixed_content, count=1)
+    # Move the remaining ads that are outside the article tag inside it,
+    # before the closing article tag
+    fixed_content = move_ads_after_article(fixed_content)
     
     return fixed_content
 
-def process_file(file_path):
+def process_file(page):
     """Process a single HTML file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = page.content
         
         # Check if file has the problematic pattern
         if '<article><div class="ast-post-format- single-layout-1">' in content:
@@ -82,14 +170,8 @@ def process_file(file_path):
             fixed_content = fix_html_structure(content)
             
             if fixed_content != original_content:
-                # Backup original file
-                backup_path = str(file_path) + '.backup'
-                with open(backup_path, 'w', encoding='utf-8') as f:
-                    f.write(original_content)
-                
-                # Write fixed content
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(fixed_content)
+                # Write fixed content (the original is kept in the rollback journal)
+                page.write(fixed_content)
                 
                 return True, "Fixed"
             else:
@@ -102,13 +184,14 @@ def process_file(file_path):
 
 def main():
     """Main function to process all Jain Docs pages."""
-    base_dir = Path(r"c:\Users\MOINAK\OneDrive\PROJECTS\WIKI TAPNEX\Jain Docs\Pages")
+    profile_from_argv(__file__)
+    base_dir = BASE_DIR / "Jain Docs" / "Pages"
     
     if not base_dir.exists():
         print(f"Directory not found: {base_dir}")
         return
     
-    html_files = list(base_dir.glob("*.html"))
+    html_files = load_corpus(BASE_DIR).jain_docs_pages()
     total_files = len(html_files)
     fixed_count = 0
     error_count = 0
@@ -116,8 +199,12 @@ def main():
     print(f"Found {total_files} HTML files to process...")
     print("-" * 60)
     
-    for i, file_path in enumerate(html_files, 1):
-        success, message = process_file(file_path)
+    manifest = manifest_from_argv(__file__)
+    results = map_pages(process_file, html_files, jobs_from_argv(),
+                        on_error=lambda message: (False, f"Error: {message}"),
+                        manifest=manifest)
+    for i, (page, result) in enumerate(zip(html_files, results), 1):
+        success, message = result['value']
         
         if success:
             fixed_count += 1
@@ -129,7 +216,10 @@ def main():
             status = "- SKIP"
         
         if i % 10 == 0 or success or "Error" in message:
-            print(f"[{i}/{total_files}] {status}: {file_path.name}")
+            print(f"[{i}/{total_files}] {status}: {page.name}")
+    
+    if manifest:
+        manifest.save()
     
     print("-" * 60)
     print(f"\nSummary:")
@@ -137,7 +227,7 @@ def main():
     print(f"  Fixed: {fixed_count}")
     print(f"  Skipped: {total_files - fixed_count - error_count}")
     print(f"  Errors: {error_count}")
-    print(f"\nBackup files created with .backup extension")
+    print(f"\nOriginals kept in the journal; undo with: python3 scripts/manage-journal.py rollback")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Generate sitemap.xml and the per-section sitemaps from the pages on disk.
+
+The pages come from the page index (see site_index.py), so the tree is
+walked once and only changed pages are re-read. URLs follow the cleanUrls
+and trailingSlash settings of vercel.json (see site_urls.py), pages with a
+robots noindex meta tag are left out, and a page's lastmod only moves when
+its content hash changes. A page seen for the first time gets the date of
+its last commit (see site_dates.py).
+
+A sitemap holding more than 50,000 URLs or 50 MB is split into numbered
+parts. The sitemap index always lists every file that was written.
+
+Usage:
+    python3 scripts/generate-sitemaps.py
+    python3 scripts/generate-sitemaps.py --dry-run
+    python3 scripts/generate-sitemaps.py --gzip
+    python3 scripts/generate-sitemaps.py --output dist
+"""
+
+import argparse
+import gzip
+import json
+import os
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+from site_corpus import BASE_DIR, BASE_URL, CACHE_DIR, ROOT_SECTION, write_bytes
+from site_dates import git_dates
+from site_index import open_index
+from site_journal import record_write
+from site_parallel import add_jobs_argument
+from site_profile import add_profile_arguments, profile_from_args, stage
+from site_urls import load_url_rules, page_url
+
+STATE_PATH = CACHE_DIR / 'sitemap-state.json'
+
+# Sitemap protocol limits per file
+MAX_URLS = 50_000
+MAX_BYTES = 50 * 1024 * 1024
+
+# Sitemaps in index order: the sections they cover and their defaults
+SITEMAPS = {
+    'core': {'sections': [ROOT_SECTION], 'changefreq': 'monthly', 'priority': '0.5'},
+    'marketing': {'sections': ['MARKETING'], 'changefreq': 'weekly', 'priority': '0.8'},
+    'technology': {'sections': ['TECHNOLOGY'], 'changefreq': 'weekly', 'priority': '0.8'},
+    'tools': {'sections': ['TOOLS'], 'changefreq': 'monthly', 'priority': '0.7'},
+    'jain-docs': {'sections': ['Jain Docs'], 'changefreq': 'monthly', 'priority': '0.8'},
+    'event-management': {'sections': ['EVENT-MANAGEMENT'], 'changefreq': 'monthly', 'priority': '0.8'},
+    'bhakti': {'sections': ['bhakti'], 'changefreq': 'monthly', 'priority': '0.7'},
+    'articles': {'sections': ['article'], 'changefreq': 'monthly', 'priority': '0.8'},
+    'hindi-articles': {'sections': ['hindi_article'], 'changefreq': 'monthly', 'priority': '0.8'},
+}
+
+# Pages that differ from their sitemap's defaults: (changefreq, priority)
+PAGE_SETTINGS = {
+    'index.html': ('weekly', '1.0'),
+    'getting-started.html': ('weekly', '0.9'),
+    'tools.html': ('monthly', '0.8'),
+    'privacy-policy.html': ('yearly', '0.5'),
+    'terms-of-service.html': ('yearly', '0.5'),
+}
+
+# Section landing pages (<section>/index.html)
+LANDING_SETTINGS = ('weekly', '0.9')
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = '</urlset>\n'
+INDEX_OPEN = '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+INDEX_CLOSE = '</sitemapindex>\n'
+
+
+def is_noindex(robots: Optional[str]) -> bool:
+    return bool(robots) and 'noindex' in robots.lower()
+
+
+def page_settings(record, sitemap: Dict[str, object]):
+    """(changefreq, priority) of one page"""
+    if record.rel_path in PAGE_SETTINGS:
+        return PAGE_SETTINGS[record.rel_path]
+    if record.rel_path == f"{record.section}/index.html":
+        return LANDING_SETTINGS
+    return sitemap['changefreq'], sitemap['priority']
+
+
+class LastmodState:
+    """Content hash and lastmod of every page the sitemaps listed last time"""
+
+    def __init__(self, path: Path = STATE_PATH):
+        self.path = Path(path)
+        self.pages: Dict[str, Dict[str, str]] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.pages = json.load(f).get('pages', {})
+        except (OSError, ValueError):
+            pass
+        self.changed = 0
+
+    def lastmod(self, rel_path: str, sha256: str, today: str) -> str:
+        """Unchanged pages keep their lastmod; changed ones get today's, new ones their last commit's"""
+        entry = self.pages.get(rel_path)
+        if entry is not None and entry['sha256'] == sha256:
+            return entry['lastmod']
+        if entry is not None:
+            lastmod = today
+        else:
+            lastmod = git_dates().modified(rel_path) or today
+        self.pages[rel_path] = {'sha256': sha256, 'lastmod': lastmod}
+        self.changed += 1
+        return lastmod
+
+    def forget_except(self, rel_paths) -> None:
+        """Drop the pages that are no longer listed"""
+        keep = set(rel_paths)
+        self.pages = {path: entry for path, entry in self.pages.items() if path in keep}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'pages': self.pages}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def url_entry(loc: str, lastmod: str, changefreq: str, priority: str) -> str:
+    return (
+        "    <url>\n"
+        f"        <loc>{escape(loc)}</loc>\n"
+        f"        <lastmod>{lastmod}</lastmod>\n"
+        f"        <changefreq>{changefreq}</changefreq>\n"
+        f"        <priority>{priority}</priority>\n"
+        "    </url>\n"
+    )
+
+
+def split_entries(entries: List[str]) -> List[List[str]]:
+    """Group url entries into files within the URL count and size limits"""
+    overhead = len((XML_HEADER + URLSET_OPEN + URLSET_CLOSE).encode('utf-8'))
+    parts: List[List[str]] = [[]]
+    size = overhead
+    for entry in entries:
+        entry_size = len(entry.encode('utf-8'))
+        if parts[-1] and (len(parts[-1]) >= MAX_URLS or size + entry_size > MAX_BYTES):
+            parts.append([])
+            size = overhead
+        parts[-1].append(entry)
+        size += entry_size
+    return parts
+
+
+def sitemap_files(name: str, parts: List[List[str]], use_gzip: bool) -> List[str]:
+    """File names of a sitemap's parts"""
+    suffix = '.xml.gz' if use_gzip else '.xml'
+    if len(parts) == 1:
+        return [f"sitemap-{name}{suffix}"]
+    return [f"sitemap-{name}-{number}{suffix}" for number in range(1, len(parts) + 1)]
+
+
+def write_file(path: Path, data: bytes, dry_run: bool) -> bool:
+    """Write data unless the file already holds it; returns True when it changed"""
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    if not dry_run:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_bytes(path, data)
+    return True
+
+
+def encode_file(text: str, use_gzip: bool) -> bytes:
+    data = text.encode('utf-8')
+    return gzip.compress(data, mtime=0) if use_gzip else data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the sitemap index and the per-section sitemaps")
+    parser.add_argument('--output', type=Path, default=BASE_DIR, help="folder to write to (default: the site root)")
+    parser.add_argument('--base-url', default=BASE_URL, help=f"site URL (default: {BASE_URL})")
+    parser.add_argument('--gzip', action='store_true', help="write the section sitemaps as .xml.gz")
+    parser.add_argument('--dry-run', action='store_true', help="report what would change without writing")
+    add_jobs_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    print("=" * 70)
+    print("🗺️  Sitemap Generator")
+    print("=" * 70)
+
+    rules = load_url_rules(BASE_DIR)
+    print(f"URL rules: cleanUrls={rules.clean_urls}, trailingSlash={rules.trailing_slash}")
+
+    index = open_index(BASE_DIR, args.jobs)
+    records = index.records()
+    index.close()
+
+    state = LastmodState()
+    today = date.today().isoformat()
+    section_sitemap = {section: name for name, sitemap in SITEMAPS.items() for section in sitemap['sections']}
+
+    entries: Dict[str, List[str]] = {name: [] for name in SITEMAPS}
+    lastmods: Dict[str, str] = {}
+    listed = []
+    skipped_noindex = []
+    unmapped: Dict[str, int] = {}
+
+    with stage('collect urls'):
+        for record in records:
+            name = section_sitemap.get(record.section)
+            if name is None:
+                unmapped[record.section] = unmapped.get(record.section, 0) + 1
+                continue
+            if is_noindex(record.robots):
+                skipped_noindex.append(record.rel_path)
+                continue
+            lastmod = state.lastmod(record.rel_path, record.sha256, today)
+            changefreq, priority = page_settings(record, SITEMAPS[name])
+            entries[name].append(url_entry(page_url(record.rel_path, rules, args.base_url),
+                                           lastmod, changefreq, priority))
+            lastmods[name] = max(lastmods.get(name, lastmod), lastmod)
+            listed.append(record.rel_path)
+
+    written = []
+    index_entries = []
+    with stage('write sitemaps'):
+        for name, urls in entries.items():
+            if not urls:
+                continue
+            parts = split_entries(urls)
+            for filename, part in zip(sitemap_files(name, parts, args.gzip), parts):
+                text = XML_HEADER + URLSET_OPEN + ''.join(part) + URLSET_CLOSE
+                if write_file(args.output / filename, encode_file(text, args.gzip), args.dry_run):
+                    written.append(filename)
+                index_entries.append(
+                    "    <sitemap>\n"
+                    f"        <loc>{escape(args.base_url.rstrip('/'))}/{filename}</loc>\n"
+                    f"        <lastmod>{lastmods[name]}</lastmod>\n"
+                    "    </sitemap>\n"
+                )
+            print(f"   {name:<18} {len(urls):>6} URLs in {len(parts)} file{'s' if len(parts) > 1 else ''}")
+
+        text = XML_HEADER + INDEX_OPEN + ''.join(index_entries) + INDEX_CLOSE
+        if write_file(args.output / 'sitemap.xml', text.encode('utf-8'), args.dry_run):
+            written.append('sitemap.xml')
+
+        # Parts and formats of earlier runs that are not in the index any more
+        current = {entry.split('<loc>')[1].split('</loc>')[0].rsplit('/', 1)[1] for entry in index_entries}
+        stale = [path for path in sorted(args.output.glob('sitemap-*.xml*')) if path.name not in current]
+        for path in stale:
+            if not args.dry_run:
+                record_write(path, None)
+                path.unlink()
+
+    if not args.dry_run:
+        state.forget_except(listed)
+        state.save()
+
+    print(f"\n   📁 Pages listed: {len(listed)}")
+    print(f"   🕒 New or changed since the last run: {state.changed}")
+    for rel_path in skipped_noindex:
+        print(f"   ⏭️  noindex, left out: {rel_path}")
+    for section, count in unmapped.items():
+        print(f"   ⚠️  {section}: {count} page(s) in no sitemap (add the section to SITEMAPS)")
+    verb = "Would write" if args.dry_run else "Wrote"
+    for filename in written:
+        print(f"   ✅ {verb}: {filename}")
+    for path in stale:
+        print(f"   🗑️  {'Would remove' if args.dry_run else 'Removed'}: {path.name}")
+    if not written and not stale:
+        print("   ✅ Sitemaps are up to date")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic copy of the site for benchmarking the maintenance scripts.
+
+Pages are cloned from the real page templates in the mix the site has today:
+category articles (EVENT-MANAGEMENT, MARKETING, TECHNOLOGY), Jain Docs pages
+and TOOLS pages, plus the section landing pages. Every clone gets its own
+folder or file name, title and canonical URL, and every Jain Docs page carries
+four ad blocks spread through the article.
+
+The site is written to .site-cache/synthetic/<pages>-pages (ignored by git)
+and reused while the generator and the templates are unchanged.
+
+Usage:
+    python3 scripts/generate-synthetic-site.py 10000
+    python3 scripts/generate-synthetic-site.py 100000 --output /tmp/site --force
+"""
+
+import argparse
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from site_ads import find_ad_blocks, remove_ad_blocks
+from site_corpus import BASE_DIR, CACHE_DIR, CATEGORY_SECTIONS, Corpus, Page, load_corpus, write_text
+from site_manifest import source_version
+from site_pipeline import load_script
+from site_profile import add_profile_arguments, profile_from_args
+
+SYNTHETIC_DIR = CACHE_DIR / 'synthetic'
+MARKER_FILE = 'synthetic-site.json'
+
+# Ad blocks in every synthetic Jain Docs page
+JAIN_DOCS_ADS_PER_PAGE = 4
+
+# Landing pages copied once, unchanged
+FIXED_PAGES = ['index.html', 'Jain Docs/index.html', 'TOOLS/index.html'] + [
+    f"{section}/index.html" for section in CATEGORY_SECTIONS
+]
+
+
+def template_pages(corpus: Corpus) -> Dict[str, List[Page]]:
+    """Real pages to clone, by kind"""
+    return {
+        'category': [page for section in CATEGORY_SECTIONS for page in corpus.subfolder_pages(section)],
+        'jain-docs': corpus.jain_docs_pages(),
+        'tools': corpus.subfolder_pages('TOOLS'),
+    }
+
+
+def page_counts(total: int, templates: Dict[str, List[Page]]) -> Dict[str, int]:
+    """Clones per kind so that the mix of kinds matches the real site"""
+    available = max(total - len(FIXED_PAGES), 0)
+    template_total = sum(len(pages) for pages in templates.values())
+    counts = {kind: available * len(pages) // template_total for kind, pages in templates.items()}
+    # The rounding remainder goes to the largest kind
+    largest = max(templates, key=lambda kind: len(templates[kind]))
+    counts[largest] += available - sum(counts.values())
+    return counts
+
+
+def rename_page(content: str, page: Page, number: int) -> str:
+    """Give a clone its own title and canonical URL"""
+    suffix = f"{number:06d}"
+    content = content.replace('</title>', f" {suffix}</title>", 1)
+    canonical = page.canonical
+    if canonical:
+        trailing = '/' if canonical.endswith('/') else ''
+        content = content.replace(canonical, f"{canonical.rstrip('/')}-{suffix}{trailing}")
+    return content
+
+
+def spread_ads(content: str, ad_block: str, count: int) -> str:
+    """Replace the page's ads with count copies of ad_block spread over the article"""
+    content = remove_ad_blocks(content, find_ad_blocks(content), leading_whitespace=True)
+
+    article_start = content.find('<article')
+    article_end = content.find('</article>', article_start)
+    if article_start == -1 or article_end == -1:
+        return content
+
+    # Paragraph ends inside the article are the insertion points
+    paragraph_ends = []
+    position = content.find('</p>', article_start, article_end)
+    while position != -1:
+        paragraph_ends.append(position + len('</p>'))
+        position = content.find('</p>', position + 1, article_end)
+
+    slots = []
+    for i in range(count):
+        if len(paragraph_ends) >= count:
+            slots.append(paragraph_ends[(i + 1) * len(paragraph_ends) // (count + 1)])
+        else:
+            slots.append(article_end)
+
+    parts = []
+    previous = 0
+    for slot in slots:
+        parts.append(content[previous:slot])
+        parts.append(f"\n{ad_block}\n")
+        previous = slot
+    parts.append(content[previous:])
+    return ''.join(parts)
+
+
+def clone_path(page: Page, kind: str, number: int) -> str:
+    """Relative path of a clone of page"""
+    suffix = f"{number:06d}"
+    if kind == 'jain-docs':
+        return f"Jain Docs/Pages/{page.path.stem} {suffix}.html"
+    return f"{page.section}/{page.subfolder}-{suffix}/index.html"
+
+
+def generator_version(corpus: Corpus) -> str:
+    """Version of the generator and of the templates it clones"""
+    templates = ','.join(
+        f"{page.rel_path}:{page.path.stat().st_mtime_ns}"
+        for pages in template_pages(corpus).values() for page in pages
+    )
+    return source_version([Path(__file__).resolve()], templates)
+
+
+def generate_site(
+    total: int,
+    out_dir: Optional[Path] = None,
+    force: bool = False,
+    corpus: Optional[Corpus] = None
+) -> Path:
+    """Write a synthetic site of about total pages and return its root directory"""
+    corpus = corpus or load_corpus(BASE_DIR)
+    out_dir = Path(out_dir) if out_dir else SYNTHETIC_DIR / f"{total}-pages"
+    marker_path = out_dir / MARKER_FILE
+    version = generator_version(corpus)
+
+    if not force and marker_path.exists():
+        marker = json.loads(marker_path.read_text(encoding='utf-8'))
+        if marker.get('version') == version and marker.get('pages') == total:
+            return out_dir
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+
+    ad_block = load_script('add-ads-to-pages.py').JAIN_DOCS_AD_BLOCK.strip('\n')
+    templates = template_pages(corpus)
+    counts = page_counts(total, templates)
+    written = 0
+
+    for rel_path in FIXED_PAGES:
+        page = corpus.get(rel_path)
+        if page is not None:
+            target = out_dir / rel_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            write_text(target, page.content)
+            written += 1
+
+    for kind, pages in templates.items():
+        for number in range(counts[kind]):
+            page = pages[number % len(pages)]
+            content = rename_page(page.content, page, number)
+            if kind == 'jain-docs':
+                content = spread_ads(content, ad_block, JAIN_DOCS_ADS_PER_PAGE)
+            target = out_dir / clone_path(page, kind, number)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            write_text(target, content)
+            written += 1
+
+    marker = {'pages': total, 'written': written, 'counts': counts, 'version': version}
+    marker_path.write_text(json.dumps(marker, indent=2), encoding='utf-8')
+    return out_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic site for benchmarking")
+    parser.add_argument('pages', type=int, help="number of pages (the real site has about 425)")
+    parser.add_argument('--output', type=Path, help=f"target directory (default: {SYNTHETIC_DIR}/<pages>-pages)")
+    parser.add_argument('--force', action='store_true', help="regenerate even if an up-to-date copy exists")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    print("=" * 70)
+    print("🏗️  Synthetic Site Generator")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    out_dir = generate_site(args.pages, args.output, args.force)
+    marker = json.loads((out_dir / MARKER_FILE).read_text(encoding='utf-8'))
+
+    print(f"📁 {out_dir}")
+    print(f"   Pages: {marker['written']}")
+    for kind, count in marker['counts'].items():
+        print(f"   {kind}: {count}")
+    print(f"\n✅ Ready in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,11 @@
 Helper script to generate Rich Results Test URLs for breadcrumb validation
 """
 
-from pathlib import Path
 from urllib.parse import quote
 
-BASE_DIR = Path(__file__).parent.parent
+from site_corpus import BASE_DIR, load_corpus
+from site_profile import profile_from_argv
+
 FOLDERS_TO_PROCESS = ['EVENT-MANAGEMENT', 'MARKETING', 'TECHNOLOGY']
 
 def generate_test_urls():
@@ -18,6 +19,7 @@ def generate_test_urls():
     print("\nUse these URLs to test your breadcrumb implementation:\n")
     
     all_urls = []
+    corpus = load_corpus(BASE_DIR)
     
     for category in FOLDERS_TO_PROCESS:
         category_path = BASE_DIR / category
@@ -29,22 +31,18 @@ def generate_test_urls():
         print(f"📁 {category}")
         print(f"{'='*80}\n")
         
-        subfolders = sorted([f for f in category_path.iterdir() if f.is_dir()])
-        
-        for i, subfolder in enumerate(subfolders, 1):
-            index_file = subfolder / 'index.html'
-            if index_file.exists():
-                page_url = f"https://wiki.tapnex.tech/{category}/{subfolder.name}/"
-                all_urls.append(page_url)
-                
-                # Generate Rich Results Test URL
-                encoded_url = quote(page_url, safe='')
-                test_url = f"https://search.google.com/test/rich-results?url={encoded_url}"
-                
-                print(f"{i}. {subfolder.name}")
-                print(f"   Page URL: {page_url}")
-                print(f"   Test URL: {test_url}")
-                print()
+        for i, page in enumerate(corpus.subfolder_pages(category), 1):
+            page_url = f"https://wiki.tapnex.tech/{category}/{page.subfolder}/"
+            all_urls.append(page_url)
+            
+            # Generate Rich Results Test URL
+            encoded_url = quote(page_url, safe='')
+            test_url = f"https://search.google.com/test/rich-results?url={encoded_url}"
+            
+            print(f"{i}. {page.subfolder}")
+            print(f"   Page URL: {page_url}")
+            print(f"   Test URL: {test_url}")
+            print()
     
     print("=" * 80)
     print("📊 SUMMARY")
@@ -105,4 +103,5 @@ def generate_test_urls():
     print("\n" + "=" * 80)
 
 if __name__ == '__main__':
+    profile_from_argv(__file__)
     generate_test_urls()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Inline the above-the-fold CSS of each page and load the rest late, in dist/.
+
+A category article does not paint until the Google Fonts CSS and its three
+stylesheets have loaded. When build-dist.py copies a page into dist/, it
+works out which rules the first screen of the page needs (critical_page())
+and inlines them in a <style> element in <head>, then wraps the page's
+<link rel="stylesheet"> tags in a noscript block that a small script turns
+back into links loading with media="print" (which does not block rendering)
+and switching to their own media once loaded:
+
+    <style id="critical-css">:root{--sidebar-bg:#1e293b;...}</style>
+    <noscript class="deferred-css">
+    <link rel="stylesheet" href="/home.css">
+    <link rel="stylesheet" href="/styles/article-styles.css">
+    </noscript>
+    <script id="critical-css-loader">...</script>
+
+Without JavaScript the noscript block applies the links as before. Once
+loaded they apply in their original order: the inlined copies of their
+rules come first and never win over them, so the finished page looks
+exactly as before. The pages in the repository keep plain links to the
+stylesheets, so nothing goes stale when a stylesheet or a page is edited:
+the next build inlines from the current sources.
+
+The first screen of a page is its <body> up to FOLD_TEXT_CHARS characters
+of text, not counting the text of <nav> and <aside> (the sidebar and
+menus, shown in full from the start) and leaving out the footer and the
+modal dialogs (FOLD_SKIPPED_TAGS, FOLD_SKIPPED_CLASS_PATTERN), which the
+first screen never shows even when the page is short. The element types,
+ids and classes in that markup pick the critical rules of the local
+stylesheets the page links (site_styles.prune_stylesheet()), minified,
+without the @media blocks for print and speech and without the earlier
+copy of a rule two sheets both carry. Names scripts add later are left
+out: their rules arrive with the full sheets.
+
+Run on its own, the script reports what a build inlines per template.
+
+Usage:
+    python3 scripts/inline-critical-css.py --jobs 0
+    python3 scripts/build-dist.py              # inlines into dist/
+"""
+
+import argparse
+import gzip
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from site_corpus import BASE_DIR, Page, load_corpus, read_text
+from site_css import minify, parse_stylesheet
+from site_parallel import add_jobs_argument, map_pages
+from site_profile import add_profile_arguments, profile_from_args, stage
+from site_styles import IMPLIED_TYPES, Names, page_template, prune_stylesheet, source_names, stylesheet_links
+
+# Text of the first screen: about 25 lines of an article on a laptop, 30 on a phone
+FOLD_TEXT_CHARS = 1200
+# Elements whose text does not count towards the fold
+FOLD_EXEMPT_TAGS = {'nav', 'aside'}
+# Elements left out of the fold altogether: the footer and dialogs, and the legal modals
+FOLD_SKIPPED_TAGS = {'footer', 'dialog'}
+FOLD_SKIPPED_CLASS_PATTERN = re.compile(r'(?:^|\s)(?:[\w-]+-)?modal(?:\s|$)')
+
+CRITICAL_STYLE_ID = 'critical-css'
+DEFERRED_CLASS = 'deferred-css'
+LOADER_ID = 'critical-css-loader'
+LOADER_SCRIPT = (
+    "document.querySelectorAll('noscript." + DEFERRED_CLASS + "').forEach(function (noscript) {"
+    "var template = document.createElement('template'); template.innerHTML = noscript.textContent;"
+    "template.content.querySelectorAll('link').forEach(function (link) {"
+    "var media = link.media || 'all'; link.media = 'print'; link.onload = function () { link.media = media; };"
+    "noscript.parentNode.insertBefore(link, noscript); }); });"
+)
+
+BODY_START_PATTERN = re.compile(r'<body\b[^>]*>', re.IGNORECASE)
+HEAD_END_PATTERN = re.compile(r'</head\s*>', re.IGNORECASE)
+# Markup of the body, one comment, script/style element, tag or run of text at a time
+BODY_TOKEN_PATTERN = re.compile(
+    r'<!--.*?-->|<(script|style|template)\b.*?</\1\s*>|</?([A-Za-z][\w-]*)[^>]*>|[^<]+|<', re.IGNORECASE | re.DOTALL)
+CLASS_ATTRIBUTE_PATTERN = re.compile(r'''\bclass\s*=\s*(["'])(.*?)\1''', re.DOTALL)
+# @media queries that never apply on a screen
+NON_SCREEN_MEDIA_PATTERN = re.compile(r'^(?:only\s+)?(?:print|speech)\b|^not\s+(?:all|screen)\b', re.IGNORECASE)
+# url(...) of a stylesheet that is relative to the sheet
+RELATIVE_URL_PATTERN = re.compile(r"""url\(\s*(["']?)(?![a-z][\w+.-]*:|/|#|["'])""", re.IGNORECASE)
+
+# Critical CSS by site root, sheets and names above the fold, per process
+_CRITICAL_CSS: Dict[Tuple[object, ...], Tuple[str, int]] = {}
+
+
+def skipped_in_fold(tag: str, token: str) -> bool:
+    """Whether an opening tag starts an element the first screen does not show (see above)"""
+    if tag in FOLD_SKIPPED_TAGS:
+        return True
+    classes = CLASS_ATTRIBUTE_PATTERN.search(token)
+    return bool(classes and FOLD_SKIPPED_CLASS_PATTERN.search(classes.group(2)))
+
+
+def fold_markup(content: str) -> str:
+    """The markup of the body up to the fold, without the elements it skips (see above)"""
+    body = BODY_START_PATTERN.search(content)
+    if not body:
+        return ''
+    parts = [body.group(0)]
+    text = exempt = 0
+    # Tag name and nesting depth of the skipped element the scan is in
+    skipped, depth = None, 0
+    for match in BODY_TOKEN_PATTERN.finditer(content, body.end()):
+        token = match.group(0)
+        tag = (match.group(2) or '').lower()
+        closing = token.startswith('</')
+        if skipped:
+            if tag == skipped and not token.endswith('/>'):
+                depth += -1 if closing else 1
+                if depth == 0:
+                    skipped = None
+            continue
+        if tag and not closing and skipped_in_fold(tag, token):
+            if not token.endswith('/>'):
+                skipped, depth = tag, 1
+            continue
+        parts.append(token)
+        if tag in FOLD_EXEMPT_TAGS:
+            exempt += -1 if closing else 1
+        elif not token.startswith('<') and exempt <= 0:
+            text += len(' '.join(token.split()))
+            if text >= FOLD_TEXT_CHARS:
+                break
+    return ''.join(parts)
+
+
+def head_links(page: Page, content: str) -> List[Tuple[str, Optional[str]]]:
+    """(tag, local file relative to the site root) of the stylesheet links in <head>"""
+    head_end = HEAD_END_PATTERN.search(content)
+    head = content[:head_end.start()] if head_end else ''
+    return [(link.tag, link.path.relative_to(page.base_dir).as_posix() if link.path else None)
+            for link in stylesheet_links(page, content) if link.tag in head]
+
+
+def rebase_urls(css: str, rel_path: str) -> str:
+    """The sheet with its relative url()s made relative to the site root, for use in any page"""
+    directory = quote('/' + rel_path.rsplit('/', 1)[0] + '/' if '/' in rel_path else '/')
+    return RELATIVE_URL_PATTERN.sub(lambda match: match.group(0) + directory, css)
+
+
+def screen_media(prelude: str) -> bool:
+    """Whether an @media block can apply on a screen (not only in print or speech)"""
+    queries = prelude.split(' ', 1)[-1].split(',') if ' ' in prelude else ['all']
+    return any(not NON_SCREEN_MEDIA_PATTERN.match(query.strip()) for query in queries)
+
+
+def critical_css(base_dir: Path, sheets: Tuple[str, ...], names: Names) -> Tuple[str, int]:
+    """(minified critical rules of the sheets, bytes of the sheets)"""
+    statements = []
+    size = 0
+    for rel_path in sheets:
+        css = read_text(base_dir / rel_path)
+        size += len(css.encode('utf-8'))
+        pruned = rebase_urls(prune_stylesheet(css, names)[0], rel_path)
+        statements.extend(minify(statement.source) for statement in parse_stylesheet(pruned).statements
+                          if statement.at_name != 'media' or screen_media(statement.prelude))
+    # A statement repeated later (article-styles.css copies the ad styles) wins over its earlier copy anyway
+    last = {text: index for index, text in enumerate(statements)}
+    css = ''.join(text for index, text in enumerate(statements) if last[text] == index)
+    # Nothing in a stylesheet may end the <style> element early
+    return css.replace('</style', '<\\/style'), size
+
+
+def critical_page(page: Page, content: Optional[str] = None) -> Tuple[List[str], str, int]:
+    """(stylesheet link tags in <head>, critical CSS, bytes of the linked sheets) of a page"""
+    content = page.content if content is None else content
+    links = head_links(page, content)
+    fold = source_names(fold_markup(content))
+    sheets = tuple(path for _tag, path in links if path)
+    # Pages with the same sheets and the same names above the fold share their critical CSS
+    key = (str(page.base_dir), sheets, *(tuple(sorted(names)) for names in (fold.types, fold.ids, fold.classes)))
+    if key not in _CRITICAL_CSS:
+        fold.types.update(IMPLIED_TYPES)
+        _CRITICAL_CSS[key] = critical_css(page.base_dir, sheets, fold)
+    css, size = _CRITICAL_CSS[key]
+    return [tag for tag, _path in links], css, size
+
+
+def line_span(content: str, start: int, end: int) -> Optional[Tuple[int, int, str]]:
+    """(start, end, indentation) of the line holding content[start:end], if nothing else is on it"""
+    line_start = content.rfind('\n', 0, start) + 1
+    line_end = content.find('\n', end)
+    line_end = len(content) if line_end < 0 else line_end + 1
+    if content[line_start:start].strip() or content[end:line_end].strip():
+        return None
+    return line_start, line_end, content[line_start:start]
+
+
+def with_critical_css(content: str, tags: List[str], css: str) -> str:
+    """Page source with the critical rules inlined and the given link tags deferred (see above)"""
+    newline = '\r\n' if '\r\n' in content else '\n'
+    head_end = HEAD_END_PATTERN.search(content).start()
+    # Runs of links on consecutive lines of their own share a noscript block
+    runs: List[List[Tuple[int, int, str]]] = []
+    position = 0
+    for tag in tags:
+        start = content.index(tag, position, head_end)
+        position = start + len(tag)
+        span = line_span(content, start, position)
+        if span and runs and runs[-1][-1][2] is not None and runs[-1][-1][1] == span[0]:
+            runs[-1].append(span)
+        else:
+            runs.append([span if span else (start, position, None)])
+
+    parts = []
+    position = 0
+    for index, run in enumerate(runs):
+        start, end, indent = run[0][0], run[-1][1], run[0][2]
+        parts.append(content[position:start])
+        if indent is None:
+            if index == 0 and css:
+                parts.append(f'<style id="{CRITICAL_STYLE_ID}">{css}</style>')
+            parts.append(f'<noscript class="{DEFERRED_CLASS}">{content[start:end]}</noscript>')
+            if index == len(runs) - 1:
+                parts.append(f'<script id="{LOADER_ID}">{LOADER_SCRIPT}</script>')
+        else:
+            if index == 0 and css:
+                parts.append(f'{indent}<style id="{CRITICAL_STYLE_ID}">{css}</style>{newline}')
+            parts.append(f'{indent}<noscript class="{DEFERRED_CLASS}">{newline}{content[start:end]}'
+                         f'{indent}</noscript>{newline}')
+            if index == len(runs) - 1:
+                parts.append(f'{indent}<script id="{LOADER_ID}">{LOADER_SCRIPT}</script>{newline}')
+        position = end
+    parts.append(content[position:])
+    return ''.join(parts)
+
+
+def inline_critical_css(page: Page, content: Optional[str] = None) -> Tuple[str, int]:
+    """(page source with its critical CSS inlined, bytes inlined); pages of no template
+    (see site_styles.TEMPLATES) and pages without stylesheet links stay as they are"""
+    content = page.content if content is None else content
+    if not page_template(page):
+        return content, 0
+    tags, css, _size = critical_page(page, content)
+    if not tags:
+        return content, 0
+    return with_critical_css(content, tags, css), len(css.encode('utf-8'))
+
+
+def gzip_size(text: str) -> int:
+    return len(gzip.compress(text.encode('utf-8'), 9))
+
+
+def report_page(page: Page) -> Dict[str, object]:
+    """Template and critical CSS sizes of one page; runs in map_pages workers"""
+    tags, css, size = critical_page(page)
+    return {'template': page_template(page), 'linked': size if tags else 0,
+            'inlined': len(css.encode('utf-8')) if tags else 0, 'gzipped': gzip_size(css) if tags and css else 0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the above-the-fold CSS build-dist.py inlines per page")
+    add_jobs_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    print("=" * 70)
+    print("🎯 Critical CSS Inliner")
+    print("=" * 70)
+
+    pages = [page for page in load_corpus(BASE_DIR).pages() if page_template(page)]
+    totals: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    with stage('inline'):
+        for result in map_pages(report_page, pages, args.jobs, echo=False):
+            if result['status'] == 'error':
+                print(f"   ❌ {result['path']}: {result['message']}")
+                continue
+            value = result['value']
+            row = totals[value['template']]
+            row[0] += 1
+            row[1] += value['linked']
+            row[2] += value['inlined']
+            row[3] += value['gzipped']
+
+    print(f"\n{'template':<11} {'pages':>5} {'linked CSS':>11} {'inlined':>9} {'gzipped':>8}   (per page)")
+    for template, (count, size, critical, compressed) in sorted(totals.items()):
+        print(f"{template:<11} {count:>5} {size // count:>11,} {critical // count:>9,} {compressed // count:>8,}")
+    print("\n   build-dist.py inlines it into the pages of dist/")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+SEO lint of the whole site, or of the given pages, in one pass per page.
+
+Every page is parsed once and all registered rules run on it (see
+site_lint.py): title and meta description lengths, a single h1, canonical
+URL, lang attribute, JSON-LD and the schema types a page must carry, word
+count of the category articles, Open Graph tags, image alt text, meta
+keywords, h2 sections, internal links and the robots meta tag. It
+replaces the per-file grep/sed scans of check_meta_lengths.sh,
+check_h1_tags.sh, count_words.sh, final_check.sh and seo-checker.sh, which
+now call it with the matching --rule.
+
+Findings are errors, warnings or notes; the exit status is 1 when a finding
+at or above --fail-on (default: error) is not in the --baseline file. With
+--incremental, pages unchanged since the last run are not parsed again.
+--score adds seo-checker.sh's page score: points for every rule a page
+passes, as a percentage, with the average and the grade of each page.
+
+As a pre-commit gate, --install-hook writes .git/hooks/pre-commit to lint
+the staged pages, and records the current findings as the baseline so only
+new problems block a commit.
+
+Usage:
+    python3 scripts/lint-site.py --jobs 0 --incremental
+    python3 scripts/lint-site.py TECHNOLOGY index.html --rule single-h1
+    python3 scripts/lint-site.py --section "Jain Docs" --fail-on warning
+    python3 scripts/lint-site.py TECHNOLOGY --score
+    python3 scripts/lint-site.py --format sarif --output .site-cache/reports/seo.sarif
+    python3 scripts/lint-site.py --format json --output seo-lint.json
+    python3 scripts/lint-site.py --staged --baseline .site-cache/lint-baseline.json
+    python3 scripts/lint-site.py --install-hook
+    python3 scripts/lint-site.py --list-rules
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from site_corpus import BASE_DIR, CACHE_DIR, load_corpus
+from site_lint import (LEVEL_ICONS, LEVELS, SCORE_GRADES, at_least, finding_key, lint_pages, lint_version,
+                       load_rules, page_score, sarif_report, score_grade)
+from site_manifest import Manifest, add_incremental_argument
+from site_parallel import add_jobs_argument
+from site_profile import add_profile_arguments, profile_from_args, stage
+
+DEFAULT_BASELINE = CACHE_DIR / 'lint-baseline.json'
+
+HOOK_MARKER = '# Installed by scripts/lint-site.py --install-hook'
+
+HOOK_SCRIPT = f'''#!/bin/sh
+{HOOK_MARKER}
+# SEO lint of the staged pages; new errors block the commit (git commit --no-verify skips it)
+cd "$(git rev-parse --show-toplevel)" || exit 1
+exec python3 scripts/lint-site.py --staged --incremental --summary --baseline {DEFAULT_BASELINE.relative_to(BASE_DIR)}
+'''
+
+
+def git(*args: str) -> str:
+    return subprocess.run(['git', *args], cwd=BASE_DIR, capture_output=True, text=True, check=True).stdout
+
+
+def staged_paths() -> Set[str]:
+    """HTML files added, copied, modified or renamed in the index"""
+    output = git('diff', '--cached', '--name-only', '-z', '--diff-filter=ACMR', '--', '*.html')
+    return {path for path in output.split('\0') if path}
+
+
+def relative_target(target: str) -> str:
+    """A file or folder argument as a path relative to the site root ('' for all of it)"""
+    path = Path(target)
+    if not path.is_absolute():
+        path = Path.cwd() / path if (Path.cwd() / path).exists() else BASE_DIR / path
+    try:
+        rel_path = path.resolve().relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        sys.exit(f"❌ {target} is not inside {BASE_DIR}")
+    return '' if rel_path == '.' else rel_path
+
+
+def selected(rel_path: str, targets: List[str]) -> bool:
+    return any(not target or rel_path == target or rel_path.startswith(target + '/') for target in targets)
+
+
+def load_baseline(path: Optional[Path]) -> Set[str]:
+    if path is None:
+        return set()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return set(json.load(f)['findings'])
+    except FileNotFoundError:
+        print(f"⚠️  Baseline {path} not found: every finding counts")
+        return set()
+    except (ValueError, KeyError) as e:
+        sys.exit(f"❌ Cannot read baseline {path}: {e}")
+
+
+def write_baseline(path: Path, results: List[Dict[str, object]]) -> int:
+    keys = sorted(finding_key(result['path'], finding) for result in results for finding in result['findings'])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'version': 1, 'findings': keys}, indent=1, ensure_ascii=False) + '\n',
+                    encoding='utf-8')
+    return len(keys)
+
+
+def install_hook() -> None:
+    hook = BASE_DIR / git('rev-parse', '--git-path', 'hooks').strip() / 'pre-commit'
+    if hook.exists() and HOOK_MARKER not in hook.read_text(encoding='utf-8', errors='replace'):
+        sys.exit(f"❌ {hook} exists and was not installed by this script; add the lint to it by hand:\n"
+                 f"   python3 scripts/lint-site.py --staged --baseline {DEFAULT_BASELINE.relative_to(BASE_DIR)}")
+    hook.parent.mkdir(parents=True, exist_ok=True)
+    hook.write_text(HOOK_SCRIPT, encoding='utf-8')
+    hook.chmod(0o755)
+    print(f"✅ Installed {hook}")
+
+
+def print_findings(results: List[Dict[str, object]], baseline: Set[str]) -> None:
+    for result in results:
+        findings = result['findings']
+        if not findings:
+            continue
+        print(f"\n📄 {result['path']}")
+        for finding in findings:
+            known = ' (baseline)' if finding_key(result['path'], finding) in baseline else ''
+            line = f"{finding['line']:>5}" if finding['line'] else ' ' * 5
+            print(f"   {LEVEL_ICONS[finding['level']]} {line}  [{finding['rule']}] {finding['message']}{known}")
+
+
+def print_summary(results: List[Dict[str, object]], rules) -> None:
+    counts = {rule.name: Counter() for rule in rules}
+    for result in results:
+        for finding in result['findings']:
+            counts.setdefault(finding['rule'], Counter())[finding['level']] += 1
+    print(f"\n📊 Findings by rule")
+    print(f"   {'rule':<20} {'errors':>8} {'warnings':>9} {'notes':>7}")
+    for rule_name, c in counts.items():
+        print(f"   {rule_name:<20} {c['error']:>8} {c['warning']:>9} {c['note']:>7}")
+
+
+def print_scores(results: List[Dict[str, object]]) -> None:
+    scores = {}
+    for result in results:
+        score = page_score(result)
+        if score is not None and score[1]:
+            scores[result['path']] = 100 * score[0] / score[1]
+    if not scores:
+        return
+    grades = Counter(score_grade(percentage) for percentage in scores.values())
+    average = sum(scores.values()) / len(scores)
+    print(f"\n📈 SEO score")
+    for lowest, grade in SCORE_GRADES:
+        label = f"{grade} ({lowest}%+)" if lowest else grade
+        print(f"   {label:<28} {grades[grade]:>6} page(s)")
+    below = sorted((percentage, path) for path, percentage in scores.items() if percentage < SCORE_GRADES[0][0])
+    if below:
+        print("   Lowest:")
+        for percentage, path in below[:5]:
+            print(f"     {percentage:>5.0f}%  {path}")
+    print(f"   Average: {average:.0f}% ({score_grade(average)}) over {len(scores)} page(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SEO lint of the site's pages")
+    parser.add_argument('paths', nargs='*', help="files or folders to lint (default: the whole site)")
+    parser.add_argument('--section', action='append', default=[], help="only pages of this section (repeatable)")
+    parser.add_argument('--rule', action='append', help="only report this rule (repeatable)")
+    parser.add_argument('--staged', action='store_true', help="only the HTML files staged for commit")
+    parser.add_argument('--format', choices=['text', 'json', 'sarif'], default='text',
+                        help="report format (default: text)")
+    parser.add_argument('--output', type=Path, help="write the json/sarif report to this file instead of stdout")
+    parser.add_argument('--fail-on', choices=LEVELS + ['never'], default='error',
+                        help="exit 1 on a new finding of this level or worse (default: error)")
+    parser.add_argument('--baseline', type=Path, help="findings listed in this file do not fail the run")
+    parser.add_argument('--write-baseline', type=Path, nargs='?', const=DEFAULT_BASELINE,
+                        help=f"record the current findings as the baseline "
+                             f"(default: {DEFAULT_BASELINE.relative_to(BASE_DIR)})")
+    parser.add_argument('--summary', action='store_true', help="text report: only failing findings and totals")
+    parser.add_argument('--score', action='store_true', help="text report: add the SEO score of the pages")
+    parser.add_argument('--install-hook', action='store_true',
+                        help="install the pre-commit hook and write the baseline")
+    parser.add_argument('--list-rules', action='store_true', help="list the registered rules")
+    add_jobs_argument(parser)
+    add_incremental_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    try:
+        rules = load_rules(args.rule)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.list_rules:
+        for rule in rules:
+            print(f"{rule.name:<20} {rule.level:<8} {rule.description}")
+        return
+    if args.install_hook:
+        install_hook()
+        args.write_baseline = args.write_baseline or DEFAULT_BASELINE
+
+    text = args.format == 'text' and args.output is None
+    if text:
+        print("=" * 70)
+        print("🔍 Site SEO Lint")
+        print("=" * 70)
+
+    with stage('select pages'):
+        pages = load_corpus(BASE_DIR).pages(*args.section)
+        if args.paths:
+            targets = [relative_target(target) for target in args.paths]
+            pages = [page for page in pages if selected(page.rel_path, targets)]
+        if args.staged:
+            staged = staged_paths()
+            pages = [page for page in pages if page.rel_path in staged]
+    if not pages:
+        if text:
+            print("✅ No pages to lint")
+        return
+
+    manifest = Manifest('lint-site', lint_version()) if args.incremental else None
+    results = lint_pages(pages, args.jobs, args.rule, manifest)
+
+    if args.write_baseline:
+        count = write_baseline(args.write_baseline, results)
+        print(f"📝 Baseline: {count} finding(s) recorded in {args.write_baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    new = [(result['path'], finding) for result in results for finding in result['findings']
+           if finding_key(result['path'], finding) not in baseline]
+    failing = [] if args.fail_on == 'never' else [(path, finding) for path, finding in new
+                                                  if at_least(finding['level'], args.fail_on)]
+
+    with stage('report'):
+        if args.format == 'text':
+            if args.summary:
+                by_path: Dict[str, List[Dict[str, object]]] = {}
+                for path, finding in failing:
+                    by_path.setdefault(path, []).append(finding)
+                print_findings([{'path': path, 'findings': findings} for path, findings in by_path.items()], set())
+            else:
+                print_findings(results, baseline)
+            print_summary(results, rules)
+            if args.score:
+                print_scores(results)
+            linted = sum(not result['skipped'] for result in results)
+            levels = Counter(finding['level'] for result in results for finding in result['findings'])
+            print("\n" + "=" * 70)
+            print(f"✨ {linted} page(s) linted: {levels['error']} error(s), {levels['warning']} warning(s), "
+                  f"{levels['note']} note(s); {len(new)} not in the baseline")
+            if failing:
+                print(f"❌ {len(failing)} finding(s) at or above '{args.fail_on}' fail the lint")
+            else:
+                print("✅ Lint passed")
+        else:
+            report = sarif_report(results, rules) if args.format == 'sarif' else results
+            data = json.dumps(report, indent=2, ensure_ascii=False) + '\n'
+            if args.output:
+                args.output.parent.mkdir(parents=True, exist_ok=True)
+                args.output.write_text(data, encoding='utf-8')
+                print(f"📄 {args.format.upper()} report: {args.output} ({len(failing)} failing finding(s))")
+            else:
+                sys.stdout.write(data)
+
+    if failing:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
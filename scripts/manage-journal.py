@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+List and roll back the runs recorded in the page write journal (see site_journal.py).
+
+Every script that writes pages keeps the originals of the files it replaces,
+so a whole run can be undone with one command. Files changed again since the
+run are reported as conflicts and left alone unless --force is given; the
+rollback is itself journaled, so it can be rolled back too.
+
+Usage:
+    python3 scripts/manage-journal.py list
+    python3 scripts/manage-journal.py show [RUN]
+    python3 scripts/manage-journal.py rollback [RUN] [--dry-run] [--force]
+    python3 scripts/manage-journal.py prune [--keep 20]
+"""
+
+import argparse
+import sys
+
+from site_journal import journal
+from site_profile import add_profile_arguments, profile_from_args
+
+
+def find_run(journal, run_id):
+    """The named run, or the latest one that was not rolled back"""
+    run = journal.run(run_id) if run_id else journal.latest()
+    if run is None:
+        print(f"❌ No run {run_id}" if run_id else "ℹ️  No run to roll back")
+        sys.exit(2 if run_id else 0)
+    return run
+
+
+def run_status(run):
+    if run.rolled_back:
+        return f"rolled back {run.rolled_back['rolled_back']}"
+    if 'rollback_of' in run.header:
+        return f"rollback of {run.header['rollback_of']}"
+    return ''
+
+
+def report_list(journal, args):
+    runs = journal.runs()
+    if not runs:
+        print("ℹ️  The journal is empty")
+        return
+    print(f"{'run':<24} {'started':<20} {'files':>6}  script")
+    for run in runs:
+        status = run_status(run)
+        print(f"{run.id:<24} {run.header.get('started', '?'):<20} {len(run.files):>6}  "
+              f"{run.script}{f'  ({status})' if status else ''}")
+    print(f"\n📦 Originals: {journal.size() / 1024:.1f} KB in {journal.objects_dir}")
+
+
+def report_show(journal, args):
+    run = find_run(journal, args.run)
+    print(f"📋 {run.id}: {run.script} {' '.join(run.header.get('argv', []))}")
+    print(f"   Started: {run.header.get('started', '?')}")
+    status = run_status(run)
+    if status:
+        print(f"   Status: {status}")
+    for rel_path, hashes in run.files.items():
+        change = 'created' if hashes['before'] is None else 'deleted' if hashes['after'] is None else 'modified'
+        print(f"   {change:<9} {rel_path}")
+
+
+def report_rollback(journal, args):
+    run = find_run(journal, args.run)
+    if run.rolled_back and not args.force:
+        print(f"ℹ️  {run.id} was already {run_status(run)}")
+        return
+
+    print("=" * 70)
+    print(f"⏪ Rolling back {run.id} ({run.script}, {len(run.files)} files)")
+    if args.dry_run:
+        print("Mode: dry run (no files are written)")
+    print("=" * 70)
+
+    outcome = journal.rollback(run, force=args.force, dry_run=args.dry_run)
+    for rel_path in outcome['restored']:
+        print(f"✅ Restored: {rel_path}")
+    for rel_path in outcome['deleted']:
+        print(f"🗑️  Deleted (created by the run): {rel_path}")
+    for rel_path in outcome['conflicts']:
+        print(f"⚠️  Changed since the run, left alone: {rel_path}")
+
+    print(f"\n   Restored: {len(outcome['restored'])}")
+    print(f"   Deleted: {len(outcome['deleted'])}")
+    print(f"   Already original: {len(outcome['unchanged'])}")
+    print(f"   Conflicts: {len(outcome['conflicts'])}")
+    if outcome['conflicts']:
+        print("\n❌ Some files were changed after the run; use --force to overwrite them")
+        sys.exit(1)
+
+
+def report_prune(journal, args):
+    counts = journal.prune(args.keep)
+    print(f"🧹 Dropped {counts['runs']} runs and {counts['objects']} originals "
+          f"({counts['bytes'] / 1024:.1f} KB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List and roll back the runs of the page write journal")
+    add_profile_arguments(parser)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help="list the recorded runs")
+
+    show = subparsers.add_parser('show', help="files written by a run (default: the latest)")
+    show.add_argument('run', nargs='?')
+
+    rollback = subparsers.add_parser('rollback', help="restore the files of a run (default: the latest)")
+    rollback.add_argument('run', nargs='?')
+    rollback.add_argument('--dry-run', action='store_true', help="report what would be restored")
+    rollback.add_argument('--force', action='store_true', help="also overwrite files changed since the run")
+
+    prune = subparsers.add_parser('prune', help="drop old runs and the originals only they use")
+    prune.add_argument('--keep', type=int, default=20, help="runs to keep (default: 20)")
+
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    reports = {
+        'list': report_list,
+        'show': report_show,
+        'rollback': report_rollback,
+        'prune': report_prune,
+    }
+    reports[args.command](journal(), args)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,14 +8,19 @@ This script optimizes all Jain Docs pages for SEO by:
 3. Adding structured data (Article and BreadcrumbList schema)
 """
 
-import os
 import re
-from pathlib import Path
 from urllib.parse import quote
 
+from site_corpus import BASE_DIR, BASE_URL, load_corpus
+from site_dates import git_dates
+from site_manifest import manifest_from_argv
+from site_parallel import jobs_from_argv, map_pages
+from site_pipeline import register_transform
+from site_profile import profile_from_argv
+from site_schema import with_schema_dates
+
 # Base configuration
-BASE_URL = "https://wiki.tapnex.tech"
-JAIN_DOCS_DIR = Path(r"c:\Users\MOINAK\OneDrive\PROJECTS\WIKI TAPNEX\Jain Docs")
+JAIN_DOCS_DIR = BASE_DIR / "Jain Docs"
 PAGES_DIR = JAIN_DOCS_DIR / "Pages"
 
 def sanitize_filename(filename):
@@ -77,11 +82,13 @@ def add_or_update_meta_tags(content, title, description):
     # Check if meta description exists
     existing_desc = extract_existing_description(content)
     if existing_desc:
-        # Update existing description
+        # Update existing description (the first one: some pages also carry
+        # an older one with unescaped quotes that this pattern would mangle)
         content = re.sub(
             r'<meta\s+name=["\']description["\']\s+content=["\'][^"\']*["\']',
             f'<meta name="description" content="{description}"',
             content,
+            count=1,
             flags=re.IGNORECASE
         )
     else:
@@ -103,16 +110,18 @@ def add_or_update_meta_tags(content, title, description):
     
     return content
 
-def create_article_schema(filename, title, description):
-    """Create Article schema JSON-LD"""
+def create_article_schema(filename, title, description, dates=None):
+    """Create Article schema JSON-LD (dates: (published, modified) from git history, either may be None)"""
     url_encoded_name = quote(filename)
     url = f"{BASE_URL}/Jain%20Docs/Pages/{url_encoded_name}"
+    date_lines = ''.join(f'\n  "{name}": "{date}",'
+                         for name, date in zip(('datePublished', 'dateModified'), dates or ()) if date)
     
     schema = f'''
 <script type="application/ld+json">
 {{
   "@context": "https://schema.org",
-  "@type": "Article",
+  "@type": "Article",{date_lines}
   "mainEntityOfPage": {{
     "@type": "WebPage",
     "@id": "{url}"
@@ -171,8 +180,8 @@ def has_schema(content, schema_type):
         return '"@type": "BreadcrumbList"' in content or '"@type":"BreadcrumbList"' in content
     return False
 
-def add_schemas(content, filename, title, description):
-    """Add Article and BreadcrumbList schemas if they don't exist"""
+def add_schemas(content, filename, title, description, dates=None):
+    """Add Article and BreadcrumbList schemas if they don't exist (and bring the Article dates up to date)"""
     
     # Check if schemas already exist
     has_article = has_schema(content, "Article")
@@ -181,7 +190,9 @@ def add_schemas(content, filename, title, description):
     schemas_to_add = []
     
     if not has_article:
-        schemas_to_add.append(create_article_schema(filename, title, description))
+        schemas_to_add.append(create_article_schema(filename, title, description, dates))
+    else:
+        content = with_schema_dates(content, ('Article',), *(dates or (None, None)))
     
     if not has_breadcrumb:
         schemas_to_add.append(create_breadcrumb_schema(filename))
@@ -198,17 +209,20 @@ def add_schemas(content, filename, title, description):
     
     return content
 
-def optimize_index_file():
+def optimize_index_file(corpus):
     """Optimize the main Jain Docs index.html file"""
-    index_path = JAIN_DOCS_DIR / "index.html"
+    index_page = corpus.section_index("Jain Docs")
     
-    if not index_path.exists():
-        print(f"❌ Index file not found: {index_path}")
+    if index_page is None:
+        print(f"❌ Index file not found: {JAIN_DOCS_DIR / 'index.html'}")
         return False
     
+    return optimize_index_page(index_page)
+
+def optimize_index_page(index_page):
+    """Optimize the already loaded Jain Docs index page"""
     try:
-        with open(index_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = index_page.content
         
         original_content = content
         
@@ -222,8 +236,7 @@ def optimize_index_file():
         
         # Only write if content changed
         if content != original_content:
-            with open(index_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            index_page.write(content)
             print(f"✅ Optimized: Jain Docs/index.html")
             return True
         else:
@@ -234,13 +247,12 @@ def optimize_index_file():
         print(f"❌ Error optimizing index.html: {e}")
         return False
 
-def optimize_page_file(filepath):
+def optimize_page_file(page):
     """Optimize a single page file"""
-    filename = filepath.name
+    filename = page.name
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = page.content
         
         original_content = content
         
@@ -267,12 +279,12 @@ def optimize_page_file(filepath):
         content = add_or_update_meta_tags(content, title, description)
         
         # 4. Add schemas
-        content = add_schemas(content, filename, title, description)
+        dates = git_dates(page.base_dir).dates(page.rel_path)
+        content = add_schemas(content, filename, title, description, dates)
         
         # Only write if content changed
         if content != original_content:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            page.write(content)
             return True
         else:
             return False
@@ -281,16 +293,28 @@ def optimize_page_file(filepath):
         print(f"❌ Error optimizing {filename}: {e}")
         return False
 
+@register_transform('jain-docs-seo', lambda page: page.section == 'Jain Docs')
+def jain_docs_seo_transform(page):
+    """Pipeline stage: language, meta tags and schemas for a Jain Docs page"""
+    if page.rel_path == 'Jain Docs/index.html':
+        return optimize_index_page(page)
+    if page.rel_path.startswith('Jain Docs/Pages/'):
+        return optimize_page_file(page)
+    return False
+
 def main():
     """Main execution function"""
+    profile_from_argv(__file__)
     print("=" * 70)
     print("🚀 Starting Jain Docs SEO Optimization")
     print("=" * 70)
     print()
     
+    corpus = load_corpus(BASE_DIR)
+    
     # Step 1: Optimize index.html
     print("📄 Step 1: Optimizing Jain Docs/index.html...")
-    optimize_index_file()
+    optimize_index_file(corpus)
     print()
     
     # Step 2: Optimize all page files
@@ -302,7 +326,7 @@ def main():
         return
     
     # Get all HTML files
-    html_files = list(PAGES_DIR.glob("*.html"))
+    html_files = corpus.jain_docs_pages()
     total_files = len(html_files)
     
     if total_files == 0:
@@ -315,14 +339,19 @@ def main():
     optimized_count = 0
     skipped_count = 0
     
-    for i, filepath in enumerate(html_files, 1):
-        if optimize_page_file(filepath):
-            print(f"✅ [{i}/{total_files}] Optimized: {filepath.name}")
+    manifest = manifest_from_argv(__file__)
+    results = map_pages(optimize_page_file, html_files, jobs_from_argv(), manifest=manifest)
+    for i, (page, result) in enumerate(zip(html_files, results), 1):
+        if result['value']:
+            print(f"✅ [{i}/{total_files}] Optimized: {page.name}")
             optimized_count += 1
         else:
-            print(f"ℹ️  [{i}/{total_files}] No changes: {filepath.name}")
+            print(f"ℹ️  [{i}/{total_files}] No changes: {page.name}")
             skipped_count += 1
     
+    if manifest:
+        manifest.save()
+    
     # Summary
     print()
     print("=" * 70)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Trim the site-wide stylesheets to the rules each page template can use, in dist/.
+
+Every category article links /home.css, /additional-ad-styles.css and
+/styles/article-styles.css, and the Jain Docs pages their copies under
+Jain Docs/ - written for every layout of the site, so most of their rules
+match nothing on a given page. When build-dist.py builds dist/, it groups
+the pages by template (see site_styles.TEMPLATES: article, jain-docs, tool,
+home), collects the element types, ids and classes the pages of a template
+and their scripts can produce (site_styles.page_names()) and drops every
+rule whose selectors all need a name none of them has (prune_site()).
+@media blocks keep their used rules, @keyframes stay while a kept rule
+animates with them. The result is written next to the source's copy in
+dist/ as pruned/<stem>.<template>.<hash>.css and the dist/ copies of the
+template's pages link it instead of the full sheet (with_pruned_sheets()):
+
+    <link rel="stylesheet" href="/styles/pruned/article-styles.article.3f2a9c01d4.css">
+
+Only rules that can match no element are removed, so the cascade of every
+page is unchanged, and a sheet nothing can be removed from stays linked as
+it is. Classes that home.js, article-scripts.js and jain_base.js toggle at
+runtime are found by the scan; RUNTIME_ALLOWLIST keeps them even if a
+script changes in a way the scan cannot read - add a name there when a
+rule for it goes missing.
+
+The pages in the repository keep linking the source stylesheets, which stay
+the ones to edit; every build prunes them again, so nothing goes stale. The
+file names carry their content hash because vercel.json serves CSS as
+immutable. Run on its own, the script reports what a build saves.
+
+Usage:
+    python3 scripts/prune-unused-css.py --jobs 0
+    python3 scripts/build-dist.py              # writes the pruned sheets into dist/
+"""
+
+import argparse
+import gzip
+import hashlib
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from site_corpus import BASE_DIR, Corpus, Page, load_corpus, read_text
+from site_parallel import add_jobs_argument, map_pages
+from site_profile import add_profile_arguments, profile_from_args, stage
+from site_styles import Names, page_names, page_template, prune_stylesheet, resolve_href, stylesheet_links
+
+# Stylesheets to prune, relative to the site root
+PRUNED_STYLESHEETS = [
+    'home.css',
+    'additional-ad-styles.css',
+    'styles/article-styles.css',
+    'Jain Docs/additional-ad-styles.css',
+    'Jain Docs/styles/article-styles.css',
+]
+
+PRUNED_DIR = 'pruned'
+HREF_ATTRIBUTE_PATTERN = re.compile(r'(\bhref\s*=\s*)(["\'])(.*?)\2', re.IGNORECASE)
+
+# Names the scripts set at runtime, kept whatever the scan finds: .class, #id or type
+RUNTIME_ALLOWLIST = [
+    # home.js: dropdowns and mobile menu, header scroll shadow, search suggestions
+    '.open', '.active', '.has-scroll', '.scrolled-to-bottom', '.show', '.highlighted',
+    # article-scripts.js and jain_base.js: sidebar, table of contents, scroll animations
+    '.sidebar-open', '.active-toc', '.animate',
+    # earth3d.js: the globe fades in once loaded
+    '.visible',
+]
+
+
+def allowlist_names(entries: List[str]) -> Names:
+    names = Names()
+    for entry in entries:
+        if entry.startswith('.'):
+            names.classes.add(entry[1:])
+        elif entry.startswith('#'):
+            names.ids.add(entry[1:])
+        else:
+            names.types.add(entry.lower())
+    return names
+
+
+def pruned_links(page: Page) -> List[Tuple[str, str]]:
+    """(href, stylesheet relative to the site root) of the page's links to the PRUNED_STYLESHEETS"""
+    sources = {(page.base_dir / rel_path).resolve(): rel_path for rel_path in PRUNED_STYLESHEETS}
+    links = []
+    for link in stylesheet_links(page):
+        path = resolve_href(page, link.href)
+        if path is not None and path.resolve() in sources:
+            links.append((link.href, sources[path.resolve()]))
+    return links
+
+
+def scan_page(page: Page) -> Dict[str, object]:
+    """Template, pruned stylesheets and names of one page; runs in map_pages workers"""
+    links = pruned_links(page)
+    names = page_names(page) if links else Names()
+    return {'template': page_template(page), 'sources': sorted({source for _href, source in links}),
+            'names': (sorted(names.types), sorted(names.ids), sorted(names.classes))}
+
+
+def pruned_file(source: str, template: str, css: str) -> Tuple[str, str]:
+    """(path relative to the site root, content) of a pruned stylesheet"""
+    header = f"/* Generated by scripts/prune-unused-css.py from /{source} for the {template} pages */\n"
+    content = header + css
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]
+    source_path = Path(source)
+    return (source_path.parent / PRUNED_DIR / f"{source_path.stem}.{template}.{digest}.css").as_posix(), content
+
+
+def pruned_href(source_href: str, rel_path: str) -> str:
+    """The href of a pruned sheet, written the way the page wrote its source's href"""
+    return source_href.rsplit('/', 1)[0] + '/' + PRUNED_DIR + '/' + rel_path.rsplit('/', 1)[1] \
+        if '/' in source_href else f"{PRUNED_DIR}/{rel_path.rsplit('/', 1)[1]}"
+
+
+def with_hrefs(content: str, hrefs: Dict[str, str]) -> str:
+    """Page source with the stylesheet hrefs replaced (old href -> new href)"""
+    def replace_tag(match):
+        tag = match.group(0)
+        if 'stylesheet' not in tag.lower():
+            return tag
+        return HREF_ATTRIBUTE_PATTERN.sub(
+            lambda href: href.group(1) + href.group(2) + hrefs.get(href.group(3), href.group(3)) + href.group(2), tag)
+    return re.sub(r'<link\b[^>]*>', replace_tag, content, flags=re.IGNORECASE)
+
+
+def with_pruned_sheets(page: Page, content: str, targets: Dict[Tuple[str, str], str]) -> str:
+    """The page source (content, the page or a copy of it) linking the pruned sheets of its template"""
+    template = page_template(page)
+    hrefs = {href: pruned_href(href, targets[(template, source)])
+             for href, source in pruned_links(page) if (template, source) in targets}
+    return with_hrefs(content, hrefs) if hrefs else content
+
+
+def prune_site(corpus: Corpus, jobs: int = 1) -> Dict[str, object]:
+    """
+    Prune the stylesheets for every template of the site. Returns 'files',
+    the pruned sheets by path relative to the site root, 'targets', the
+    pruned sheet of each (template, source stylesheet), 'rows' for report()
+    and 'errors'.
+    """
+    allowlist = allowlist_names(RUNTIME_ALLOWLIST)
+    pages = [page for page in corpus.pages() if page_template(page)]
+    groups: Dict[Tuple[str, str], Names] = defaultdict(Names)
+    page_counts: Dict[Tuple[str, str], int] = defaultdict(int)
+    errors = []
+    for result in map_pages(scan_page, pages, jobs, echo=False):
+        if result['status'] == 'error':
+            errors.append(f"{result['path']}: {result['message']}")
+            continue
+        value = result['value']
+        for source in value['sources']:
+            key = (value['template'], source)
+            groups[key].update(Names(*value['names']))
+            page_counts[key] += 1
+
+    files: Dict[str, str] = {}
+    targets: Dict[Tuple[str, str], str] = {}
+    rows = []
+    for (template, source), names in sorted(groups.items()):
+        css = read_text(corpus.base_dir / source)
+        pruned, kept, removed = prune_stylesheet(css, names.update(allowlist))
+        if not removed:
+            continue
+        rel_path, content = pruned_file(source, template, pruned)
+        files[rel_path] = content
+        targets[(template, source)] = rel_path
+        rows.append((template, source, page_counts[(template, source)], css, content, kept, removed))
+    return {'files': files, 'targets': targets, 'rows': rows, 'errors': errors}
+
+
+def gzip_size(text: str) -> int:
+    return len(gzip.compress(text.encode('utf-8'), 9))
+
+
+def report(rows: List[Tuple[str, str, int, str, str, int, int]]) -> None:
+    print(f"\n{'template':<11} {'stylesheet':<36} {'pages':>5} {'full':>9} {'pruned':>9} {'saved':>6}  rules kept")
+    saved_bytes = saved_gzip = 0
+    for template, source, count, css, content, kept, removed in rows:
+        full, trimmed = len(css.encode('utf-8')), len(content.encode('utf-8'))
+        saved_bytes += (full - trimmed) * count
+        saved_gzip += (gzip_size(css) - gzip_size(content)) * count
+        print(f"{template:<11} {source:<36} {count:>5} {full:>9,} {trimmed:>9,} {1 - trimmed / full:>6.0%}"
+              f"  {kept}/{kept + removed}")
+    print(f"\n📊 Saved over one view of each page: {saved_bytes / 1024:,.0f} KB "
+          f"({saved_gzip / 1024:,.0f} KB gzipped)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report what build-dist.py prunes from the site-wide stylesheets")
+    add_jobs_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    print("=" * 70)
+    print("✂️  Unused CSS Pruner")
+    print("=" * 70)
+
+    with stage('prune'):
+        pruning = prune_site(load_corpus(BASE_DIR), args.jobs)
+    for message in pruning['errors']:
+        print(f"   ❌ {message}")
+    report(pruning['rows'])
+    print("\n   build-dist.py writes the pruned sheets into dist/")
+
+
+if __name__ == '__main__':
+    main()
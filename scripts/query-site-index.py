@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Query the persistent page index (see site_index.py).
+
+The index is brought up to date with the working tree first (only changed
+pages are re-read), then the report is answered with SQL.
+
+Usage:
+    python3 scripts/query-site-index.py update [--jobs N]
+    python3 scripts/query-site-index.py meta-lengths [--min 150] [--max 160]
+    python3 scripts/query-site-index.py word-counts [--under 1500]
+    python3 scripts/query-site-index.py sql "SELECT path, h1_count FROM pages WHERE h1_count > 1"
+"""
+
+import argparse
+import sqlite3
+import sys
+
+from site_corpus import CATEGORY_SECTIONS
+from site_index import open_index
+from site_parallel import add_jobs_argument
+from site_profile import add_profile_arguments, profile_from_args
+
+
+def in_sections(sections):
+    return f"section IN ({', '.join('?' * len(sections))})"
+
+
+def report_update(index, args):
+    counts = index.update(jobs=args.jobs)
+    print(f"📁 {index.path}")
+    for outcome, count in counts.items():
+        print(f"   {outcome}: {count}")
+
+
+def report_meta_lengths(index, args):
+    """Category pages whose meta description is outside the recommended length"""
+    rows = index.query(
+        f"SELECT path, description_length FROM pages WHERE {in_sections(CATEGORY_SECTIONS)} "
+        "AND path LIKE '%index.html' AND description_length > 0 "
+        "AND (description_length < ? OR description_length > ?) ORDER BY path",
+        (*CATEGORY_SECTIONS, args.min, args.max)
+    )
+    for row in rows:
+        print(f"[{row['description_length']}] {row['path']}")
+
+
+def report_word_counts(index, args):
+    """Article word counts of the category pages, shortest first"""
+    rows = index.query(
+        f"SELECT section, subfolder, word_count FROM pages WHERE {in_sections(CATEGORY_SECTIONS)} "
+        "AND path LIKE '%index.html' ORDER BY word_count, path",
+        CATEGORY_SECTIONS
+    )
+    print("==========================================")
+    print("   CONTENT DEPTH ANALYSIS")
+    print("==========================================")
+    print("")
+    print("Analyzing word count for all article pages...")
+    print("")
+    print(f"FILES UNDER {args.under} WORDS (Need Enhancement):")
+    print("")
+    for row in rows:
+        page_name = row['subfolder'] or row['section']
+        if row['word_count'] < args.under:
+            print(f"  ⚠️  [{row['word_count']:4d} words] {page_name}")
+        else:
+            print(f"  ✓  [{row['word_count']:4d} words] {page_name}")
+    print("")
+    print("==========================================")
+
+
+def report_sql(index, args):
+    try:
+        cursor = index.db.execute(args.query)
+    except sqlite3.Error as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    if cursor.description is None:
+        return
+    print('\t'.join(column[0] for column in cursor.description))
+    for row in cursor:
+        print('\t'.join('' if value is None else str(value) for value in row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the persistent page index")
+    add_jobs_argument(parser)
+    add_profile_arguments(parser)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('update', help="bring the index up to date and show what changed")
+
+    meta = subparsers.add_parser('meta-lengths', help="category pages with meta descriptions outside a length range")
+    meta.add_argument('--min', type=int, default=150)
+    meta.add_argument('--max', type=int, default=160)
+
+    words = subparsers.add_parser('word-counts', help="article word counts of the category pages")
+    words.add_argument('--under', type=int, default=1500, help="flag pages with fewer words")
+
+    sql = subparsers.add_parser('sql', help="run an SQL query against the index")
+    sql.add_argument('query')
+
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    reports = {
+        'update': report_update,
+        'meta-lengths': report_meta_lengths,
+        'word-counts': report_word_counts,
+        'sql': report_sql,
+    }
+    # 'update' reports what it changed itself
+    index = open_index(jobs=args.jobs, update=args.command != 'update')
+    try:
+        reports[args.command](index, args)
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,51 +4,32 @@ SAFE Ad Removal Script
 This script ONLY removes ad blocks, keeping all content intact.
 """
 
-import re
-import os
-import glob
+from site_ads import find_ad_blocks, remove_ad_blocks
+from site_corpus import BASE_DIR, load_corpus
+from site_manifest import manifest_from_argv
+from site_parallel import DEFAULT_JOBS, jobs_from_argv, map_pages
+from site_profile import profile_from_argv
 
-# Pattern to match ad blocks - more specific to avoid matching content
-AD_BLOCK_PATTERN = re.compile(
-    r'<!-- AdSense.*?-->\s*'
-    r'<div class="ad-container[^>]*>.*?'
-    r'<script async src="https://pagead2\.googlesyndication\.com.*?</script>\s*'
-    r'<ins class="adsbygoogle".*?</ins>\s*'
-    r'<script>.*?\(adsbygoogle = window\.adsbygoogle.*?</script>\s*'
-    r'</div>',
-    re.DOTALL | re.MULTILINE
-)
-
-def remove_ads_from_file(file_path, create_backup=True):
-    """Remove ad blocks from a single file"""
+def remove_ads_from_file(page):
+    """Remove ad blocks from a single file (the original is kept in the rollback journal)"""
     
     try:
-        if not os.path.exists(file_path):
-            return False, f"File not found: {file_path}"
-        
         # Read original content
-        with open(file_path, 'r', encoding='utf-8') as f:
-            original_content = f.read()
+        original_content = page.content
     except Exception as e:
         return False, f"Error reading file: {str(e)}"
     
     original_size = len(original_content)
     
-    # Count ad blocks
-    ad_matches = list(AD_BLOCK_PATTERN.finditer(original_content))
-    ad_count = len(ad_matches)
+    # Count ad blocks - only complete blocks behind an AdSense comment, never content
+    ad_blocks = find_ad_blocks(original_content, require_comment=True, require_complete=True)
+    ad_count = len(ad_blocks)
     
     if ad_count == 0:
         return True, f"No ad blocks found"
     
-    # Create backup if requested
-    if create_backup:
-        backup_path = file_path + '.backup'
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            f.write(original_content)
-    
     # Remove ad blocks
-    new_content = AD_BLOCK_PATTERN.sub('', original_content)
+    new_content = remove_ad_blocks(original_content, ad_blocks)
     new_size = len(new_content)
     
     # Verify important content markers still exist
@@ -65,8 +46,7 @@ def remove_ads_from_file(file_path, create_backup=True):
     
     # Write cleaned content
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        page.write(new_content)
     except Exception as e:
         return False, f"Error writing file: {str(e)}"
     
@@ -79,21 +59,25 @@ def test_single_file(file_path):
     print(f"TESTING: {file_path}")
     print(f"{'='*80}\n")
     
-    success, message = remove_ads_from_file(file_path, create_backup=True)
+    page = load_corpus(BASE_DIR).get(file_path)
+    if page is None:
+        print(f"❌ FAILED: File not found: {file_path}")
+        return False
+    
+    success, message = remove_ads_from_file(page)
     
     if success:
         print(f"✅ SUCCESS: {message}")
-        print(f"✅ Backup created: {file_path}.backup")
+        print(f"✅ Original kept in the journal (python3 scripts/manage-journal.py show)")
         print(f"\n⚠️  Please manually verify the file looks correct!")
     else:
         print(f"❌ FAILED: {message}")
     
     return success
 
-def process_all_jain_docs():
+def process_all_jain_docs(jobs=DEFAULT_JOBS, manifest=None):
     """Remove ads from all Jain Docs files"""
-    jain_docs_pattern = "Jain Docs/Pages/*.html"
-    files = glob.glob(jain_docs_pattern)
+    files = load_corpus(BASE_DIR).jain_docs_pages()
     
     print(f"\n{'='*80}")
     print(f"Processing {len(files)} Jain Docs files")
@@ -103,11 +87,14 @@ def process_all_jain_docs():
     failure_count = 0
     no_ads_count = 0
     
-    for i, file_path in enumerate(files, 1):
-        filename = os.path.basename(file_path)
+    results = map_pages(remove_ads_from_file, files, jobs,
+                        on_error=lambda message: (False, f"Error: {message}"),
+                        manifest=manifest)
+    for i, (page, result) in enumerate(zip(files, results), 1):
+        filename = page.name
         print(f"[{i}/{len(files)}] {filename[:50]}...", end=' ')
         
-        success, message = remove_ads_from_file(file_path, create_backup=False)
+        success, message = result['value']
         
         if success:
             if "No ad blocks" in message:
@@ -120,6 +107,9 @@ def process_all_jain_docs():
             print(f"✗ {message}")
             failure_count += 1
     
+    if manifest:
+        manifest.save()
+    
     print(f"\n{'='*80}")
     print(f"SUMMARY:")
     print(f"{'='*80}")
@@ -131,6 +121,7 @@ def process_all_jain_docs():
     return failure_count == 0
 
 if __name__ == "__main__":
+    profile_from_argv(__file__)
     import sys
     
     print("\n" + "="*80)
@@ -146,7 +137,7 @@ if __name__ == "__main__":
             print("❌ Cancelled by user")
             sys.exit(0)
         
-        process_all_jain_docs()
+        process_all_jain_docs(jobs_from_argv(), manifest_from_argv(__file__))
     else:
         print("\nTEST MODE - Processing ONE file only")
         print("="*80)
@@ -162,7 +153,6 @@ if __name__ == "__main__":
             print("2. Check that all content is still there")
             print("3. Check that ads are gone")
             print("4. If everything looks good, run:")
-            print("   python scripts/remove-ads-safe.py --all")
+            print("   python scripts/remove-ads-safe.py --all [--jobs N] [--incremental]")
             print("5. If something is wrong:")
-            print("   mv 'Jain Docs/Pages/Acharya Shri 108 Samay Sagar Ji Maharaj.html.backup' \\")
-            print("      'Jain Docs/Pages/Acharya Shri 108 Samay Sagar Ji Maharaj.html'")
+            print("   python3 scripts/manage-journal.py rollback")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Run the page transforms (Jain Docs SEO, breadcrumb/article/FAQ schema, H1 fix,
+Jain Docs footer, ad injection) as one in-memory pipeline.
+
+Every page is read once, all applicable transforms are applied to the source in
+memory, and the file is written at most once - only when its bytes changed.
+
+Usage:
+    python3 scripts/run-pipeline.py                      # all transforms
+    python3 scripts/run-pipeline.py --only article-schema,faq-schema
+    python3 scripts/run-pipeline.py --dry-run --verbose
+    python3 scripts/run-pipeline.py --jobs 8                # 8 worker processes
+    python3 scripts/run-pipeline.py --incremental           # skip pages unchanged since last run
+    python3 scripts/run-pipeline.py --profile               # time per stage and file
+    python3 scripts/run-pipeline.py --dist                  # then build the minified dist/ (build-dist.py)
+    python3 scripts/run-pipeline.py --list
+"""
+
+import argparse
+import sys
+from collections import Counter
+
+from site_corpus import BASE_DIR, Corpus, load_corpus
+from site_manifest import Manifest, add_incremental_argument
+from site_parallel import add_jobs_argument
+from site_pipeline import TRANSFORMS, load_script, load_transforms, pipeline_version, run_pipeline
+from site_profile import add_profile_arguments, profile_from_args
+
+
+def parse_names(value):
+    return [name.strip() for name in value.split(',') if name.strip()] if value else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the page transforms as one in-memory pipeline")
+    parser.add_argument('--only', help="comma-separated transforms to run (default: all)")
+    parser.add_argument('--skip', help="comma-separated transforms to leave out")
+    parser.add_argument('--dry-run', action='store_true', help="report what would change without writing")
+    parser.add_argument('--verbose', action='store_true', help="print the messages of every transform")
+    parser.add_argument('--list', action='store_true', help="list the registered transforms and exit")
+    parser.add_argument('--dist', action='store_true',
+                        help="after the transforms, build the minified deploy copy in dist/")
+    add_jobs_argument(parser)
+    add_incremental_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    try:
+        transforms = load_transforms(parse_names(args.only))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    if args.list:
+        for transform in TRANSFORMS.values():
+            print(transform.name)
+        return
+
+    skip = set(parse_names(args.skip) or [])
+    transforms = [t for t in transforms if t.name not in skip]
+
+    print("=" * 70)
+    print("🔧 Page Transform Pipeline")
+    print("=" * 70)
+    print(f"Base directory: {BASE_DIR}")
+    print(f"Transforms: {', '.join(t.name for t in transforms)}")
+    if args.dry_run:
+        print("Mode: dry run (no files are written)")
+
+    # A dry run leaves pages unwritten, so it must not mark them as settled
+    manifest = None
+    if args.incremental and not args.dry_run:
+        manifest = Manifest('run-pipeline', pipeline_version(transforms))
+
+    corpus = load_corpus(BASE_DIR)
+    results = run_pipeline(corpus, transforms, dry_run=args.dry_run, jobs=args.jobs, manifest=manifest)
+    if manifest:
+        manifest.save()
+
+    per_transform = Counter()
+    for result in results:
+        per_transform.update(result['transforms'])
+        if result['status'] == 'changed':
+            print(f"✅ {result['path']} ({', '.join(result['transforms'])})")
+        elif result['status'] == 'error':
+            print(f"❌ {result['path']}")
+        if args.verbose or result['status'] == 'error':
+            for message in result['messages']:
+                print(f"     {message}")
+
+    statuses = Counter(result['status'] for result in results)
+    print("\n" + "=" * 70)
+    print("📊 Summary")
+    print("=" * 70)
+    for transform in transforms:
+        print(f"   {transform.name}: {per_transform[transform.name]} pages changed")
+    written = "would be written" if args.dry_run else "written"
+    print(f"\n   📁 Pages scanned: {len(results)}")
+    print(f"   ✅ Pages {written}: {statuses['changed']}")
+    print(f"   ⏭️  Unchanged: {statuses['skipped']}")
+    print(f"   ❌ Errors: {statuses['error']}")
+
+    if args.dist:
+        build_dist = load_script('build-dist.py')
+        # A fresh corpus: the deploy copy is built from the files as written above
+        summary = build_dist.build_dist(Corpus(BASE_DIR), jobs=args.jobs, dry_run=args.dry_run)
+        build_dist.report(summary, args.dry_run)
+        if summary['errors']:
+            sys.exit(1)
+
+    if statuses['error']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,8 +5,9 @@ This script ONLY replaces ad blocks, NOT content.
 Tests on ONE file first before batch processing.
 """
 
-import re
-import os
+from site_ads import find_ad_blocks, replace_ad_code
+from site_corpus import BASE_DIR, load_corpus
+from site_profile import profile_from_argv
 
 # New ad script to use
 NEW_AD_SCRIPT = '''<script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client=ca-pub-4315586112110103"
@@ -22,17 +23,6 @@ NEW_AD_SCRIPT = '''<script async src="https://pagead2.googlesyndication.com/page
      (adsbygoogle = window.adsbygoogle || []).push({});
 </script>'''
 
-# Pattern to match ONLY the ad block (more specific)
-# Matches from <script async to </script> (inclusive)
-AD_PATTERN = re.compile(
-    r'<script async src="https://pagead2\.googlesyndication\.com/pagead/js/adsbygoogle\.js\?client=ca-pub-4315586112110103"[^>]*>.*?</script>\s*'
-    r'(?:<!--.*?-->)?[^<]*'
-    r'<ins class="adsbygoogle"[^>]*>.*?</ins>\s*'
-    r'<script>\s*'
-    r'\(adsbygoogle = window\.adsbygoogle \|\| \[\]\)\.push\(\{\}\);\s*'
-    r'</script>',
-    re.DOTALL
-)
 
 def test_single_file(file_path):
     """Test replacement on a single file and show before/after"""
@@ -40,18 +30,19 @@ def test_single_file(file_path):
     print(f"TESTING: {file_path}")
     print(f"{'='*80}\n")
     
-    if not os.path.exists(file_path):
+    page = load_corpus(BASE_DIR).get(file_path)
+    if page is None:
         print(f"❌ File not found: {file_path}")
         return False
     
     # Read original content
-    with open(file_path, 'r', encoding='utf-8') as f:
-        original_content = f.read()
+    original_content = page.content
     
     original_lines = len(original_content.split('\n'))
     
-    # Find all ad matches
-    matches = list(AD_PATTERN.finditer(original_content))
+    # Find all ad blocks; ONLY their ad code (loader <script> through the
+    # push() <script>, inclusive) is replaced
+    matches = find_ad_blocks(original_content, require_complete=True)
     
     if not matches:
         print(f"⚠️  No ad blocks found in file!")
@@ -63,7 +54,7 @@ def test_single_file(file_path):
     # Show first match as example
     print("Example of ad block to be replaced:")
     print("-" * 80)
-    first_match = matches[0].group(0)
+    first_match = original_content[matches[0].code_start:matches[0].code_end]
     print(first_match[:200] + "..." if len(first_match) > 200 else first_match)
     print("-" * 80)
     print("\nWill be replaced with:")
@@ -72,7 +63,7 @@ def test_single_file(file_path):
     print("-" * 80)
     
     # Perform replacement
-    new_content = AD_PATTERN.sub(NEW_AD_SCRIPT, original_content)
+    new_content = replace_ad_code(original_content, matches, NEW_AD_SCRIPT)
     new_lines = len(new_content.split('\n'))
     
     # Verify content is preserved
@@ -104,24 +95,18 @@ def test_single_file(file_path):
     
     print("\n✓ All integrity checks passed!")
     
-    # Create backup
-    backup_path = file_path + '.backup'
-    with open(backup_path, 'w', encoding='utf-8') as f:
-        f.write(original_content)
-    print(f"✓ Backup created: {backup_path}")
-    
-    # Save new content
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    # Save new content (the original is kept in the rollback journal)
+    page.write(new_content)
     
     print(f"\n✅ SUCCESS! File updated: {file_path}")
     print(f"   - Replaced {len(matches)} ad blocks")
-    print(f"   - Backup saved at: {backup_path}")
+    print(f"   - Undo with: python3 scripts/manage-journal.py rollback")
     print(f"   - Please verify the file manually before proceeding with all files!")
     
     return True
 
 if __name__ == "__main__":
+    profile_from_argv(__file__)
     # Test on ONE file first
     test_file = "Jain Docs/Pages/Acharya Shri 108 Samay Sagar Ji Maharaj.html"
     
@@ -130,7 +115,7 @@ if __name__ == "__main__":
     print("="*80)
     print("\nThis script will:")
     print("1. Test on ONE file only")
-    print("2. Create a backup (.backup)")
+    print("2. Keep the original in the rollback journal")
     print("3. Show before/after comparison")
     print("4. Verify content integrity")
     print("\n⚠️  PLEASE REVIEW THE RESULTS BEFORE RUNNING ON ALL FILES!")
@@ -146,6 +131,6 @@ if __name__ == "__main__":
         print("2. Check that all content is still there")
         print("3. Check that ads are updated")
         print("4. If everything looks good, I can create a script to run on all files")
-        print("5. If something is wrong, restore from .backup file")
+        print("5. If something is wrong: python3 scripts/manage-journal.py rollback")
     else:
         print("\n❌ Test failed! Not safe to proceed.")
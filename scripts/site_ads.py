@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Linear-time AdSense ad-block locator shared by the ad removal and
+replacement scripts.
+
+An ad block is an ad container
+
+    <!-- AdSense - Jain Docs Ad -->              (optional marker comment)
+    <div class="ad-container article-bottom-ad">
+        <script async src="https://pagead2.googlesyndication.com/...">
+        <ins class="adsbygoogle" ...></ins>
+        <script>(adsbygoogle = window.adsbygoogle || []).push({});</script>
+    </div>
+
+find_ad_blocks() locates every block with plain substring searches that only
+move forward: the search for a container's closing </div> stops at the next
+container, the marker comment is looked for only between the previous block
+and this one, and the ad code only inside the container. Every character is
+therefore examined a bounded number of times, so the scan is linear in the
+page size even for malformed or adversarial pages, unlike the chained
+DOTALL `.*?` patterns it replaces.
+
+Usage from a script in this folder:
+
+    from site_ads import find_ad_blocks, remove_ad_blocks
+
+    blocks = find_ad_blocks(page.content, require_comment=True)
+    new_content = remove_ad_blocks(page.content, blocks)
+"""
+
+from typing import List, Optional, Tuple
+
+AD_COMMENT = '<!-- AdSense'
+AD_CONTAINER = '<div class="ad-container'
+AD_LOADER = '<script async src="https://pagead2.googlesyndication.com'
+AD_INS = '<ins class="adsbygoogle"'
+AD_PUSH = '(adsbygoogle = window.adsbygoogle'
+
+_DIV_OPEN = '<div'
+_DIV_CLOSE = '</div>'
+_SCRIPT_OPEN = '<script'
+_SCRIPT_CLOSE = '</script>'
+
+
+class AdBlock:
+    """Offsets of one ad block within a page source"""
+
+    def __init__(self, start: int, end: int, container_start: int,
+                 comment_end: Optional[int] = None,
+                 code_start: Optional[int] = None, code_end: Optional[int] = None):
+        # start is the marker comment when there is one, else the container
+        self.start = start
+        # end is just past the container's closing </div>
+        self.end = end
+        self.container_start = container_start
+        self.comment_end = comment_end
+        # Loader <script> through the closing tag of the push() script
+        self.code_start = code_start
+        self.code_end = code_end
+
+    def __repr__(self) -> str:
+        return f"AdBlock({self.start}, {self.end})"
+
+    @property
+    def has_comment(self) -> bool:
+        return self.comment_end is not None
+
+    @property
+    def complete(self) -> bool:
+        """True when the container holds the loader, the <ins> and the push() call"""
+        return self.code_start is not None
+
+    def text(self, content: str) -> str:
+        return content[self.start:self.end]
+
+    def comment(self, content: str) -> Optional[str]:
+        return content[self.start:self.comment_end] if self.has_comment else None
+
+
+def _is_div_open(content: str, pos: int) -> bool:
+    """'<div' at pos starts a div tag (and not e.g. '<divider')"""
+    after = content[pos + 4:pos + 5]
+    return after == '>' or after.isspace() or after == '/'
+
+
+def _closing_div(content: str, container_start: int, limit: int) -> Optional[int]:
+    """Index just past the </div> matching the container, or None before limit"""
+    depth = 1
+    next_open = content.find(_DIV_OPEN, container_start + len(AD_CONTAINER), limit)
+    next_close = content.find(_DIV_CLOSE, container_start, limit)
+    while next_close != -1:
+        if next_open != -1 and next_open < next_close:
+            if _is_div_open(content, next_open):
+                depth += 1
+            next_open = content.find(_DIV_OPEN, next_open + 4, limit)
+        else:
+            depth -= 1
+            if depth == 0:
+                return next_close + len(_DIV_CLOSE)
+            next_close = content.find(_DIV_CLOSE, next_close + len(_DIV_CLOSE), limit)
+    return None
+
+
+def _marker_comment(content: str, lower: int, container_start: int) -> Optional[Tuple[int, int]]:
+    """(start, end) of an AdSense comment separated from the container only by whitespace"""
+    end = container_start
+    while end > lower and content[end - 1].isspace():
+        end -= 1
+    if end - lower < len(AD_COMMENT) + 3 or content[end - 3:end] != '-->':
+        return None
+    start = content.rfind('<!--', lower, end - 3)
+    if start == -1 or not content.startswith(AD_COMMENT, start):
+        return None
+    # The '-->' before the container must close this very comment
+    if content.find('-->', start + 4, end - 3) != -1:
+        return None
+    return start, end
+
+
+def _ad_code(content: str, container_start: int, end: int):
+    """(start, end) of loader script .. push() script inside the container, or (None, None)"""
+    loader = content.find(AD_LOADER, container_start, end)
+    if loader == -1:
+        return None, None
+    loader_end = content.find(_SCRIPT_CLOSE, loader, end)
+    if loader_end == -1:
+        return None, None
+    ins = content.find(AD_INS, loader_end, end)
+    if ins == -1:
+        return None, None
+    push = content.find(AD_PUSH, ins, end)
+    if push == -1:
+        return None, None
+    # The push() call must sit in a plain <script> opened after the <ins>
+    push_script = content.rfind(_SCRIPT_OPEN, ins, push)
+    push_end = content.find(_SCRIPT_CLOSE, push, end)
+    if push_script == -1 or push_end == -1:
+        return None, None
+    return loader, push_end + len(_SCRIPT_CLOSE)
+
+
+def find_ad_blocks(content: str, require_comment: bool = False, require_complete: bool = False) -> List[AdBlock]:
+    """
+    Every ad block in content, in document order, in one forward pass.
+    require_comment keeps only blocks preceded by an AdSense marker comment;
+    require_complete keeps only containers holding the full ad code.
+    Containers that are not closed before the next container are skipped.
+    """
+    blocks = []
+    previous_end = 0
+    container = content.find(AD_CONTAINER)
+    while container != -1:
+        next_container = content.find(AD_CONTAINER, container + len(AD_CONTAINER))
+        limit = next_container if next_container != -1 else len(content)
+        end = _closing_div(content, container, limit)
+
+        if end is not None:
+            comment = _marker_comment(content, previous_end, container)
+            code_start, code_end = _ad_code(content, container, end)
+            block = AdBlock(
+                start=comment[0] if comment else container,
+                end=end,
+                container_start=container,
+                comment_end=comment[1] if comment else None,
+                code_start=code_start,
+                code_end=code_end
+            )
+            if (block.has_comment or not require_comment) and (block.complete or not require_complete):
+                blocks.append(block)
+            previous_end = end
+
+        container = next_container
+    return blocks
+
+
+def remove_ad_blocks(content: str, blocks: List[AdBlock], leading_whitespace: bool = False) -> str:
+    """content with the given blocks cut out (optionally with the whitespace before each)"""
+    parts = []
+    position = 0
+    for block in blocks:
+        start = block.start
+        if leading_whitespace:
+            while start > position and content[start - 1].isspace():
+                start -= 1
+        parts.append(content[position:start])
+        position = block.end
+    parts.append(content[position:])
+    return ''.join(parts)
+
+
+def replace_ad_code(content: str, blocks: List[AdBlock], new_code: str) -> str:
+    """content with the ad code of every complete block replaced by new_code"""
+    parts = []
+    position = 0
+    for block in blocks:
+        if not block.complete:
+            continue
+        parts.append(content[position:block.code_start])
+        parts.append(new_code)
+        position = block.code_end
+    parts.append(content[position:])
+    return ''.join(parts)
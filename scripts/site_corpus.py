@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Shared site corpus for the maintenance scripts.
+
+Discovers every HTML page of the wiki in a single directory walk and loads and
+indexes each page at most once: head, title, canonical, meta description,
+robots meta, ld+json blocks, h1s, link hrefs and article body. The transform
+and verify scripts ask the corpus for their pages instead of walking the tree
+and re-reading files.
+
+Usage from a script in this folder:
+
+    from site_corpus import load_corpus
+
+    corpus = load_corpus()
+    for page in corpus.subfolder_pages('TECHNOLOGY'):
+        print(page.rel_path, page.title, len(page.h1s))
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from html import unescape
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from site_profile import stage
+
+# Repository root (this file lives in <root>/scripts)
+BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_URL = "https://wiki.tapnex.tech"
+
+# Manifests and indexes built by the scripts (ignored by git)
+CACHE_DIR = BASE_DIR / '.site-cache'
+
+# Minified copy of the site that is deployed, built by build-dist.py (ignored by git)
+DIST_DIR = BASE_DIR / 'dist'
+
+# Article categories that share the same page template
+CATEGORY_SECTIONS = ['EVENT-MANAGEMENT', 'MARKETING', 'TECHNOLOGY']
+
+# Section name used for pages that live directly in the repository root
+ROOT_SECTION = 'ROOT'
+
+# Directories that never contain published pages
+EXCLUDED_DIRS = {'.git', 'scripts', 'markdown files', 'node_modules', 'dist', '__pycache__'}
+
+# HTML fragments that are included by other pages and are not pages themselves
+EXCLUDED_FILES = {'TOOLS/shared/footer.html'}
+
+# Compiled once and shared by every page
+TITLE_PATTERN = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+DESCRIPTION_PATTERN = re.compile(
+    r'<meta\s+name=["\']description["\']\s+content=(["\'])(.*?)\1',
+    re.IGNORECASE | re.DOTALL
+)
+CANONICAL_PATTERN = re.compile(
+    r'<link\s+rel=["\']canonical["\']\s+href=(["\'])(.*?)\1',
+    re.IGNORECASE
+)
+OG_IMAGE_PATTERN = re.compile(
+    r'<meta\s+property=["\']og:image["\']\s+content=(["\'])(.*?)\1',
+    re.IGNORECASE
+)
+ROBOTS_PATTERN = re.compile(
+    r'<meta\s+name=["\']robots["\']\s+content=(["\'])(.*?)\1',
+    re.IGNORECASE
+)
+LANG_PATTERN = re.compile(r'<html[^>]*\slang=["\']?([\w-]+)', re.IGNORECASE)
+H1_PATTERN = re.compile(r'<h1\b[^>]*>(.*?)</h1>', re.IGNORECASE | re.DOTALL)
+H1_OPEN_PATTERN = re.compile(r'<h1\b[^>]*>', re.IGNORECASE)
+LD_JSON_PATTERN = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+ANCHOR_HREF_PATTERN = re.compile(r'<a\s[^>]*?\bhref\s*=\s*(["\'])(.*?)\1', re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+def strip_tags(html: str) -> str:
+    """Remove HTML tags and surrounding whitespace from a fragment"""
+    return TAG_PATTERN.sub('', html).strip()
+
+
+def read_text(path: Path) -> str:
+    """Read a page exactly as stored (line endings are preserved)"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def write_bytes(path: Path, data: bytes) -> None:
+    """
+    Replace a file atomically: the data goes to a temp file in the same folder
+    that is renamed over the original, so a crash leaves either the old or the
+    new file. Inside the site tree the original is kept in the rollback
+    journal first (see site_journal).
+    """
+    from site_journal import record_write
+
+    path = Path(path)
+    record_write(path, data)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_text(path: Path, content: str) -> None:
+    """Write a page without translating line endings (atomically, see write_bytes)"""
+    write_bytes(path, content.encode('utf-8'))
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 of a page source as stored on disk"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _schema_types(schema) -> List[str]:
+    """Collect every @type of a parsed ld+json value, including @graph members"""
+    types = []
+    if isinstance(schema, list):
+        for item in schema:
+            types.extend(_schema_types(item))
+    elif isinstance(schema, dict):
+        schema_type = schema.get('@type')
+        if isinstance(schema_type, list):
+            types.extend(t for t in schema_type if isinstance(t, str))
+        elif isinstance(schema_type, str):
+            types.append(schema_type)
+        if '@graph' in schema:
+            types.extend(_schema_types(schema['@graph']))
+    return types
+
+
+class Page:
+    """A single HTML page of the site, read and indexed on first use"""
+
+    def __init__(self, path: Path, base_dir: Path = BASE_DIR):
+        self.path = Path(path)
+        self.base_dir = Path(base_dir)
+        self.rel_path = self.path.relative_to(self.base_dir).as_posix()
+
+        parts = self.rel_path.split('/')
+        self.section = parts[0] if len(parts) > 1 else ROOT_SECTION
+        # <section>/<subfolder>/index.html pages (category articles and tools)
+        self.subfolder = parts[1] if len(parts) == 3 and parts[2] == 'index.html' else None
+
+        self._content: Optional[str] = None
+        self._disk_content: Optional[str] = None
+        self._index: Dict[str, object] = {}
+        # While set, write() only updates the in-memory source (see site_pipeline)
+        self.defer_writes = False
+        # Set by save() once the file has been rewritten
+        self.written = False
+
+    def __repr__(self) -> str:
+        return f"Page({self.rel_path!r})"
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def loaded(self) -> bool:
+        return self._content is not None
+
+    @property
+    def content(self) -> str:
+        """Page source, read from disk once"""
+        if self._content is None:
+            self._content = read_text(self.path)
+            self._disk_content = self._content
+        return self._content
+
+    @content.setter
+    def content(self, value: str) -> None:
+        """Replace the in-memory source and drop everything indexed from the old one"""
+        if self._content is None:
+            # Remember what is on disk so save() can tell whether to write
+            self._disk_content = read_text(self.path)
+        self._content = value
+        self._index = {}
+
+    @property
+    def dirty(self) -> bool:
+        """True when the in-memory source differs from the file on disk"""
+        return self._content is not None and self._content != self._disk_content
+
+    def save(self) -> bool:
+        """Write the in-memory source if it changed; returns True when written"""
+        if not self.dirty:
+            return False
+        write_text(self.path, self._content)
+        self._disk_content = self._content
+        self.written = True
+        return True
+
+    def write(self, new_content: str) -> bool:
+        """Replace the source and write it if it differs from the file on disk"""
+        self.content = new_content
+        if self.defer_writes:
+            return self.dirty
+        return self.save()
+
+    def fingerprint(self) -> Dict[str, object]:
+        """Size, mtime and content hash of the file as it is on disk"""
+        stat = self.path.stat()
+        content = self._disk_content if self._disk_content is not None else read_text(self.path)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': content_hash(content)}
+
+    def _parsed(self, key: str, parse: Callable[[str], object]):
+        if key not in self._index:
+            self._index[key] = parse(self.content)
+        return self._index[key]
+
+    # ------------------------------------------------------------------
+    # Indexed fields
+    # ------------------------------------------------------------------
+
+    @property
+    def head(self) -> str:
+        """Everything up to the closing </head> tag"""
+        def parse(content):
+            end = content.lower().find('</head>')
+            return content[:end] if end != -1 else ''
+        return self._parsed('head', parse)
+
+    @property
+    def title(self) -> Optional[str]:
+        def parse(content):
+            match = TITLE_PATTERN.search(content)
+            return match.group(1).strip() if match else None
+        return self._parsed('title', parse)
+
+    @property
+    def description(self) -> Optional[str]:
+        def parse(content):
+            match = DESCRIPTION_PATTERN.search(content)
+            return match.group(2).strip() if match else None
+        return self._parsed('description', parse)
+
+    @property
+    def canonical(self) -> Optional[str]:
+        def parse(content):
+            match = CANONICAL_PATTERN.search(content)
+            return match.group(2).strip() if match else None
+        return self._parsed('canonical', parse)
+
+    @property
+    def og_image(self) -> Optional[str]:
+        def parse(content):
+            match = OG_IMAGE_PATTERN.search(content)
+            return match.group(2).strip() if match else None
+        return self._parsed('og_image', parse)
+
+    @property
+    def robots(self) -> Optional[str]:
+        """Content of the robots meta tag (e.g. 'noindex, nofollow')"""
+        def parse(content):
+            match = ROBOTS_PATTERN.search(content)
+            return match.group(2).strip() if match else None
+        return self._parsed('robots', parse)
+
+    @property
+    def lang(self) -> Optional[str]:
+        def parse(content):
+            match = LANG_PATTERN.search(content[:2048])
+            return match.group(1) if match else None
+        return self._parsed('lang', parse)
+
+    @property
+    def h1_tags(self) -> List[str]:
+        """Opening <h1> tags, as counted by the duplicate-H1 checks"""
+        return self._parsed('h1_tags', H1_OPEN_PATTERN.findall)
+
+    @property
+    def h1s(self) -> List[str]:
+        """Text of every <h1> element with inner tags removed"""
+        return self._parsed('h1s', lambda c: [strip_tags(h) for h in H1_PATTERN.findall(c)])
+
+    @property
+    def hrefs(self) -> List[str]:
+        """href of every <a> element in document order, entities decoded"""
+        return self._parsed('hrefs', lambda c: [unescape(m.group(2)) for m in ANCHOR_HREF_PATTERN.finditer(c)])
+
+    @property
+    def ld_json(self) -> List[str]:
+        """Raw source of every application/ld+json block"""
+        return self._parsed('ld_json', lambda c: [b.strip() for b in LD_JSON_PATTERN.findall(c)])
+
+    @property
+    def schemas(self) -> List[object]:
+        """Parsed ld+json blocks; blocks that are not valid JSON are skipped"""
+        def parse(_content):
+            parsed = []
+            for block in self.ld_json:
+                try:
+                    parsed.append(json.loads(block))
+                except json.JSONDecodeError:
+                    continue
+            return parsed
+        return self._parsed('schemas', parse)
+
+    @property
+    def schema_types(self) -> List[str]:
+        """@type of every parsed ld+json block, in document order"""
+        def parse(_content):
+            types = []
+            for schema in self.schemas:
+                types.extend(_schema_types(schema))
+            return types
+        return self._parsed('schema_types', parse)
+
+    def find_schema(self, *types: str) -> Optional[dict]:
+        """First parsed ld+json object whose @type is one of types"""
+        for schema in self.schemas:
+            if isinstance(schema, dict) and schema.get('@type') in types:
+                return schema
+        return None
+
+    @property
+    def article_body(self) -> str:
+        """Source between the first <article> and the last </article>"""
+        def parse(content):
+            lower = content.lower()
+            start = lower.find('<article')
+            end = lower.rfind('</article>')
+            if start == -1 or end == -1 or end < start:
+                return ''
+            start = content.find('>', start) + 1
+            return content[start:end]
+        return self._parsed('article_body', parse)
+
+
+class Corpus:
+    """All pages of the site, discovered with one walk of the tree"""
+
+    def __init__(self, base_dir: Path = BASE_DIR):
+        self.base_dir = Path(base_dir).resolve()
+        self._pages: Optional[Dict[str, Page]] = None
+
+    def _discover(self) -> Dict[str, Page]:
+        pages = {}
+        with stage('discover pages'):
+            for root, dirs, files in os.walk(self.base_dir):
+                dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS and not d.startswith('.'))
+                for file in sorted(files):
+                    if not file.endswith('.html'):
+                        continue
+                    page = Page(Path(root) / file, self.base_dir)
+                    if page.rel_path not in EXCLUDED_FILES:
+                        pages[page.rel_path] = page
+        return pages
+
+    @property
+    def by_path(self) -> Dict[str, Page]:
+        if self._pages is None:
+            self._pages = self._discover()
+        return self._pages
+
+    def __iter__(self) -> Iterator[Page]:
+        return iter(self.by_path.values())
+
+    def __len__(self) -> int:
+        return len(self.by_path)
+
+    def get(self, rel_path: str) -> Optional[Page]:
+        """Page by its path relative to the repository root"""
+        return self.by_path.get(Path(rel_path).as_posix())
+
+    def pages(self, *sections: str) -> List[Page]:
+        """Every page, or only the pages of the given sections"""
+        if not sections:
+            return list(self)
+        return [page for page in self if page.section in sections]
+
+    def section_index(self, section: str) -> Optional[Page]:
+        """The <section>/index.html landing page"""
+        return self.get(f"{section}/index.html")
+
+    def subfolder_pages(self, section: str) -> List[Page]:
+        """<section>/<subfolder>/index.html pages, sorted by subfolder"""
+        return [page for page in self if page.section == section and page.subfolder]
+
+    def jain_docs_pages(self) -> List[Page]:
+        """Pages in Jain Docs/Pages (the section index is not included)"""
+        return [page for page in self if page.rel_path.startswith('Jain Docs/Pages/')]
+
+
+_CORPORA: Dict[Path, Corpus] = {}
+
+
+def load_corpus(base_dir: Path = BASE_DIR) -> Corpus:
+    """Shared corpus for base_dir; scripts in the same process reuse it"""
+    key = Path(base_dir).resolve()
+    if key not in _CORPORA:
+        _CORPORA[key] = Corpus(key)
+    return _CORPORA[key]
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+A small CSS reader for the stylesheet build stages.
+
+The site's stylesheets are plain CSS: rules, @media blocks and @keyframes.
+parse_stylesheet() splits a sheet into its top-level statements without
+losing a byte - each Statement keeps its source text together with the
+comments and whitespace in front of it, so ''.join(s.text for s in sheet)
+is the original file - and parses the rules inside @media blocks as
+statements of their own.
+
+On top of that:
+
+    statement.key           the statement without comments and with
+                            whitespace collapsed: identical rules in
+                            different files have the same key
+    split_selectors(text)   a selector list, split on its top-level commas
+    specificity(selector)   (ids, classes/attributes/pseudo-classes, types)
+    required_names(sel)     the types, ids and classes a page needs for
+                            the selector to match anything
+    declarations(body)      (property, value, important) of a rule body
+    minify(css)             the same sheet without comments and optional
+                            whitespace, for inlining into a page
+    can_reorder(a, b)       whether swapping two statements can never change
+                            the cascade (see below)
+
+can_reorder() is conservative: two statements may swap when no property of
+one could override the same property of the other on the same element at
+equal specificity and importance. Shorthands and longhands count as the same
+property (margin / margin-top), and two selectors are only taken to match
+different elements when their subjects have different element types or ids,
+target different pseudo-elements or - when the caller passes what the
+markup tells (classes_may_meet) - carry classes no element has together.
+
+Usage from a script in this folder:
+
+    from site_css import parse_stylesheet
+
+    sheet = parse_stylesheet(read_text(path))
+    for statement in sheet.statements:
+        print(statement.prelude, len(statement.text))
+"""
+
+import re
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+STRING_PATTERN = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+# A string (kept) or a comment (dropped), whichever starts first
+STRING_OR_COMMENT_PATTERN = re.compile(STRING_PATTERN.pattern + r'|/\*.*?\*/', re.DOTALL)
+# Whitespace no parser needs: around braces, semicolons, commas and child combinators
+OPTIONAL_SPACE_PATTERN = re.compile(r' ?([{};,>]) ?')
+
+# At-rules whose block holds rules (parsed as nested statements)
+GROUPING_AT_RULES = {'media', 'supports', 'container', 'layer', 'document'}
+
+# Pseudo-elements that may be written with a single colon
+LEGACY_PSEUDO_ELEMENTS = {'before', 'after', 'first-line', 'first-letter'}
+
+# Longhands that do not start with the name of their shorthand
+PROPERTY_ALIASES = {
+    'top': 'inset', 'right': 'inset', 'bottom': 'inset', 'left': 'inset',
+    'row-gap': 'gap', 'column-gap': 'gap', 'grid-gap': 'gap',
+    'column-count': 'columns', 'column-width': 'columns',
+}
+
+Specificity = Tuple[int, int, int]
+
+
+def strip_comments(css: str) -> str:
+    return COMMENT_PATTERN.sub('', css)
+
+
+def collapse(text: str) -> str:
+    """Text without comments and with runs of whitespace as one space"""
+    return WHITESPACE_PATTERN.sub(' ', strip_comments(text)).strip()
+
+
+def minify(css: str) -> str:
+    """The sheet without comments and optional whitespace; strings are left as they are"""
+    css = STRING_OR_COMMENT_PATTERN.sub(lambda match: match.group(1) or '', css)
+    parts = STRING_PATTERN.split(css)
+    for index in range(0, len(parts), 2):
+        parts[index] = OPTIONAL_SPACE_PATTERN.sub(r'\1', WHITESPACE_PATTERN.sub(' ', parts[index]))
+    return ''.join(parts).replace(';}', '}').strip()
+
+
+class Statement:
+    """One top-level statement of a stylesheet: a rule, an at-rule block or an at-rule"""
+
+    def __init__(self, leading: str, source: str, prelude: str, body: Optional[str]):
+        self.leading = leading
+        self.source = source
+        self.prelude = collapse(prelude)
+        self.body = body
+        self.at_name = self.prelude[1:].split(' ', 1)[0].split('(', 1)[0].lower() if self.prelude.startswith('@') else None
+        self.children: List['Statement'] = []
+        self._children_trailing = ''
+        if self.at_name in GROUPING_AT_RULES and body is not None:
+            sheet = parse_stylesheet(body)
+            self.children = sheet.statements
+            self._children_trailing = sheet.trailing
+        self._key: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return f"Statement({self.prelude[:40]!r})"
+
+    @property
+    def text(self) -> str:
+        return self.leading + self.source
+
+    @property
+    def key(self) -> str:
+        if self._key is None:
+            self._key = collapse(self.source)
+        return self._key
+
+    @property
+    def is_rule(self) -> bool:
+        return self.at_name is None
+
+    def with_children(self, children: List['Statement']) -> str:
+        """Source of a grouping at-rule (@media) holding only the given statements of its block"""
+        head = self.source[:len(self.source) - len(self.body) - 1]
+        return head + ''.join(child.text for child in children) + self._children_trailing + self.source[-1]
+
+
+class Stylesheet:
+    """The statements of a stylesheet and whatever follows the last one"""
+
+    def __init__(self, statements: List[Statement], trailing: str):
+        self.statements = statements
+        self.trailing = trailing
+
+    @property
+    def text(self) -> str:
+        return ''.join(statement.text for statement in self.statements) + self.trailing
+
+
+def _skip_leading(css: str, start: int) -> int:
+    """Position of the first character after the whitespace and comments at start"""
+    position = start
+    while True:
+        while position < len(css) and css[position].isspace():
+            position += 1
+        if css.startswith('/*', position):
+            end = css.find('*/', position + 2)
+            position = len(css) if end < 0 else end + 2
+        else:
+            return position
+
+
+def parse_stylesheet(css: str) -> Stylesheet:
+    """Split a stylesheet into its top-level statements (see the module docstring)"""
+    statements = []
+    start = 0
+    while True:
+        begin = _skip_leading(css, start)
+        if begin >= len(css):
+            return Stylesheet(statements, css[start:])
+        position = begin
+        depth = 0
+        quote = None
+        brace = -1
+        while position < len(css):
+            char = css[position]
+            if quote:
+                if char == '\\':
+                    position += 1
+                elif char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif css.startswith('/*', position):
+                end = css.find('*/', position + 2)
+                position = len(css) - 1 if end < 0 else end + 1
+            elif char == '{':
+                if depth == 0:
+                    brace = position
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth <= 0:
+                    break
+            elif char == ';' and depth == 0:
+                break
+            position += 1
+        end = min(position + 1, len(css))
+        if brace >= 0:
+            statements.append(Statement(css[start:begin], css[begin:end], css[begin:brace], css[brace + 1:end - 1]))
+        else:
+            statements.append(Statement(css[start:begin], css[begin:end], css[begin:end].rstrip(';'), None))
+        start = end
+
+
+def _split_top_level(text: str, separator: str) -> List[str]:
+    """Split on separator outside parentheses, brackets and strings"""
+    parts = []
+    depth = 0
+    quote = None
+    current = []
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append(''.join(current))
+    return parts
+
+
+def split_selectors(prelude: str) -> List[str]:
+    """The selectors of a selector list"""
+    return [selector.strip() for selector in _split_top_level(collapse(prelude), ',') if selector.strip()]
+
+
+def declarations(body: str) -> List[Tuple[str, str, bool]]:
+    """(property, value, important) of every declaration of a rule body"""
+    result = []
+    for declaration in _split_top_level(strip_comments(body), ';'):
+        name, colon, value = declaration.partition(':')
+        if not colon or not name.strip():
+            continue
+        value = value.strip()
+        important = bool(re.search(r'!\s*important\s*$', value, re.IGNORECASE))
+        if important:
+            value = re.sub(r'\s*!\s*important\s*$', '', value, flags=re.IGNORECASE)
+        result.append((name.strip().lower() if not name.strip().startswith('--') else name.strip(), value, important))
+    return result
+
+
+# Simple selectors: #id, .class, [attr], ::pseudo-element, :pseudo(...), type or *
+SIMPLE_SELECTOR_PATTERN = re.compile(
+    r'#(?P<id>[\w-]+)|\.(?P<cls>[\w-]+)|(?P<attr>\[[^\]]*\])|::(?P<element>[\w-]+)'
+    r'|:(?P<pseudo>[\w-]+)(?P<args>\()?|(?P<type>[\w-]+|\*)'
+)
+
+
+def _matching_paren(text: str, start: int) -> int:
+    """Index just past the parenthesis closing the one before start"""
+    depth = 1
+    position = start
+    while position < len(text) and depth:
+        if text[position] == '(':
+            depth += 1
+        elif text[position] == ')':
+            depth -= 1
+        position += 1
+    return position
+
+
+def specificity(selector: str) -> Specificity:
+    """Specificity of one selector; :is/:not/:has count their most specific argument, :where nothing"""
+    ids = classes = types = 0
+    position = 0
+    while position < len(selector):
+        match = SIMPLE_SELECTOR_PATTERN.match(selector, position)
+        if not match:
+            position += 1
+            continue
+        position = match.end()
+        if match.group('id'):
+            ids += 1
+        elif match.group('cls') or match.group('attr'):
+            classes += 1
+        elif match.group('element'):
+            types += 1
+        elif match.group('pseudo'):
+            name = match.group('pseudo').lower()
+            if match.group('args'):
+                end = _matching_paren(selector, position)
+                arguments = selector[position:end - 1]
+                position = end
+                if name in ('is', 'not', 'has', 'matches'):
+                    inner = max((specificity(s) for s in split_selectors(arguments)), default=(0, 0, 0))
+                    ids, classes, types = ids + inner[0], classes + inner[1], types + inner[2]
+                elif name != 'where':
+                    classes += 1
+            elif name in LEGACY_PSEUDO_ELEMENTS:
+                types += 1
+            else:
+                classes += 1
+        elif match.group('type') and match.group('type') != '*':
+            types += 1
+    return ids, classes, types
+
+
+def subject(selector: str) -> str:
+    """The last compound selector: the part that names the element styled"""
+    depth = 0
+    quote = None
+    for position in range(len(selector) - 1, -1, -1):
+        char = selector[position]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in ')]':
+            depth += 1
+        elif char in '([':
+            depth -= 1
+        elif depth == 0 and (char.isspace() or char in '>+~'):
+            return selector[position + 1:]
+    return selector
+
+
+def required_names(selector: str) -> Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[str]]:
+    """
+    (types, ids, classes) a document must contain for the selector to match
+    anything: those of every compound, not those inside :not(), :is() and
+    the other functional pseudo-classes
+    """
+    types, ids, classes = set(), set(), set()
+    position = 0
+    while position < len(selector):
+        match = SIMPLE_SELECTOR_PATTERN.match(selector, position)
+        if not match:
+            position += 1
+            continue
+        position = match.end()
+        if match.group('args'):
+            position = _matching_paren(selector, position)
+        elif match.group('id'):
+            ids.add(match.group('id'))
+        elif match.group('cls'):
+            classes.add(match.group('cls'))
+        elif match.group('type') and match.group('type') != '*':
+            types.add(match.group('type').lower())
+    return frozenset(types), frozenset(ids), frozenset(classes)
+
+
+def subject_traits(selector: str) -> Tuple[Optional[str], Optional[str], Optional[str], FrozenSet[str]]:
+    """(element type, id, pseudo-element, classes) of a selector's subject, None where unspecified"""
+    compound = subject(selector)
+    element_type = element_id = pseudo_element = None
+    classes = set()
+    position = 0
+    while position < len(compound):
+        match = SIMPLE_SELECTOR_PATTERN.match(compound, position)
+        if not match:
+            position += 1
+            continue
+        position = match.end()
+        if match.group('args'):
+            position = _matching_paren(compound, position)
+        elif match.group('type') and match.group('type') != '*' and match.start() == 0:
+            element_type = match.group('type').lower()
+        elif match.group('id'):
+            element_id = match.group('id')
+        elif match.group('cls'):
+            classes.add(match.group('cls'))
+        elif match.group('element'):
+            pseudo_element = match.group('element').lower()
+        elif match.group('pseudo') and match.group('pseudo').lower() in LEGACY_PSEUDO_ELEMENTS:
+            pseudo_element = match.group('pseudo').lower()
+    return element_type, element_id, pseudo_element, frozenset(classes)
+
+
+ClassCheck = Callable[[FrozenSet[str]], bool]
+
+
+def disjoint(first: str, second: str, classes_may_meet: Optional[ClassCheck] = None) -> bool:
+    """
+    Whether two selectors can never style the same box. CSS alone cannot rule
+    out an element carrying both of two classes; classes_may_meet, given the
+    classes of both subjects, answers that from the markup when the caller
+    knows it.
+    """
+    type_a, id_a, element_a, classes_a = subject_traits(first)
+    type_b, id_b, element_b, classes_b = subject_traits(second)
+    if element_a != element_b:
+        return True
+    if type_a and type_b and type_a != type_b:
+        return True
+    if id_a and id_b and id_a != id_b:
+        return True
+    return bool(classes_may_meet and classes_a and classes_b and not classes_may_meet(classes_a | classes_b))
+
+
+def property_root(name: str) -> str:
+    """The shorthand a property belongs to: margin-top -> margin, -webkit-transition -> transition"""
+    if name.startswith('--'):
+        return name
+    if name.startswith('-') and name.count('-') >= 2:
+        name = name.split('-', 2)[2]
+    if name in PROPERTY_ALIASES:
+        return PROPERTY_ALIASES[name]
+    return name.split('-', 1)[0]
+
+
+# What a statement does to the cascade: ('rule', selector, {root: {(important, specificity)}}),
+# ('keyframes', name) or ('opaque',) for at-rules that must keep their place
+Effect = Tuple
+
+
+def effects(statement: Statement) -> List[Effect]:
+    result = []
+    if statement.is_rule:
+        parsed = declarations(statement.body or '')
+        for selector in split_selectors(statement.prelude):
+            selector_specificity = specificity(selector)
+            roots: Dict[str, Set[Tuple[bool, Specificity]]] = {}
+            for name, _value, important in parsed:
+                # place-items sets both align-items and justify-items
+                for root in (('align', 'justify') if name.startswith('place-') else (property_root(name),)):
+                    roots.setdefault(root, set()).add((important, selector_specificity))
+            result.append(('rule', selector, roots))
+    elif statement.at_name in GROUPING_AT_RULES:
+        for child in statement.children:
+            result.extend(effects(child))
+    elif statement.at_name and statement.at_name.endswith('keyframes'):
+        result.append(('keyframes', statement.prelude.split(' ', 1)[-1]))
+    else:
+        result.append(('opaque',))
+    return result
+
+
+_EFFECTS_CACHE: Dict[str, List[Effect]] = {}
+
+
+def cached_effects(statement: Statement) -> List[Effect]:
+    key = statement.key
+    if key not in _EFFECTS_CACHE:
+        _EFFECTS_CACHE[key] = effects(statement)
+    return _EFFECTS_CACHE[key]
+
+
+def property_roots(statement: Statement) -> FrozenSet[str]:
+    """Every property root a statement sets (for a quick no-overlap test)"""
+    roots = set()
+    for effect in cached_effects(statement):
+        if effect[0] == 'rule':
+            roots.update(effect[2])
+        else:
+            roots.add('@' + effect[0])
+    return frozenset(roots)
+
+
+def can_reorder(first: Statement, second: Statement, classes_may_meet: Optional[ClassCheck] = None) -> bool:
+    """Whether the order of two statements can never make a difference to the cascade (see disjoint())"""
+    for effect_a in cached_effects(first):
+        for effect_b in cached_effects(second):
+            if effect_a[0] == 'opaque' or effect_b[0] == 'opaque':
+                return False
+            if effect_a[0] == 'keyframes' or effect_b[0] == 'keyframes':
+                if effect_a == effect_b:
+                    return False
+                continue
+            roots_a, roots_b = effect_a[2], effect_b[2]
+            common = set(roots_a) & set(roots_b)
+            if 'all' in roots_a or 'all' in roots_b:
+                common = set(roots_a) | set(roots_b)
+            for root in common:
+                if roots_a.get(root, roots_a.get('all', set())) & roots_b.get(root, roots_b.get('all', set())):
+                    if not disjoint(effect_a[1], effect_b[1], classes_may_meet):
+                        return False
+    return True
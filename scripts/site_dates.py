@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Publication and modification dates of the site's files from git history.
+
+One batched `git log --name-only` walk over the repository records, for every
+path, the date of the first and of the last commit that touched it. The
+result is cached in .site-cache/git-dates.json keyed by the HEAD commit: while
+HEAD is unchanged the cache is used as is, and after new commits only the
+commits since the cached HEAD are walked. File modification times are not
+used because every checkout resets them.
+
+Root commits are not history: the commit that imported the site into the
+repository (or the cut-off commit of a shallow clone) says when the files
+were imported, not when they were written or changed. A path a root commit
+added has no publication date, and a path no other commit touched has no
+modification date either; callers keep the date the page already carries,
+or leave it out. Files git does not know (untracked, or a tree outside a
+repository) have no dates at all; callers fall back to their own defaults.
+
+Usage from a script in this folder:
+
+    from site_dates import git_dates
+
+    dates = git_dates()
+    published, modified = dates.dates('TECHNOLOGY/APIs/index.html') or (default, default)
+    # either may be None: imported with the site, no later commit
+    lastmod = dates.modified('Jain Docs/Pages/Acharya Vandana.html')
+"""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from site_corpus import BASE_DIR, CACHE_DIR
+
+DATES_PATH = CACHE_DIR / 'git-dates.json'
+
+# Separates the commits in the `git log` output (fields are NUL-separated with -z)
+RECORD_SEPARATOR = '\x1e'
+
+# Bump when the layout or the meaning of the cache file changes
+CACHE_VERSION = 2
+
+
+class GitDates:
+    """First and last commit date of every path of a repository, from one `git log` walk"""
+
+    def __init__(self, base_dir: Path = BASE_DIR, path: Path = DATES_PATH):
+        self.base_dir = Path(base_dir).resolve()
+        self.path = Path(path)
+        # rel_path -> [first commit date, last commit date] (ISO 8601 author dates),
+        # None where a root commit is all there is (see above)
+        self.files: Dict[str, List[Optional[str]]] = {}
+        self.head: Optional[str] = None
+        self._load()
+
+    def _git(self, *args: str) -> Optional[str]:
+        try:
+            return subprocess.run(['git', '-C', str(self.base_dir), *args], capture_output=True,
+                                  text=True, encoding='utf-8', check=True).stdout
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def _walk(self, revisions: str) -> Dict[str, List[Optional[str]]]:
+        """Dates per path over the commits of revisions (newest commit first)"""
+        output = self._git('log', revisions, '--no-renames', '--name-only', '-z', '--relative',
+                           f"--format={RECORD_SEPARATOR}%aI %P")
+        files: Dict[str, List[Optional[str]]] = {}
+        for record in (output or '').split(RECORD_SEPARATOR):
+            header, _, names = record.partition('\0')
+            date, _, parents = header.partition(' ')
+            # A root commit imported the file: it dates neither its writing nor its changes
+            if not parents.strip():
+                date = None
+            for name in names.split('\0'):
+                name = name.lstrip('\n')
+                if not name:
+                    continue
+                if name in files:
+                    files[name][0] = date
+                else:
+                    files[name] = [date, date]
+        return files
+
+    def _load(self) -> None:
+        """Read the cache and walk whatever history it does not cover yet"""
+        head = self._git('rev-parse', 'HEAD')
+        if head is None:
+            return
+        head = head.strip()
+
+        cached: Dict[str, object] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if cached.get('version') != CACHE_VERSION or cached.get('base_dir') != str(self.base_dir):
+            cached = {}
+
+        self.head = head
+        cached_head = cached.get('head')
+        if cached_head == head:
+            self.files = cached['files']
+            return
+
+        # New commits on top of the cached HEAD: only they need walking
+        if cached_head and self._git('merge-base', '--is-ancestor', cached_head, head) is not None:
+            self.files = cached['files']
+            for name, (first, last) in self._walk(f"{cached_head}..{head}").items():
+                if name in self.files:
+                    self.files[name][1] = last or self.files[name][1]
+                else:
+                    self.files[name] = [first, last]
+        else:
+            self.files = self._walk(head)
+        self.save()
+
+    def save(self) -> None:
+        """Write the cache atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'base_dir': str(self.base_dir), 'head': self.head,
+                       'files': self.files}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def dates(self, rel_path: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """(published, modified) as YYYY-MM-DD, either None without history, or None for a path git does not know"""
+        entry = self.files.get(rel_path)
+        if entry is None:
+            return None
+        return self.published(rel_path), self.modified(rel_path)
+
+    def published(self, rel_path: str) -> Optional[str]:
+        """Date of the commit that added rel_path as YYYY-MM-DD (None when a root commit did)"""
+        entry = self.files.get(rel_path)
+        return entry[0][:10] if entry and entry[0] else None
+
+    def modified(self, rel_path: str) -> Optional[str]:
+        """Date of the last commit of rel_path as YYYY-MM-DD (None when that is a root commit)"""
+        entry = self.files.get(rel_path)
+        return entry[1][:10] if entry and entry[1] else None
+
+    def modified_at(self, rel_path: str) -> Optional[str]:
+        """Full ISO 8601 timestamp of the last commit of rel_path (for sitemap lastmod)"""
+        entry = self.files.get(rel_path)
+        return entry[1] if entry else None
+
+
+# One walk per process, per site tree
+_GIT_DATES: Dict[Path, GitDates] = {}
+
+
+def git_dates(base_dir: Path = BASE_DIR) -> GitDates:
+    """The shared GitDates of a site tree, loaded on first use"""
+    base_dir = Path(base_dir).resolve()
+    if base_dir not in _GIT_DATES:
+        path = DATES_PATH if base_dir == BASE_DIR else base_dir / '.site-cache' / 'git-dates.json'
+        _GIT_DATES[base_dir] = GitDates(base_dir, path)
+    return _GIT_DATES[base_dir]
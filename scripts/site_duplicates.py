@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection over the whole corpus with MinHash and LSH banding.
+
+Each page's main content (<main>, else the article, else the body; site
+chrome and the related-articles block left out) is reduced to the set of its
+word shingles: every run of SHINGLE_SIZE consecutive words (site_text.words,
+so Hindi and Hinglish pages shingle as well as English ones). Shingles are
+hashed to 64 bits in NumPy - each distinct word gets a stable blake2b id, a
+shingle is a polynomial of its word ids - and the set is summarised by a
+MinHash signature: for NUM_PERM hash functions (a*x + b mod 2^64, top 32
+bits) the minimum over the page's shingles. The share of positions on which
+two signatures agree estimates the Jaccard similarity of the two sets.
+
+Signatures are cached by content hash in .site-cache/minhash-signatures.npz,
+so only pages whose content changed since the last run are read again (the
+hashes come from the page index, see site_index.py).
+
+Candidate pairs come from LSH banding: the signature is cut into bands of
+rows; pages whose band hashes alike land in the same bucket, and only pages
+sharing a bucket are compared. The band/row split is picked from the
+similarity threshold, so pairs above it are found with high probability
+without comparing all n^2 pairs.
+
+For every pair at or above the threshold the report gives the estimated
+Jaccard similarity and the overlap: the share of the smaller page's shingles
+also found in the other page (|A & B| estimated from the Jaccard and the
+exact set sizes). Pairs are grouped into clusters with union-find.
+
+Usage from a script in this folder:
+
+    from site_duplicates import find_duplicates
+
+    report = find_duplicates(open_index().records(), load_corpus(BASE_DIR), threshold=0.6)
+    for cluster in report['clusters']:
+        print(cluster['pages'], [(pair['a'], pair['b'], pair['overlap']) for pair in cluster['pairs']])
+"""
+
+import hashlib
+import io
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from site_corpus import CACHE_DIR, Corpus, Page
+from site_manifest import source_version
+from site_parallel import DEFAULT_JOBS, map_pages
+from site_related import RELATED_BLOCK_PATTERN
+from site_search import CHROME_PATTERN, page_main
+from site_text import html_text, words
+
+SIGNATURES_PATH = CACHE_DIR / 'minhash-signatures.npz'
+
+# Words per shingle: long enough that shared phrasing ("in this article") alone
+# does not make two pages similar
+SHINGLE_SIZE = 5
+
+# Hash functions per signature; the standard error of the Jaccard estimate is
+# about sqrt(J(1 - J) / NUM_PERM), under 0.045
+NUM_PERM = 128
+
+# Seed of the hash function coefficients: part of the cache version
+SEED = 20251031
+
+# Shingles hashed per block: bounds memory to NUM_PERM x block uint64s
+BLOCK_SHINGLES = 8192
+
+DEFAULT_THRESHOLD = 0.5
+
+# Multiplier of the shingle polynomial (odd, so multiplying mod 2^64 loses nothing)
+SHINGLE_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _coefficients() -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(SEED)
+    a = rng.integers(1, 2 ** 63, size=NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=NUM_PERM, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+_A, _B = _coefficients()
+
+
+def duplicates_version() -> str:
+    """Cache version: the extraction and hashing code and their settings"""
+    scripts_dir = Path(__file__).resolve().parent
+    return source_version([scripts_dir / name for name in ('site_duplicates.py', 'site_search.py', 'site_text.py')],
+                          f"{SHINGLE_SIZE}:{NUM_PERM}:{SEED}")
+
+
+def main_text(page: Page) -> str:
+    """Visible text of the page's main content, without chrome or the related-articles block"""
+    return html_text(CHROME_PATTERN.sub(' ', RELATED_BLOCK_PATTERN.sub('', page_main(page))))
+
+
+def word_ids(tokens: Sequence[str]) -> np.ndarray:
+    """Stable 64-bit id of every word (blake2b, computed once per distinct word)"""
+    ids: Dict[str, int] = {}
+    for token in tokens:
+        if token not in ids:
+            ids[token] = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+    return np.fromiter((ids[token] for token in tokens), dtype=np.uint64, count=len(tokens))
+
+
+def shingle_hashes(tokens: Sequence[str], size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Distinct 64-bit hashes of the word shingles of a text (one shingle if it is shorter than size)"""
+    ids = word_ids(tokens)
+    if len(ids) == 0:
+        return ids
+    width = min(size, len(ids))
+    count = len(ids) - width + 1
+    hashes = ids[:count].copy()
+    for offset in range(1, width):
+        # uint64 arithmetic wraps, which is the mod 2^64 we want
+        hashes *= SHINGLE_MULTIPLIER
+        hashes += ids[offset:offset + count]
+    return np.unique(hashes)
+
+
+def minhash(hashes: np.ndarray) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint32s) of a set of shingle hashes"""
+    signature = np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint32)
+    for start in range(0, len(hashes), BLOCK_SHINGLES):
+        block = hashes[None, start:start + BLOCK_SHINGLES]
+        permuted = ((_A * block + _B) >> np.uint64(32)).astype(np.uint32)
+        np.minimum(signature, permuted.min(axis=1), out=signature)
+    return signature
+
+
+def page_signature(page: Page) -> Dict[str, object]:
+    """Signature and shingle count of a page's main content (run in the workers)"""
+    hashes = shingle_hashes(words(main_text(page)))
+    return {'signature': minhash(hashes).tolist(), 'shingles': int(len(hashes))}
+
+
+class SignatureCache:
+    """MinHash signatures by content hash, valid while the code and settings are unchanged"""
+
+    def __init__(self, path: Path = SIGNATURES_PATH):
+        self.path = Path(path)
+        self.version = duplicates_version()
+        self.signatures: Dict[str, Tuple[np.ndarray, int]] = {}
+        self.computed = 0
+        try:
+            with np.load(self.path) as data:
+                if str(data['version']) == self.version:
+                    for sha, signature, count in zip(data['hashes'], data['signatures'], data['shingles']):
+                        self.signatures[str(sha)] = (signature, int(count))
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def update(self, pages: List[Page], hashes: Dict[str, str], jobs: int = DEFAULT_JOBS) -> List[str]:
+        """Compute the signatures missing for the given pages; returns error messages"""
+        todo = [page for page in pages if hashes[page.rel_path] not in self.signatures]
+        errors = []
+        for result in map_pages(page_signature, todo, jobs, echo=False):
+            if result['status'] == 'error':
+                errors.append(f"{result['path']}: {result['message']}")
+                continue
+            value = result['value']
+            self.signatures[hashes[result['path']]] = (np.array(value['signature'], dtype=np.uint32),
+                                                       value['shingles'])
+            self.computed += 1
+        return errors
+
+    def save(self, keep: Iterable[str]) -> None:
+        """Write the cache, keeping only the given content hashes"""
+        keep = sorted(sha for sha in set(keep) if sha in self.signatures)
+        buffer = io.BytesIO()
+        np.savez(buffer, version=np.array(self.version),
+                 hashes=np.array(keep, dtype='U64'),
+                 signatures=np.array([self.signatures[sha][0] for sha in keep], dtype=np.uint32).reshape(-1, NUM_PERM),
+                 shingles=np.array([self.signatures[sha][1] for sha in keep], dtype=np.int64))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.npz.tmp')
+        tmp_path.write_bytes(buffer.getvalue())
+        os.replace(tmp_path, self.path)
+
+
+def band_layout(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """
+    (bands, rows) for a similarity threshold. A pair of similarity s shares a
+    bucket with probability 1 - (1 - s^rows)^bands, which rises steeply around
+    (1 / bands)^(1 / rows); the layout whose rise lies just below the
+    threshold keeps recall high with the fewest candidates.
+    """
+    layouts = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [(bands, rows) for bands, rows in layouts if (1 / bands) ** (1 / rows) <= threshold]
+    if not below:
+        return layouts[0]
+    return max(below, key=lambda layout: (1 / layout[0]) ** (1 / layout[1]))
+
+
+def candidate_pairs(signatures: np.ndarray, bands: int, rows: int) -> List[Tuple[int, int]]:
+    """Index pairs of signatures that share at least one band bucket"""
+    pairs = set()
+    for band in range(bands):
+        buckets: Dict[bytes, List[int]] = defaultdict(list)
+        block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        for index, key in enumerate(block):
+            buckets[key.tobytes()].append(index)
+        for members in buckets.values():
+            for i, first in enumerate(members):
+                for second in members[i + 1:]:
+                    pairs.add((first, second))
+    return sorted(pairs)
+
+
+def overlap(jaccard: float, size_a: int, size_b: int) -> float:
+    """Share of the smaller set found in the other, from the Jaccard similarity and the set sizes"""
+    if not size_a or not size_b:
+        return 0.0
+    shared = jaccard / (1 + jaccard) * (size_a + size_b)
+    return min(1.0, shared / min(size_a, size_b))
+
+
+def clusters_of(paths: List[str], pairs: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Group the pairs into connected clusters, largest and most similar first"""
+    parent = list(range(len(paths)))
+    position = {path: index for index, path in enumerate(paths)}
+
+    def root(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for pair in pairs:
+        a, b = root(position[pair['a']]), root(position[pair['b']])
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+
+    groups: Dict[int, Dict[str, object]] = {}
+    for pair in pairs:
+        group = groups.setdefault(root(position[pair['a']]), {'pages': set(), 'pairs': []})
+        group['pages'].update((pair['a'], pair['b']))
+        group['pairs'].append(pair)
+
+    clusters = []
+    for group in groups.values():
+        members = sorted(group['pages'], key=position.get)
+        group_pairs = sorted(group['pairs'], key=lambda pair: -pair['jaccard'])
+        clusters.append({
+            'pages': members,
+            'max_jaccard': group_pairs[0]['jaccard'],
+            'max_overlap': max(pair['overlap'] for pair in group_pairs),
+            'pairs': group_pairs,
+        })
+    clusters.sort(key=lambda cluster: (-len(cluster['pages']), -cluster['max_jaccard'], cluster['pages'][0]))
+    return clusters
+
+
+def find_duplicates(
+    records: Sequence,
+    corpus: Corpus,
+    threshold: float = DEFAULT_THRESHOLD,
+    jobs: int = DEFAULT_JOBS,
+    cache: Optional[SignatureCache] = None,
+    min_shingles: int = 1
+) -> Dict[str, object]:
+    """
+    Near-duplicate clusters among the pages of the given index records
+    (anything with .path and .sha256). Returns the clusters with some
+    statistics: pages compared, signatures computed this run, candidate
+    pairs, band layout and errors.
+    """
+    cache = cache or SignatureCache()
+    hashes = {record.path: record.sha256 for record in records}
+    pages = [corpus.get(path) for path in hashes]
+    pages = [page for page in pages if page is not None]
+    errors = cache.update(pages, hashes, jobs)
+    cache.save(hashes.values())
+
+    paths = [page.rel_path for page in pages
+             if hashes[page.rel_path] in cache.signatures
+             and cache.signatures[hashes[page.rel_path]][1] >= min_shingles]
+    if paths:
+        signatures = np.stack([cache.signatures[hashes[path]][0] for path in paths])
+    else:
+        signatures = np.zeros((0, NUM_PERM), dtype=np.uint32)
+    sizes = [cache.signatures[hashes[path]][1] for path in paths]
+
+    bands, rows = band_layout(threshold)
+    candidates = candidate_pairs(signatures, bands, rows)
+    pairs = []
+    if candidates:
+        first, second = np.array(candidates).T
+        similarities = (signatures[first] == signatures[second]).mean(axis=1)
+        for a, b, jaccard in zip(first.tolist(), second.tolist(), similarities.tolist()):
+            if jaccard >= threshold:
+                pairs.append({'a': paths[a], 'b': paths[b], 'jaccard': round(jaccard, 4),
+                              'overlap': round(overlap(jaccard, sizes[a], sizes[b]), 4),
+                              'shingles': [sizes[a], sizes[b]]})
+
+    return {
+        'threshold': threshold,
+        'bands': bands,
+        'rows': rows,
+        'pages': len(paths),
+        'computed': cache.computed,
+        'candidates': len(candidates),
+        'pairs': len(pairs),
+        'clusters': clusters_of(paths, pairs),
+        'errors': errors,
+    }
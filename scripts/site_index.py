@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Persistent page index (SQLite) for the verify scripts and site reports.
+
+One row per page holds what the audits ask about - canonical, robots meta,
+title, description, lang, h1 count, word count, schema types, ad-block
+count - plus the file's size, mtime and hash. The ld+json objects are stored
+too, so the schema verifiers never open the HTML:
+
+    pages(path, sort_key, section, subfolder, canonical, robots, title, lang, description,
+          description_length, h1_count, word_count, ad_blocks,
+          size, mtime_ns, sha256)
+    schemas(path, position, type, body)       -- top-level ld+json objects
+    schema_types(path, type)                  -- every @type, @graph included
+    links(path, position, href, kind, target) -- <a href>s, normalised (see site_links.py)
+
+update() only re-reads pages whose size or mtime changed (and only
+re-extracts those whose hash changed), and drops rows of deleted pages, so a
+settled site is brought up to date with one stat per file. The index lives in
+.site-cache/site-index.sqlite and is rebuilt from scratch when this module,
+site_corpus.py, site_links.py, site_text.py or the URL rules in vercel.json
+change.
+
+Usage from a script in this folder:
+
+    from site_index import open_index
+
+    index = open_index()                       # updated from the working tree
+    for record in index.records(section='TECHNOLOGY', subfolders=True):
+        print(record.rel_path, record.h1_count, record.word_count)
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from site_ads import find_ad_blocks
+from site_corpus import BASE_DIR, CACHE_DIR, Corpus, Page, content_hash, load_corpus
+from site_links import page_links
+from site_manifest import source_version
+from site_parallel import DEFAULT_JOBS, map_pages
+from site_text import count_words, html_text
+from site_urls import VERCEL_CONFIG
+
+INDEX_PATH = CACHE_DIR / 'site-index.sqlite'
+
+SCHEMA_SQL = '''
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS pages (
+    path TEXT PRIMARY KEY,
+    sort_key TEXT NOT NULL,
+    section TEXT NOT NULL,
+    subfolder TEXT,
+    canonical TEXT,
+    robots TEXT,
+    title TEXT,
+    lang TEXT,
+    description TEXT,
+    description_length INTEGER,
+    h1_count INTEGER NOT NULL,
+    word_count INTEGER NOT NULL,
+    ad_blocks INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_section ON pages (section, subfolder);
+CREATE INDEX IF NOT EXISTS pages_sort_key ON pages (sort_key);
+CREATE TABLE IF NOT EXISTS schemas (
+    path TEXT NOT NULL REFERENCES pages (path) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    type TEXT,
+    body TEXT NOT NULL,
+    PRIMARY KEY (path, position)
+);
+CREATE TABLE IF NOT EXISTS schema_types (
+    path TEXT NOT NULL REFERENCES pages (path) ON DELETE CASCADE,
+    type TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS schema_types_type ON schema_types (type, path);
+CREATE INDEX IF NOT EXISTS schema_types_path ON schema_types (path);
+CREATE TABLE IF NOT EXISTS links (
+    path TEXT NOT NULL REFERENCES pages (path) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    href TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    target TEXT,
+    PRIMARY KEY (path, position)
+);
+CREATE INDEX IF NOT EXISTS links_target ON links (target);
+'''
+
+PAGE_COLUMNS = ['path', 'sort_key', 'section', 'subfolder', 'canonical', 'robots', 'title', 'lang',
+                'description', 'description_length', 'h1_count', 'word_count', 'ad_blocks',
+                'size', 'mtime_ns', 'sha256']
+
+
+def article_word_count(page: Page) -> int:
+    """
+    Words of the article text: the visible text between <article> and
+    </article>, counted by the shared tokenizer (see site_text.py), so a
+    Devanagari word with its vowel signs and conjuncts is one word and
+    entities, scripts and ad slots are not words at all.
+    """
+    return count_words(html_text(page.article_body))
+
+
+def walk_sort_key(rel_path: str) -> str:
+    """Key that sorts paths in corpus order: a folder's files before its subfolders, names sorted"""
+    *folders, filename = rel_path.split('/')
+    return ''.join(f"1{folder}\x01" for folder in folders) + f"0{filename}"
+
+
+def extract_row(page: Page) -> Dict[str, object]:
+    """Index row (and schema rows) for one page; runs in map_pages workers"""
+    fingerprint = page.fingerprint()
+    description = page.description
+    schemas = []
+    for position, schema in enumerate(page.schemas):
+        schema_type = schema.get('@type') if isinstance(schema, dict) else None
+        schemas.append((position, schema_type if isinstance(schema_type, str) else None,
+                        json.dumps(schema, ensure_ascii=False)))
+    return {
+        'path': page.rel_path,
+        'sort_key': walk_sort_key(page.rel_path),
+        'section': page.section,
+        'subfolder': page.subfolder,
+        'canonical': page.canonical,
+        'robots': page.robots,
+        'title': page.title,
+        'lang': page.lang,
+        'description': description,
+        'description_length': len(description) if description is not None else None,
+        'h1_count': len(page.h1_tags),
+        'word_count': article_word_count(page),
+        'ad_blocks': len(find_ad_blocks(page.content)),
+        'size': fingerprint['size'],
+        'mtime_ns': fingerprint['mtime_ns'],
+        'sha256': fingerprint['sha256'],
+        'schemas': schemas,
+        'schema_types': page.schema_types,
+        'links': page_links(page),
+    }
+
+
+class PageRecord:
+    """
+    An indexed page, answering the attributes the verify checks read from a
+    Page (rel_path, name, section, subfolder, title, description, lang,
+    schema_types, ...) without reading the file.
+    """
+
+    def __init__(self, row: sqlite3.Row, schema_types: List[str]):
+        for column in PAGE_COLUMNS:
+            setattr(self, column, row[column])
+        self.rel_path = row['path']
+        self.name = Path(self.rel_path).name
+        self.schema_types = schema_types
+
+    def __repr__(self) -> str:
+        return f"PageRecord({self.rel_path!r})"
+
+
+class SiteIndex:
+    """The page index database of one site tree"""
+
+    def __init__(self, path: Path = INDEX_PATH, base_dir: Path = BASE_DIR):
+        self.path = Path(path)
+        self.base_dir = Path(base_dir).resolve()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.execute('PRAGMA journal_mode = WAL')
+        self._check_version()
+
+    def _check_version(self) -> None:
+        """Start over when the extraction code or the site root changed"""
+        scripts_dir = Path(__file__).resolve().parent
+        sources = [Path(__file__).resolve(), scripts_dir / 'site_ads.py', scripts_dir / 'site_links.py',
+                   scripts_dir / 'site_urls.py', scripts_dir / 'site_text.py']
+        try:
+            url_config = (self.base_dir / VERCEL_CONFIG).read_text(encoding='utf-8')
+        except OSError:
+            url_config = ''
+        version = source_version(sources, str(self.base_dir) + url_config)
+        try:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        if row is not None and row['value'] == version:
+            return
+        with self.db:
+            for table in ('links', 'schema_types', 'schemas', 'pages', 'meta'):
+                self.db.execute(f'DROP TABLE IF EXISTS {table}')
+        self.db.executescript(SCHEMA_SQL)
+        with self.db:
+            self.db.execute("INSERT INTO meta (key, value) VALUES ('version', ?)", (version,))
+
+    def close(self) -> None:
+        self.db.close()
+
+    def update(self, corpus: Optional[Corpus] = None, jobs: int = DEFAULT_JOBS) -> Dict[str, int]:
+        """Bring the index up to date with the pages on disk; returns counts per outcome"""
+        corpus = corpus or load_corpus(self.base_dir)
+        known = {row['path']: row for row in self.db.execute('SELECT path, size, mtime_ns, sha256 FROM pages')}
+        counts = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+
+        stale = []
+        touched = []
+        for page in corpus:
+            row = known.get(page.rel_path)
+            if row is not None:
+                stat = page.path.stat()
+                if stat.st_size == row['size'] and stat.st_mtime_ns == row['mtime_ns']:
+                    counts['unchanged'] += 1
+                    continue
+                # Touched but maybe not modified (checkout, copy): compare contents
+                if stat.st_size == row['size'] and content_hash(page.content) == row['sha256']:
+                    touched.append((stat.st_mtime_ns, page.rel_path))
+                    counts['unchanged'] += 1
+                    continue
+            stale.append(page)
+
+        removed = set(known) - set(corpus.by_path)
+        with self.db:
+            self.db.executemany('UPDATE pages SET mtime_ns = ? WHERE path = ?', touched)
+            for path in removed:
+                self.db.execute('DELETE FROM pages WHERE path = ?', (path,))
+            counts['removed'] = len(removed)
+
+            for result in map_pages(extract_row, stale, jobs, echo=False):
+                if result['status'] == 'error':
+                    raise RuntimeError(f"Cannot index {result['path']}: {result['message']}")
+                self._store(result['value'])
+                counts['updated' if result['path'] in known else 'added'] += 1
+        return counts
+
+    def _store(self, row: Dict[str, object]) -> None:
+        path = row['path']
+        self.db.execute('DELETE FROM pages WHERE path = ?', (path,))
+        self.db.execute(
+            f"INSERT INTO pages ({', '.join(PAGE_COLUMNS)}) VALUES ({', '.join('?' * len(PAGE_COLUMNS))})",
+            [row[column] for column in PAGE_COLUMNS]
+        )
+        self.db.executemany('INSERT INTO schemas (path, position, type, body) VALUES (?, ?, ?, ?)',
+                            [(path, *schema) for schema in row['schemas']])
+        self.db.executemany('INSERT INTO schema_types (path, type) VALUES (?, ?)',
+                            [(path, schema_type) for schema_type in row['schema_types']])
+        self.db.executemany('INSERT INTO links (path, position, href, kind, target) VALUES (?, ?, ?, ?, ?)',
+                            [(path, *link) for link in row['links']])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query(self, sql: str, params: Sequence[object] = ()) -> List[sqlite3.Row]:
+        return self.db.execute(sql, params).fetchall()
+
+    def records(
+        self,
+        section: Optional[str] = None,
+        sections: Sequence[str] = (),
+        subfolders: bool = False,
+        prefix: Optional[str] = None
+    ) -> List[PageRecord]:
+        """Indexed pages in corpus order, optionally of one or more sections,
+        only <section>/<subfolder>/index.html pages, or under a path prefix"""
+        where = []
+        params: List[object] = []
+        if section is not None:
+            sections = [section]
+        if sections:
+            where.append(f"section IN ({', '.join('?' * len(sections))})")
+            params.extend(sections)
+        if subfolders:
+            where.append('subfolder IS NOT NULL')
+        if prefix is not None:
+            where.append('substr(path, 1, ?) = ?')
+            params.extend([len(prefix), prefix])
+        where_sql = ' WHERE ' + ' AND '.join(where) if where else ''
+        rows = self.query(f'SELECT * FROM pages{where_sql} ORDER BY sort_key', params)
+
+        types: Dict[str, List[str]] = {}
+        for row in self.query(f'SELECT path, type FROM schema_types WHERE path IN '
+                              f'(SELECT path FROM pages{where_sql}) ORDER BY rowid', params):
+            types.setdefault(row['path'], []).append(row['type'])
+        return [PageRecord(row, types.get(row['path'], [])) for row in rows]
+
+    def record(self, path: str) -> Optional[PageRecord]:
+        row = self.db.execute('SELECT * FROM pages WHERE path = ?', (path,)).fetchone()
+        if row is None:
+            return None
+        types = [r['type'] for r in self.query('SELECT type FROM schema_types WHERE path = ? ORDER BY rowid', (path,))]
+        return PageRecord(row, types)
+
+    def schemas(self, path: str) -> Iterator[object]:
+        """Parsed top-level ld+json objects of a page, in document order"""
+        for row in self.query('SELECT body FROM schemas WHERE path = ? ORDER BY position', (path,)):
+            yield json.loads(row['body'])
+
+    def find_schema(self, path: str, *types: str) -> Optional[dict]:
+        """First top-level ld+json object of the page whose @type is one of types (as Page.find_schema)"""
+        row = self.db.execute(
+            f"SELECT body FROM schemas WHERE path = ? AND type IN ({', '.join('?' * len(types))}) "
+            "ORDER BY position LIMIT 1",
+            (path, *types)
+        ).fetchone()
+        return json.loads(row['body']) if row else None
+
+
+def open_index(base_dir: Path = BASE_DIR, jobs: int = DEFAULT_JOBS, update: bool = True,
+               path: Optional[Path] = None) -> SiteIndex:
+    """The site's page index, brought up to date with the working tree unless update is False"""
+    base_dir = Path(base_dir).resolve()
+    if path is None:
+        path = INDEX_PATH if base_dir == BASE_DIR else base_dir / '.site-cache' / 'site-index.sqlite'
+    index = SiteIndex(path, base_dir)
+    if update:
+        index.update(load_corpus(base_dir), jobs)
+    return index
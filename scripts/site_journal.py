@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Rollback journal for the pages the maintenance scripts write.
+
+Every write through site_corpus.write_text() is atomic (temp file + rename),
+and before a file of the site tree is replaced its original bytes are kept
+in the journal:
+
+    .site-cache/journal/objects/ab/abcd...ef.gz   originals, gzipped, one per SHA-256
+    .site-cache/journal/runs/<run>.jsonl          header line, then one line per write
+
+Originals are content-addressed, so a page written by several runs, or many
+pages with identical sources, are stored once. The object and the run entry
+are flushed to disk before the page is replaced, so even a run that crashed
+halfway can be rolled back.
+
+A run is one script invocation together with its map_pages workers, which
+join the run of the parent process. Exporting SITE_JOURNAL_RUN=<id> makes
+several invocations (e.g. the steps of a shell script) one run. Writes
+outside the site tree, inside .site-cache (synthetic benchmark sites) or to
+dist/ (rebuilt from the sources by build-dist.py) are not journaled;
+SITE_JOURNAL=off turns the journal off altogether.
+
+    python3 scripts/manage-journal.py list
+    python3 scripts/manage-journal.py rollback          # undo the last run
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from site_corpus import BASE_DIR, CACHE_DIR, DIST_DIR
+
+JOURNAL_DIR = CACHE_DIR / 'journal'
+
+# Environment variables: a run id to share between invocations, and the off switch
+RUN_ENV = 'SITE_JOURNAL_RUN'
+DISABLE_ENV = 'SITE_JOURNAL'
+
+# Extra fields for the header of this process's run (e.g. 'rollback_of')
+RUN_INFO: Dict[str, object] = {}
+
+
+def new_run_id() -> str:
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+
+
+RUN_ID = os.environ.get(RUN_ENV) or new_run_id()
+
+
+def current_run() -> str:
+    return RUN_ID
+
+
+def join_run(run_id: str) -> None:
+    """Record this process's writes in run_id (map_pages workers join their parent's run)"""
+    global RUN_ID
+    RUN_ID = run_id
+
+
+def journal_enabled() -> bool:
+    return os.environ.get(DISABLE_ENV, '').lower() not in ('off', '0', 'no', 'false')
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _append_line(path: Path, record: Dict[str, object]) -> None:
+    """Append one JSON line and flush it to disk (O_APPEND keeps worker lines whole)"""
+    line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Run:
+    """One run of the journal: its header and the writes it made, in order"""
+
+    def __init__(self, run_id: str, header: Dict[str, object], entries: List[Dict[str, object]],
+                 rolled_back: Optional[Dict[str, object]] = None):
+        self.id = run_id
+        self.header = header
+        self.entries = entries
+        self.rolled_back = rolled_back
+
+    def __repr__(self) -> str:
+        return f"Run({self.id!r})"
+
+    @property
+    def script(self) -> str:
+        return str(self.header.get('script', '?'))
+
+    @property
+    def files(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """Per file: the hash before the run's first write and after its last (None = no file)"""
+        files: Dict[str, Dict[str, Optional[str]]] = {}
+        for entry in self.entries:
+            if entry['path'] in files:
+                files[entry['path']]['after'] = entry['after']
+            else:
+                files[entry['path']] = {'before': entry['before'], 'after': entry['after']}
+        return files
+
+
+class Journal:
+    """The journal of one site tree"""
+
+    def __init__(self, base_dir: Path = BASE_DIR, journal_dir: Path = JOURNAL_DIR):
+        self.base_dir = Path(base_dir).resolve()
+        self.dir = Path(journal_dir)
+        self.objects_dir = self.dir / 'objects'
+        self.runs_dir = self.dir / 'runs'
+
+    # ------------------------------------------------------------------
+    # Originals
+    # ------------------------------------------------------------------
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.gz"
+
+    def store(self, data: bytes) -> str:
+        """Keep data (once per content hash) and return its hash"""
+        digest = sha256(data)
+        path = self.object_path(digest)
+        if path.exists():
+            return digest
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(data, mtime=0))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return digest
+
+    def load(self, digest: str) -> bytes:
+        return gzip.decompress(self.object_path(digest).read_bytes())
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def rel_path(self, path: Path) -> Optional[str]:
+        """Path relative to the site tree, or None for files the journal does not cover"""
+        path = Path(path).resolve()
+        try:
+            rel_path = path.relative_to(self.base_dir)
+        except ValueError:
+            return None
+        if rel_path.parts and (rel_path.parts[0].startswith('.') or rel_path.parts[0] == DIST_DIR.name):
+            return None
+        return rel_path.as_posix()
+
+    def run_path(self, run_id: str) -> Path:
+        return self.runs_dir / f"{run_id}.jsonl"
+
+    def record(self, path: Path, after: Optional[bytes], run_id: Optional[str] = None) -> None:
+        """Journal the current bytes of path before it is replaced by after (None = deleted)"""
+        run_id = run_id or RUN_ID
+        rel_path = self.rel_path(path)
+        if rel_path is None:
+            return
+        try:
+            before = Path(path).read_bytes()
+        except FileNotFoundError:
+            before = None
+        if before == after:
+            return
+
+        entry = {
+            'path': rel_path,
+            'before': self.store(before) if before is not None else None,
+            'after': sha256(after) if after is not None else None,
+        }
+        run_path = self.run_path(run_id)
+        if not run_path.exists():
+            self._start_run(run_path, run_id)
+        _append_line(run_path, entry)
+
+    def _start_run(self, run_path: Path, run_id: str) -> None:
+        """Write the header line; with parallel workers only the first one wins"""
+        run_path.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            'run': run_id,
+            'script': Path(sys.argv[0]).name if sys.argv and sys.argv[0] else 'python',
+            'argv': sys.argv[1:],
+            'started': datetime.now().isoformat(timespec='seconds'),
+            **RUN_INFO,
+        }
+        try:
+            fd = os.open(run_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            return
+        os.close(fd)
+        _append_line(run_path, header)
+
+    # ------------------------------------------------------------------
+    # Runs
+    # ------------------------------------------------------------------
+
+    def run(self, run_id: str) -> Optional[Run]:
+        path = self.run_path(run_id)
+        try:
+            lines = path.read_text(encoding='utf-8').splitlines()
+        except FileNotFoundError:
+            return None
+        header: Dict[str, object] = {}
+        entries = []
+        rolled_back = None
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line cut short by a crash
+                continue
+            if 'run' in record:
+                header = record
+            elif 'rolled_back' in record:
+                rolled_back = record
+            elif 'path' in record:
+                entries.append(record)
+        return Run(run_id, header, entries, rolled_back)
+
+    def runs(self) -> List[Run]:
+        """Every run, oldest first"""
+        if not self.runs_dir.exists():
+            return []
+        runs = [self.run(path.stem) for path in self.runs_dir.glob('*.jsonl')]
+        return sorted((run for run in runs if run is not None),
+                      key=lambda run: (str(run.header.get('started', '')), run.id))
+
+    def latest(self) -> Optional[Run]:
+        """The newest run that is neither rolled back nor itself a rollback"""
+        for run in reversed(self.runs()):
+            if run.rolled_back is None and 'rollback_of' not in run.header:
+                return run
+        return None
+
+    def rollback(self, run: Run, force: bool = False, dry_run: bool = False) -> Dict[str, List[str]]:
+        """
+        Put every file the run wrote back to its original bytes (files it
+        created are deleted). Files changed again since the run are left alone
+        unless force is set. Returns the paths per outcome: restored,
+        deleted, conflicts, unchanged.
+        """
+        from site_corpus import write_bytes
+
+        outcome: Dict[str, List[str]] = {'restored': [], 'deleted': [], 'conflicts': [], 'unchanged': []}
+        RUN_INFO['rollback_of'] = run.id
+        for rel_path, hashes in run.files.items():
+            path = self.base_dir / rel_path
+            current = sha256(path.read_bytes()) if path.exists() else None
+            if current == hashes['before']:
+                outcome['unchanged'].append(rel_path)
+                continue
+            if current != hashes['after'] and not force:
+                outcome['conflicts'].append(rel_path)
+                continue
+            if hashes['before'] is None:
+                if not dry_run:
+                    self.record(path, None)
+                    path.unlink()
+                outcome['deleted'].append(rel_path)
+            else:
+                if not dry_run:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    write_bytes(path, self.load(hashes['before']))
+                outcome['restored'].append(rel_path)
+
+        if not dry_run and not outcome['conflicts']:
+            _append_line(self.run_path(run.id), {
+                'rolled_back': datetime.now().isoformat(timespec='seconds'),
+                'by': RUN_ID,
+            })
+        return outcome
+
+    def prune(self, keep: int) -> Dict[str, int]:
+        """Drop all but the newest keep runs and the originals only they referenced"""
+        runs = self.runs()
+        dropped = runs[:-keep] if keep > 0 else runs
+        for run in dropped:
+            self.run_path(run.id).unlink()
+
+        referenced = {entry['before'] for run in self.runs() for entry in run.entries if entry['before']}
+        objects = 0
+        freed = 0
+        if self.objects_dir.exists():
+            for path in self.objects_dir.glob('*/*.gz'):
+                if path.name[:-len('.gz')] not in referenced:
+                    freed += path.stat().st_size
+                    path.unlink()
+                    objects += 1
+            for folder in self.objects_dir.iterdir():
+                if folder.is_dir() and not any(folder.iterdir()):
+                    folder.rmdir()
+        return {'runs': len(dropped), 'objects': objects, 'bytes': freed}
+
+    def size(self) -> int:
+        """Bytes used by the stored originals"""
+        if not self.objects_dir.exists():
+            return 0
+        return sum(path.stat().st_size for path in self.objects_dir.glob('*/*.gz'))
+
+
+_JOURNAL: Optional[Journal] = None
+
+
+def journal() -> Journal:
+    """The journal of the site tree"""
+    global _JOURNAL
+    if _JOURNAL is None:
+        _JOURNAL = Journal()
+    return _JOURNAL
+
+
+def record_write(path: Path, data: Optional[bytes]) -> None:
+    """Journal path's original before it is replaced with data (called by write_bytes)"""
+    if journal_enabled():
+        journal().record(path, data)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Multi-keyword matching with an Aho-Corasick automaton.
+
+All keywords are compiled into one automaton, so a text is scanned once no
+matter how many keywords there are: the cost is linear in the length of the
+text plus the number of matches, not in text length x keywords as with one
+regex or str.find() per keyword. Matching ignores letter case and only
+accepts whole words; overlapping matches are resolved leftmost-longest
+("edge computing platform" wins over "edge computing" at the same start).
+
+Usage from a script in this folder:
+
+    from site_keywords import KeywordMatcher
+
+    matcher = KeywordMatcher(['edge computing', 'NFC', '5G technology'])
+    for start, end, keyword in matcher.find(text):
+        print(text[start:end], '->', keyword)
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def fold_case(text: str) -> str:
+    """Lower-cased text of the same length (characters that lower to several are kept as they are)"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(char if len(char.lower()) != 1 else char.lower() for char in text)
+
+
+def is_word_char(char: str) -> bool:
+    # Devanagari vowel signs and viramas are not alphanumeric but belong to the word
+    return char.isalnum() or char == '_' or 'ऀ' <= char <= 'ॿ'
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a set of keywords"""
+
+    def __init__(self, keywords: Iterable[str]):
+        # State 0 is the root; goto[state][char] -> state
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        # Keyword spelled by the path to a state, and the path's length
+        self.output: List[Optional[str]] = [None]
+        self.depth: List[int] = [0]
+        # Nearest state on the fail chain that ends a keyword
+        self.dict_link: List[int] = [0]
+        self.keywords: List[str] = []
+
+        for keyword in keywords:
+            self._add(keyword)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _add(self, keyword: str) -> None:
+        folded = fold_case(keyword.strip())
+        if not folded:
+            return
+        state = 0
+        for char in folded:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(None)
+                self.depth.append(self.depth[state] + 1)
+                self.dict_link.append(0)
+                self.goto[state][char] = next_state
+            state = next_state
+        if self.output[state] is None:
+            self.keywords.append(keyword)
+        self.output[state] = keyword
+
+    def _build(self) -> None:
+        """Fail and dictionary links, breadth first"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                fail_state = self.fail[next_state]
+                self.dict_link[next_state] = fail_state if self.output[fail_state] else self.dict_link[fail_state]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """Every whole-word occurrence of every keyword as (start, end, keyword), overlaps included"""
+        folded = fold_case(text)
+        goto, fail, output, dict_link, depth = self.goto, self.fail, self.output, self.dict_link, self.depth
+        matches = []
+        state = 0
+        for end, char in enumerate(folded, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            match_state = state if output[state] else dict_link[state]
+            while match_state:
+                keyword = output[match_state]
+                start = end - depth[match_state]
+                if (start == 0 or not is_word_char(text[start - 1])) and \
+                        (end == len(text) or not is_word_char(text[end])):
+                    matches.append((start, end, keyword))
+                match_state = dict_link[match_state]
+        return matches
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Non-overlapping whole-word matches, leftmost-longest, in text order"""
+        matches = sorted(self.find_all(text), key=lambda match: (match[0], match[0] - match[1]))
+        selected = []
+        position = 0
+        for start, end, keyword in matches:
+            if start >= position:
+                selected.append((start, end, keyword))
+                position = end
+        return selected
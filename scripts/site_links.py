@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Internal link graph of the site.
+
+The hrefs of every page's <a> elements are normalised when the page is
+indexed (see site_index.py, table links): each one is resolved against the
+URL the page is served under - with cleanUrls, TECHNOLOGY/APIs/index.html is
+/TECHNOLOGY/APIs, so "../x" means /x - and stored as a decoded URL path
+without query or fragment. Links are classified as
+
+    internal      a path on this site (relative, root-relative or absolute)
+    fragment      "#section" on the same page
+    placeholder   "#" or an empty href
+    external      another host
+    other         mailto:, tel:, javascript:, ...
+
+LinkGraph reads the stored links in one pass and resolves every internal
+target with the hash set of site_urls.SitePaths, giving the adjacency lists
+with in/out degree, the broken targets and the orphan pages. Only pages
+changed since the last run are re-extracted, by the index.
+
+Usage from a script in this folder:
+
+    from site_index import open_index
+    from site_links import LinkGraph
+
+    graph = LinkGraph(open_index())
+    for target, sources in graph.broken_targets().items():
+        print(target, len(sources))
+"""
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote, urljoin, urlsplit
+
+from site_corpus import BASE_DIR, BASE_URL, Page
+from site_parallel import DEFAULT_JOBS
+from site_urls import SitePaths, UrlRules, encode_path, load_url_rules, url_path
+
+SITE_HOST = urlsplit(BASE_URL).netloc
+
+PLACEHOLDER_HREFS = {'', '#'}
+
+# URL rules per site tree, read once per process (extract_row runs per page)
+_RULES: Dict[Path, UrlRules] = {}
+
+
+def url_rules(base_dir: Path) -> UrlRules:
+    if base_dir not in _RULES:
+        _RULES[base_dir] = load_url_rules(base_dir)
+    return _RULES[base_dir]
+
+
+def normalize_href(href: str, page_path: str, host: str = SITE_HOST) -> Tuple[str, Optional[str]]:
+    """(kind, target) of an href on the page served at page_path (a decoded URL path)"""
+    href = href.strip()
+    if href in PLACEHOLDER_HREFS:
+        return 'placeholder', None
+    if href.startswith('#'):
+        return 'fragment', page_path
+    parts = urlsplit(href)
+    if parts.scheme and parts.scheme.lower() not in ('http', 'https'):
+        return 'other', None
+    if parts.netloc and parts.netloc.lower() != host:
+        return 'external', None
+    absolute = urljoin(f"https://{host}{encode_path(page_path)}", href)
+    return 'internal', unquote(urlsplit(absolute).path) or '/'
+
+
+def page_links(page: Page) -> List[Tuple[int, str, str, Optional[str]]]:
+    """(position, href, kind, target) of every <a href> of a page; runs in map_pages workers"""
+    page_path = url_path(page.rel_path, url_rules(page.base_dir.resolve()))
+    return [(position, href, *normalize_href(href, page_path)) for position, href in enumerate(page.hrefs)]
+
+
+class LinkGraph:
+    """Page-to-page links of the indexed site, resolved against the files of the tree"""
+
+    def __init__(self, index, paths: Optional[SitePaths] = None):
+        self.paths = paths or SitePaths(index.base_dir)
+        self.pages = [row['path'] for row in index.query('SELECT path FROM pages ORDER BY sort_key')]
+        self.out_links: Dict[str, Set[str]] = {page: set() for page in self.pages}
+        self.in_links: Dict[str, Set[str]] = {page: set() for page in self.pages}
+        self.kinds: Dict[str, int] = defaultdict(int)
+        self.placeholders: Dict[str, int] = defaultdict(int)
+        # (source, href, target path, canonical path or None) per broken link
+        self.broken: List[Tuple[str, str, str, Optional[str]]] = []
+
+        resolved: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        for row in index.query('SELECT path, href, kind, target FROM links ORDER BY path, position'):
+            source, kind, target = row['path'], row['kind'], row['target']
+            self.kinds[kind] += 1
+            if kind == 'placeholder':
+                self.placeholders[source] += 1
+            if kind != 'internal':
+                continue
+            if target not in resolved:
+                resolved[target] = self._resolve(target)
+            rel_path, hint = resolved[target]
+            if rel_path is None:
+                self.broken.append((source, row['href'], target, hint))
+            elif rel_path in self.in_links and rel_path != source:
+                self.out_links[source].add(rel_path)
+                self.in_links[rel_path].add(source)
+
+    def _resolve(self, target: str) -> Tuple[Optional[str], Optional[str]]:
+        """(file served for target, None), or (None, the page meant if letter case or a legacy slug is off)"""
+        resolved = self.paths.resolve(target)
+        if resolved is not None:
+            return resolved[0], None
+        return None, self.paths.check(target)[1]
+
+    def in_degree(self, page: str) -> int:
+        return len(self.in_links[page])
+
+    def out_degree(self, page: str) -> int:
+        return len(self.out_links[page])
+
+    def broken_targets(self) -> Dict[str, List[str]]:
+        """Linking pages per broken target, most linked first"""
+        targets: Dict[str, List[str]] = defaultdict(list)
+        for source, _href, target, _hint in self.broken:
+            if source not in targets[target]:
+                targets[target].append(source)
+        return dict(sorted(targets.items(), key=lambda item: (-len(item[1]), item[0])))
+
+    def orphans(self) -> List[str]:
+        """Pages no other page links to (the home page excepted)"""
+        home = 'index.html'
+        return [page for page in self.pages if not self.in_links[page] and page != home]
+
+
+def load_graph(base_dir: Path = BASE_DIR, jobs: int = DEFAULT_JOBS) -> LinkGraph:
+    """The link graph of a site tree, with its page index brought up to date first"""
+    from site_index import open_index
+
+    index = open_index(base_dir, jobs)
+    try:
+        return LinkGraph(index)
+    finally:
+        index.close()
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Single-pass SEO lint for the pages of the site.
+
+Each page is parsed once with html.parser into PageFacts (lang, title, meta
+tags, canonical links, h1s, images, ld+json blocks, with their line
+numbers), and every registered rule runs on those facts in the same pass.
+The built-in rules are the checks of check_meta_lengths.sh, check_h1_tags.sh,
+count_words.sh, final_check.sh, seo-checker.sh and check-duplicate-h1.py;
+other scripts register their own when they are loaded:
+
+    from site_lint import ERROR, register_rule
+
+    @register_rule('jain-docs-seo', "Jain Docs pages are optimised", is_jain_docs_page)
+    def jain_docs_rule(page, facts):
+        if facts.lang != 'hi':
+            yield ERROR, "lang is not 'hi'", facts.lang_line
+
+A rule yields (level, message, line) for every problem it finds; level is
+ERROR, WARNING or NOTE (the SARIF levels) and line may be None. Pages with a
+noindex robots meta tag are only checked by the robots rule, which reports
+them.
+
+page_score() weighs the rules a page passed the way seo-checker.sh scored
+pages (SCORE_WEIGHTS, 15 points with every built-in rule).
+
+lint_page() returns a JSON-serialisable result, so lint-site.py can run it
+through map_pages() with a manifest and replay unchanged pages.
+"""
+
+import json
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+from site_corpus import BASE_URL, CATEGORY_SECTIONS, Page
+from site_index import article_word_count
+from site_links import page_links
+from site_manifest import source_version
+from site_parallel import DEFAULT_JOBS, map_pages
+from site_pipeline import SCRIPTS_DIR, load_script
+from site_schema import REQUIREMENTS, VALIDATOR_SCRIPTS, load_validators, object_types, schema_objects
+
+# Scripts that register lint rules
+RULE_SCRIPTS = [
+    'verify-jain-docs-seo.py',
+]
+
+ERROR = 'error'
+WARNING = 'warning'
+NOTE = 'note'
+
+# Most severe first
+LEVELS = [ERROR, WARNING, NOTE]
+
+LEVEL_ICONS = {ERROR: '❌', WARNING: '⚠️ ', NOTE: 'ℹ️ '}
+
+# Meta description length search engines show in full
+META_DESCRIPTION_RANGE = (150, 160)
+
+# Acceptable title length, and the optimum within it
+TITLE_RANGE = (30, 70)
+TITLE_OPTIMUM = (50, 60)
+
+# Category articles shorter than this need enhancement (count_words.sh)
+MIN_ARTICLE_WORDS = 1500
+
+# Open Graph properties every indexable page should fill in
+OPEN_GRAPH_PROPERTIES = ['og:title', 'og:description', 'og:url', 'og:image']
+
+# Pages with fewer <h2> sections are thinly structured
+MIN_H2_SECTIONS = 3
+
+# Links to other pages of the site every page should have
+MIN_INTERNAL_LINKS = 5
+
+# Points a page earns for every rule it passes (seo-checker.sh's 15-point
+# score); rules not listed are worth one point
+SCORE_WEIGHTS = {
+    'title': 2, 'meta-description': 2, 'meta-keywords': 1, 'single-h1': 2, 'h2-structure': 1,
+    'canonical': 1, 'open-graph': 1, 'img-alt': 1, 'internal-links': 1, 'schema': 1, 'robots': 1,
+    'word-count': 1,
+}
+
+# Lowest score percentage of each grade, best first
+SCORE_GRADES = [(85, 'excellent'), (70, 'good'), (50, 'needs improvement'), (0, 'poor')]
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+
+Finding = Tuple[str, str, Optional[int]]
+
+
+class PageFacts(HTMLParser):
+    """Everything the rules read from a page, collected in one parse"""
+
+    def __init__(self, content: str):
+        super().__init__(convert_charrefs=True)
+        self.lang: Optional[str] = None
+        self.lang_line: Optional[int] = None
+        self.title: Optional[str] = None
+        self.title_line: Optional[int] = None
+        # First value of every <meta name=...> / <meta property=...>, lower-cased key
+        self.meta: Dict[str, Tuple[str, int]] = {}
+        self.canonicals: List[Tuple[str, int]] = []
+        self.h1s: List[Tuple[str, int]] = []
+        self.h2_count = 0
+        self.images_without_alt: List[Tuple[str, int]] = []
+        self.ld_json: List[Tuple[str, int]] = []
+        self._capture: Optional[str] = None
+        self._text: List[str] = []
+        self._start_line = 0
+        self.feed(content)
+        self.close()
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        attributes = {name: value or '' for name, value in attrs}
+        line = self.getpos()[0]
+        if tag == 'html' and self.lang is None:
+            self.lang = attributes.get('lang')
+            self.lang_line = line
+        elif tag == 'meta':
+            key = (attributes.get('name') or attributes.get('property') or '').lower()
+            if key and key not in self.meta:
+                self.meta[key] = (attributes.get('content', '').strip(), line)
+        elif tag == 'link' and 'canonical' in attributes.get('rel', '').lower().split():
+            self.canonicals.append((attributes.get('href', '').strip(), line))
+        elif tag == 'h2':
+            self.h2_count += 1
+        elif tag == 'img' and 'alt' not in attributes:
+            self.images_without_alt.append((attributes.get('src', ''), line))
+        elif tag == 'title' and self.title is None or tag == 'h1':
+            self._begin(tag, line)
+        elif tag == 'script' and attributes.get('type', '').lower() == 'application/ld+json':
+            self._begin('ld+json', line)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._capture is None or tag != {'ld+json': 'script'}.get(self._capture, self._capture):
+            return
+        text = ''.join(self._text)
+        if self._capture == 'title':
+            self.title, self.title_line = ' '.join(text.split()), self._start_line
+        elif self._capture == 'h1':
+            self.h1s.append((' '.join(text.split()), self._start_line))
+        else:
+            self.ld_json.append((text, self._start_line))
+        self._capture = None
+
+    def handle_data(self, data: str) -> None:
+        if self._capture is not None:
+            self._text.append(data)
+
+    def _begin(self, capture: str, line: int) -> None:
+        self._capture = capture
+        self._text = []
+        self._start_line = line
+
+    def meta_content(self, key: str) -> Optional[str]:
+        entry = self.meta.get(key)
+        return entry[0] if entry else None
+
+    def meta_line(self, key: str) -> Optional[int]:
+        entry = self.meta.get(key)
+        return entry[1] if entry else None
+
+    @property
+    def noindex(self) -> bool:
+        return 'noindex' in (self.meta_content('robots') or '').lower()
+
+
+Rule = Callable[[Page, PageFacts], Iterable[Finding]]
+
+
+class LintRule:
+    """A named check, the pages it applies to and its default level"""
+
+    def __init__(self, name: str, description: str, check: Rule,
+                 applies_to: Optional[Callable[[Page], bool]], level: str):
+        self.name = name
+        self.description = description
+        self.check = check
+        self.applies_to = applies_to
+        self.level = level
+
+    def __repr__(self) -> str:
+        return f"LintRule({self.name!r})"
+
+
+# Registered rules by name, in registration order
+RULES: Dict[str, LintRule] = {}
+
+
+def register_rule(name: str, description: str, applies_to: Optional[Callable[[Page], bool]] = None,
+                  level: str = ERROR):
+    """Decorator registering a rule for every page applies_to accepts (all pages by default)"""
+    def decorator(func):
+        RULES[name] = LintRule(name, description, func, applies_to, level)
+        return func
+    return decorator
+
+
+def load_rules(names: Optional[Iterable[str]] = None) -> List[LintRule]:
+    """Load the rule scripts and return the rules, all of them or the named ones"""
+    for filename in RULE_SCRIPTS:
+        load_script(filename)
+    if names is None:
+        return list(RULES.values())
+    wanted = set(names)
+    unknown = wanted - set(RULES)
+    if unknown:
+        raise ValueError(f"Unknown rule(s): {', '.join(sorted(unknown))}")
+    return [rule for rule in RULES.values() if rule.name in wanted]
+
+
+def lint_version() -> str:
+    """Manifest version covering the rules, the rule scripts and the schema requirements"""
+    sources = ([Path(__file__).resolve(), SCRIPTS_DIR / 'site_index.py', SCRIPTS_DIR / 'site_links.py',
+                SCRIPTS_DIR / 'site_schema.py']
+               + [SCRIPTS_DIR / filename for filename in RULE_SCRIPTS + VALIDATOR_SCRIPTS])
+    return source_version(dict.fromkeys(sources))
+
+
+def is_category_article(page: Page) -> bool:
+    return page.section in CATEGORY_SECTIONS and page.subfolder is not None
+
+
+# ----------------------------------------------------------------------
+# Built-in rules
+# ----------------------------------------------------------------------
+
+@register_rule('title', "Page has a <title> of 30-70 characters")
+def title_rule(page: Page, facts: PageFacts) -> Iterator[Finding]:
+    if not facts.title:
+        yield ERROR, "Missing or empty <title>", facts.title_line
+        return
+    low, high = TITLE_RANGE
+    if not low <= len(facts.title) <= high:
+        yield (WARNING, f"Title is {len(facts.title)} characters (keep it {low}-{high}, "
+                        f"{TITLE_OPTIMUM[0]}-{TITLE_OPTIMUM[1]} is best)", facts.title_line)
+
+
+@register_rule('meta-description', "Meta description of 150-160 characters")
+def meta_description_rule(page: Page, facts: PageFacts) -> Iterator[Finding]:
+    description = facts.meta_content('description')
+    if not description:
+        yield ERROR, "Missing or empty meta description", facts.meta_line('description')
+        return
+    low, high = META_DESCRIPTION_RANGE
+    if not low <= len(description) <= high:
+        yield (WARNING, f"Meta description is {len(description)} characters (keep it {low}-{high})",
+               facts.meta_line('description'))
+
+
+@register_rule('single-h1', "Exactly one <h1>")
+def single_h1_rule(page: Page, facts: PageFacts) -> Iterator[Finding]:
+    if not facts.h1s:
+        yield ERROR, "No <h1>", None
+    elif len(facts.h1s) > 1:
+        headings = ', '.join(repr(text[:40]) for text, _line in facts.h1s[:3])
+        yield ERROR, f"{len(facts.h1s)} <h1> tags: {headings}", facts.h1s[1][1]
+
+
+@register_rule('meta-keywords', "Page has a meta keywords tag (used by the internal search)", level=NOTE)
+def meta_keywords_rule(page: Page, facts: PageFacts) -> Iterator[Finding]:
+    if not facts.meta_content('keywords'):
+        yield NOTE, "Missing or empty meta keywords", facts.meta_line('keywords')
+
+
+@register_rule('h2-structure', f"Content is split into at least {MIN_H2_SECTIONS} <h2> sections", level=WARNING)
+def h2_structure_rule(page: Page, facts: PageFacts) -> Iterator[Finding]:
+    if facts.h2_count < MIN_H2_SECTIONS:
+        yield WARNING, f"{facts.h2_count} <h2> heading(s) (structure the content in {MIN_H2_SECTIONS}+ sections)", None
+
+
+@register_rule('canonical', "One absolute canonical URL on the site's domain")
+def canonical_rule(page: Page, facts: PageFacts) -> Iterator[Finding]:
+    if not facts.canonicals:
+        yield ERROR, "Missing <link rel=\"canonical\">", None
+        return
+    href, line = facts.canonicals[0]
+    if len(facts.canonicals) > 1:
+        yield ERROR, f"{len(facts.canonicals)} canonical links", facts.canonicals[1][1]
+    if not href:
+        yield ERROR, "Empty canonical URL", line
+    elif not href.startswith(BASE_URL + '/') and href != BASE_URL:
+        yield WARNING, f"Canonical URL is not on {BASE_URL}: {href}", line
+
+
+@register_rule('lang', "<html> has a lang attribute")
+def lang_rule(page: Page, facts: PageFacts) -> Iterator[Finding]:
+    if not facts.lang:
+        yield ERROR, "Missing lang attribute on <html>", facts.lang_line
+
+
+@register_rule('schema', "Valid JSON-LD with the schema types the page must carry")
+def schema_rule(page: Page, facts: PageFacts) -> Iterator[Finding]:
+    if not facts.ld_json:
+        yield WARNING, "No JSON-LD structured data", None
+    found = set()
+    for text, line in facts.ld_json:
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError as e:
+            yield ERROR, f"Invalid JSON-LD: {e}", line
+            continue
+        for schema in schema_objects(value):
+            found.update(object_types(schema))
+    load_validators()
+    for requirement in REQUIREMENTS.values():
+        if requirement.applies_to(page) and not found.intersection(requirement.types):
+            yield ERROR, f"No {'/'.join(requirement.types)} schema ({requirement.name})", None
+
+
+@register_rule('word-count', "Category articles have at least 1500 words", is_category_article, WARNING)
+def word_count_rule(page: Page, facts: PageFacts) -> Iterator[Finding]:
+    words = article_word_count(page)
+    if words < MIN_ARTICLE_WORDS:
+        yield WARNING, f"Article has {words} words (needs enhancement: {MIN_ARTICLE_WORDS}+)", None
+
+
+@register_rule('open-graph', "og:title, og:description, og:url and og:image are filled in", level=WARNING)
+def open_graph_rule(page: Page, facts: PageFacts) -> Iterator[Finding]:
+    missing = [key for key in OPEN_GRAPH_PROPERTIES if not facts.meta_content(key)]
+    if missing:
+        yield WARNING, f"Missing or empty Open Graph tags: {', '.join(missing)}", None
+
+
+@register_rule('img-alt', "Every <img> has an alt attribute", level=WARNING)
+def img_alt_rule(page: Page, facts: PageFacts) -> Iterator[Finding]:
+    if facts.images_without_alt:
+        images = facts.images_without_alt
+        yield WARNING, f"{len(images)} <img> without alt: {', '.join(src for src, _line in images[:3])}", images[0][1]
+
+
+@register_rule('internal-links', f"At least {MIN_INTERNAL_LINKS} links to other pages of the site", level=WARNING)
+def internal_links_rule(page: Page, facts: PageFacts) -> Iterator[Finding]:
+    count = sum(kind == 'internal' for _position, _href, kind, _target in page_links(page))
+    if count < MIN_INTERNAL_LINKS:
+        yield WARNING, f"{count} internal link(s) (link to {MIN_INTERNAL_LINKS}+ related pages)", None
+
+
+@register_rule('robots', "Robots meta tag allows indexing", level=WARNING)
+def robots_rule(page: Page, facts: PageFacts) -> Iterator[Finding]:
+    if facts.noindex:
+        yield (WARNING, f"Robots meta tag is {facts.meta_content('robots')!r}: the page will not be indexed",
+               facts.meta_line('robots'))
+
+
+# ----------------------------------------------------------------------
+# Running the rules
+# ----------------------------------------------------------------------
+
+def lint_page(page: Page) -> Dict[str, object]:
+    """
+    Run every applicable rule on one page; runs in map_pages workers.
+    Returns {'path', 'section', 'skipped', 'rules', 'findings'} where rules
+    names the rules that ran and findings holds {'rule', 'level', 'message',
+    'line'} per problem. Noindex pages are skipped: only the robots rule runs.
+    """
+    rules = load_rules()
+    facts = PageFacts(page.content)
+    result = {'path': page.rel_path, 'section': page.section, 'skipped': facts.noindex, 'rules': [], 'findings': []}
+    if facts.noindex:
+        rules = [rule for rule in rules if rule.name == 'robots']
+    for rule in rules:
+        if rule.applies_to is not None and not rule.applies_to(page):
+            continue
+        result['rules'].append(rule.name)
+        try:
+            findings = list(rule.check(page, facts))
+        except Exception as e:
+            findings = [(ERROR, f"{rule.check.__name__} failed: {e}", None)]
+        for level, message, line in findings:
+            result['findings'].append({'rule': rule.name, 'level': level, 'message': message, 'line': line})
+    return result
+
+
+def lint_pages(pages: Sequence[Page], jobs: int = DEFAULT_JOBS, names: Optional[Iterable[str]] = None,
+               manifest=None) -> List[Dict[str, object]]:
+    """
+    lint_page() results of the given pages in order, keeping only the findings
+    of the named rules when names is given. Every rule runs regardless, so a
+    manifest's entries serve any selection of rules.
+    """
+    wanted = None if names is None else {rule.name for rule in load_rules(names)}
+    sections = {page.rel_path: page.section for page in pages}
+    results = []
+    for result in map_pages(lint_page, pages, jobs, echo=False, manifest=manifest):
+        if result['status'] == 'error':
+            value = {'path': result['path'], 'section': sections[result['path']], 'skipped': False, 'rules': [],
+                     'findings': [{'rule': 'lint', 'level': ERROR, 'message': result['message'], 'line': None}]}
+        else:
+            value = result['value']
+        if wanted is not None:
+            value = dict(value, rules=[name for name in value['rules'] if name in wanted],
+                         findings=[f for f in value['findings'] if f['rule'] in wanted or f['rule'] == 'lint'])
+        results.append(value)
+    if manifest is not None:
+        manifest.save()
+    return results
+
+
+def page_score(result: Dict[str, object]) -> Optional[Tuple[int, int]]:
+    """(points, possible points) of a linted page; None for a skipped one"""
+    if result['skipped']:
+        return None
+    failed = {finding['rule'] for finding in result['findings']}
+    possible = sum(SCORE_WEIGHTS.get(name, 1) for name in result['rules'])
+    points = sum(SCORE_WEIGHTS.get(name, 1) for name in result['rules'] if name not in failed)
+    return points, possible
+
+
+def score_grade(percentage: float) -> str:
+    return next(grade for lowest, grade in SCORE_GRADES if percentage >= lowest)
+
+
+def at_least(level: str, threshold: str) -> bool:
+    """Whether level is as severe as threshold"""
+    return LEVELS.index(level) <= LEVELS.index(threshold)
+
+
+def finding_key(path: str, finding: Dict[str, object]) -> str:
+    """Identity of a finding in a baseline: without its line, so edits elsewhere in the page do not matter"""
+    return f"{path}\t{finding['rule']}\t{finding['message']}"
+
+
+def sarif_report(results: List[Dict[str, object]], rules: List[LintRule]) -> Dict[str, object]:
+    """SARIF 2.1.0 log of the findings, for code scanning tools"""
+    rule_index = {rule.name: position for position, rule in enumerate(rules)}
+    sarif_results = []
+    for result in results:
+        for finding in result['findings']:
+            region = {'startLine': finding['line']} if finding['line'] else None
+            location = {'artifactLocation': {'uri': quote(result['path']), 'uriBaseId': '%SRCROOT%'}}
+            if region:
+                location['region'] = region
+            sarif_results.append({
+                'ruleId': finding['rule'],
+                'ruleIndex': rule_index.get(finding['rule'], -1),
+                'level': finding['level'],
+                'message': {'text': finding['message']},
+                'locations': [{'physicalLocation': location}],
+            })
+    return {
+        '$schema': SARIF_SCHEMA,
+        'version': '2.1.0',
+        'runs': [{
+            'tool': {'driver': {
+                'name': 'lint-site',
+                'informationUri': BASE_URL,
+                'rules': [{'id': rule.name, 'shortDescription': {'text': rule.description},
+                           'defaultConfiguration': {'level': rule.level}} for rule in rules],
+            }},
+            'results': sarif_results,
+        }],
+    }
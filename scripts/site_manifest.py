@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Content-hash manifest behind the --incremental mode of the batch scripts.
+
+Each script keeps one manifest in .site-cache/manifests/<script>.json holding,
+for every page it has processed, the file's size, mtime and SHA-256 plus the
+result and output of the last run. A page is unchanged when its size and
+mtime still match (no read needed) or, failing that, when its content hash
+matches. The manifest is tied to a version hashed from the script's source
+and every site_* module it imports, directly or through another one
+(with_imports()), so editing a script's rules - or the shared ones in
+site_ads.py, site_dates.py, ... - invalidates its entries.
+
+Only pages a run left untouched are recorded: a page that was just rewritten
+is processed once more on the next run, which confirms it is settled.
+
+Usage from a script in this folder:
+
+    from site_manifest import manifest_from_argv
+
+    manifest = manifest_from_argv(__file__)          # None without --incremental
+    for result in map_pages(verify_file, pages, jobs, manifest=manifest):
+        ...
+    if manifest:
+        manifest.save()
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from site_corpus import CACHE_DIR, Page, content_hash
+
+MANIFEST_DIR = CACHE_DIR / 'manifests'
+
+# Shared code whose changes can alter every script's results
+_SHARED_SOURCES = [Path(__file__).resolve().parent / 'site_corpus.py']
+
+# from site_ads import ... / import site_ads, at any indentation
+LOCAL_IMPORT_PATTERN = re.compile(r'^[ \t]*(?:from|import)[ \t]+(site_\w+)', re.MULTILINE)
+
+
+def with_imports(sources: Iterable[Path]) -> List[Path]:
+    """The source files and every site_* module of their folder they import, directly or not"""
+    found: Dict[Path, None] = {}
+    pending = [Path(path).resolve() for path in sources]
+    while pending:
+        path = pending.pop(0)
+        if path in found:
+            continue
+        found[path] = None
+        for name in LOCAL_IMPORT_PATTERN.findall(path.read_text(encoding='utf-8')):
+            module = path.parent / f"{name}.py"
+            if module.exists():
+                pending.append(module)
+    return list(found)
+
+
+def source_version(sources: Iterable[Path], extra: str = '') -> str:
+    """Version string hashed from the given source files and any extra settings"""
+    digest = hashlib.sha256()
+    for path in list(sources) + _SHARED_SOURCES:
+        digest.update(Path(path).read_bytes())
+    digest.update(extra.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class Manifest:
+    """Per-script record of the pages that are unchanged since the last run"""
+
+    def __init__(self, tool: str, version: str, manifest_dir: Path = MANIFEST_DIR):
+        self.tool = tool
+        self.version = version
+        self.path = Path(manifest_dir) / f"{tool}.json"
+        self.files: Dict[str, Dict[str, object]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        # A different script or rule version invalidates every entry
+        if data.get('version') == self.version:
+            self.files = data.get('files', {})
+
+    def lookup(self, page: Page) -> Optional[Dict[str, object]]:
+        """Recorded entry for page if the file is unchanged, otherwise None"""
+        entry = self.files.get(page.rel_path)
+        if entry is None:
+            self.misses += 1
+            return None
+        try:
+            stat = page.path.stat()
+        except OSError:
+            self.misses += 1
+            return None
+
+        if stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']:
+            self.hits += 1
+            return entry
+
+        # Touched but maybe not modified (checkout, copy): compare contents
+        if stat.st_size == entry['size'] and content_hash(page.content) == entry['sha256']:
+            entry['mtime_ns'] = stat.st_mtime_ns
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        return None
+
+    def record(self, rel_path: str, fingerprint: Dict[str, object], value: object, output: str) -> None:
+        """Remember a page's state together with the result of processing it"""
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            # Results that cannot be replayed are simply not cached
+            self.forget(rel_path)
+            return
+        self.files[rel_path] = dict(fingerprint, value=value, output=output)
+
+    def forget(self, rel_path: str) -> None:
+        self.files.pop(rel_path, None)
+
+    def save(self) -> None:
+        """Write the manifest atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'tool': self.tool, 'version': self.version, 'files': self.files},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def incremental_from_argv(argv: Optional[Sequence[str]] = None) -> bool:
+    """True when --incremental is on the command line"""
+    argv = sys.argv[1:] if argv is None else argv
+    return '--incremental' in argv
+
+
+def add_incremental_argument(parser) -> None:
+    """Add --incremental to an argparse parser"""
+    parser.add_argument('--incremental', action='store_true',
+                        help="skip pages unchanged since the last run (see .site-cache/manifests)")
+
+
+def manifest_from_argv(
+    script_file: str,
+    extra_sources: Iterable[Path] = (),
+    extra: str = '',
+    argv: Optional[Sequence[str]] = None
+) -> Optional[Manifest]:
+    """The script's manifest when --incremental was given, otherwise None"""
+    if not incremental_from_argv(argv):
+        return None
+    script_path = Path(script_file).resolve()
+    version = source_version(with_imports([script_path, *extra_sources]), extra)
+    return Manifest(script_path.stem, version)
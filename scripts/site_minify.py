@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+HTML minifier for the deploy copy of the site (see build-dist.py).
+
+minify_html() takes a page source and returns the same document with
+
+    - whitespace between tags collapsed: a run of whitespace becomes one
+      space, and goes altogether next to block-level elements, where the
+      browser would not render it. Scripts, styles, <noscript>, <link>,
+      <meta> and the kept comments render nothing, so the decision is made
+      from the elements or text on either side of them
+    - whitespace inside tags collapsed (attribute values are left alone)
+    - comments dropped, except the AdSense marker comments the ad scripts
+      look for (site_ads.AD_COMMENT) and conditional comments
+    - inline JSON-LD compacted (the schema scripts write it with indent=4)
+      without otherwise touching it
+    - inline <style> minified (site_css.minify)
+
+<pre> and <textarea> elements and every other inline script are copied
+byte for byte. Runs of whitespace in text become one space, as the browser
+renders them; &nbsp; and non-breaking spaces are not whitespace and stay.
+
+Usage from a script in this folder:
+
+    from site_minify import minify_html
+
+    write_text(DIST_DIR / page.rel_path, minify_html(page.content))
+"""
+
+import json
+import re
+from typing import List, Tuple
+
+from site_ads import AD_COMMENT
+from site_css import minify
+
+# HTML whitespace (\s would also take the non-breaking space)
+HTML_WHITESPACE_PATTERN = re.compile(r'[ \t\n\r\f]+')
+
+# Elements around which whitespace is never rendered
+BLOCK_TAGS = {
+    'html', 'head', 'body', 'title', 'div', 'p', 'br', 'hr', 'ul', 'ol', 'li', 'dl', 'dt', 'dd', 'section', 'article', 'aside', 'nav',
+    'header', 'footer', 'main', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'figure', 'figcaption',
+    'pre', 'address', 'details', 'summary', 'dialog', 'form', 'fieldset', 'legend', 'table', 'caption',
+    'thead', 'tbody', 'tfoot', 'tr', 'td', 'th', 'colgroup', 'col', 'option', 'optgroup',
+}
+
+# Elements that render nothing in place; like the doctype and the kept comments (no tag name), whitespace
+# next to them depends on what is rendered beyond them
+TRANSPARENT_TAGS = {'', 'meta', 'link', 'base', 'script', 'style', 'noscript', 'template'}
+
+# Comments to keep: AdSense markers and conditional comments
+KEPT_COMMENT_PREFIXES = (AD_COMMENT, '<!--[if', '<![endif]')
+
+# One comment, element with raw content, tag, doctype or run of text at a time
+TAG = r'''</?[A-Za-z][\w-]*(?:[^>"']|"[^"]*"|'[^']*')*>'''
+TOKEN_PATTERN = re.compile(
+    r'(?P<comment><!--.*?-->)'
+    r'|(?P<raw><(?P<raw_tag>script|style|pre|textarea)\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>.*?</(?P=raw_tag)\s*>)'
+    r'|(?P<tag>' + TAG + r'|<![^>]*>)'
+    r'|(?P<text>[^<]+|<)',
+    re.IGNORECASE | re.DOTALL,
+)
+TAG_NAME_PATTERN = re.compile(r'</?([A-Za-z][\w-]*)')
+QUOTED_PATTERN = re.compile(r'''("[^"]*"|'[^']*')''')
+RAW_CONTENT_PATTERN = re.compile(r'^(<[^>]*>)(.*)(</[^>]*>)$', re.DOTALL)
+JSON_LD_PATTERN = re.compile(r'''\btype\s*=\s*["']?application/ld\+json''', re.IGNORECASE)
+JSON_STRING_PATTERN = re.compile(r'("(?:\\.|[^"\\])*")')
+JSON_WHITESPACE_PATTERN = re.compile(r'[ \t\n\r]+')
+
+
+def minify_tag(tag: str) -> str:
+    """A tag with the whitespace between its attributes collapsed; quoted values are kept"""
+    parts = QUOTED_PATTERN.split(tag)
+    for index in range(0, len(parts), 2):
+        parts[index] = HTML_WHITESPACE_PATTERN.sub(' ', parts[index])
+    # A space before '/>' may end an unquoted value, so only ' >' goes
+    parts[-1] = parts[-1][:-2] + '>' if parts[-1].endswith(' >') else parts[-1]
+    return ''.join(parts)
+
+
+def compact_json_ld(source: str) -> str:
+    """The JSON of a ld+json script without its whitespace; unparsable blocks stay as they are"""
+    try:
+        json.loads(source)
+    except ValueError:
+        return source
+    # Only the whitespace between tokens goes: strings, escapes and key order stay as written
+    parts = JSON_STRING_PATTERN.split(source)
+    for index in range(0, len(parts), 2):
+        parts[index] = JSON_WHITESPACE_PATTERN.sub('', parts[index])
+    return ''.join(parts)
+
+
+def minify_raw(element: str, name: str) -> str:
+    """A script, style, pre or textarea element: only JSON-LD and styles change"""
+    match = RAW_CONTENT_PATTERN.match(element)
+    if not match:
+        return element
+    open_tag, content, close_tag = match.groups()
+    if name == 'script' and JSON_LD_PATTERN.search(open_tag):
+        return open_tag + compact_json_ld(content) + close_tag
+    if name == 'style':
+        return open_tag + minify(content) + close_tag
+    return element
+
+
+def tokens(content: str) -> List[Tuple[str, str, str]]:
+    """(kind, text, tag name) of the page: 'tag' (tags, doctype, raw elements, kept comments) or 'text'
+
+    The doctype and kept comments have no tag name.
+    """
+    found: List[Tuple[str, str, str]] = []
+    for match in TOKEN_PATTERN.finditer(content):
+        if match.group('comment'):
+            if match.group('comment').startswith(KEPT_COMMENT_PREFIXES):
+                found.append(('tag', match.group('comment'), ''))
+        elif match.group('raw'):
+            name = match.group('raw_tag').lower()
+            found.append(('tag', minify_raw(match.group('raw'), name), name))
+        elif match.group('tag'):
+            name = TAG_NAME_PATTERN.match(match.group('tag'))
+            found.append(('tag', minify_tag(match.group('tag')), name.group(1).lower() if name else ''))
+        elif found and found[-1][0] == 'text':
+            # Text on both sides of a dropped comment
+            found[-1] = ('text', found[-1][1] + match.group('text'), '')
+        else:
+            found.append(('text', match.group('text'), ''))
+    return found
+
+
+def rendered_neighbour_is_block(found: List[Tuple[str, str, str]], index: int, step: int) -> bool:
+    """Whether the first rendered token from index in direction step is a block-level tag or the document edge
+
+    Transparent tags and whitespace-only text are looked through; any other
+    text or tag is inline.
+    """
+    index += step
+    while 0 <= index < len(found):
+        kind, text, name = found[index]
+        if kind == 'tag' and name not in TRANSPARENT_TAGS:
+            return name in BLOCK_TAGS
+        if kind == 'text' and HTML_WHITESPACE_PATTERN.sub('', text):
+            return False
+        index += step
+    return True
+
+
+def minify_html(content: str) -> str:
+    """The page with the whitespace, comments and JSON-LD indentation taken out (see above)"""
+    found = tokens(content)
+    parts = []
+    # Whether the text written last, with only transparent tags since, ended in a space
+    after_space = False
+    for index, (kind, text, name) in enumerate(found):
+        if kind == 'tag':
+            parts.append(text)
+            if name not in TRANSPARENT_TAGS:
+                after_space = False
+            continue
+        text = HTML_WHITESPACE_PATTERN.sub(' ', text)
+        if after_space or rendered_neighbour_is_block(found, index, -1):
+            text = text.lstrip(' ')
+        if rendered_neighbour_is_block(found, index, 1):
+            text = text.rstrip(' ')
+        if text:
+            after_space = text.endswith(' ')
+        parts.append(text)
+    return ''.join(parts)
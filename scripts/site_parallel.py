@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Parallel page executor for the batch scripts.
+
+map_pages() runs a per-page function over a list of pages, fanning them out to
+a process pool when --jobs N asks for more than one worker. Whatever the
+function prints is captured per page and replayed in page order, so a script's
+output reads the same at any job count, and every page yields a result:
+
+    {'path': 'TECHNOLOGY/APIs/index.html',
+     'status': 'changed' | 'skipped' | 'error',
+     'value': <return value of the function>,
+     'message': <error text, empty otherwise>,
+     'output': <captured stdout>}
+
+With a manifest (--incremental, see site_manifest), pages unchanged since the
+last run are not processed at all; their recorded value and output are
+replayed instead and the result carries 'cached': True.
+
+With --profile (see site_profile), each map_pages() run is timed as a stage
+and every page as a file, in the workers too.
+
+Usage from a script in this folder:
+
+    from site_parallel import jobs_from_argv, map_pages
+
+    for result in map_pages(remove_ads_from_file, pages, jobs_from_argv()):
+        success, message = result['value']
+"""
+
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from site_corpus import Page
+from site_journal import current_run, join_run
+from site_profile import PROFILER
+
+# Without --jobs the scripts run serially, exactly as before
+DEFAULT_JOBS = 1
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Number of workers to use; 0 (or less) means one per CPU"""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def jobs_from_argv(argv: Optional[Sequence[str]] = None) -> int:
+    """Read --jobs N, --jobs=N or -j N from the command line"""
+    argv = sys.argv[1:] if argv is None else argv
+    for i, arg in enumerate(argv):
+        value = None
+        if arg in ('--jobs', '-j') and i + 1 < len(argv):
+            value = argv[i + 1]
+        elif arg.startswith('--jobs='):
+            value = arg.split('=', 1)[1]
+        if value is not None:
+            try:
+                return resolve_jobs(int(value))
+            except ValueError:
+                raise SystemExit(f"❌ --jobs expects a number, got {value!r}")
+    return DEFAULT_JOBS
+
+
+def add_jobs_argument(parser) -> None:
+    """Add --jobs/-j to an argparse parser"""
+    parser.add_argument('--jobs', '-j', type=int, default=DEFAULT_JOBS,
+                        help="worker processes (0 = one per CPU, default: 1)")
+
+
+def _run_page(func: Callable, page: Page, args: tuple, fingerprint: bool = False) -> Dict[str, object]:
+    """Run func on one page, capturing its output and any error"""
+    output = io.StringIO()
+    result = {'path': page.rel_path, 'status': 'skipped', 'value': None, 'message': '', 'output': ''}
+    page.written = False
+    with PROFILER.measure(page.rel_path) as sample:
+        try:
+            with redirect_stdout(output):
+                result['value'] = func(page, *args)
+            if page.written:
+                result['status'] = 'changed'
+            elif fingerprint and not page.dirty:
+                # Left as it was: the manifest may skip it next time
+                result['fingerprint'] = page.fingerprint()
+        except Exception as e:
+            result['status'] = 'error'
+            result['message'] = str(e)
+    if PROFILER.enabled:
+        result['profile'] = sample
+    result['output'] = output.getvalue()
+    return result
+
+
+def _run_task(task) -> Dict[str, object]:
+    """Worker entry point: rebuild the page from its path and run func on it"""
+    func, path, base_dir, args, fingerprint, profile, run_id = task
+    join_run(run_id)
+    if profile and not PROFILER.enabled:
+        PROFILER.attach_worker()
+    return _run_page(func, Page(path, base_dir), args, fingerprint)
+
+
+def map_pages(
+    func: Callable,
+    pages: Iterable[Page],
+    jobs: int = DEFAULT_JOBS,
+    args: tuple = (),
+    on_error: Optional[Callable[[str], object]] = None,
+    echo: bool = True,
+    manifest=None
+) -> Iterator[Dict[str, object]]:
+    """
+    Run func(page, *args) for every page and yield the results in page order.
+    func must be a module-level function so it can be sent to the workers.
+    on_error turns the message of an uncaught exception into the value the
+    script expects from func (e.g. a (False, message) tuple). When echo is set,
+    each page's captured output is printed as it arrives. With a manifest,
+    unchanged pages are replayed from it and the others are recorded.
+    """
+    pages = list(pages)
+    jobs = resolve_jobs(jobs)
+    fingerprint = manifest is not None
+
+    # Manifest lookups only stat the files; unchanged pages are never read
+    cached = [manifest.lookup(page) if manifest is not None else None for page in pages]
+    todo = [page for page, entry in zip(pages, cached) if entry is None]
+
+    if jobs <= 1 or len(todo) <= 1:
+        results = (_run_page(func, page, args, fingerprint) for page in todo)
+        pool = None
+    else:
+        tasks = [(func, page.path, page.base_dir, args, fingerprint, PROFILER.enabled, current_run())
+                 for page in todo]
+        pool = ProcessPoolExecutor(max_workers=min(jobs, len(tasks)))
+        results = pool.map(_run_task, tasks, chunksize=max(1, len(tasks) // (jobs * 4)))
+
+    try:
+        with PROFILER.stage(f"map_pages: {func.__name__}"):
+            yield from _collect(pages, cached, results, manifest, echo, on_error)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def _collect(pages, cached, results, manifest, echo, on_error) -> Iterator[Dict[str, object]]:
+    """Merge replayed manifest entries and fresh results back into page order"""
+    for page, entry in zip(pages, cached):
+        if entry is not None:
+            result = {'path': page.rel_path, 'status': 'skipped', 'value': entry['value'],
+                      'message': '', 'output': entry['output'], 'cached': True}
+        else:
+            result = next(results)
+            if 'profile' in result:
+                PROFILER.add_file(result.pop('profile'))
+            if manifest is not None:
+                if 'fingerprint' in result:
+                    manifest.record(result['path'], result.pop('fingerprint'),
+                                    result['value'], result['output'])
+                else:
+                    manifest.forget(result['path'])
+        if echo and result['output']:
+            sys.stdout.write(result['output'])
+        if result['status'] == 'error' and on_error is not None:
+            result['value'] = on_error(result['message'])
+        yield result
+
+
+def count_statuses(results: List[Dict[str, object]]) -> Dict[str, int]:
+    """Number of results per status"""
+    counts = {'changed': 0, 'skipped': 0, 'error': 0}
+    for result in results:
+        counts[result['status']] += 1
+    return counts
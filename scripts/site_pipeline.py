@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+In-memory transform pipeline for the maintenance scripts.
+
+Each transform script registers a per-page function with @register_transform.
+The pipeline reads a page once, runs every registered transform that applies
+to it against the in-memory source (later transforms see the edits of earlier
+ones through the page index), and writes the file at most once, and only if
+its bytes changed.
+
+Usage from a script in this folder:
+
+    from site_pipeline import register_transform
+
+    @register_transform('footer', lambda page: page.section == 'Jain Docs')
+    def footer_transform(page):
+        return update_footer_in_file(page)
+"""
+
+import importlib.util
+import io
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from site_corpus import Page
+from site_manifest import Manifest, source_version, with_imports
+from site_parallel import DEFAULT_JOBS, map_pages
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Scripts that register transforms, in the order the transforms run
+PIPELINE_SCRIPTS = [
+    'optimize-jain-docs-seo.py',
+    'add-breadcrumb-schema.py',
+    'add-article-schema.py',
+    'add-faq-schema.py',
+    'fix-duplicate-h1.py',
+    'update-jain-docs-footer.py',
+    'add-internal-links.py',
+    'add-ads-to-pages.py',
+]
+
+
+class Transform:
+    """A named per-page edit and the pages it applies to"""
+
+    def __init__(self, name: str, apply: Callable[[Page], object], applies_to: Callable[[Page], bool]):
+        self.name = name
+        self.apply = apply
+        self.applies_to = applies_to
+
+    def __repr__(self) -> str:
+        return f"Transform({self.name!r})"
+
+
+# Registered transforms by name, in registration order
+TRANSFORMS: Dict[str, Transform] = {}
+
+
+def register_transform(name: str, applies_to: Callable[[Page], bool]):
+    """Decorator registering a per-page transform under name"""
+    def decorator(func):
+        TRANSFORMS[name] = Transform(name, func, applies_to)
+        return func
+    return decorator
+
+
+def load_script(filename: str):
+    """Import a script from this folder (the hyphenated names are not importable)"""
+    module_name = filename[:-3].replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_transforms(names: Optional[Iterable[str]] = None) -> List[Transform]:
+    """Load the pipeline scripts and return their transforms in pipeline order"""
+    for filename in PIPELINE_SCRIPTS:
+        load_script(filename)
+    if names is None:
+        return list(TRANSFORMS.values())
+
+    wanted = set(names)
+    unknown = wanted - set(TRANSFORMS)
+    if unknown:
+        raise ValueError(f"Unknown transform(s): {', '.join(sorted(unknown))}")
+    return [transform for transform in TRANSFORMS.values() if transform.name in wanted]
+
+
+def run_page(page: Page, transforms: List[Transform], dry_run: bool = False) -> Dict[str, object]:
+    """
+    Run every applicable transform on one page and write it at most once.
+    Returns {'path', 'status', 'transforms', 'messages'} where status is
+    'changed', 'skipped' or 'error'.
+    """
+    result = {'path': page.rel_path, 'status': 'skipped', 'transforms': [], 'messages': []}
+    applicable = [t for t in transforms if t.applies_to(page)]
+    if not applicable:
+        return result
+
+    page.defer_writes = True
+    try:
+        for transform in applicable:
+            before = page.content
+            output = io.StringIO()
+            try:
+                # The transforms report through print(); keep it with the page result
+                with redirect_stdout(output):
+                    transform.apply(page)
+            except Exception as e:
+                page.content = before
+                result['status'] = 'error'
+                result['messages'].append(f"{transform.name}: {e}")
+                continue
+            result['messages'].extend(
+                f"{transform.name}: {line.strip()}" for line in output.getvalue().splitlines() if line.strip()
+            )
+            if page.content != before:
+                result['transforms'].append(transform.name)
+    finally:
+        page.defer_writes = False
+
+    if page.dirty:
+        if not dry_run:
+            page.save()
+        if result['status'] != 'error':
+            result['status'] = 'changed'
+    return result
+
+
+def _run_page_by_names(page: Page, names: List[str], dry_run: bool) -> Dict[str, object]:
+    """Worker entry point: transforms are looked up by name in the worker process"""
+    return run_page(page, load_transforms(names), dry_run)
+
+
+def pipeline_version(transforms: List[Transform]) -> str:
+    """Manifest version covering the transform scripts, the site_* modules they use and the selected transforms"""
+    sources = [SCRIPTS_DIR / filename for filename in PIPELINE_SCRIPTS] + [Path(__file__).resolve()]
+    return source_version(with_imports(sources), ','.join(transform.name for transform in transforms))
+
+
+def run_pipeline(
+    pages: Iterable[Page],
+    transforms: List[Transform],
+    dry_run: bool = False,
+    jobs: int = DEFAULT_JOBS,
+    manifest: Optional[Manifest] = None
+) -> List[Dict[str, object]]:
+    """Run the transforms over every page, across jobs worker processes; one result per page"""
+    names = [transform.name for transform in transforms]
+    results = []
+    for result in map_pages(_run_page_by_names, pages, jobs, args=(names, dry_run), echo=False,
+                            manifest=manifest):
+        if result['status'] == 'error':
+            results.append({'path': result['path'], 'status': 'error', 'transforms': [],
+                            'messages': [result['message']]})
+        else:
+            results.append(result['value'])
+    return results
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Timing and profiling instrumentation behind the --profile flag of the scripts.
+
+With --profile a script records:
+  - wall time per stage (the corpus walk, every map_pages() run and any
+    block a script wraps in stage())
+  - wall time per file, with the part of it spent in regular expressions
+    and in file I/O
+  - the slowest N files (--profile-top N, default 10)
+
+and prints a report to stderr when it exits. The code runs under cProfile, so
+the regex/I/O split comes from the functions actually called; per-file
+profiles are also taken in --jobs workers and merged in the main process.
+
+    --profile-stats out.pstats   dump the merged cProfile data (python -m pstats out.pstats)
+    --profile-trace out.json     write a Chrome trace (chrome://tracing, ui.perfetto.dev)
+
+Either of these implies --profile. Without the flag everything here is a no-op.
+
+Usage from a script in this folder:
+
+    from site_profile import profile_from_argv, stage
+
+    def main():
+        profile_from_argv(__file__)
+        with stage('report'):
+            print_report(results)
+"""
+
+import atexit
+import cProfile
+import json
+import os
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+DEFAULT_TOP = 10
+
+# Directory of the re package: time spent in its Python code counts as regex
+_RE_DIR = os.path.dirname(__import__('re').__file__)
+
+
+def _is_regex(func) -> bool:
+    """pstats key (file, line, name) of regex compilation or matching"""
+    filename, _, name = func
+    if filename == '~':
+        return "re.Pattern" in name or "re.Match" in name or "_sre." in name
+    return filename.startswith(_RE_DIR)
+
+
+def _is_io(func) -> bool:
+    """pstats key (file, line, name) of file system access or file reading/writing"""
+    filename, _, name = func
+    if filename == '~':
+        return "_io." in name or "io.open" in name or "posix." in name or "nt." in name
+    return False
+
+
+def _split_time(stats: Dict) -> Dict[str, float]:
+    """Own time of regex, I/O and all functions in raw profile stats"""
+    regex = io = total = 0.0
+    for func, (_, _, tottime, _, _) in stats.items():
+        total += tottime
+        if _is_regex(func):
+            regex += tottime
+        elif _is_io(func):
+            io += tottime
+    return {'regex': regex, 'io': io, 'total': total}
+
+
+class _RawStats:
+    """Stand-in profile object so pstats.Stats can load stats sent by a worker"""
+
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class Profiler:
+    """Collects stage and file timings for one script run"""
+
+    def __init__(self):
+        self.enabled = False
+        self.script = ''
+        self.top = DEFAULT_TOP
+        self.stats_path: Optional[Path] = None
+        self.trace_path: Optional[Path] = None
+        self.started = 0.0
+        self.stages: List[Dict[str, object]] = []
+        self.files: List[Dict[str, object]] = []
+        self._main: Optional[cProfile.Profile] = None
+        self._stats: Optional[pstats.Stats] = None
+
+    def start(self, script: str, top: int = DEFAULT_TOP,
+              stats_path: Optional[Path] = None, trace_path: Optional[Path] = None) -> None:
+        if self.enabled:
+            return
+        self.enabled = True
+        self.script = script
+        self.top = top
+        self.stats_path = stats_path
+        self.trace_path = trace_path
+        self.started = time.time()
+        self._main = cProfile.Profile()
+        self._main.enable()
+        atexit.register(self.finish)
+
+    def attach_worker(self) -> None:
+        """In a worker process: profile files only; their samples go back to the parent"""
+        if self._main is not None:
+            # A forked worker inherits the parent's running profile
+            self._main.disable()
+            self._main = None
+        self.enabled = True
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.stages.append({'name': name, 'start': start, 'seconds': time.time() - start})
+
+    @contextmanager
+    def measure(self, path: str) -> Iterator[Dict[str, object]]:
+        """
+        Time and profile the block as the work on one file. The sample dict is
+        filled in on exit; it can be sent back from a worker and passed to
+        add_file().
+        """
+        sample: Dict[str, object] = {'path': path}
+        if not self.enabled:
+            yield sample
+            return
+        # Only one profiler can be active: pause the script-wide one
+        if self._main is not None:
+            self._main.disable()
+        profile = cProfile.Profile()
+        sample['start'] = time.time()
+        sample['pid'] = os.getpid()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield sample
+        finally:
+            profile.disable()
+            sample['seconds'] = time.perf_counter() - start
+            profile.create_stats()
+            sample.update(_split_time(profile.stats))
+            sample['stats'] = profile.stats
+            if self._main is not None:
+                self._main.enable()
+
+    def add_file(self, sample: Dict[str, object]) -> None:
+        """Keep the timing of one file (measured here or in a worker)"""
+        if not self.enabled or 'seconds' not in sample:
+            return
+        stats = sample.pop('stats', None)
+        if stats:
+            if self._stats is None:
+                self._stats = pstats.Stats(_RawStats(stats))
+            else:
+                self._stats.add(_RawStats(stats))
+        self.files.append(sample)
+
+    @contextmanager
+    def file(self, path: str) -> Iterator[None]:
+        """Time and profile the block as the work on one file in this process"""
+        with self.measure(path) as sample:
+            yield
+        self.add_file(sample)
+
+    def merged_stats(self) -> Optional[pstats.Stats]:
+        """Script-wide profile plus every per-file profile"""
+        if self._main is None:
+            return self._stats
+        self._main.disable()
+        self._main.create_stats()
+        stats = pstats.Stats(_RawStats(self._main.stats))
+        if self._stats is not None:
+            stats.add(self._stats)
+        return stats
+
+    def chrome_trace(self) -> Dict[str, object]:
+        """Stages and files as Chrome trace 'complete' events"""
+        main_pid = os.getpid()
+        events = [{
+            'name': self.script, 'cat': 'script', 'ph': 'X', 'pid': main_pid, 'tid': 0,
+            'ts': int(self.started * 1e6), 'dur': int((time.time() - self.started) * 1e6),
+        }]
+        for item in self.stages:
+            events.append({
+                'name': item['name'], 'cat': 'stage', 'ph': 'X', 'pid': main_pid, 'tid': 0,
+                'ts': int(item['start'] * 1e6), 'dur': int(item['seconds'] * 1e6),
+            })
+        for item in self.files:
+            events.append({
+                'name': item['path'], 'cat': 'file', 'ph': 'X', 'pid': item['pid'], 'tid': 1,
+                'ts': int(item['start'] * 1e6), 'dur': int(item['seconds'] * 1e6),
+                'args': {'regex_ms': round(item['regex'] * 1000, 3), 'io_ms': round(item['io'] * 1000, 3)},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def finish(self) -> None:
+        """Print the report and write the requested dumps"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        wall = time.time() - self.started
+        stats = self.merged_stats()
+        split = _split_time(stats.stats) if stats is not None else {'regex': 0.0, 'io': 0.0, 'total': 0.0}
+
+        out = sys.stderr
+        print("\n" + "=" * 70, file=out)
+        print(f"⏱️  Profile: {self.script}", file=out)
+        print("=" * 70, file=out)
+        print(f"   Wall time: {wall:.3f}s", file=out)
+        total = split['total'] or 1.0
+        print(f"   Regex:     {split['regex']:.3f}s ({split['regex'] / total:.0%} of profiled time)", file=out)
+        print(f"   File I/O:  {split['io']:.3f}s ({split['io'] / total:.0%} of profiled time)", file=out)
+        other = split['total'] - split['regex'] - split['io']
+        print(f"   Other:     {other:.3f}s", file=out)
+
+        if self.stages:
+            print("\n   Stages:", file=out)
+            for item in self.stages:
+                print(f"     {item['name']:<40} {item['seconds']:>9.3f}s", file=out)
+
+        if self.files:
+            file_seconds = sum(item['seconds'] for item in self.files)
+            print(f"\n   Files: {len(self.files)} in {file_seconds:.3f}s "
+                  f"(avg {file_seconds / len(self.files) * 1000:.1f} ms)", file=out)
+            print(f"   Slowest {min(self.top, len(self.files))}:", file=out)
+            for item in sorted(self.files, key=lambda item: item['seconds'], reverse=True)[:self.top]:
+                print(f"     {item['seconds'] * 1000:>8.1f} ms  regex {item['regex'] * 1000:>7.1f}  "
+                      f"io {item['io'] * 1000:>7.1f}  {item['path']}", file=out)
+
+        if self.stats_path and stats is not None:
+            self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+            stats.dump_stats(str(self.stats_path))
+            print(f"\n   📄 cProfile stats: {self.stats_path}", file=out)
+        if self.trace_path:
+            self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.trace_path, 'w', encoding='utf-8') as f:
+                json.dump(self.chrome_trace(), f)
+            print(f"   📄 Chrome trace: {self.trace_path}", file=out)
+
+
+# One profiler per process
+PROFILER = Profiler()
+
+
+def stage(name: str):
+    """Context manager timing a stage of the script (no-op without --profile)"""
+    return PROFILER.stage(name)
+
+
+def profile_file(path: str):
+    """Context manager timing the work on one file (no-op without --profile)"""
+    return PROFILER.file(path)
+
+
+def _option_value(argv: Sequence[str], name: str) -> Optional[str]:
+    for i, arg in enumerate(argv):
+        if arg == name and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith(name + '='):
+            return arg.split('=', 1)[1]
+    return None
+
+
+def profile_from_argv(script_file: str, argv: Optional[Sequence[str]] = None) -> bool:
+    """Start profiling if --profile (or a profile output option) is on the command line"""
+    argv = sys.argv[1:] if argv is None else argv
+    stats_path = _option_value(argv, '--profile-stats')
+    trace_path = _option_value(argv, '--profile-trace')
+    top = _option_value(argv, '--profile-top')
+    if '--profile' not in argv and not stats_path and not trace_path:
+        return False
+    try:
+        top = int(top) if top else DEFAULT_TOP
+    except ValueError:
+        raise SystemExit(f"❌ --profile-top expects a number, got {top!r}")
+    PROFILER.start(Path(script_file).name, top,
+                   Path(stats_path) if stats_path else None,
+                   Path(trace_path) if trace_path else None)
+    return True
+
+
+def add_profile_arguments(parser) -> None:
+    """Add --profile and its output options to an argparse parser"""
+    parser.add_argument('--profile', action='store_true',
+                        help="report time per stage and per file, regex vs I/O, slowest files")
+    parser.add_argument('--profile-top', type=int, default=DEFAULT_TOP, metavar='N',
+                        help=f"slowest files to list (default: {DEFAULT_TOP})")
+    parser.add_argument('--profile-stats', type=Path, metavar='FILE', help="dump cProfile stats to FILE")
+    parser.add_argument('--profile-trace', type=Path, metavar='FILE', help="write a Chrome trace JSON to FILE")
+
+
+def profile_from_args(script_file: str, args) -> bool:
+    """Start profiling from arguments added by add_profile_arguments()"""
+    if not (args.profile or args.profile_stats or args.profile_trace):
+        return False
+    PROFILER.start(Path(script_file).name, args.profile_top, args.profile_stats, args.profile_trace)
+    return True
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+TF-IDF "related articles" for the article pages of the site.
+
+Each page's article text (its h1 and the <article> body without scripts,
+styles, ad slots and the related-articles block itself) is reduced to term
+counts. The counts are cached in .site-cache/related-terms.json with the
+file's size and mtime, so only pages changed since the last run are read
+and tokenised again.
+
+From the counts a sparse TF-IDF matrix is built in NumPy (CSR arrays:
+indptr, indices, data; sublinear tf, smoothed idf, L2-normalised rows) and
+the cosine similarities of all pages are computed as one sparse product
+X @ X.T, in row blocks so memory stays bounded. The top-k neighbours of each
+page come from argpartition over its row - no pairwise text comparison.
+
+Usage from a script in this folder:
+
+    from site_related import related_pages
+
+    for rel_path, neighbours in related_pages(pages, k=5).items():
+        print(rel_path, [(other, round(score, 3)) for other, score in neighbours])
+"""
+
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from site_corpus import CACHE_DIR, Page
+from site_profile import stage
+from site_text import decode_entities, html_text, normalize, terms
+
+TERMS_PATH = CACHE_DIR / 'related-terms.json'
+
+# Bump when the extracted text or the tokenizer changes
+TERMS_VERSION = 2
+
+# Markers around the injected block, so it can be replaced and left out of the text
+RELATED_START = '<!-- related-articles:start -->'
+RELATED_END = '<!-- related-articles:end -->'
+RELATED_BLOCK_PATTERN = re.compile(re.escape(RELATED_START) + r'.*?' + re.escape(RELATED_END) + r'(?:\r?\n)?', re.DOTALL)
+
+# The title counts this many times as much as a word of the body
+TITLE_WEIGHT = 3
+
+# Similarity rows computed per block of the product: bounds memory to block x nnz
+BLOCK_ELEMENTS = 16_000_000
+
+
+def page_heading(page: Page) -> str:
+    """The page's h1, or its title without the site suffix"""
+    if page.h1s and page.h1s[0]:
+        return normalize(decode_entities(page.h1s[0]))
+    return normalize(decode_entities((page.title or page.name).split(' | ')[0].strip()))
+
+
+def article_text(page: Page) -> str:
+    """Visible text of the article body, the related-articles block left out"""
+    return html_text(RELATED_BLOCK_PATTERN.sub('', page.article_body))
+
+
+def page_terms(page: Page) -> Dict[str, object]:
+    """Cache entry of one page: heading and term counts (title weighted)"""
+    heading = page_heading(page)
+    counts = Counter(terms(article_text(page)))
+    for term in terms(heading):
+        counts[term] += TITLE_WEIGHT
+    return {'heading': heading, 'lang': page.lang, 'terms': dict(counts)}
+
+
+class TermCache:
+    """Term counts per page, valid while the file's size and mtime are unchanged"""
+
+    def __init__(self, path: Path = TERMS_PATH):
+        self.path = Path(path)
+        self.pages: Dict[str, Dict[str, object]] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('version') == TERMS_VERSION:
+                self.pages = cached['pages']
+        except (OSError, ValueError, KeyError):
+            pass
+        self.extracted = 0
+
+    def terms(self, page: Page) -> Dict[str, object]:
+        stat = page.path.stat()
+        entry = self.pages.get(page.rel_path)
+        if entry is not None and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry
+        entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, **page_terms(page)}
+        self.pages[page.rel_path] = entry
+        self.extracted += 1
+        return entry
+
+    def refresh(self, page: Page) -> None:
+        """Record the new size and mtime of a page whose text did not change (e.g. after injecting)"""
+        entry = self.pages.get(page.rel_path)
+        if entry is not None:
+            stat = page.path.stat()
+            entry['size'], entry['mtime_ns'] = stat.st_size, stat.st_mtime_ns
+
+    def save(self, keep: Iterable[str]) -> None:
+        """Write the cache, keeping only the given pages"""
+        keep = set(keep)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': TERMS_VERSION,
+                       'pages': {path: entry for path, entry in self.pages.items() if path in keep}},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class TfidfMatrix:
+    """L2-normalised TF-IDF rows of a set of documents, as CSR arrays"""
+
+    def __init__(self, documents: List[Dict[str, int]]):
+        vocabulary: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        counts: List[float] = []
+        for terms in documents:
+            for term, count in terms.items():
+                indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                counts.append(count)
+            indptr.append(len(indices))
+
+        self.vocabulary = vocabulary
+        self.shape = (len(documents), len(vocabulary))
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+
+        # Sublinear tf, smoothed idf: log((1 + n) / (1 + df)) + 1
+        tf = 1.0 + np.log(np.asarray(counts, dtype=np.float64))
+        df = np.bincount(self.indices, minlength=len(vocabulary))
+        idf = np.log((1.0 + len(documents)) / (1.0 + df)) + 1.0
+        data = tf * idf[self.indices]
+
+        rows = np.repeat(np.arange(len(documents)), np.diff(self.indptr))
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=len(documents)))
+        norms[norms == 0] = 1.0
+        self.data = (data / norms[rows]).astype(np.float32)
+        self.rows = rows
+
+    def dense_rows(self, start: int, stop: int) -> np.ndarray:
+        """Rows start..stop as a dense (stop - start) x vocabulary block"""
+        block = np.zeros((stop - start, self.shape[1]), dtype=np.float32)
+        low, high = self.indptr[start], self.indptr[stop]
+        block[self.rows[low:high] - start, self.indices[low:high]] = self.data[low:high]
+        return block
+
+    def similarities(self, start: int, stop: int) -> np.ndarray:
+        """Cosine similarities of rows start..stop with every row: a block of X @ X.T"""
+        block = self.dense_rows(start, stop)
+        products = block[:, self.indices] * self.data
+        result = np.zeros((stop - start, self.shape[0]), dtype=np.float32)
+        # Sum the products of each document's non-zeros (rows with no terms stay 0)
+        nonempty = np.flatnonzero(np.diff(self.indptr))
+        if len(nonempty):
+            result[:, nonempty] = np.add.reduceat(products, self.indptr[nonempty], axis=1)
+        return result
+
+
+def top_neighbours(matrix: TfidfMatrix, k: int) -> List[List[Tuple[int, float]]]:
+    """The k most similar other documents of each document, best first (score > 0 only)"""
+    count = matrix.shape[0]
+    nnz = max(1, len(matrix.data))
+    block_rows = max(1, min(count, BLOCK_ELEMENTS // max(nnz, matrix.shape[1])))
+    neighbours: List[List[Tuple[int, float]]] = []
+    for start in range(0, count, block_rows):
+        stop = min(count, start + block_rows)
+        scores = matrix.similarities(start, stop)
+        scores[np.arange(stop - start), np.arange(start, stop)] = -1.0
+        top = min(k, count - 1)
+        if top <= 0:
+            neighbours.extend([] for _ in range(start, stop))
+            continue
+        candidates = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+        for row, columns in enumerate(candidates):
+            ranked = sorted(columns, key=lambda column: (-scores[row, column], column))
+            neighbours.append([(int(column), float(scores[row, column]))
+                               for column in ranked if scores[row, column] > 0])
+    return neighbours
+
+
+def related_pages(pages: List[Page], k: int = 5, cache: Optional[TermCache] = None) -> Dict[str, List[Tuple[str, float]]]:
+    """The k most related pages of each page as (rel_path, cosine similarity), best first"""
+    cache = cache or TermCache()
+    with stage('related: terms'):
+        documents = [cache.terms(page)['terms'] for page in pages]
+    with stage('related: tf-idf'):
+        matrix = TfidfMatrix(documents)
+        neighbours = top_neighbours(matrix, k)
+    return {
+        page.rel_path: [(pages[column].rel_path, round(score, 4)) for column, score in ranked]
+        for page, ranked in zip(pages, neighbours)
+    }
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Single-pass JSON-LD verification for the pages of the site.
+
+Every ld+json block of a page is parsed once. Each object in it (the block
+itself, the members of a top-level list and the members of @graph) is sent by
+@type to the validators registered for that type, and the page is checked for
+the schema types it is expected to carry. The verify scripts register their
+checks when they are loaded:
+
+    from site_schema import register_requirement, register_validator
+
+    @register_validator('BreadcrumbList')
+    def breadcrumb_validator(schema, page):
+        return validate_breadcrumb_schema(schema, page.path)
+
+    register_requirement('breadcrumb-schema', is_article_page, 'BreadcrumbList')
+
+A validator returns (is_valid, messages); messages starting with "⚠️" are
+warnings, the others errors (as validate_article_schema reports them).
+
+with_schema_dates() keeps the datePublished and dateModified of a page's
+Article schema in step with git history (see site_dates.py) for the scripts
+that write the schemas.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from site_corpus import BASE_URL, LD_JSON_PATTERN, Page
+from site_manifest import source_version
+from site_pipeline import SCRIPTS_DIR, load_script
+
+# Scripts that register validators and requirements
+VALIDATOR_SCRIPTS = [
+    'verify-article-schema.py',
+    'verify-breadcrumb-schema.py',
+    'verify-faq-schema.py',
+    'verify-jain-docs-seo.py',
+]
+
+SCHEMA_CONTEXT = 'https://schema.org'
+
+WARNING_PREFIX = '⚠️'
+
+Validator = Callable[[dict, Page], Tuple[bool, List[str]]]
+
+
+class Requirement:
+    """Schema types a set of pages must carry (any one of types)"""
+
+    def __init__(self, name: str, applies_to: Callable[[Page], bool], types: Tuple[str, ...]):
+        self.name = name
+        self.applies_to = applies_to
+        self.types = types
+
+    def __repr__(self) -> str:
+        return f"Requirement({self.name!r})"
+
+
+# Registered validators by @type, in registration order
+VALIDATORS: Dict[str, List[Validator]] = {}
+
+# Registered requirements by name
+REQUIREMENTS: Dict[str, Requirement] = {}
+
+
+def register_validator(*types: str):
+    """Decorator registering a validator for every object of the given @types"""
+    def decorator(func):
+        for schema_type in types:
+            VALIDATORS.setdefault(schema_type, []).append(func)
+        return func
+    return decorator
+
+
+def register_requirement(name: str, applies_to: Callable[[Page], bool], *types: str) -> None:
+    """Require every page applies_to accepts to carry one of types"""
+    REQUIREMENTS[name] = Requirement(name, applies_to, types)
+
+
+def load_validators() -> Dict[str, List[Validator]]:
+    """Load the validator scripts and return the validators by @type"""
+    for filename in VALIDATOR_SCRIPTS:
+        load_script(filename)
+    return VALIDATORS
+
+
+def validator_version() -> str:
+    """Manifest version covering the validator scripts and this module"""
+    sources = [SCRIPTS_DIR / filename for filename in VALIDATOR_SCRIPTS] + [Path(__file__).resolve()]
+    return source_version(sources)
+
+
+def is_warning(message: str) -> bool:
+    return message.startswith(WARNING_PREFIX)
+
+
+# ----------------------------------------------------------------------
+# Validators for the site-wide schema types
+# ----------------------------------------------------------------------
+
+# Properties the site-wide schemas must have, by @type
+REQUIRED_PROPERTIES = {
+    'WebSite': ['name', 'url'],
+    'Organization': ['name', 'url'],
+    'WebPage': ['url'],
+    'CollectionPage': ['name', 'url'],
+    'ItemList': ['itemListElement'],
+    'WebApplication': ['name', 'url', 'applicationCategory', 'offers'],
+}
+
+
+def validate_common(schema: dict, required: List[str]) -> Tuple[bool, List[str]]:
+    """@context, required properties and an HTTPS url"""
+    errors = []
+    if schema.get('@context') != SCHEMA_CONTEXT:
+        errors.append(f"Invalid @context: {schema.get('@context')}")
+    for field in required:
+        if field not in schema:
+            errors.append(f"Missing required field: {field}")
+    url = schema.get('url')
+    if isinstance(url, str) and not url.startswith('https://'):
+        errors.append(f"url should use HTTPS: {url}")
+    return len(errors) == 0, errors
+
+
+def _required_properties_validator(schema_type: str) -> Validator:
+    def validate(schema: dict, page: Page) -> Tuple[bool, List[str]]:
+        is_valid, messages = validate_common(schema, REQUIRED_PROPERTIES[schema_type])
+        url = schema.get('url')
+        if isinstance(url, str) and url.startswith('https://') and not url.startswith(BASE_URL):
+            messages.append(f"{WARNING_PREFIX} url is not on {BASE_URL}: {url}")
+        return is_valid, messages
+    validate.__name__ = f"{schema_type.lower()}_validator"
+    return validate
+
+
+for _schema_type in REQUIRED_PROPERTIES:
+    register_validator(_schema_type)(_required_properties_validator(_schema_type))
+
+
+@register_validator('ItemList')
+def item_list_validator(schema: dict, page: Page) -> Tuple[bool, List[str]]:
+    """List items are ListItems numbered from 1"""
+    errors = []
+    items = schema.get('itemListElement')
+    if not isinstance(items, list):
+        return True, []
+    for i, item in enumerate(items, 1):
+        if not isinstance(item, dict) or item.get('@type') != 'ListItem':
+            errors.append(f"Item {i}: Invalid @type")
+        elif item.get('position') != i:
+            errors.append(f"Item {i}: Position mismatch (expected {i}, got {item.get('position')})")
+    number = schema.get('numberOfItems')
+    messages = list(errors)
+    if number is not None and number != len(items):
+        messages.append(f"{WARNING_PREFIX} numberOfItems is {number}, list has {len(items)} items")
+    return len(errors) == 0, messages
+
+
+# ----------------------------------------------------------------------
+# The page pass
+# ----------------------------------------------------------------------
+
+def schema_objects(value: object, context: Optional[str] = None) -> Iterator[dict]:
+    """Every typed object of a parsed ld+json value, including list and @graph members.
+    Members without their own @context inherit the enclosing one."""
+    if isinstance(value, list):
+        for item in value:
+            yield from schema_objects(item, context)
+    elif isinstance(value, dict):
+        context = value.get('@context', context)
+        if '@type' in value:
+            yield value if '@context' in value or context is None else {'@context': context, **value}
+        if '@graph' in value:
+            yield from schema_objects(value['@graph'], context)
+
+
+def object_types(schema: dict) -> List[str]:
+    schema_type = schema.get('@type')
+    if isinstance(schema_type, list):
+        return [t for t in schema_type if isinstance(t, str)]
+    return [schema_type] if isinstance(schema_type, str) else []
+
+
+def verify_page(page: Page) -> Dict[str, object]:
+    """
+    Check every JSON-LD object of one page; runs in map_pages workers.
+    Returns {'path', 'section', 'valid', 'objects', 'missing', 'errors'} where
+    objects holds {'type', 'valid', 'messages', 'checked'} per object.
+    """
+    validators = load_validators()
+    result = {'path': page.rel_path, 'section': page.section, 'valid': True,
+              'objects': [], 'missing': [], 'errors': []}
+    found = set()
+
+    for position, block in enumerate(page.ld_json, 1):
+        try:
+            value = json.loads(block)
+        except json.JSONDecodeError as e:
+            result['errors'].append(f"ld+json block {position}: Invalid JSON: {e}")
+            continue
+        for schema in schema_objects(value):
+            types = object_types(schema)
+            found.update(types)
+            checks = [validator for schema_type in types for validator in validators.get(schema_type, [])]
+            entry = {'type': '/'.join(types) or '?', 'valid': True, 'messages': [], 'checked': bool(checks)}
+            for validator in checks:
+                try:
+                    is_valid, messages = validator(schema, page)
+                except Exception as e:
+                    is_valid, messages = False, [f"{validator.__name__} failed: {e}"]
+                entry['valid'] = entry['valid'] and is_valid
+                entry['messages'].extend(m for m in messages if m not in entry['messages'])
+            result['objects'].append(entry)
+
+    for requirement in REQUIREMENTS.values():
+        if requirement.applies_to(page) and not found.intersection(requirement.types):
+            result['missing'].append(f"{requirement.name}: no {'/'.join(requirement.types)} schema")
+
+    result['valid'] = (not result['errors'] and not result['missing']
+                       and all(entry['valid'] for entry in result['objects']))
+    return result
+
+
+# ----------------------------------------------------------------------
+# Editing
+# ----------------------------------------------------------------------
+
+def _date_pattern(name: str):
+    return re.compile(r'("' + name + r'"\s*:\s*")([^"]*)(")')
+
+
+DATE_PUBLISHED_PATTERN = _date_pattern('datePublished')
+DATE_MODIFIED_PATTERN = _date_pattern('dateModified')
+
+
+def _type_line_pattern(types: Tuple[str, ...]):
+    names = '|'.join(re.escape(t) for t in types)
+    return re.compile(r'^([ \t]*)"@type"\s*:\s*"(?:' + names + r')",[ \t]*(\r?\n)', re.MULTILINE)
+
+
+def with_schema_dates(content: str, types: Tuple[str, ...], published: Optional[str],
+                      modified: Optional[str]) -> str:
+    """
+    Page source with the dates of its first top-level schema of one of types
+    brought up to date, editing the JSON-LD text in place: dateModified moves
+    forward to modified, datePublished is added from published when the
+    schema has none. A date given as None leaves the schema as it is, so a
+    page without history keeps the dates it has.
+    """
+    for match in LD_JSON_PATTERN.finditer(content):
+        try:
+            value = json.loads(match.group(1))
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(value, dict) or not set(object_types(value)) & set(types):
+            continue
+        block = match.group(1)
+        current = value.get('dateModified')
+        if modified and isinstance(current, str) and current[:10] < modified:
+            block = DATE_MODIFIED_PATTERN.sub(lambda date: date.group(1) + modified + date.group(3), block, count=1)
+        added = [(name, date) for name, date in (('datePublished', published), ('dateModified', modified))
+                 if date and name not in value]
+        type_line = _type_line_pattern(types).search(block)
+        if added and type_line:
+            indent, newline = type_line.group(1), type_line.group(2)
+            lines = ''.join(f'{indent}"{name}": "{date}",{newline}' for name, date in added)
+            block = block[:type_line.end()] + lines + block[type_line.end():]
+        return content[:match.start(1)] + block + content[match.end(1):]
+    return content
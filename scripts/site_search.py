@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+Site search index: built from the pages, sharded, fetched lazily by home.js.
+
+Every indexable page (noindex pages left out) is reduced to a document - URL,
+title, category, a short description - and weighted term counts of its
+title, headings, meta description and visible body text. From the documents
+an inverted index is built:
+
+    search/index.json          version, format, document count, shard and
+                               chunk files
+    search/terms-<key>.bin     a range of terms, sorted, with their postings
+                               (binary format, the default)
+    search/terms-<key>.json    the same as JSON, with a prefix table
+    search/docs-<n>.json       the documents, in chunks of DOC_CHUNK
+
+The terms are sharded by their first character. A first character whose
+terms would take more than MAX_SHARD_BYTES is split further into runs of
+consecutive two-character prefixes; index.json lists each shard as
+[first prefix, file] under its first character, so a lookup takes the last
+shard whose first prefix is not after the query word.
+
+A binary shard is the magic b'TXS1', the number of terms, then per term:
+bytes shared with the previous term, suffix length, suffix (UTF-8), posting
+count and postings size - a front-coded dictionary - followed by every
+term's postings as (doc - previous doc, score) pairs. All numbers are
+unsigned LEB128 varints. Postings are only decoded for the terms a query
+hits. A JSON shard has the terms, flat [doc, score, doc, score, ...]
+postings and a prefix table mapping each prefix of up to PREFIX_LENGTH
+characters to the [first, end) range of terms starting with it.
+The browser loads index.json (a few KB), then only the shards of the query's
+first characters and the document chunks of the hits. Shard and chunk file
+names carry a hash of their content, so they can be cached for good.
+
+Words are found, folded and matched as in site_text.py. Latin terms are also
+indexed under their Hinglish spelling key ("mahaveer" under "mahavir"), and
+index.json carries the word pattern, the fold table and the spelling rules,
+so home.js tokenises a query exactly as the pages were.
+
+The same lookup is implemented by SearchIndex below, which the builder uses
+to time queries and which is the reference for the JavaScript in home.js.
+
+Usage from a script in this folder:
+
+    from site_search import SearchIndex
+
+    index = SearchIndex(SEARCH_DIR)
+    for document, score in index.search('blockchain sup'):
+        print(score, document['url'], document['title'])
+"""
+
+import hashlib
+import json
+import math
+import re
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from site_corpus import BASE_DIR, ROOT_SECTION, Corpus, Page
+from site_manifest import Manifest, source_version
+from site_parallel import DEFAULT_JOBS, map_pages
+from site_related import page_heading
+from site_text import (FOLD_TABLE, STOPWORDS, VARIANT_RULES, WORD_PATTERN, decode_entities, html_text, normalize,
+                       terms, variant, words)
+from site_urls import encode_path, url_path
+
+SEARCH_DIR = BASE_DIR / 'search'
+
+# Bump when the file format changes (home.js checks it)
+SEARCH_VERSION = 3
+
+# File formats of the term shards
+FORMATS = ('binary', 'json')
+
+SHARD_MAGIC = b'TXS1'
+
+# Weight of one occurrence of a term per field
+FIELD_WEIGHTS = {
+    'title': 10,
+    'description': 4,
+    'headings': 3,
+    'body': 1,
+}
+
+# First-character shards larger than this are split into two-character prefix runs
+MAX_SHARD_BYTES = 32 * 1024
+
+# Longest prefix with an entry in a shard's prefix table
+PREFIX_LENGTH = 3
+
+# Documents per docs-<n>.json chunk
+DOC_CHUNK = 50
+
+# Characters of the description shown under a result
+DESCRIPTION_LENGTH = 160
+
+# Prefix matches of the last query word that are looked up, most frequent first
+MAX_EXPANSIONS = 30
+
+# A prefix match scores this fraction of a whole-word match
+PREFIX_FACTOR = 0.8
+
+# Category shown with a result, per section
+CATEGORY_NAMES = {
+    ROOT_SECTION: 'TapNex Wiki',
+    'EVENT-MANAGEMENT': 'Event Management',
+    'MARKETING': 'Marketing',
+    'TECHNOLOGY': 'Technology',
+    'TOOLS': 'Tools',
+    'Jain Docs': 'Jain Docs',
+    'bhakti': 'Bhakti',
+    'article': 'Articles',
+    'hindi_article': 'Hindi Articles',
+}
+
+HEADING_PATTERN = re.compile(r'<h([2-6])[^>]*>(.*?)</h\1>', re.IGNORECASE | re.DOTALL)
+MAIN_PATTERN = re.compile(r'<main\b[^>]*>(.*)</main>', re.IGNORECASE | re.DOTALL)
+BODY_PATTERN = re.compile(r'<body\b[^>]*>(.*)</body>', re.IGNORECASE | re.DOTALL)
+# Site chrome repeated on every page
+CHROME_PATTERN = re.compile(r'<(nav|header|footer|aside|form)\b.*?</\1>', re.IGNORECASE | re.DOTALL)
+# Python group references in replacements, \1 -> $1 for JavaScript
+GROUP_REFERENCE_PATTERN = re.compile(r'\\(\d)')
+
+
+def is_noindex(robots: Optional[str]) -> bool:
+    return bool(robots) and 'noindex' in robots.lower()
+
+
+def file_key(prefix: str) -> str:
+    """File-name-safe form of a shard's first prefix"""
+    return ''.join(char if char.isascii() and char.isalnum() else f"u{ord(char):04x}" for char in prefix)
+
+
+def search_title(page: Page) -> str:
+    """Title of a result: the page title without the site suffix, else the h1"""
+    if page.title:
+        return normalize(decode_entities(page.title.split(' | ')[0].strip()))
+    return page_heading(page)
+
+
+def page_main(page: Page) -> str:
+    """The page's main content: <main>, else the article, else the whole body"""
+    match = MAIN_PATTERN.search(page.content)
+    if match:
+        return match.group(1)
+    if page.article_body:
+        return page.article_body
+    match = BODY_PATTERN.search(page.content)
+    return match.group(1) if match else page.content
+
+
+def page_document(page: Page) -> Dict[str, object]:
+    """Search document of a page: what a result shows and its weighted term counts"""
+    main = CHROME_PATTERN.sub(' ', page_main(page))
+    headings = ' '.join(heading for _level, heading in HEADING_PATTERN.findall(main))
+    title = search_title(page)
+    description = normalize(decode_entities(page.description or '')).strip()
+    body = html_text(main)
+
+    fields = {
+        'title': title,
+        'description': description,
+        'headings': html_text(headings),
+        'body': body,
+    }
+    counts: Counter = Counter()
+    for field, text in fields.items():
+        for term in terms(text):
+            counts[term] += FIELD_WEIGHTS[field]
+            key = variant(term)
+            if key != term:
+                counts[key] += FIELD_WEIGHTS[field]
+
+    summary = description or body
+    if len(summary) > DESCRIPTION_LENGTH:
+        summary = summary[:DESCRIPTION_LENGTH].rsplit(' ', 1)[0] + '…'
+    return {
+        'title': title,
+        'category': CATEGORY_NAMES.get(page.section, page.section),
+        'description': summary,
+        'terms': dict(counts),
+    }
+
+
+def collect_documents(corpus: Corpus, jobs: int = DEFAULT_JOBS) -> Tuple[List[Tuple[str, Dict[str, object]]], int]:
+    """
+    (rel_path, document) of every indexable page, and the number of pages
+    read this run: documents are cached in a manifest, so only changed pages
+    are read again.
+    """
+    scripts_dir = Path(__file__).resolve().parent
+    version = source_version([scripts_dir / name for name in ('site_search.py', 'site_related.py', 'site_text.py')])
+    manifest = Manifest('build-search-index', version)
+    pages = [page for page in corpus if not is_noindex(page.robots)]
+    documents = []
+    for result in map_pages(page_document, pages, jobs, manifest=manifest):
+        if result['status'] == 'error':
+            print(f"❌ {result['path']}: {result['message']}")
+            continue
+        documents.append((result['path'], result['value']))
+    manifest.save()
+    return documents, manifest.misses
+
+
+def dump_json(value: object) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def hashed_name(stem: str, data: bytes, suffix: str = '.json') -> str:
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{suffix}"
+
+
+def encode_varint(value: int, out: bytearray) -> None:
+    """Append an unsigned LEB128 varint"""
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """Unsigned LEB128 varint at offset, and the offset after it"""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def shard_data(group: List[Tuple[str, List[int]]]) -> bytes:
+    """JSON of a shard: sorted terms, their postings and the prefix table"""
+    prefixes: Dict[str, List[int]] = {}
+    for position, (term, _flat) in enumerate(group):
+        for length in range(2, min(PREFIX_LENGTH, len(term)) + 1):
+            prefixes.setdefault(term[:length], [position, position])[1] = position + 1
+    return dump_json({
+        'terms': [term for term, _flat in group],
+        'postings': [flat for _term, flat in group],
+        'prefixes': prefixes,
+    })
+
+
+def binary_shard_data(group: List[Tuple[str, List[int]]]) -> bytes:
+    """Binary shard: front-coded terms, then delta-encoded postings"""
+    dictionary = bytearray(SHARD_MAGIC)
+    encode_varint(len(group), dictionary)
+    postings = bytearray()
+    previous = b''
+    for term, flat in group:
+        encoded = term.encode('utf-8')
+        shared = 0
+        limit = min(len(previous), len(encoded))
+        while shared < limit and previous[shared] == encoded[shared]:
+            shared += 1
+        encode_varint(shared, dictionary)
+        encode_varint(len(encoded) - shared, dictionary)
+        dictionary += encoded[shared:]
+        previous = encoded
+
+        start = len(postings)
+        last_doc = 0
+        for i in range(0, len(flat), 2):
+            encode_varint(flat[i] - last_doc, postings)
+            encode_varint(flat[i + 1], postings)
+            last_doc = flat[i]
+        encode_varint(len(flat) // 2, dictionary)
+        encode_varint(len(postings) - start, dictionary)
+    return bytes(dictionary + postings)
+
+
+SHARD_ENCODERS = {'binary': (binary_shard_data, '.bin'), 'json': (shard_data, '.json')}
+
+
+def split_group(first: str, group: List[Tuple[str, List[int]]],
+                encode=binary_shard_data) -> List[Tuple[str, List[Tuple[str, List[int]]]]]:
+    """
+    The terms of one first character as shards: one shard, or runs of
+    two-character prefixes of at most MAX_SHARD_BYTES each once encoded (a
+    single prefix larger than that stays whole). Returns (first prefix, terms)
+    pairs.
+    """
+    if len(encode(group)) <= MAX_SHARD_BYTES:
+        return [(first, group)]
+    runs: Dict[str, List[Tuple[str, List[int]]]] = {}
+    for term, flat in group:
+        runs.setdefault(term[:2], []).append((term, flat))
+    parts: List[Tuple[str, List[Tuple[str, List[int]]]]] = []
+    size = 0
+    for prefix, run in runs.items():
+        run_size = len(encode(run))
+        if parts and size + run_size <= MAX_SHARD_BYTES:
+            parts[-1][1].extend(run)
+            size += run_size
+        else:
+            # The first run keeps the first character, so shorter words find it
+            parts.append((prefix if parts else first, list(run)))
+            size = run_size
+    return parts
+
+
+def build_files(documents: List[Tuple[str, Dict[str, object]]], rules,
+                shard_format: str = 'binary') -> Dict[str, bytes]:
+    """
+    Files of the search index (name -> content) for a list of
+    (rel_path, document) pairs, with term shards in the given format. The
+    doc ids are positions in the list.
+    """
+    encode, suffix = SHARD_ENCODERS[shard_format]
+    postings: Dict[str, List[Tuple[int, float]]] = {}
+    for doc, (_rel_path, document) in enumerate(documents):
+        for term, weight in document['terms'].items():
+            postings.setdefault(term, []).append((doc, 1.0 + math.log(weight)))
+
+    # Scores: sublinear weighted tf x idf, as small integers
+    total = len(documents)
+    groups: Dict[str, List[Tuple[str, List[int]]]] = {}
+    for term in sorted(postings):
+        entries = postings[term]
+        idf = math.log(1.0 + total / len(entries))
+        flat: List[int] = []
+        for doc, tf in entries:
+            flat.extend((doc, max(1, round(tf * idf * 10))))
+        groups.setdefault(term[0], []).append((term, flat))
+
+    files: Dict[str, bytes] = {}
+    shard_files: Dict[str, List[List[str]]] = {}
+    for first, group in groups.items():
+        for start, part in split_group(first, group, encode):
+            data = encode(part)
+            name = hashed_name(f"terms-{file_key(start)}", data, suffix)
+            files[name] = data
+            shard_files.setdefault(first, []).append([start, name])
+
+    chunk_files = []
+    for start in range(0, total, DOC_CHUNK):
+        chunk = [
+            [encode_path(url_path(rel_path, rules)), document['title'], document['category'], document['description']]
+            for rel_path, document in documents[start:start + DOC_CHUNK]
+        ]
+        data = dump_json(chunk)
+        name = hashed_name(f"docs-{start // DOC_CHUNK}", data)
+        files[name] = data
+        chunk_files.append(name)
+
+    files['index.json'] = dump_json({
+        'version': SEARCH_VERSION,
+        'format': shard_format,
+        'documents': total,
+        'chunk': DOC_CHUNK,
+        'prefix': PREFIX_LENGTH,
+        'expansions': MAX_EXPANSIONS,
+        'prefixFactor': PREFIX_FACTOR,
+        'shards': dict(sorted(shard_files.items())),
+        'docs': chunk_files,
+        'stopwords': sorted(STOPWORDS),
+        'pattern': WORD_PATTERN.pattern,
+        'fold': {chr(code): replacement for code, replacement in FOLD_TABLE.items()},
+        'variants': [[pattern, GROUP_REFERENCE_PATTERN.sub(r'$\1', replacement)]
+                     for pattern, replacement in VARIANT_RULES],
+    })
+    return files
+
+
+class JsonShard:
+    """A JSON term shard"""
+
+    def __init__(self, data: Dict[str, object]):
+        self.terms: List[str] = data['terms']
+        self._postings: List[List[int]] = data['postings']
+        self._prefixes: Dict[str, List[int]] = data['prefixes']
+
+    def bounds(self, token: str) -> Tuple[int, int]:
+        """Range of terms that may start with the token (the prefix table's entry)"""
+        return tuple(self._prefixes.get(token[:PREFIX_LENGTH], [0, 0]))
+
+    def count(self, position: int) -> int:
+        return len(self._postings[position]) // 2
+
+    def postings(self, position: int) -> List[int]:
+        return self._postings[position]
+
+
+class BinaryShard:
+    """A binary term shard: the dictionary is decoded up front, postings on demand"""
+
+    def __init__(self, data: bytes):
+        if data[:len(SHARD_MAGIC)] != SHARD_MAGIC:
+            raise ValueError("not a binary search shard")
+        self.data = data
+        count, offset = read_varint(data, len(SHARD_MAGIC))
+        self.terms: List[str] = []
+        self.counts: List[int] = []
+        sizes: List[int] = []
+        previous = b''
+        for _ in range(count):
+            shared, offset = read_varint(data, offset)
+            length, offset = read_varint(data, offset)
+            previous = previous[:shared] + data[offset:offset + length]
+            offset += length
+            self.terms.append(previous.decode('utf-8'))
+            postings, offset = read_varint(data, offset)
+            size, offset = read_varint(data, offset)
+            self.counts.append(postings)
+            sizes.append(size)
+        self.offsets: List[int] = []
+        for size in sizes:
+            self.offsets.append(offset)
+            offset += size
+
+    def bounds(self, token: str) -> Tuple[int, int]:
+        return 0, len(self.terms)
+
+    def count(self, position: int) -> int:
+        return self.counts[position]
+
+    def postings(self, position: int) -> List[int]:
+        flat: List[int] = []
+        offset = self.offsets[position]
+        doc = 0
+        for _ in range(self.counts[position]):
+            delta, offset = read_varint(self.data, offset)
+            score, offset = read_varint(self.data, offset)
+            doc += delta
+            flat.extend((doc, score))
+        return flat
+
+
+class SearchIndex:
+    """Reads a built search index the way home.js does: shards and chunks on demand"""
+
+    def __init__(self, directory: Path = SEARCH_DIR):
+        self.directory = Path(directory)
+        self.meta = self._load('index.json')
+        if self.meta.get('version') != SEARCH_VERSION:
+            raise ValueError(f"search index version {self.meta.get('version')}, expected {SEARCH_VERSION}")
+        self.stopwords = frozenset(self.meta['stopwords'])
+        self.shards: Dict[str, object] = {}
+        self.chunks: Dict[int, List[List[str]]] = {}
+
+    def _load(self, name: str):
+        with open(self.directory / name, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load_shard(self, name: str):
+        """Read and decode one shard file"""
+        if name.endswith('.bin'):
+            return BinaryShard((self.directory / name).read_bytes())
+        return JsonShard(self._load(name))
+
+    def shard_name(self, token: str) -> Optional[str]:
+        """File of the shard holding the terms that start with the token (at least two characters)"""
+        name = None
+        for start, file_name in self.meta['shards'].get(token[0], []):
+            if start <= token[:2]:
+                name = file_name
+        return name
+
+    def shard(self, token: str):
+        name = self.shard_name(token)
+        if name is None:
+            return None
+        if name not in self.shards:
+            self.shards[name] = self.load_shard(name)
+        return self.shards[name]
+
+    def document(self, doc: int) -> Dict[str, str]:
+        chunk_number = doc // self.meta['chunk']
+        if chunk_number not in self.chunks:
+            self.chunks[chunk_number] = self._load(self.meta['docs'][chunk_number])
+        url, title, category, description = self.chunks[chunk_number][doc % self.meta['chunk']]
+        return {'url': url, 'title': title, 'category': category, 'description': description}
+
+    def term_scores(self, token: str, prefix: bool) -> Dict[int, float]:
+        """Best score per doc of the token (and, with prefix, of the terms it starts)"""
+        shard = self.shard(token)
+        if shard is None:
+            return {}
+        terms = shard.terms
+        if prefix:
+            start, end = shard.bounds(token)
+            position = bisect_left(terms, token, start, end)
+            matches = []
+            while position < end and terms[position].startswith(token):
+                matches.append(position)
+                position += 1
+            # Most frequent completions first
+            matches.sort(key=lambda match: -shard.count(match))
+            matches = matches[:self.meta['expansions']]
+        else:
+            position = bisect_left(terms, token)
+            matches = [position] if position < len(terms) and terms[position] == token else []
+
+        scores: Dict[int, float] = {}
+        for match in matches:
+            factor = 1.0 if terms[match] == token else self.meta['prefixFactor']
+            flat = shard.postings(match)
+            for i in range(0, len(flat), 2):
+                score = flat[i + 1] * factor
+                if score > scores.get(flat[i], 0):
+                    scores[flat[i]] = score
+        return scores
+
+    def search(self, query: str, limit: int = 8) -> List[Tuple[Dict[str, str], float]]:
+        """Documents containing every word of the query (the last one as a prefix), best first"""
+        found = words(query)
+        # The last word may be half typed: a stopword is only dropped once it is complete
+        tokens = [word for number, word in enumerate(found)
+                  if len(word) > 1 and (word not in self.stopwords or number == len(found) - 1)]
+        if not tokens:
+            return []
+        totals: Optional[Dict[int, float]] = None
+        for number, token in enumerate(tokens):
+            prefix = number == len(tokens) - 1
+            scores = self.term_scores(token, prefix)
+            key = variant(token)
+            if key != token:
+                for doc, score in self.term_scores(key, prefix).items():
+                    if score > scores.get(doc, 0):
+                        scores[doc] = score
+            if totals is None:
+                totals = scores
+            else:
+                totals = {doc: total + scores[doc] for doc, total in totals.items() if doc in scores}
+            if not totals:
+                return []
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(self.document(doc), score) for doc, score in ranked]
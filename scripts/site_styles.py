@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+The stylesheets and scripts of a page, its template, and the names it uses.
+
+The CSS build stages (bundle-tools-css.py, prune-unused-css.py) need to
+know, for a page:
+
+    page_template(page)      'article', 'jain-docs', 'tool' or 'home' - the
+                             page layouts the site is built from (None for
+                             the section indexes and one-off pages)
+    stylesheet_links(page)   its <link rel="stylesheet"> tags, local hrefs
+                             resolved to files the way the browser resolves
+                             them under vercel.json's clean URLs
+    script_paths(page)       the local scripts it loads
+    page_names(page)         the element types, ids and classes it can have
+    prune_stylesheet(css, names)
+                             the sheet without the rules no element with
+                             those names can match
+
+page_names() reads the markup and inline scripts of the page and every
+local script it loads, with the HTML fragments those fetch: tags, id and
+class attributes (in markup and in the HTML strings of scripts), className
+assignments, createElement() calls, and the classes a script adds at
+runtime (runtime_classes()): a literal given to classList, to a ${...} in a
+class string or concatenated into one. When that argument is a variable,
+its values are the literals assigned to it and the last literal arguments
+of the calls in the same script (showStatus(message, 'error')). Classes set
+by third-party scripts are not seen; the stages that act on the names take
+an allowlist for those.
+
+Usage from a script in this folder:
+
+    from site_styles import page_names, stylesheet_links
+
+    names = page_names(page)
+    for link in stylesheet_links(page):
+        print(link.href, link.path, names.can_match('.toc-sidebar a'))
+"""
+
+import re
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from site_corpus import BASE_DIR, CATEGORY_SECTIONS, Page, read_text
+from site_css import GROUPING_AT_RULES, Statement, declarations, parse_stylesheet, required_names, split_selectors
+from site_links import normalize_href, url_rules
+from site_urls import url_path
+
+# Page layouts, in the order they are tried
+TEMPLATES: Dict[str, Callable[[Page], bool]] = {
+    'home': lambda page: page.rel_path == 'index.html',
+    'article': lambda page: (page.section in CATEGORY_SECTIONS and page.subfolder is not None)
+                            or page.section in ('article', 'hindi_article'),
+    'jain-docs': lambda page: page.rel_path.startswith('Jain Docs/Pages/'),
+    'tool': lambda page: page.section == 'TOOLS' and page.subfolder is not None,
+}
+
+# Elements a page has without writing them: parser-implied ones, and the frames AdSense inserts
+IMPLIED_TYPES = {'html', 'head', 'body', 'tbody', 'iframe'}
+
+LINK_TAG_PATTERN = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+STYLE_ELEMENT_PATTERN = re.compile(r'<style\b.*?</style\s*>', re.IGNORECASE | re.DOTALL)
+SCRIPT_SRC_PATTERN = re.compile(r'<script\b[^>]*\bsrc\s*=\s*(["\'])(.*?)\1', re.IGNORECASE)
+ATTRIBUTE_PATTERN = re.compile(r'\b([\w-]+)\s*=\s*(["\'])(.*?)\2', re.DOTALL)
+
+TAG_NAME_PATTERN = re.compile(r'<([A-Za-z][\w-]*)')
+ID_ATTRIBUTE_PATTERN = re.compile(r"""\bid\s*=\s*(["'`])([^"'`\s]+)\1""")
+# element.id = 'name', document.createElement('div')
+ID_PROPERTY_PATTERN = re.compile(r"""\.id\s*=\s*(["'`])([\w-]+)\1""")
+CREATE_ELEMENT_PATTERN = re.compile(r"""createElement(?:NS)?\((?:[^,)]*,\s*)?(["'`])([\w-]+)\1""")
+# fetch('/TOOLS/shared/footer.html'): markup a script inserts
+FETCH_HTML_PATTERN = re.compile(r"""fetch\(\s*(["'`])(/[^"'`]+\.html)\1""")
+
+# class="..." in markup and script strings
+CLASS_ATTRIBUTE_PATTERN = re.compile(r"""\bclass\s*=\s*(["'`])(.*?)\1""", re.DOTALL)
+# element.className = 'a b' / `a ${b}` / test ? 'a' : 'b'
+CLASS_NAME_PATTERN = re.compile(r'\.className\s*=\s*([^;\n]+)')
+STRING_LITERAL_PATTERN = re.compile(r"""(["'`])(.*?)\1""", re.DOTALL)
+# '<span class="' + cls + '">'
+CLASS_CONCATENATION_PATTERN = re.compile(r"""\bclass=["']\s*(["'])\s*\+\s*([A-Za-z_$][\w$]*)""")
+TEMPLATE_PLACEHOLDER_PATTERN = re.compile(r'\$\{([^}]*)\}')
+CLASS_LIST_PATTERN = re.compile(r'\.classList\.(?:add|remove|toggle|replace)\(([^)]*)\)')
+WORD_LITERAL_PATTERN = re.compile(r"""(["'`])(-?[A-Za-z_][\w-]*)\1""")
+IDENTIFIER_PATTERN = re.compile(r"""(?<![\w.'"`-])([A-Za-z_$][\w$]*)(?![\w'"`(-])""")
+LAST_ARGUMENT_PATTERN = re.compile(r""",\s*(["'])(-?[A-Za-z_][\w-]*)\1\s*\)""")
+
+ANIMATION_PROPERTY_PATTERN = re.compile(r'^(?:-\w+-)?animation(?:-name)?$')
+
+
+def page_template(page: Page) -> Optional[str]:
+    for name, applies_to in TEMPLATES.items():
+        if applies_to(page):
+            return name
+    return None
+
+
+class StylesheetLink:
+    """A <link rel="stylesheet"> tag of a page; path is the local file it loads, if any"""
+
+    def __init__(self, tag: str, href: str, path: Optional[Path]):
+        self.tag = tag
+        self.href = href
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"StylesheetLink({self.href!r})"
+
+
+def resolve_href(page: Page, href: str) -> Optional[Path]:
+    """The file of the site an href on the page loads, or None for external and missing files"""
+    page_path = url_path(page.rel_path, url_rules(page.base_dir.resolve()))
+    kind, target = normalize_href(href.replace('&amp;', '&'), page_path)
+    if kind != 'internal':
+        return None
+    path = page.base_dir / target.lstrip('/')
+    return path if path.is_file() else None
+
+
+def stylesheet_links(page: Page, content: Optional[str] = None) -> List[StylesheetLink]:
+    """The stylesheet links of the page, or of another version of its source"""
+    links = []
+    for match in LINK_TAG_PATTERN.finditer(page.content if content is None else content):
+        attributes = {name.lower(): value for name, _quote, value in ATTRIBUTE_PATTERN.findall(match.group(0))}
+        if attributes.get('rel', '').lower() == 'stylesheet' and 'href' in attributes:
+            links.append(StylesheetLink(match.group(0), attributes['href'],
+                                        resolve_href(page, attributes['href'])))
+    return links
+
+
+def script_paths(page: Page) -> List[Path]:
+    paths = (resolve_href(page, match.group(2)) for match in SCRIPT_SRC_PATTERN.finditer(page.content))
+    return [path for path in paths if path is not None]
+
+
+def class_strings(source: str) -> List[str]:
+    """Class attribute values of markup, or of the strings and className assignments of a script"""
+    values = [match.group(2) for match in CLASS_ATTRIBUTE_PATTERN.finditer(source)]
+    for assignment in CLASS_NAME_PATTERN.findall(source):
+        values.extend(match.group(2) for match in STRING_LITERAL_PATTERN.finditer(assignment))
+    return values
+
+
+def class_sets(source: str) -> Set[FrozenSet[str]]:
+    """The sets of classes the class strings of a page or script give one element"""
+    sets = set()
+    for value in class_strings(source):
+        words = frozenset(TEMPLATE_PLACEHOLDER_PATTERN.sub(' ', value).split())
+        if words:
+            sets.add(words)
+    return sets
+
+
+def runtime_classes(script: str) -> Set[str]:
+    """Classes a script may add to an element after the page has loaded (see above)"""
+    arguments = CLASS_LIST_PATTERN.findall(script)
+    for value in class_strings(script):
+        arguments.extend(TEMPLATE_PLACEHOLDER_PATTERN.findall(value))
+    classes = set()
+    variables = {match.group(2) for match in CLASS_CONCATENATION_PATTERN.finditer(script)}
+    for argument in arguments:
+        classes.update(match.group(2) for match in WORD_LITERAL_PATTERN.finditer(argument))
+        variables.update(IDENTIFIER_PATTERN.findall(WORD_LITERAL_PATTERN.sub('', argument)))
+    for variable in variables:
+        assigned = re.compile(r'\b' + re.escape(variable) + r"""\s*=\s*(["'`])(-?[A-Za-z_][\w-]*)\1""")
+        classes.update(match.group(2) for match in assigned.finditer(script))
+    if variables:
+        classes.update(match.group(2) for match in LAST_ARGUMENT_PATTERN.finditer(script))
+    return classes
+
+
+class Names:
+    """Element types, ids and classes a page (or every page of a group) can have"""
+
+    def __init__(self, types: Iterable[str] = (), ids: Iterable[str] = (), classes: Iterable[str] = ()):
+        self.types = set(types)
+        self.ids = set(ids)
+        self.classes = set(classes)
+
+    def __repr__(self) -> str:
+        return f"Names({len(self.types)} types, {len(self.ids)} ids, {len(self.classes)} classes)"
+
+    def update(self, other: 'Names') -> 'Names':
+        self.types.update(other.types)
+        self.ids.update(other.ids)
+        self.classes.update(other.classes)
+        return self
+
+    def can_match(self, selector: str) -> bool:
+        """False when the selector needs a type, id or class none of these elements has"""
+        types, ids, classes = required_names(selector)
+        return types <= self.types and ids <= self.ids and classes <= self.classes
+
+
+def source_names(source: str) -> Names:
+    """Names in markup or in a script; scripts and inline scripts are read the same way"""
+    names = Names(
+        types={match.group(1).lower() for match in TAG_NAME_PATTERN.finditer(source)},
+        ids={match.group(2) for pattern in (ID_ATTRIBUTE_PATTERN, ID_PROPERTY_PATTERN)
+             for match in pattern.finditer(source)},
+        classes=runtime_classes(source),
+    )
+    names.types.update(match.group(2).lower() for match in CREATE_ELEMENT_PATTERN.finditer(source))
+    for words in class_sets(source):
+        names.classes.update(words)
+    return names
+
+
+# Names of the site's scripts, read once per process
+_SCRIPT_NAMES: Dict[Path, Names] = {}
+
+
+def script_names(path: Path, base_dir: Path = BASE_DIR) -> Names:
+    """Names of a script and of the HTML fragments it fetches"""
+    if path not in _SCRIPT_NAMES:
+        source = read_text(path)
+        names = source_names(source)
+        for match in FETCH_HTML_PATTERN.finditer(source):
+            fragment = base_dir / match.group(2).lstrip('/')
+            if fragment.is_file():
+                names.update(source_names(read_text(fragment)))
+        _SCRIPT_NAMES[path] = names
+    return _SCRIPT_NAMES[path]
+
+
+def page_names(page: Page) -> Names:
+    """Everything the page and its scripts can put in the document (see above)"""
+    names = source_names(STYLE_ELEMENT_PATTERN.sub('', page.content))
+    names.types.update(IMPLIED_TYPES)
+    for path in script_paths(page):
+        if path.suffix == '.js':
+            names.update(script_names(path, page.base_dir))
+    return names
+
+
+def used(statement: Statement, names: Names, animations: Optional[Set[str]]) -> bool:
+    """Whether a statement can apply to a page with these names (keyframes: while animations use them)"""
+    if statement.is_rule:
+        return any(names.can_match(selector) for selector in split_selectors(statement.prelude))
+    if statement.at_name in GROUPING_AT_RULES:
+        return any(used(child, names, animations) for child in statement.children)
+    if statement.at_name.endswith('keyframes'):
+        return animations is None or statement.prelude.split(' ', 1)[-1] in animations
+    return True
+
+
+def animation_names(statements: List[Statement], names: Names) -> Set[str]:
+    """Every word of the animation values of the rules that can apply"""
+    found = set()
+    for statement in statements:
+        if statement.children:
+            found.update(animation_names(statement.children, names))
+        elif statement.is_rule and used(statement, names, None):
+            for name, value, _important in declarations(statement.body or ''):
+                if ANIMATION_PROPERTY_PATTERN.match(name):
+                    found.update(re.findall(r'[\w-]+', value))
+    return found
+
+
+def prune_stylesheet(css: str, names: Names) -> Tuple[str, int, int]:
+    """(css without the rules these names cannot match, rules kept, rules removed)
+
+    @media blocks keep their used rules, @keyframes stay while a kept rule
+    animates with them, and other at-rules (@font-face, @import) always stay.
+    """
+    sheet = parse_stylesheet(css)
+    animations = animation_names(sheet.statements, names)
+    parts = []
+    kept = removed = 0
+    for statement in sheet.statements:
+        children = statement.children if statement.at_name in GROUPING_AT_RULES else [statement]
+        keep = [child for child in children if used(child, names, animations)]
+        kept += len(keep)
+        removed += len(children) - len(keep)
+        if not keep:
+            continue
+        if statement.at_name in GROUPING_AT_RULES:
+            parts.append(statement.leading + statement.with_children(keep))
+        else:
+            parts.append(statement.text)
+    return ''.join(parts).lstrip() + sheet.trailing, kept, removed
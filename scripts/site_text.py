@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Text normalisation and tokenisation shared by the search index, the related
+articles, the word counts and the duplicate checks.
+
+Much of the site is Hindi (Jain Docs, hindi_article/, bhakti), often next to
+romanised Hindi ("Hinglish") and English, so splitting on whitespace or on
+ASCII letters is not enough. Here:
+
+    html_text(html)     visible text of a fragment: scripts, styles, ad slots,
+                        svg and comments dropped, tags removed, HTML entities
+                        decoded (double-encoded ones too), whitespace collapsed
+    normalize(text)     NFC, so a nukta or a vowel sign typed as a separate code
+                        point compares equal to the precomposed letter; zero-
+                        width joiners and soft hyphens removed
+    fold(text)          matching form: lower case, nukta dropped (क़ = क),
+                        chandrabindu as anusvara (हँस = हंस), Devanagari digits
+                        as ASCII digits, curly apostrophes as straight ones
+    words(text)         every word: Latin words and Devanagari words with their
+                        vowel signs, viramas and nuktas (never split in a conjunct)
+    terms(text)         folded words without stopwords and one-letter words
+    variant(term)       Hinglish spelling key: "mahaveer", "mahavir" and
+                        "mahaaveer" all give "mahavir"
+
+Every step runs over a whole document at once (one str.translate, one
+regular-expression pass), never character by character in Python.
+
+Usage from a script in this folder:
+
+    from site_text import count_words, html_text, terms, variant
+
+    text = html_text(page.article_body)
+    print(count_words(text), [variant(term) for term in terms(text)])
+"""
+
+import re
+import unicodedata
+from html import unescape
+from typing import Dict, List, Sequence, Tuple
+
+# Markup whose text is not part of the page's prose
+NON_TEXT_PATTERN = re.compile(
+    r'<(script|style|ins|noscript|svg)\b.*?</\1>|<!--.*?-->',
+    re.IGNORECASE | re.DOTALL
+)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Code points that only affect rendering: ZWNJ, ZWJ (half forms after a
+# virama), zero-width space, word joiner, soft hyphen, BOM
+INVISIBLE = '\u200b\u200c\u200d\u2060\u00ad\ufeff'
+
+INVISIBLE_TABLE: Dict[int, str] = {ord(char): '' for char in INVISIBLE}
+
+DEVANAGARI_DIGITS = '०१२३४५६७८९'
+NUKTA = '़'
+CHANDRABINDU = 'ँ'
+ANUSVARA = 'ं'
+
+FOLD_TABLE: Dict[int, str] = {
+    **INVISIBLE_TABLE,
+    **{ord(digit): str(value) for value, digit in enumerate(DEVANAGARI_DIGITS)},
+    ord(NUKTA): '',
+    ord(CHANDRABINDU): ANUSVARA,
+    ord('’'): "'",
+    ord('‘'): "'",
+}
+
+# Latin words (with one apostrophe: it's, don't) and Devanagari words: letters,
+# vowel signs, virama, nukta, avagraha - not the danda (।, ॥) or the digits,
+# which are folded to ASCII first
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?|[ऀ-ॣॱ-ॿ]+")
+
+STOPWORDS = frozenset('''
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers herself him himself his how i if in into is it its itself just
+let me more most my myself no nor not now of off on once only or other our ours ourselves out over
+own same she should so some such than that the their theirs them themselves then there these they
+this those through to too under until up very was we were what when where which while who whom
+why will with would you your yours yourself yourselves 2024 2025 one two use used using like get
+make many may new way ways well it's you're
+है हैं का की के को में से और या पर भी यह वह इस उस कि तो ही एक लिए कर करें करने होता होती होते था थी थे
+हो जो तक ने जब सब कुछ अपने अपनी लेकिन
+'''.split())
+
+# Hinglish spelling variants, applied in order to a folded Latin term: long
+# vowels written doubled, w/v, ph/f, q/k, z/j and doubled consonants. The
+# same rules (as regular-expression source) go into the search index for
+# home.js, so keep them to syntax Python and JavaScript agree on.
+VARIANT_RULES: Sequence[Tuple[str, str]] = (
+    ('aa', 'a'),
+    ('ee', 'i'),
+    ('ii', 'i'),
+    ('oo', 'u'),
+    ('uu', 'u'),
+    ('w', 'v'),
+    ('ph', 'f'),
+    ('q', 'k'),
+    ('z', 'j'),
+    (r'([bcdfghjklmnprstvxy])\1', r'\1'),
+)
+_VARIANT_PATTERNS = [(re.compile(pattern), replacement) for pattern, replacement in VARIANT_RULES]
+LATIN_PATTERN = re.compile(r'[a-z]')
+
+
+def decode_entities(text: str) -> str:
+    """Text with HTML entities decoded, twice encoded ones (&amp;nbsp;) included"""
+    for _ in range(2):
+        if '&' not in text:
+            break
+        decoded = unescape(text)
+        if decoded == text:
+            break
+        text = decoded
+    return text
+
+
+def normalize(text: str) -> str:
+    """NFC text without zero-width joiners and soft hyphens"""
+    return unicodedata.normalize('NFC', text).translate(INVISIBLE_TABLE)
+
+
+def fold(text: str) -> str:
+    """Matching form of a text: lower case, nukta and chandrabindu folded, ASCII digits"""
+    # NFC first: precomposed nukta letters (क़ U+0958) decompose to letter + nukta
+    return unicodedata.normalize('NFC', text).lower().translate(FOLD_TABLE)
+
+
+def html_text(html: str) -> str:
+    """Visible text of an HTML fragment, entities decoded and whitespace collapsed"""
+    text = TAG_PATTERN.sub(' ', NON_TEXT_PATTERN.sub(' ', html))
+    return WHITESPACE_PATTERN.sub(' ', normalize(decode_entities(text))).strip()
+
+
+def words(text: str) -> List[str]:
+    """Every word of a text, folded"""
+    return WORD_PATTERN.findall(fold(text))
+
+
+def count_words(text: str) -> int:
+    """Number of words of a text (Devanagari words count once, whatever their marks)"""
+    return len(words(text))
+
+
+def terms(text: str) -> List[str]:
+    """Folded words of a text without stopwords and one-letter words"""
+    return [word for word in words(text) if len(word) > 1 and word not in STOPWORDS]
+
+
+def variant(term: str) -> str:
+    """Hinglish spelling key of a Latin term (Devanagari terms are returned as they are)"""
+    if not LATIN_PATTERN.match(term):
+        return term
+    for pattern, replacement in _VARIANT_PATTERNS:
+        term = pattern.sub(replacement, term)
+    return term
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Public URLs of the site's pages under the routing rules in vercel.json.
+
+With "cleanUrls": true Vercel serves foo.html as /foo and dir/index.html as
+/dir (and redirects the .html forms there); "trailingSlash" decides whether
+those URLs end in a slash (true), never do (false) or are served both ways
+(unset). Paths are percent-encoded as UTF-8, so "Jain Docs/Pages/भक्तामर.html"
+becomes /Jain%20Docs/Pages/%E0%A4%AD...
+
+SitePaths goes the other way: it resolves URL paths against a hash set of
+the tree's files, so sitemaps and links can be checked offline.
+
+Usage from a script in this folder:
+
+    from site_urls import SitePaths, load_url_rules, page_url
+
+    rules = load_url_rules()
+    page_url('TECHNOLOGY/APIs/index.html', rules)   # https://wiki.tapnex.tech/TECHNOLOGY/APIs
+
+    paths = SitePaths()
+    paths.check('/TECHNOLOGY/APIs/')                  # ('trailing_slash', '/TECHNOLOGY/APIs')
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from site_corpus import BASE_DIR, BASE_URL
+
+VERCEL_CONFIG = 'vercel.json'
+
+# Characters left as they are in URL paths; everything else is percent-encoded
+PATH_SAFE = "/-._~"
+
+
+class UrlRules:
+    """The URL settings of vercel.json"""
+
+    def __init__(self, clean_urls: bool = False, trailing_slash: Optional[bool] = None,
+                 rewrites: Optional[Dict[str, str]] = None):
+        self.clean_urls = clean_urls
+        self.trailing_slash = trailing_slash
+        # Literal rewrite sources -> destination paths
+        self.rewrites = rewrites or {}
+
+    def __repr__(self) -> str:
+        return f"UrlRules(clean_urls={self.clean_urls}, trailing_slash={self.trailing_slash})"
+
+
+def load_url_rules(base_dir: Path = BASE_DIR) -> UrlRules:
+    """Rules from the site's vercel.json (Vercel's defaults when there is none)"""
+    try:
+        with open(Path(base_dir) / VERCEL_CONFIG, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return UrlRules()
+    # Only literal sources; patterns (:param, regex groups) are not resolved offline
+    rewrites = {
+        rewrite['source']: rewrite['destination'] for rewrite in config.get('rewrites', [])
+        if not any(char in rewrite['source'] for char in ':(*')
+    }
+    return UrlRules(bool(config.get('cleanUrls', False)), config.get('trailingSlash'), rewrites)
+
+
+def url_path(rel_path: str, rules: UrlRules) -> str:
+    """Unencoded URL path of a page, e.g. '/TECHNOLOGY/APIs' for TECHNOLOGY/APIs/index.html"""
+    folder, _, name = rel_path.rpartition('/')
+    if name == 'index.html':
+        path = f"/{folder}" if folder else '/'
+    elif rules.clean_urls and name.endswith('.html'):
+        path = f"/{rel_path[:-len('.html')]}"
+    else:
+        return f"/{rel_path}"
+
+    if path == '/':
+        return path
+    # Without cleanUrls a folder is served with its slash unless told otherwise
+    if rules.trailing_slash or (rules.trailing_slash is None and not rules.clean_urls):
+        return f"{path}/"
+    return path
+
+
+def encode_path(path: str) -> str:
+    return quote(path, safe=PATH_SAFE)
+
+
+def page_url(rel_path: str, rules: UrlRules, base_url: str = BASE_URL) -> str:
+    """Absolute, percent-encoded URL of a page"""
+    return f"{base_url.rstrip('/')}{encode_path(url_path(rel_path, rules))}"
+
+
+# Old URL schemes still found in sitemaps and links: prefix -> folder whose
+# pages it addressed by slug ("Acharya Vandana.html" -> /jain-docs/acharya-vandana)
+LEGACY_PREFIXES = {
+    '/jain-docs/': 'Jain Docs/Pages',
+}
+
+
+def page_slug(name: str) -> str:
+    """Slug of a page file name under the legacy URL schemes"""
+    if name.endswith('.html'):
+        name = name[:-len('.html')]
+    return name.lower().replace(' ', '-')
+
+
+class SitePaths:
+    """
+    Every file of a site tree in a hash set, resolving decoded URL paths the
+    way Vercel serves them without touching the disk again. resolve() returns
+    the file a path serves and the canonical path of that file; check()
+    classifies a path that is not canonical.
+    """
+
+    def __init__(self, base_dir: Path = BASE_DIR, rules: Optional[UrlRules] = None):
+        self.base_dir = Path(base_dir).resolve()
+        self.rules = rules or load_url_rules(self.base_dir)
+        self.files = set(self._walk())
+        self.folded = {rel_path.lower(): rel_path for rel_path in self.files}
+        self.slugs = {
+            prefix: {page_slug(rel_path[len(folder) + 1:]): rel_path
+                     for rel_path in self.files
+                     if rel_path.startswith(f"{folder}/") and '/' not in rel_path[len(folder) + 1:]}
+            for prefix, folder in LEGACY_PREFIXES.items()
+        }
+
+    def _walk(self) -> Iterator[str]:
+        for root, dirs, files in os.walk(self.base_dir):
+            dirs[:] = [name for name in dirs if not name.startswith('.')]
+            folder = os.path.relpath(root, self.base_dir).replace(os.sep, '/')
+            for name in files:
+                yield name if folder == '.' else f"{folder}/{name}"
+
+    def canonical_path(self, rel_path: str) -> str:
+        """URL path a file is served under without a redirect"""
+        if rel_path.endswith('.html'):
+            return url_path(rel_path, self.rules)
+        return f"/{rel_path}"
+
+    def _candidates(self, path: str) -> Iterator[str]:
+        """Files that may serve a URL path (without slashes at either end)"""
+        if not path:
+            yield 'index.html'
+            return
+        yield path
+        if self.rules.clean_urls:
+            yield f"{path}.html"
+        yield f"{path}/index.html"
+
+    def resolve(self, path: str) -> Optional[Tuple[str, str]]:
+        """(file, canonical path) served for a decoded URL path, or None when nothing is"""
+        if path in self.rules.rewrites:
+            destination = self.rules.rewrites[path].lstrip('/')
+            return (destination, path) if destination in self.files else None
+        stripped = path.strip('/')
+        for candidate in self._candidates(stripped):
+            if candidate in self.files:
+                return candidate, self.canonical_path(candidate)
+        return None
+
+    def check(self, path: str) -> Tuple[str, Optional[str]]:
+        """
+        (problem, canonical path) of a decoded URL path. problem is None for a
+        canonical path, 'trailing_slash' or 'redirect' (.html or index.html
+        forms) for a path that redirects, 'case_mismatch' for a path that only
+        matches with other letter case, 'wrong_path' for a legacy slug, and
+        'not_found' (with no canonical path) otherwise.
+        """
+        resolved = self.resolve(path)
+        if resolved is not None:
+            canonical = resolved[1]
+            if path == canonical:
+                return None, canonical
+            if path.rstrip('/') == canonical.rstrip('/'):
+                # Served both ways when trailingSlash is unset
+                return (None if self.rules.trailing_slash is None else 'trailing_slash'), canonical
+            return 'redirect', canonical
+
+        stripped = path.strip('/')
+        for candidate in self._candidates(stripped.lower()):
+            rel_path = self.folded.get(candidate)
+            if rel_path is not None:
+                return 'case_mismatch', self.canonical_path(rel_path)
+
+        for prefix, slugs in self.slugs.items():
+            if path.startswith(prefix):
+                rel_path = slugs.get(page_slug(path[len(prefix):].rstrip('/')))
+                if rel_path is not None:
+                    return 'wrong_path', self.canonical_path(rel_path)
+        return 'not_found', None
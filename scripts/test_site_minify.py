@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for site_minify.minify_html().
+
+Usage:
+    cd scripts && python3 -m unittest test_site_minify
+"""
+
+import unittest
+
+from site_minify import minify_html
+
+
+class WhitespaceTests(unittest.TestCase):
+    def test_space_between_inline_elements_is_kept(self):
+        self.assertEqual(minify_html('<span>a</span>\n  <span>b</span>'), '<span>a</span> <span>b</span>')
+
+    def test_space_next_to_block_elements_goes(self):
+        self.assertEqual(minify_html('<div>\n  <p> a </p>\n</div>'), '<div><p>a</p></div>')
+
+    def test_script_between_inline_elements(self):
+        self.assertEqual(minify_html('<span>a</span> <script>f()</script> <span>b</span>'),
+                         '<span>a</span> <script>f()</script><span>b</span>')
+
+    def test_noscript_inside_text(self):
+        self.assertEqual(minify_html('<p>Call <noscript>x</noscript> now</p>'),
+                         '<p>Call <noscript>x</noscript> now</p>')
+
+    def test_kept_comment_inside_text(self):
+        self.assertEqual(minify_html('<p>a <!-- AdSense x --> b</p>'), '<p>a <!-- AdSense x -->b</p>')
+
+    def test_dropped_comment_inside_text(self):
+        self.assertEqual(minify_html('<p>a <!-- note --> b</p>'), '<p>a b</p>')
+
+    def test_script_between_block_elements(self):
+        self.assertEqual(minify_html('<div>a</div>\n<script>f()</script>\n<div>b</div>'),
+                         '<div>a</div><script>f()</script><div>b</div>')
+
+    def test_head_whitespace_goes(self):
+        source = '<!DOCTYPE html>\n<html>\n<head>\n  <meta charset="utf-8">\n  <link rel="stylesheet" href="a.css">\n</head>'
+        self.assertEqual(minify_html(source),
+                         '<!DOCTYPE html><html><head><meta charset="utf-8"><link rel="stylesheet" href="a.css"></head>')
+
+
+class RawContentTests(unittest.TestCase):
+    def test_pre_is_copied(self):
+        source = '<pre>\n  a   b\n</pre>'
+        self.assertEqual(minify_html(source), source)
+
+    def test_json_ld_is_compacted(self):
+        source = '<script type="application/ld+json">\n{\n    "name": "a  b"\n}\n</script>'
+        self.assertEqual(minify_html(source), '<script type="application/ld+json">{"name":"a  b"}</script>')
+
+
+if __name__ == '__main__':
+    unittest.main()
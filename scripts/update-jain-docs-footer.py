@@ -4,9 +4,13 @@ Script to update footer section in all Jain Docs HTML files
 Replaces existing footer with the one from ticketing platform
 """
 
-import os
 import re
-from pathlib import Path
+
+from site_corpus import BASE_DIR, load_corpus
+from site_manifest import manifest_from_argv
+from site_parallel import jobs_from_argv, map_pages
+from site_pipeline import register_transform
+from site_profile import profile_from_argv
 
 # Define the new footer content (from ticketing platform)
 NEW_FOOTER = '''    <footer class="site-footer">
@@ -225,44 +229,54 @@ NEW_FOOTER = '''    <footer class="site-footer">
         </div>
     </div>'''
 
-def update_footer_in_file(file_path):
+def without_indentation(markup):
+    """Markup with the indentation and blank lines taken out, for comparison"""
+    return '\n'.join(line.strip() for line in markup.splitlines() if line.strip())
+
+def update_footer_in_file(page):
     """Update footer in a single HTML file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = page.content
         
         # Pattern to match footer section including modals
-        # Match from <footer to end of file (</body></html>)
-        pattern = r'<footer\s+class="site-footer">.*?</html>'
+        # Match from <footer to end of file (</body></html>); the indentation
+        # before <footer is included because NEW_FOOTER brings its own
+        pattern = r'[ \t]*<footer\s+class="site-footer">.*?</html>'
         
         # Check if footer exists
-        if not re.search(pattern, content, re.DOTALL):
-            print(f"⚠️  No footer found in: {file_path}")
+        match = re.search(pattern, content, re.DOTALL)
+        if not match:
+            print(f"⚠️  No footer found in: {page.rel_path}")
             return False
         
+        # The home page links are relative to the page (Jain Docs/index.html is one level up)
+        new_footer = NEW_FOOTER.replace('../../index.html', '../' * page.rel_path.count('/') + 'index.html')
+        replacement = new_footer + '\n</body>\n</html>'
+        
+        # A footer that differs only in indentation and blank lines is left as the page has it
+        if without_indentation(match.group(0)) == without_indentation(replacement):
+            return True
+        
         # Replace footer with new content
-        new_content = re.sub(
-            pattern,
-            NEW_FOOTER + '\n</body>\n</html>',
-            content,
-            flags=re.DOTALL
-        )
+        new_content = content[:match.start()] + replacement + content[match.end():]
         
         # Write back to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        page.write(new_content)
         
         return True
     except Exception as e:
-        print(f"❌ Error processing {file_path}: {e}")
+        print(f"❌ Error processing {page.rel_path}: {e}")
         return False
 
+@register_transform('jain-docs-footer', lambda page: page.section == 'Jain Docs')
+def footer_transform(page):
+    """Pipeline stage: replace the Jain Docs footer and modals"""
+    return update_footer_in_file(page)
+
 def main():
-    # Base directory
-    base_dir = Path(r'c:\Users\MOINAK\OneDrive\PROJECTS\WIKI TAPNEX\Jain Docs')
-    
+    profile_from_argv(__file__)
     # Find all HTML files
-    html_files = list(base_dir.rglob('*.html'))
+    html_files = load_corpus(BASE_DIR).pages('Jain Docs')
     
     print(f"Found {len(html_files)} HTML files in Jain Docs")
     print("=" * 60)
@@ -270,13 +284,17 @@ def main():
     success_count = 0
     failed_count = 0
     
-    for html_file in html_files:
-        if update_footer_in_file(html_file):
-            print(f"✅ Updated: {html_file.relative_to(base_dir.parent)}")
+    manifest = manifest_from_argv(__file__)
+    for result in map_pages(update_footer_in_file, html_files, jobs_from_argv(), manifest=manifest):
+        if result['value']:
+            print(f"✅ Updated: {result['path']}")
             success_count += 1
         else:
             failed_count += 1
     
+    if manifest:
+        manifest.save()
+    
     print("=" * 60)
     print(f"\n📊 Summary:")
     print(f"   ✅ Successfully updated: {success_count} files")
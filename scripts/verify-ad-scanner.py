@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Ad Scanner Timing Check
+=======================
+Checks that the ad-block scanner in site_ads.py stays linear in the page size,
+including on the malformed inputs that made the old DOTALL regexes backtrack:
+ad containers that are never closed, AdSense comments without '-->', and
+pages with thousands of ad blocks.
+
+For every input the scan is timed at n and 4n repetitions; a linear scan takes
+about four times as long, a quadratic one sixteen times.
+
+Usage:
+    python3 scripts/verify-ad-scanner.py
+    python3 scripts/verify-ad-scanner.py --legacy    # also time the old regex
+"""
+
+import re
+import sys
+import time
+from typing import Callable, Tuple
+
+from site_ads import find_ad_blocks, remove_ad_blocks
+from site_profile import profile_from_argv
+
+# Worst acceptable growth when the input grows 4x (linear is ~4, quadratic ~16)
+MAX_GROWTH = 8.0
+
+# Worst acceptable scan time per MB of page source
+MAX_MS_PER_MB = 250.0
+
+# The regex batch-remove-ads.py used before site_ads
+LEGACY_AD_PATTERN = re.compile(
+    r'<!-- AdSense.*?-->\s*'
+    r'<div class="ad-container[^>]*>.*?'
+    r'<script async src="https://pagead2\.googlesyndication\.com.*?</script>\s*'
+    r'<ins class="adsbygoogle".*?</ins>\s*'
+    r'<script>.*?\(adsbygoogle = window\.adsbygoogle.*?</script>\s*'
+    r'</div>',
+    re.DOTALL
+)
+
+AD_BLOCK = '''<!-- AdSense - Jain Docs Ad -->
+<div class="ad-container article-bottom-ad">
+    <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client=ca-pub-1"
+     crossorigin="anonymous"></script>
+    <ins class="adsbygoogle" style="display:block" data-ad-slot="1"></ins>
+    <script>
+         (adsbygoogle = window.adsbygoogle || []).push({});
+    </script>
+</div>
+'''
+
+PARAGRAPH = '<p>Jain philosophy teaches ahimsa, anekantavada and aparigraha.</p>\n'
+
+# name -> function building an input from a repetition count
+CASES = {
+    'well-formed page': lambda n: (PARAGRAPH * 20 + AD_BLOCK) * n,
+    'unclosed containers': lambda n: ('<div class="ad-container x"><div>' + PARAGRAPH) * n,
+    'unterminated comments': lambda n: ('<!-- AdSense ' + PARAGRAPH) * n,
+    'ads without code': lambda n: ('<!-- AdSense --><div class="ad-container"><ins class="adsbygoogle">'
+                                   + PARAGRAPH + '</div>') * n,
+    'loader without push': lambda n: ('<div class="ad-container"><script async src="https://pagead2.'
+                                      'googlesyndication.com/x"></script><ins class="adsbygoogle"></ins>'
+                                      + PARAGRAPH) * n,
+}
+
+
+def scan(content: str) -> None:
+    remove_ad_blocks(content, find_ad_blocks(content, require_comment=True, require_complete=True))
+
+
+def legacy_scan(content: str) -> None:
+    LEGACY_AD_PATTERN.sub('', content)
+
+
+def timed(func: Callable[[str], None], content: str, repeat: int = 3) -> float:
+    """Best wall time of a few runs, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_case(name: str, build: Callable[[int], str], n: int) -> Tuple[bool, str]:
+    """Time the scanner at n and 4n repetitions and judge the growth"""
+    small, large = build(n), build(4 * n)
+    small_time, large_time = timed(scan, small), timed(scan, large)
+    growth = large_time / max(small_time, 1e-6)
+    ms_per_mb = large_time * 1000 / (len(large) / 1_000_000)
+    ok = growth <= MAX_GROWTH and ms_per_mb <= MAX_MS_PER_MB
+    message = (f"{name}: {len(large) / 1_000_000:.1f} MB in {large_time * 1000:.1f} ms "
+               f"({ms_per_mb:.0f} ms/MB, x{growth:.1f} for 4x input)")
+    return ok, message
+
+
+def main():
+    profile_from_argv(__file__)
+    print("=" * 70)
+    print("⏱️  Ad Scanner Timing Check")
+    print("=" * 70)
+
+    failures = 0
+    for name, build in CASES.items():
+        ok, message = check_case(name, build, 2000)
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    if '--legacy' in sys.argv[1:]:
+        print("\nLegacy regex on the same inputs (kept small, it does not scale):")
+        for name, build in CASES.items():
+            small, large = build(20), build(80)
+            small_time, large_time = timed(legacy_scan, small, 1), timed(legacy_scan, large, 1)
+            print(f"   {name}: {len(large) / 1000:.0f} KB in {large_time * 1000:.1f} ms "
+                  f"(x{large_time / max(small_time, 1e-6):.1f} for 4x input)")
+
+    print("\n" + "=" * 70)
+    if failures:
+        print(f"❌ {failures} input(s) did not scan in linear time")
+        sys.exit(1)
+    print("✅ The scanner is linear on every input")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,13 +3,16 @@
 Script to verify Article schema implementation across all article pages
 """
 
-import os
 import re
-import json
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-BASE_DIR = Path(__file__).parent.parent
+from site_corpus import BASE_DIR, Page
+from site_index import SiteIndex, open_index
+from site_parallel import jobs_from_argv
+from site_profile import profile_from_argv
+from site_schema import register_requirement, register_validator
+
 FOLDERS_TO_PROCESS = ['EVENT-MANAGEMENT', 'MARKETING', 'TECHNOLOGY']
 
 # Required fields for Article schema
@@ -26,22 +29,6 @@ REQUIRED_FIELDS = [
     'mainEntityOfPage'
 ]
 
-def extract_article_schema(html_content: str) -> dict:
-    """Extract and parse the article schema from HTML"""
-    # Find all script tags with type="application/ld+json"
-    schema_pattern = r'<script type="application/ld\+json">(.*?)</script>'
-    schemas = re.findall(schema_pattern, html_content, re.DOTALL | re.IGNORECASE)
-    
-    for schema_str in schemas:
-        try:
-            schema = json.loads(schema_str.strip())
-            if schema.get('@type') in ['Article', 'TechArticle']:
-                return schema
-        except json.JSONDecodeError:
-            continue
-    
-    return None
-
 def validate_article_schema(schema: dict, file_path: Path, expected_type: str) -> Tuple[bool, List[str]]:
     """Validate the article schema structure"""
     errors = []
@@ -132,23 +119,24 @@ def validate_article_schema(schema: dict, file_path: Path, expected_type: str) -
     
     return len(errors) == 0, errors + [f"⚠️ {w}" for w in warnings]
 
-def verify_file(file_path: Path, category: str, expected_type: str) -> Tuple[bool, dict, List[str]]:
-    """Verify article schema in a single file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        schema = extract_article_schema(content)
-        is_valid, messages = validate_article_schema(schema, file_path, expected_type)
-        
-        return is_valid, schema, messages
-        
-    except Exception as e:
-        return False, None, [f"Error reading file: {str(e)}"]
+def expected_article_type(page: Page) -> str:
+    """TechArticle for the TECHNOLOGY articles, Article everywhere else"""
+    return 'TechArticle' if page.section == 'TECHNOLOGY' else 'Article'
 
-def verify_folder(base_path: Path, category: str) -> Dict:
-    """Verify all files in a category folder"""
-    category_path = base_path / category
+@register_validator('Article', 'TechArticle')
+def article_validator(schema: dict, page: Page) -> Tuple[bool, List[str]]:
+    """Article checks for the unified schema verifier (see site_schema.py)"""
+    return validate_article_schema(schema, page.path, expected_article_type(page))
+
+register_requirement(
+    'article-schema',
+    lambda page: page.section in FOLDERS_TO_PROCESS and page.subfolder is not None,
+    'Article', 'TechArticle'
+)
+
+def verify_folder(index: SiteIndex, category: str) -> Dict:
+    """Verify all files in a category folder, from the page index"""
+    category_path = index.base_dir / category
     
     # Determine expected schema type
     expected_type = 'TechArticle' if category == 'TECHNOLOGY' else 'Article'
@@ -165,30 +153,28 @@ def verify_folder(base_path: Path, category: str) -> Dict:
     if not category_path.exists():
         return results
     
-    for subfolder in sorted(category_path.iterdir()):
-        if subfolder.is_dir():
-            index_file = subfolder / 'index.html'
-            if index_file.exists():
-                results['total'] += 1
-                is_valid, schema, messages = verify_file(index_file, category, expected_type)
-                
-                file_result = {
-                    'path': str(index_file.relative_to(base_path)),
-                    'subfolder': subfolder.name,
-                    'valid': is_valid,
-                    'messages': messages
-                }
-                
-                if schema:
-                    file_result['headline'] = schema.get('headline', 'N/A')
-                    file_result['type'] = schema.get('@type', 'N/A')
-                
-                results['files'].append(file_result)
-                
-                if is_valid:
-                    results['valid'] += 1
-                else:
-                    results['invalid'] += 1
+    for record in index.records(section=category, subfolders=True):
+        results['total'] += 1
+        schema = index.find_schema(record.rel_path, 'Article', 'TechArticle')
+        is_valid, messages = validate_article_schema(schema, index.base_dir / record.rel_path, expected_type)
+        
+        file_result = {
+            'path': record.rel_path,
+            'subfolder': record.subfolder,
+            'valid': is_valid,
+            'messages': messages
+        }
+        
+        if schema:
+            file_result['headline'] = schema.get('headline', 'N/A')
+            file_result['type'] = schema.get('@type', 'N/A')
+        
+        results['files'].append(file_result)
+        
+        if is_valid:
+            results['valid'] += 1
+        else:
+            results['invalid'] += 1
     
     return results
 
@@ -268,11 +254,15 @@ def print_report(all_results: List[Dict]):
 
 def main():
     """Main verification function"""
+    profile_from_argv(__file__)
     all_results = []
     
+    # Only pages changed since the last run are re-read
+    index = open_index(BASE_DIR, jobs_from_argv())
     for category in FOLDERS_TO_PROCESS:
-        results = verify_folder(BASE_DIR, category)
+        results = verify_folder(index, category)
         all_results.append(results)
+    index.close()
     
     print_report(all_results)
 
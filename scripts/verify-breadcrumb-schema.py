@@ -3,30 +3,16 @@
 Script to verify breadcrumb schema implementation across all article pages
 """
 
-import os
-import re
-import json
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-BASE_DIR = Path(__file__).parent.parent
-FOLDERS_TO_PROCESS = ['EVENT-MANAGEMENT', 'MARKETING', 'TECHNOLOGY']
+from site_corpus import BASE_DIR, Page
+from site_index import SiteIndex, open_index
+from site_parallel import jobs_from_argv
+from site_profile import profile_from_argv
+from site_schema import register_requirement, register_validator
 
-def extract_breadcrumb_schema(html_content: str) -> dict:
-    """Extract and parse the breadcrumb schema from HTML"""
-    # Find all script tags with type="application/ld+json"
-    schema_pattern = r'<script type="application/ld\+json">(.*?)</script>'
-    schemas = re.findall(schema_pattern, html_content, re.DOTALL | re.IGNORECASE)
-    
-    for schema_str in schemas:
-        try:
-            schema = json.loads(schema_str.strip())
-            if schema.get('@type') == 'BreadcrumbList':
-                return schema
-        except json.JSONDecodeError:
-            continue
-    
-    return None
+FOLDERS_TO_PROCESS = ['EVENT-MANAGEMENT', 'MARKETING', 'TECHNOLOGY']
 
 def validate_breadcrumb_schema(schema: dict, file_path: Path) -> Tuple[bool, List[str]]:
     """Validate the breadcrumb schema structure"""
@@ -78,23 +64,20 @@ def validate_breadcrumb_schema(schema: dict, file_path: Path) -> Tuple[bool, Lis
     
     return len(errors) == 0, errors
 
-def verify_file(file_path: Path, category: str) -> Tuple[bool, dict, List[str]]:
-    """Verify breadcrumb schema in a single file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        schema = extract_breadcrumb_schema(content)
-        is_valid, errors = validate_breadcrumb_schema(schema, file_path)
-        
-        return is_valid, schema, errors
-        
-    except Exception as e:
-        return False, None, [f"Error reading file: {str(e)}"]
+@register_validator('BreadcrumbList')
+def breadcrumb_validator(schema: dict, page: Page) -> Tuple[bool, List[str]]:
+    """Breadcrumb checks for the unified schema verifier (see site_schema.py)"""
+    return validate_breadcrumb_schema(schema, page.path)
 
-def verify_folder(base_path: Path, category: str) -> Dict:
-    """Verify all files in a category folder"""
-    category_path = base_path / category
+register_requirement(
+    'breadcrumb-schema',
+    lambda page: page.section in FOLDERS_TO_PROCESS and page.subfolder is not None,
+    'BreadcrumbList'
+)
+
+def verify_folder(index: SiteIndex, category: str) -> Dict:
+    """Verify all files in a category folder, from the page index"""
+    category_path = index.base_dir / category
     results = {
         'category': category,
         'total': 0,
@@ -106,30 +89,28 @@ def verify_folder(base_path: Path, category: str) -> Dict:
     if not category_path.exists():
         return results
     
-    for subfolder in category_path.iterdir():
-        if subfolder.is_dir():
-            index_file = subfolder / 'index.html'
-            if index_file.exists():
-                results['total'] += 1
-                is_valid, schema, errors = verify_file(index_file, category)
-                
-                file_result = {
-                    'path': str(index_file.relative_to(base_path)),
-                    'subfolder': subfolder.name,
-                    'valid': is_valid,
-                    'errors': errors
-                }
-                
-                if schema and schema.get('itemListElement'):
-                    items = schema['itemListElement']
-                    file_result['breadcrumb'] = ' > '.join([item.get('name', '?') for item in items])
-                
-                results['files'].append(file_result)
-                
-                if is_valid:
-                    results['valid'] += 1
-                else:
-                    results['invalid'] += 1
+    for record in index.records(section=category, subfolders=True):
+        results['total'] += 1
+        schema = index.find_schema(record.rel_path, 'BreadcrumbList')
+        is_valid, errors = validate_breadcrumb_schema(schema, index.base_dir / record.rel_path)
+        
+        file_result = {
+            'path': record.rel_path,
+            'subfolder': record.subfolder,
+            'valid': is_valid,
+            'errors': errors
+        }
+        
+        if schema and schema.get('itemListElement'):
+            items = schema['itemListElement']
+            file_result['breadcrumb'] = ' > '.join([item.get('name', '?') for item in items])
+        
+        results['files'].append(file_result)
+        
+        if is_valid:
+            results['valid'] += 1
+        else:
+            results['invalid'] += 1
     
     return results
 
@@ -200,11 +181,15 @@ def print_report(all_results: List[Dict]):
 
 def main():
     """Main verification function"""
+    profile_from_argv(__file__)
     all_results = []
     
+    # Only pages changed since the last run are re-read
+    index = open_index(BASE_DIR, jobs_from_argv())
     for category in FOLDERS_TO_PROCESS:
-        results = verify_folder(BASE_DIR, category)
+        results = verify_folder(index, category)
         all_results.append(results)
+    index.close()
     
     print_report(all_results)
 
@@ -9,12 +9,15 @@ Author: TAPNEX SEO Team
 Date: 2025
 """
 
-import os
 import re
 import json
 from pathlib import Path
 from typing import List, Dict, Tuple
 
+from site_corpus import BASE_DIR, Page, load_corpus
+from site_profile import profile_file, profile_from_argv, stage
+from site_schema import register_requirement, register_validator
+
 # ANSI color codes for terminal output
 GREEN = '\033[92m'
 RED = '\033[91m'
@@ -24,9 +27,6 @@ CYAN = '\033[96m'
 BOLD = '\033[1m'
 RESET = '\033[0m'
 
-# Base directory
-BASE_DIR = Path(r"C:\Users\MOINAK\OneDrive\PROJECTS\WIKI TAPNEX")
-
 # Pages that should have FAQ schema (4 existing + 9 newly added in Task 6)
 EXPECTED_FAQ_PAGES = {
     # Existing FAQ pages (before Task 6)
@@ -54,7 +54,8 @@ EXPECTED_FAQ_PAGES = {
 class FAQSchemaValidator:
     """Validates FAQ schema implementations in HTML files."""
     
-    def __init__(self):
+    def __init__(self, corpus=None):
+        self.corpus = corpus or load_corpus(BASE_DIR)
         self.results = {
             'valid': [],
             'invalid': [],
@@ -62,20 +63,18 @@ class FAQSchemaValidator:
             'warnings': []
         }
     
-    def extract_faq_schema(self, html_content: str) -> Tuple[bool, Dict | None, List[str]]:
+    def extract_faq_schema(self, page: Page) -> Tuple[bool, Dict | None, List[str]]:
         """
-        Extract and parse FAQ schema from HTML content.
+        Extract and parse FAQ schema from the page's ld+json blocks.
         
         Returns:
             Tuple of (found, schema_dict, issues)
         """
         issues = []
         
-        # Find FAQ schema script tag
-        faq_pattern = r'<script type="application/ld\+json">\s*({[^<]*"@type"\s*:\s*"FAQPage"[^<]*})\s*</script>'
-        matches = re.finditer(faq_pattern, html_content, re.DOTALL)
-        
-        faq_schemas = list(matches)
+        # Find FAQ schema script blocks
+        faq_pattern = re.compile(r'"@type"\s*:\s*"FAQPage"')
+        faq_schemas = [block for block in page.ld_json if faq_pattern.search(block)]
         
         if not faq_schemas:
             return False, None, ["FAQ schema not found"]
@@ -85,7 +84,7 @@ class FAQSchemaValidator:
         
         # Parse the first FAQ schema
         try:
-            schema_text = faq_schemas[0].group(1)
+            schema_text = faq_schemas[0]
             # Clean up the JSON
             schema_text = re.sub(r'\s+', ' ', schema_text)
             schema = json.loads(schema_text)
@@ -96,7 +95,8 @@ class FAQSchemaValidator:
             issues.append(f"Invalid JSON: {str(e)}")
             return True, None, issues
     
-    def validate_faq_structure(self, schema: Dict, page_title: str) -> List[str]:
+    @staticmethod
+    def validate_faq_structure(schema: Dict, page_title: str) -> List[str]:
         """
         Validate the structure and content of FAQ schema.
         
@@ -172,7 +172,7 @@ class FAQSchemaValidator:
         
         return issues
     
-    def validate_file(self, file_path: Path, page_title: str) -> Dict:
+    def validate_file(self, rel_path: str, page_title: str) -> Dict:
         """
         Validate FAQ schema in a single HTML file.
         
@@ -180,29 +180,29 @@ class FAQSchemaValidator:
             Dict with validation results
         """
         result = {
-            'file': str(file_path.relative_to(BASE_DIR)),
+            'file': str(Path(rel_path)),
             'title': page_title,
             'status': 'unknown',
             'issues': [],
             'question_count': 0
         }
         
-        if not file_path.exists():
+        page = self.corpus.get(rel_path)
+        if page is None:
             result['status'] = 'missing'
             result['issues'].append('File not found')
             return result
         
         # Read file content
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
+            page.content
         except Exception as e:
             result['status'] = 'error'
             result['issues'].append(f'Failed to read file: {str(e)}')
             return result
         
         # Extract FAQ schema
-        found, schema, extract_issues = self.extract_faq_schema(html_content)
+        found, schema, extract_issues = self.extract_faq_schema(page)
         
         if not found:
             result['status'] = 'missing'
@@ -223,7 +223,7 @@ class FAQSchemaValidator:
         
         # Determine status
         if validation_issues:
-            result['status'] = 'warning' if not any('Missing' in issue or 'Invalid' in issue for issue in validation_issues) else 'invalid'
+            result['status'] = 'warning' if not any(is_faq_error(issue) for issue in validation_issues) else 'invalid'
             result['issues'].extend(validation_issues)
         else:
             result['status'] = 'valid'
@@ -248,8 +248,8 @@ class FAQSchemaValidator:
         total = len(EXPECTED_FAQ_PAGES)
         
         for rel_path, page_title in EXPECTED_FAQ_PAGES.items():
-            file_path = BASE_DIR / rel_path
-            result = self.validate_file(file_path, page_title)
+            with profile_file(rel_path):
+                result = self.validate_file(rel_path, page_title)
             
             # Categorize result
             if result['status'] == 'valid':
@@ -262,7 +262,8 @@ class FAQSchemaValidator:
                 self.results['invalid'].append(result)
         
         # Print results
-        self._print_results()
+        with stage('report'):
+            self._print_results()
         
         # Return summary
         return {
@@ -362,8 +363,24 @@ class FAQSchemaValidator:
         
         print()
 
+def is_faq_error(issue: str) -> bool:
+    """Issues that make a FAQ schema invalid; the others are warnings"""
+    return 'Missing' in issue or 'Invalid' in issue
+
+@register_validator('FAQPage')
+def faq_validator(schema: Dict, page: Page) -> Tuple[bool, List[str]]:
+    """FAQ checks for the unified schema verifier (see site_schema.py)"""
+    page_title = EXPECTED_FAQ_PAGES.get(page.rel_path) or page.title or page.rel_path
+    issues = FAQSchemaValidator.validate_faq_structure(schema, page_title)
+    errors = [issue for issue in issues if is_faq_error(issue)]
+    warnings = [f"⚠️ {issue}" for issue in issues if not is_faq_error(issue)]
+    return len(errors) == 0, errors + warnings
+
+register_requirement('faq-schema', lambda page: page.rel_path in EXPECTED_FAQ_PAGES, 'FAQPage')
+
 def main():
     """Main execution function."""
+    profile_from_argv(__file__)
     validator = FAQSchemaValidator()
     summary = validator.validate_all()
     
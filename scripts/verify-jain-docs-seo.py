@@ -3,146 +3,79 @@
 Verification Script for Jain Docs SEO Optimization
 ---------------------------------------------------
 This script verifies that all Jain Docs files have been properly optimized.
-"""
 
-import os
-import re
-from pathlib import Path
+The checks run as rules of the SEO lint (see site_lint.py): the lang rule
+below, and the built-in title, meta-description and schema rules, which
+enforce the Article and BreadcrumbList requirements registered here. Pages
+unchanged since the last lint are replayed from the lint-site manifest.
+"""
 
-# Base configuration
-JAIN_DOCS_DIR = Path(r"c:\Users\MOINAK\OneDrive\PROJECTS\WIKI TAPNEX\Jain Docs")
-PAGES_DIR = JAIN_DOCS_DIR / "Pages"
+from site_corpus import BASE_DIR, load_corpus
+from site_lint import ERROR, lint_pages, lint_version, register_rule
+from site_manifest import Manifest
+from site_parallel import jobs_from_argv
+from site_profile import profile_from_argv
+from site_schema import register_requirement
 
-def check_language_attribute(content, filename):
-    """Check if lang='hi' is present"""
-    if 'lang="hi"' in content or "lang='hi'" in content:
-        return True, "✅"
-    else:
-        return False, f"❌ Missing lang='hi'"
+def is_jain_docs_page(page):
+    """Jain Docs/index.html and the pages under Jain Docs/Pages/"""
+    return page.rel_path == "Jain Docs/index.html" or page.rel_path.startswith("Jain Docs/Pages/")
 
-def check_title_tag(content, filename):
-    """Check if title tag is present"""
-    title_match = re.search(r'<title>(.*?)</title>', content, re.IGNORECASE | re.DOTALL)
-    if title_match:
-        title = title_match.group(1).strip()
-        if len(title) > 10:
-            return True, "✅"
-        else:
-            return False, f"❌ Title too short: {title}"
-    else:
-        return False, "❌ No title tag"
+# The schemas every Jain Docs page carries, for the unified schema verifier
+# and the lint schema rule (see site_schema.py)
+register_requirement('jain-docs-article', is_jain_docs_page, 'Article')
+register_requirement('jain-docs-breadcrumb', is_jain_docs_page, 'BreadcrumbList')
 
-def check_meta_description(content, filename):
-    """Check if meta description is present"""
-    desc_match = re.search(r'<meta\s+name=["\']description["\']\s+content=["\'](.*?)["\']', content, re.IGNORECASE)
-    if desc_match:
-        desc = desc_match.group(1).strip()
-        if len(desc) > 20:
-            return True, "✅"
-        else:
-            return False, f"❌ Description too short"
-    else:
-        return False, "❌ No meta description"
-
-def check_article_schema(content, filename):
-    """Check if Article schema is present"""
-    if '"@type": "Article"' in content or '"@type":"Article"' in content:
-        return True, "✅"
-    else:
-        return False, "❌ No Article schema"
-
-def check_breadcrumb_schema(content, filename):
-    """Check if BreadcrumbList schema is present"""
-    if '"@type": "BreadcrumbList"' in content or '"@type":"BreadcrumbList"' in content:
-        return True, "✅"
-    else:
-        return False, "❌ No BreadcrumbList schema"
+@register_rule('jain-docs-lang', "Jain Docs pages declare lang='hi'", is_jain_docs_page)
+def jain_docs_lang_rule(page, facts):
+    if facts.lang != 'hi':
+        yield ERROR, f"Missing lang='hi' (lang is {facts.lang!r})", facts.lang_line
 
-def verify_file(filepath):
-    """Verify a single file has all optimizations"""
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        checks = {
-            'Language (hi)': check_language_attribute(content, filepath.name),
-            'Title Tag': check_title_tag(content, filepath.name),
-            'Meta Description': check_meta_description(content, filepath.name),
-            'Article Schema': check_article_schema(content, filepath.name),
-            'Breadcrumb Schema': check_breadcrumb_schema(content, filepath.name)
-        }
-        
-        all_passed = all(result[0] for result in checks.values())
-        
-        return all_passed, checks
-        
-    except Exception as e:
-        return False, {'Error': (False, f"❌ Error reading file: {e}")}
+# Lint rules that make up this verification
+LINT_RULES = ['jain-docs-lang', 'title', 'meta-description', 'schema']
 
 def main():
     """Main verification function"""
+    profile_from_argv(__file__)
     print("=" * 80)
     print("🔍 VERIFYING JAIN DOCS SEO OPTIMIZATION")
     print("=" * 80)
     print()
     
-    # Verify index.html
-    print("📄 Verifying Jain Docs/index.html...")
-    index_path = JAIN_DOCS_DIR / "index.html"
-    
-    if index_path.exists():
-        all_passed, checks = verify_file(index_path)
-        for check_name, (passed, status) in checks.items():
-            print(f"  {check_name}: {status}")
-        print()
-    else:
-        print("❌ Index file not found!")
-        print()
-    
-    # Verify all page files
-    print("📄 Verifying all pages in Jain Docs/Pages/...")
-    print()
-    
-    if not PAGES_DIR.exists():
-        print(f"❌ Pages directory not found: {PAGES_DIR}")
-        return
-    
-    html_files = list(PAGES_DIR.glob("*.html"))
-    total_files = len(html_files)
-    
+    pages = [page for page in load_corpus(BASE_DIR) if is_jain_docs_page(page)]
+    total_files = len(pages)
     if total_files == 0:
-        print("❌ No HTML files found in Pages directory")
+        print("❌ No Jain Docs pages found")
         return
     
     print(f"📊 Found {total_files} HTML files to verify")
     print()
     
+    # Only errors fail a page: the length warnings are reported by lint-site.py
+    results = lint_pages(pages, jobs_from_argv(), LINT_RULES, Manifest('lint-site', lint_version()))
     all_passed_count = 0
     failed_files = []
     
-    for i, filepath in enumerate(html_files, 1):
-        all_passed, checks = verify_file(filepath)
-        
-        if all_passed:
+    for i, result in enumerate(results, 1):
+        errors = [finding for finding in result['findings'] if finding['level'] == ERROR]
+        if not errors:
             all_passed_count += 1
             # Only show progress every 25 files to reduce output
             if i % 25 == 0 or i == total_files:
                 print(f"✅ Verified {i}/{total_files} files... ({all_passed_count} passed)")
         else:
-            failed_checks = [name for name, (passed, _) in checks.items() if not passed]
-            failed_files.append((filepath.name, failed_checks))
-            print(f"❌ [{i}/{total_files}] FAILED: {filepath.name}")
-            for check_name, (passed, status) in checks.items():
-                if not passed:
-                    print(f"    {check_name}: {status}")
+            failed_files.append((result['path'], sorted({finding['rule'] for finding in errors})))
+            print(f"❌ [{i}/{total_files}] FAILED: {result['path']}")
+            for finding in errors:
+                print(f"    {finding['rule']}: ❌ {finding['message']}")
     
     # Summary
     print()
     print("=" * 80)
     print("📊 VERIFICATION SUMMARY")
     print("=" * 80)
-    print(f"✅ Total files verified: {total_files + 1}")  # +1 for index.html
-    print(f"✅ Files passed all checks: {all_passed_count + 1}")  # +1 for index.html
+    print(f"✅ Total files verified: {total_files}")
+    print(f"✅ Files passed all checks: {all_passed_count}")
     print(f"❌ Files with issues: {len(failed_files)}")
     print()
     
@@ -150,7 +83,7 @@ def main():
         print("⚠️  FILES WITH ISSUES:")
         for filename, failed_checks in failed_files:
             print(f"  ❌ {filename}")
-            print(f"     Missing: {', '.join(failed_checks)}")
+            print(f"     Failed: {', '.join(failed_checks)}")
         print()
     else:
         print("🎉 ALL FILES PASSED VERIFICATION!")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Verify the internal links of every page offline, from the link graph.
+
+The hrefs of all pages (home, categories, article/, hindi_article/, Jain
+Docs, TOOLS, bhakti, ...) are extracted once into the page index and
+normalised under the cleanUrls rules of vercel.json; later runs only
+re-extract pages that changed (see site_links.py). One pass over the stored
+links then reports:
+
+    broken targets   internal links no file of the tree serves
+    orphan pages     pages no other page links to
+    placeholders     href="#" (and empty) links
+
+and the pages with the most incoming and outgoing links. Exits 1 when a link
+is broken.
+
+Usage:
+    python3 scripts/verify-links.py
+    python3 scripts/verify-links.py --section "Jain Docs" --top 20
+    python3 scripts/verify-links.py --json link-report.json
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+from site_corpus import BASE_DIR, ROOT_SECTION
+from site_index import open_index
+from site_links import LinkGraph
+from site_parallel import add_jobs_argument
+from site_profile import add_profile_arguments, profile_from_args, stage
+from site_urls import encode_path
+
+
+def page_section(rel_path: str) -> str:
+    return rel_path.split('/', 1)[0] if '/' in rel_path else ROOT_SECTION
+
+
+def build_report(graph: LinkGraph, sections):
+    """Findings of the graph, limited to pages of the given sections (all when empty)"""
+    def wanted(rel_path):
+        return not sections or page_section(rel_path) in sections
+
+    broken = [
+        {'page': source, 'href': href, 'target': target,
+         **({'did_you_mean': encode_path(hint)} if hint else {})}
+        for source, href, target, hint in graph.broken if wanted(source)
+    ]
+    return {
+        'pages': len(graph.pages),
+        'links': dict(graph.kinds),
+        'broken': broken,
+        'orphans': [page for page in graph.orphans() if wanted(page)],
+        'placeholders': {page: count for page, count in graph.placeholders.items() if wanted(page)},
+        'degrees': {
+            page: {'in': graph.in_degree(page), 'out': graph.out_degree(page)}
+            for page in graph.pages if wanted(page)
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify the internal links of every page, offline")
+    parser.add_argument('--section', action='append', default=[],
+                        help="only report pages of this section (repeatable)")
+    parser.add_argument('--top', type=int, default=10, help="pages to list by in/out degree (default: 10)")
+    parser.add_argument('--json', type=Path, help="write the findings as JSON to this file")
+    add_jobs_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    print("=" * 70)
+    print("🔗 Internal Link Verification")
+    print("=" * 70)
+
+    index = open_index(BASE_DIR, args.jobs)
+    try:
+        with stage('link graph'):
+            graph = LinkGraph(index)
+    finally:
+        index.close()
+    report = build_report(graph, set(args.section))
+
+    edges = sum(graph.out_degree(page) for page in graph.pages)
+    print(f"Pages: {report['pages']}   page-to-page links: {edges}")
+    print("Links: " + ", ".join(f"{kind} {count}" for kind, count in sorted(report['links'].items())))
+
+    print(f"\n❌ BROKEN LINKS: {len(report['broken'])}")
+    by_target = Counter(entry['target'] for entry in report['broken'])
+    for target, count in by_target.most_common():
+        entries = [entry for entry in report['broken'] if entry['target'] == target]
+        hint = f"  (did you mean {entries[0]['did_you_mean']}?)" if 'did_you_mean' in entries[0] else ''
+        pages = sorted({entry['page'] for entry in entries})
+        print(f"   {target}  <- {count} link(s) on {len(pages)} page(s){hint}")
+        for page in pages[:3]:
+            print(f"      {page}")
+        if len(pages) > 3:
+            print(f"      ... and {len(pages) - 3} more")
+
+    print(f"\n🏝️  ORPHAN PAGES: {len(report['orphans'])}")
+    for page in report['orphans']:
+        print(f"   {page}")
+
+    placeholders = report['placeholders']
+    print(f"\n⚠️  PLACEHOLDER LINKS (href=\"#\"): {sum(placeholders.values())} on {len(placeholders)} page(s)")
+    for page, count in sorted(placeholders.items(), key=lambda item: (-item[1], item[0]))[:args.top]:
+        print(f"   [{count:3d}] {page}")
+
+    degrees = report['degrees']
+    for direction, label in (('in', "MOST LINKED-TO PAGES"), ('out', "PAGES WITH THE MOST LINKS")):
+        print(f"\n📊 {label}")
+        ranked = sorted(degrees.items(), key=lambda item: (-item[1][direction], item[0]))
+        for page, degree in ranked[:args.top]:
+            print(f"   [{degree[direction]:4d}] {page}")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"\n📄 Report: {args.json}")
+
+    print("\n" + "=" * 70)
+    if report['broken']:
+        print(f"❌ {len(report['broken'])} broken internal links")
+        sys.exit(1)
+    print("✅ Every internal link resolves")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,15 +4,14 @@ Verify all navigation links in index.html are functional.
 """
 
 import re
-from pathlib import Path
+
+from site_corpus import BASE_DIR, load_corpus
+from site_profile import profile_from_argv
 
 def check_navigation_links():
     """Check all navigation links in index.html."""
     
-    index_path = Path(r"c:\Users\MOINAK\OneDrive\PROJECTS\WIKI TAPNEX\index.html")
-    
-    with open(index_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = load_corpus(BASE_DIR).get("index.html").content
     
     # Find all href attributes
     href_pattern = r'href="([^"]*)"'
@@ -127,4 +126,5 @@ def check_navigation_links():
         return False
 
 if __name__ == "__main__":
+    profile_from_argv(__file__)
     check_navigation_links()
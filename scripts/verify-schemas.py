@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Verify every JSON-LD schema of the site in one pass per page.
+
+Each page is read once and all of its ld+json objects are checked by the
+validators of their @type (Article/TechArticle, BreadcrumbList, FAQPage,
+WebSite, Organization, WebApplication, ...), together with the schemas the
+page is expected to carry (category articles, FAQ pages, Jain Docs). The
+checks are the ones of verify-article-schema.py, verify-breadcrumb-schema.py,
+verify-faq-schema.py and verify-jain-docs-seo.py (see site_schema.py).
+
+Usage:
+    python3 scripts/verify-schemas.py
+    python3 scripts/verify-schemas.py --section "Jain Docs" --section TECHNOLOGY
+    python3 scripts/verify-schemas.py --warnings --json schema-report.json
+    python3 scripts/verify-schemas.py --jobs 0 --incremental
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from site_corpus import BASE_DIR, load_corpus
+from site_manifest import Manifest, add_incremental_argument
+from site_parallel import add_jobs_argument, map_pages
+from site_profile import add_profile_arguments, profile_from_args, stage
+from site_schema import is_warning, load_validators, validator_version, verify_page
+
+
+def summarize(results):
+    """Object counts per @type and page counts per section"""
+    types = defaultdict(Counter)
+    sections = defaultdict(Counter)
+    for result in results:
+        section = sections[result['section']]
+        section['pages'] += 1
+        section['with schema'] += bool(result['objects'])
+        section['failed'] += not result['valid']
+        for entry in result['objects']:
+            counts = types[entry['type']]
+            counts['objects'] += 1
+            if not entry['checked']:
+                counts['unchecked'] += 1
+            elif not entry['valid']:
+                counts['invalid'] += 1
+            elif any(is_warning(m) for m in entry['messages']):
+                counts['warnings'] += 1
+            else:
+                counts['valid'] += 1
+    return types, sections
+
+
+def print_report(results, show_warnings):
+    types, sections = summarize(results)
+
+    print("\n📊 Schemas by @type")
+    print(f"   {'@type':<18} {'objects':>8} {'valid':>7} {'warnings':>9} {'invalid':>8} {'unchecked':>10}")
+    for schema_type in sorted(types):
+        c = types[schema_type]
+        print(f"   {schema_type:<18} {c['objects']:>8} {c['valid']:>7} {c['warnings']:>9} "
+              f"{c['invalid']:>8} {c['unchecked']:>10}")
+
+    print("\n📁 Pages by section")
+    print(f"   {'section':<18} {'pages':>8} {'with schema':>12} {'failed':>8}")
+    for section in sorted(sections):
+        c = sections[section]
+        print(f"   {section:<18} {c['pages']:>8} {c['with schema']:>12} {c['failed']:>8}")
+
+    failed = [result for result in results if not result['valid']]
+    if failed:
+        print(f"\n❌ Pages with schema errors ({len(failed)}):")
+    for result in failed:
+        print(f"   • {result['path']}")
+        for message in result['errors'] + result['missing']:
+            print(f"     - {message}")
+        for entry in result['objects']:
+            for message in entry['messages']:
+                if not is_warning(message) or show_warnings:
+                    print(f"     - {entry['type']}: {message}")
+
+    if show_warnings:
+        warned = [result for result in results if result['valid']
+                  and any(is_warning(m) for entry in result['objects'] for m in entry['messages'])]
+        if warned:
+            print(f"\n⚠️  Valid with warnings ({len(warned)}):")
+        for result in warned:
+            print(f"   • {result['path']}")
+            for entry in result['objects']:
+                for message in entry['messages']:
+                    print(f"     - {entry['type']}: {message}")
+
+    objects = sum(c['objects'] for c in types.values())
+    print("\n" + "=" * 70)
+    print(f"✨ {len(results) - len(failed)}/{len(results)} pages passed ({objects} schema objects checked)")
+    if not failed:
+        print("✅ All schemas passed validation!")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify every JSON-LD schema of the site in one pass per page")
+    parser.add_argument('--section', action='append', help="only pages of this section (repeatable)")
+    parser.add_argument('--warnings', action='store_true', help="also list the warnings of every page")
+    parser.add_argument('--json', type=Path, help="write the per-page results as JSON to this file")
+    add_jobs_argument(parser)
+    add_incremental_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    print("=" * 70)
+    print("🧩 Unified JSON-LD Schema Verification")
+    print("=" * 70)
+    validators = load_validators()
+    print(f"Validators: {', '.join(sorted(validators))}")
+
+    corpus = load_corpus(BASE_DIR)
+    pages = [page for page in corpus if not args.section or page.section in args.section]
+    manifest = Manifest('verify-schemas', validator_version()) if args.incremental else None
+
+    results = []
+    for result in map_pages(verify_page, pages, args.jobs, echo=False, manifest=manifest):
+        if result['status'] == 'error':
+            results.append({'path': result['path'], 'section': corpus.get(result['path']).section,
+                            'valid': False, 'objects': [], 'missing': [], 'errors': [result['message']]})
+        else:
+            results.append(result['value'])
+    if manifest:
+        manifest.save()
+
+    with stage('report'):
+        print_report(results, args.warnings)
+        if args.json:
+            args.json.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding='utf-8')
+            print(f"📄 Results: {args.json}")
+
+    if any(not result['valid'] for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Verify the sitemaps offline against the files of the site tree.
+
+sitemap_verification_report.json came from requesting every URL of the live
+site. This resolves the URLs locally instead: every sitemap-*.xml (or
+.xml.gz) is streamed with iterparse, each <loc> is percent-decoded
+(Devanagari page names included) and looked up in a hash set of the tree's
+files under the cleanUrls / trailingSlash rules of vercel.json (see
+site_urls.py). Reported per URL:
+
+    not_found        no file serves the URL
+    trailing_slash   the URL redirects to the form with/without the slash
+    redirect         the URL redirects to its clean form (.html, index.html)
+    case_mismatch    only a file with other letter case matches
+    wrong_path       an old /jain-docs/<slug> URL of a Jain Docs page
+    wrong_host       the URL is not on the site's host
+    duplicate        the URL is listed more than once
+
+The sitemaps listed in sitemap.xml must exist. Exits 1 when any URL has a
+problem.
+
+Usage:
+    python3 scripts/verify-sitemaps.py
+    python3 scripts/verify-sitemaps.py --json sitemap_verification_report.json
+    python3 scripts/verify-sitemaps.py sitemap_backup_old.xml
+    python3 scripts/verify-sitemaps.py --dir dist
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List
+from urllib.parse import unquote, urlsplit
+
+from site_corpus import BASE_DIR, BASE_URL
+from site_profile import add_profile_arguments, profile_from_args, stage
+from site_urls import SitePaths, encode_path
+
+SITEMAP_INDEX = 'sitemap.xml'
+
+PROBLEMS = ['not_found', 'trailing_slash', 'redirect', 'case_mismatch', 'wrong_path', 'wrong_host', 'duplicate']
+
+PROBLEM_LABELS = {
+    'not_found': "❌ Not found",
+    'trailing_slash': "↪️  Trailing slash",
+    'redirect': "↪️  Redirects",
+    'case_mismatch': "🔠 Case mismatch",
+    'wrong_path': "🔀 Wrong path",
+    'wrong_host': "🌐 Wrong host",
+    'duplicate': "♊ Duplicate",
+}
+
+
+def open_sitemap(path: Path):
+    return gzip.open(path, 'rb') if path.suffix == '.gz' else open(path, 'rb')
+
+
+def iter_locs(path: Path) -> Iterator[str]:
+    """<loc> values of a sitemap or sitemap index, streamed"""
+    with open_sitemap(path) as f:
+        for _event, elem in ET.iterparse(f, events=('end',)):
+            if elem.tag.rpartition('}')[2] == 'loc':
+                yield (elem.text or '').strip()
+            elem.clear()
+
+
+def sitemap_files(folder: Path, names: List[str]) -> List[Path]:
+    """The sitemaps to check: the ones named, or every sitemap-*.xml(.gz) of the folder"""
+    if names:
+        return [Path(name) for name in names]
+    return sorted(folder.glob('sitemap-*.xml')) + sorted(folder.glob('sitemap-*.xml.gz'))
+
+
+def check_index(folder: Path) -> List[str]:
+    """Sitemaps listed in the sitemap index that do not exist"""
+    index_path = folder / SITEMAP_INDEX
+    if not index_path.exists():
+        return []
+    return [loc for loc in iter_locs(index_path)
+            if not (folder / unquote(urlsplit(loc).path).lstrip('/')).exists()]
+
+
+def verify_sitemaps(paths: SitePaths, sitemaps: List[Path], base_url: str) -> Dict[str, object]:
+    """Problems per kind over every URL of the sitemaps"""
+    host = urlsplit(base_url).netloc
+    problems: Dict[str, List[Dict[str, str]]] = {problem: [] for problem in PROBLEMS}
+    seen: Dict[str, str] = {}
+    urls = Counter()
+
+    for sitemap in sitemaps:
+        for url in iter_locs(sitemap):
+            urls[sitemap.name] += 1
+            entry = {'url': url, 'sitemap': sitemap.name}
+            if url in seen:
+                problems['duplicate'].append({**entry, 'first': seen[url]})
+                continue
+            seen[url] = sitemap.name
+
+            parts = urlsplit(url)
+            if parts.netloc != host:
+                problems['wrong_host'].append(entry)
+                continue
+            problem, canonical = paths.check(unquote(parts.path) or '/')
+            if problem is None:
+                continue
+            if canonical is not None:
+                entry['correct'] = f"{base_url.rstrip('/')}{encode_path(canonical)}"
+            problems[problem].append(entry)
+
+    return {'urls': dict(urls), 'problems': problems}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify the sitemap URLs against the site tree, offline")
+    parser.add_argument('sitemaps', nargs='*', help="sitemap files (default: every sitemap-*.xml of --dir)")
+    parser.add_argument('--dir', type=Path, default=BASE_DIR, help="folder the site is served from (default: the site root)")
+    parser.add_argument('--base-url', default=BASE_URL, help=f"site URL (default: {BASE_URL})")
+    parser.add_argument('--json', type=Path, help="write the problems as JSON to this file")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile_from_args(__file__, args)
+
+    print("=" * 70)
+    print("🗺️  Sitemap Verifier (offline)")
+    print("=" * 70)
+
+    started = time.perf_counter()
+    with stage('index files'):
+        paths = SitePaths(args.dir)
+    print(f"URL rules: cleanUrls={paths.rules.clean_urls}, trailingSlash={paths.rules.trailing_slash}")
+    print(f"Files in the tree: {len(paths.files)}")
+
+    sitemaps = sitemap_files(args.dir, args.sitemaps)
+    with stage('check urls'):
+        missing = [] if args.sitemaps else check_index(args.dir)
+        report = verify_sitemaps(paths, sitemaps, args.base_url)
+    elapsed = time.perf_counter() - started
+
+    print()
+    for name, count in report['urls'].items():
+        print(f"   {name:<32} {count:>6} URLs")
+
+    problems = report['problems']
+    for problem in PROBLEMS:
+        if not problems[problem]:
+            continue
+        print(f"\n{PROBLEM_LABELS[problem]}: {len(problems[problem])}")
+        for entry in problems[problem]:
+            detail = f" -> {entry['correct']}" if 'correct' in entry else ''
+            print(f"   [{entry['sitemap']}] {unquote(entry['url'])}{detail}")
+    for loc in missing:
+        print(f"\n❌ Listed in {SITEMAP_INDEX} but missing: {loc}")
+
+    if args.json:
+        args.json.write_text(json.dumps(problems, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"\n📄 Report: {args.json}")
+
+    total = sum(report['urls'].values())
+    failed = sum(len(entries) for entries in problems.values())
+    print("\n" + "=" * 70)
+    print(f"📊 {total} URLs in {len(sitemaps)} sitemaps, {failed} with problems ({elapsed * 1000:.0f} ms)")
+    if failed or missing:
+        sys.exit(1)
+    print("✅ Every sitemap URL resolves to its canonical form")
+
+
+if __name__ == '__main__':
+    main()